@@ -2,25 +2,20 @@ from flask import Blueprint, request, jsonify, g, current_app
 from database import db
 from models import WorkoutTemplate, TemplateExercise, Exercise
 from api.auth import admin_required
+from utils.catalog_cache import SYSTEM_TEMPLATES, invalidate_catalog
+from utils.workout_templates import load_template_exercises
 from datetime import datetime
 
 admin_templates_bp = Blueprint('admin_templates_bp', __name__)
 
 
 def _serialize_template(t):
-    template_exercises = TemplateExercise.query.filter_by(
-        template_id=t.id
-    ).order_by(TemplateExercise.order_index).all()
-
     exercises = []
-    for te in template_exercises:
-        exercise = Exercise.query.get(te.exercise_id)
-        if not exercise:
-            continue
+    for te, name in load_template_exercises([t.id])[t.id]:
         exercises.append({
             'id': te.id,
             'exercise_id': te.exercise_id,
-            'name': exercise.name,
+            'name': name,
             'sets': te.sets,
             'reps': te.reps or '',
             'order_index': te.order_index,
@@ -79,6 +74,7 @@ def create_system_template():
             db.session.add(te)
 
         db.session.commit()
+        invalidate_catalog(SYSTEM_TEMPLATES)
         return jsonify({"success": True, "template": _serialize_template(template)}), 201
 
     except Exception as e:
@@ -110,6 +106,7 @@ def update_system_template(template_id):
             template.duration_minutes = data['duration_minutes']
 
         db.session.commit()
+        invalidate_catalog(SYSTEM_TEMPLATES)
         return jsonify({"success": True, "template": _serialize_template(template)}), 200
 
     except Exception as e:
@@ -129,6 +126,7 @@ def delete_system_template(template_id):
 
         db.session.delete(template)
         db.session.commit()
+        invalidate_catalog(SYSTEM_TEMPLATES)
         return jsonify({"success": True, "message": "System template deleted"}), 200
 
     except Exception as e:
@@ -165,6 +163,7 @@ def add_exercise_to_system_template(template_id):
         )
         db.session.add(te)
         db.session.commit()
+        invalidate_catalog(SYSTEM_TEMPLATES)
 
         return jsonify({"success": True, "template_exercise_id": te.id}), 201
 
@@ -189,6 +188,7 @@ def remove_exercise_from_system_template(template_id, te_id):
 
         db.session.delete(te)
         db.session.commit()
+        invalidate_catalog(SYSTEM_TEMPLATES)
         return jsonify({"success": True, "message": "Exercise removed from template"}), 200
 
     except Exception as e:
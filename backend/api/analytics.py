@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
-from models import Workout, HabitLog, Goal, UserPoint, PointTransaction
+from models import Workout, HabitLog, Goal, UserPoint, PointTransaction, Habit
 from api.auth import login_required
+from utils.local_time import local_today
+from utils.training_sessions import period_totals, sessions_between, training_streak
 from datetime import datetime, timedelta
 from sqlalchemy import func
 
@@ -14,29 +16,19 @@ def get_weekly_overview():
     """Get weekly overview stats for the dashboard"""
     try:
         user_id = g.user['id']
-        today = datetime.now().date()
+        today = local_today(user_id)
         week_ago = today - timedelta(days=7)
         
-        # Workout stats
-        workouts_this_week = Workout.query.filter(
-            Workout.user_id == user_id,
-            Workout.date >= week_ago,
-            Workout.date <= today
-        ).count()
-        
-        total_workout_duration = db.session.query(
-            func.sum(Workout.duration)
-        ).filter(
-            Workout.user_id == user_id,
-            Workout.date >= week_ago,
-            Workout.date <= today
-        ).scalar() or 0
+        # Workout stats (strength and cardio)
+        workouts_this_week, total_workout_duration, _ = period_totals(
+            user_id, week_ago, today + timedelta(days=1)
+        )
         
         # Habit stats
         habits_completed = HabitLog.query.join(HabitLog.habit).filter(
-            HabitLog.habit.has(user_id=user_id),
+            Habit.user_id == user_id,
             HabitLog.completed == True,
-            HabitLog.timestamp >= week_ago
+            HabitLog.local_date >= week_ago
         ).count()
         
         # Goal stats
@@ -87,30 +79,9 @@ def get_weekly_overview():
 
 
 def _calculate_workout_streak(user_id):
-    """Calculate current workout streak (consecutive days with workouts)"""
+    """Calculate current workout streak (consecutive days with a workout or cardio session)"""
     try:
-        today = datetime.now().date()
-        streak = 0
-        current_date = today
-
-        # Check backwards from today
-        while True:
-            workout_exists = Workout.query.filter(
-                Workout.user_id == user_id,
-                Workout.date == current_date
-            ).first()
-
-            if workout_exists:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
-
-            # Limit to prevent infinite loops
-            if streak > 365:
-                break
-
-        return streak
+        return training_streak(user_id, local_today(user_id))
     except Exception:
         return 0
 
@@ -131,6 +102,7 @@ def get_workout_history():
             func.sum(Workout.duration).label('total_duration')
         ).filter(
             Workout.user_id == user_id,
+            Workout.is_completed,
             Workout.date >= thirty_days_ago,
             Workout.date <= today
         ).group_by(Workout.date).all()
@@ -174,6 +146,7 @@ def get_last_workout_by_type(workout_type):
         safe_type = workout_type.replace('%', r'\%').replace('_', r'\_')
         last_workout = Workout.query.filter(
             Workout.user_id == user_id,
+            Workout.is_completed,
             Workout.type.ilike(f"%{safe_type}%")
         ).order_by(Workout.date.desc()).first()
         
@@ -224,10 +197,7 @@ def get_enhanced_analytics():
     """Get comprehensive analytics with real data for charts."""
     try:
         user_id = g.user['id']
-        today = datetime.now().date()
-        from models import WorkoutExercise, Exercise
-        from models.cardio_workout import CardioWorkout
-
+        today = local_today(user_id)
         # Time range from query param
         time_range = request.args.get('range', 'month')
         if time_range == 'week':
@@ -242,34 +212,33 @@ def get_enhanced_analytics():
             start_date = today - timedelta(days=30)
 
         # --- Aggregate Stats ---
-        workouts = Workout.query.filter(
-            Workout.user_id == user_id,
-            Workout.date >= start_date,
-            Workout.date <= today
-        ).all()
-
-        cardio_workouts = CardioWorkout.query.filter(
-            CardioWorkout.user_id == user_id,
-            func.date(CardioWorkout.date) >= start_date,
-            func.date(CardioWorkout.date) <= today
-        ).all()
+        sessions = sessions_between(user_id, start_date, today)
 
-        total_workouts = len(workouts) + len(cardio_workouts)
-        total_duration = sum(w.duration or 0 for w in workouts) + sum(c.duration or 0 for c in cardio_workouts)
+        total_workouts = len(sessions)
+        total_duration = sum(s.duration or 0 for s in sessions)
         avg_duration = total_duration / total_workouts if total_workouts > 0 else 0
 
         # Habits
         habits_completed = HabitLog.query.join(HabitLog.habit).filter(
-            HabitLog.habit.has(user_id=user_id),
+            Habit.user_id == user_id,
             HabitLog.completed == True,
-            HabitLog.timestamp >= start_date
+            HabitLog.local_date >= start_date
         ).count()
 
         total_habits = HabitLog.query.join(HabitLog.habit).filter(
-            HabitLog.habit.has(user_id=user_id),
-            HabitLog.timestamp >= start_date
+            Habit.user_id == user_id,
+            HabitLog.local_date >= start_date
         ).count()
 
+        habits_by_day = dict(db.session.query(
+            HabitLog.local_date, func.count(HabitLog.id)
+        ).join(HabitLog.habit).filter(
+            Habit.user_id == user_id,
+            HabitLog.completed == True,
+            HabitLog.local_date >= start_date,
+            HabitLog.local_date <= today
+        ).group_by(HabitLog.local_date).all())
+
         habit_rate = round((habits_completed / total_habits) * 100) if total_habits > 0 else 0
 
         # Goals
@@ -285,17 +254,15 @@ def get_enhanced_analytics():
         streak = _calculate_workout_streak(user_id)
 
         # --- Daily Activity Chart Data ---
+        sessions_by_day = {}
+        for s in sessions:
+            sessions_by_day[s.local_date] = sessions_by_day.get(s.local_date, 0) + 1
+
         daily_data = []
         date_cursor = start_date
         while date_cursor <= today:
-            day_workouts = sum(1 for w in workouts if w.date == date_cursor)
-            day_cardio = sum(1 for c in cardio_workouts
-                           if (c.date.date() if hasattr(c.date, 'date') else c.date) == date_cursor)
-            day_habits = HabitLog.query.join(HabitLog.habit).filter(
-                HabitLog.habit.has(user_id=user_id),
-                HabitLog.completed == True,
-                func.date(HabitLog.timestamp) == date_cursor
-            ).count()
+            day_sessions = sessions_by_day.get(date_cursor, 0)
+            day_habits = habits_by_day.get(date_cursor, 0)
 
             if time_range == 'week':
                 label = date_cursor.strftime('%a')
@@ -307,18 +274,18 @@ def get_enhanced_analytics():
             daily_data.append({
                 'date': date_cursor.isoformat(),
                 'label': label,
-                'workouts': day_workouts + day_cardio,
+                'workouts': day_sessions,
                 'habits': day_habits,
             })
             date_cursor += timedelta(days=1)
 
         # --- Workout Type Distribution ---
         type_counts = {}
-        for w in workouts:
-            t = w.type or 'Other'
-            type_counts[t] = type_counts.get(t, 0) + 1
-        for c in cardio_workouts:
-            t = c.cardio_type.capitalize() if c.cardio_type else 'Cardio'
+        for s in sessions:
+            if s.kind == 'cardio':
+                t = s.activity.capitalize() if s.activity else 'Cardio'
+            else:
+                t = s.activity or 'Other'
             type_counts[t] = type_counts.get(t, 0) + 1
 
         colors = ['#22c55e', '#3b82f6', '#8b5cf6', '#f59e0b', '#ef4444', '#06b6d4', '#ec4899']
@@ -332,14 +299,7 @@ def get_enhanced_analytics():
         week_start = start_date
         while week_start <= today:
             week_end = min(week_start + timedelta(days=6), today)
-            week_workouts = [w for w in workouts if week_start <= w.date <= week_end]
-
-            week_volume = 0
-            for w in week_workouts:
-                exercises = WorkoutExercise.query.filter_by(workout_id=w.id).all()
-                for ex in exercises:
-                    if ex.weight and ex.reps and ex.sets:
-                        week_volume += float(ex.weight) * ex.reps * ex.sets
+            week_volume = sum(s.volume or 0 for s in sessions if week_start <= s.local_date <= week_end)
 
             volume_data.append({
                 'label': week_start.strftime('%d %b'),
@@ -349,8 +309,8 @@ def get_enhanced_analytics():
 
         # --- Most Active Day ---
         day_counts = {}
-        for w in workouts:
-            day_name = w.date.strftime('%A')
+        for s in sessions:
+            day_name = s.local_date.strftime('%A')
             day_counts[day_name] = day_counts.get(day_name, 0) + 1
         best_day = max(day_counts, key=day_counts.get) if day_counts else 'N/A'
 
@@ -393,11 +353,22 @@ def get_enhanced_analytics():
 @analytics_bp.route('/analytics/exercise-progression/<int:exercise_id>', methods=['GET'])
 @login_required
 def get_exercise_progression(exercise_id):
-    """Get progression data for a specific exercise over time"""
+    """Get per-session progression, e1RM trend and plateau status for an exercise"""
     try:
         user_id = g.user['id']
-        from models import WorkoutExercise, Exercise
-        
+        from models import Exercise
+        from utils.strength_analytics import (
+            ONE_RM_FORMULAS, DEFAULT_FORMULA, load_exercise_history, analyze_progression
+        )
+
+        formula = request.args.get('formula', DEFAULT_FORMULA).lower()
+        if formula not in ONE_RM_FORMULAS:
+            return jsonify({
+                'success': False,
+                'message': f"formula must be one of: {', '.join(ONE_RM_FORMULAS)}"
+            }), 400
+        max_points = min(max(request.args.get('max_points', 500, type=int), 3), 2000)
+
         # Verify exercise exists
         exercise = Exercise.query.get(exercise_id)
         if not exercise:
@@ -405,56 +376,14 @@ def get_exercise_progression(exercise_id):
                 'success': False,
                 'message': 'Exercise not found'
             }), 404
-        
-        # Get all workout exercises for this exercise, ordered by date
-        workout_exercises = db.session.query(
-            WorkoutExercise, Workout.date
-        ).join(
-            Workout, WorkoutExercise.workout_id == Workout.id
-        ).filter(
-            Workout.user_id == user_id,
-            WorkoutExercise.exercise_id == exercise_id
-        ).order_by(Workout.date.asc()).all()
-        
-        if not workout_exercises:
-            return jsonify({
-                'success': True,
-                'exercise_name': exercise.name,
-                'progression': []
-            }), 200
-        
-        # Build progression data
-        progression = []
-        for we, date in workout_exercises:
-            progression.append({
-                'date': date.isoformat(),
-                'sets': we.sets,
-                'reps': we.reps,
-                'weight': float(we.weight) if we.weight else None,
-                'volume': float(we.weight * we.reps * we.sets) if we.weight and we.reps and we.sets else None,
-                'duration': we.duration
-            })
-        
-        # Calculate statistics
-        weights = [p['weight'] for p in progression if p['weight']]
-        reps = [p['reps'] for p in progression if p['reps']]
-        volumes = [p['volume'] for p in progression if p['volume']]
-        
-        stats = {
-            'total_sessions': len(progression),
-            'max_weight': max(weights) if weights else None,
-            'avg_weight': sum(weights) / len(weights) if weights else None,
-            'max_reps': max(reps) if reps else None,
-            'avg_reps': sum(reps) / len(reps) if reps else None,
-            'max_volume': max(volumes) if volumes else None,
-            'avg_volume': sum(volumes) / len(volumes) if volumes else None
-        }
-        
+
+        history = load_exercise_history(user_id, exercise_id)
+        result = analyze_progression(history, formula=formula, max_points=max_points)
+
         return jsonify({
             'success': True,
             'exercise_name': exercise.name,
-            'progression': progression,
-            'stats': stats
+            **result
         }), 200
         
     except Exception as e:
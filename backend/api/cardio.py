@@ -4,6 +4,7 @@ from models.cardio_workout import CardioWorkout
 from api.auth import login_required
 from datetime import datetime
 from utils.validators import validate_request, CardioSchema
+from utils.local_time import as_utc, local_date_for
 
 cardio_bp = Blueprint('cardio_bp', __name__)
 
@@ -28,14 +29,20 @@ def log_cardio():
 
         # Parse date
         workout_date = datetime.utcnow()
-        if data.get('date'):
+        raw_date = data.get('date')
+        if raw_date:
             try:
-                workout_date = datetime.fromisoformat(data['date'].replace('Z', '+00:00'))
+                workout_date = as_utc(datetime.fromisoformat(raw_date.replace('Z', '+00:00')))
             except Exception:
                 try:
-                    workout_date = datetime.strptime(data['date'], '%Y-%m-%d')
+                    workout_date = datetime.strptime(raw_date, '%Y-%m-%d')
                 except Exception:
                     pass
+        # A bare date is already the user's calendar day
+        if raw_date and len(raw_date) == 10:
+            local_date = workout_date.date()
+        else:
+            local_date = local_date_for(user_id, workout_date)
 
         cardio = CardioWorkout(
             user_id=user_id,
@@ -48,7 +55,8 @@ def log_cardio():
             heart_rate_max=data.get('heart_rate_max'),
             elevation_gain=data.get('elevation_gain'),
             notes=data.get('notes', ''),
-            date=workout_date
+            date=workout_date,
+            local_date=local_date
         )
 
         db.session.add(cardio)
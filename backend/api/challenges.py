@@ -1,11 +1,13 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
 from models.challenge import Challenge, ChallengeParticipant
-from models import User, Workout, WorkoutExercise
+from models import User
 from api.auth import login_required
 from datetime import datetime, timedelta
-from sqlalchemy import and_, or_, func
+from sqlalchemy import or_, update
 from utils.validators import validate_request, ChallengeSchema
+from utils.challenge_progress import recompute_challenge_progress
+from utils.leaderboards import leaderboard_page
 
 challenges_bp = Blueprint('challenges_bp', __name__)
 
@@ -29,12 +31,13 @@ def get_challenges():
             Challenge.status == 'active'
         ).distinct().all()
         
-        # Get public challenges user hasn't joined
+        # Get public challenges not already listed above (no per-row EXISTS)
+        my_ids = [c.id for c in user_challenges]
         public_challenges = Challenge.query.filter(
             Challenge.is_public == True,
             Challenge.status == 'active',
             Challenge.end_date > datetime.utcnow(),
-            ~Challenge.participants.any(ChallengeParticipant.user_id == user_id)
+            Challenge.id.notin_(my_ids)
         ).all()
         
         result = {
@@ -85,16 +88,17 @@ def create_challenge():
         )
         db.session.add(participant)
 
-        for invited_id in data.get('invited_users', []):
-            if invited_id != user_id:
-                invite = ChallengeParticipant(
-                    challenge_id=challenge.id,
-                    user_id=invited_id,
-                    current_progress=0,
-                    status='active'
-                )
-                db.session.add(invite)
+        invited_ids = {invited_id for invited_id in data.get('invited_users', []) if invited_id != user_id}
+        for invited_id in invited_ids:
+            invite = ChallengeParticipant(
+                challenge_id=challenge.id,
+                user_id=invited_id,
+                current_progress=0,
+                status='active'
+            )
+            db.session.add(invite)
 
+        challenge.participant_count = 1 + len(invited_ids)
         db.session.commit()
 
         return jsonify({
@@ -120,7 +124,7 @@ def join_challenge(challenge_id):
         if not challenge:
             return jsonify({'success': False, 'message': 'Challenge not found'}), 404
         
-        if challenge.status != 'active':
+        if challenge.status != 'active' or challenge.end_date <= datetime.utcnow():
             return jsonify({'success': False, 'message': 'Challenge is not active'}), 400
         
         # Check if already participating
@@ -140,6 +144,17 @@ def join_challenge(challenge_id):
         )
         
         db.session.add(participant)
+        # Increment in SQL so concurrent joins don't lose updates
+        db.session.execute(
+            update(Challenge)
+            .where(Challenge.id == challenge_id)
+            .values(participant_count=Challenge.participant_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.flush()
+
+        # Credit workouts already logged inside the challenge window
+        recompute_challenge_progress(challenge, user_ids=[user_id])
         db.session.commit()
         
         return jsonify({
@@ -156,39 +171,57 @@ def join_challenge(challenge_id):
 @challenges_bp.route('/challenges/<int:challenge_id>', methods=['GET'])
 @login_required
 def get_challenge_details(challenge_id):
-    """Get challenge details with leaderboard"""
+    """Get challenge details with a page of the leaderboard and the viewer's rank"""
     try:
+        user_id = g.user['id']
         challenge = Challenge.query.get(challenge_id)
         if not challenge:
             return jsonify({'success': False, 'message': 'Challenge not found'}), 404
-        
-        # Get all participants with user details
-        participants = db.session.query(
-            ChallengeParticipant,
-            User.username,
-            User.profile_picture
-        ).join(
-            User, ChallengeParticipant.user_id == User.id
-        ).filter(
-            ChallengeParticipant.challenge_id == challenge_id
-        ).order_by(
-            ChallengeParticipant.current_progress.desc()
-        ).all()
-        
+
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 100)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+
+        if challenge.status == 'active':
+            entries, total, my_rank = leaderboard_page(challenge_id, user_id, offset, limit)
+        else:
+            entries, total, my_rank = _final_standings(challenge_id, user_id, offset, limit)
+
+        # Only the users on this page are joined to their profile and status
+        page_user_ids = [member for _, member, _ in entries]
+        details = {
+            row.user_id: row for row in db.session.query(
+                ChallengeParticipant.user_id,
+                ChallengeParticipant.status,
+                User.email
+            ).join(
+                User, ChallengeParticipant.user_id == User.id
+            ).filter(
+                ChallengeParticipant.challenge_id == challenge_id,
+                ChallengeParticipant.user_id.in_(page_user_ids)
+            )
+        } if page_user_ids else {}
+
+        target = challenge.target_value or 0
         leaderboard = []
-        for participant, username, profile_pic in participants:
+        for rank, member, progress in entries:
+            row = details.get(member)
+            # Use email as username; the user schema has no username or picture
+            username = row.email.split('@')[0] if row and row.email else f"User{member}"
             leaderboard.append({
-                'user_id': participant.user_id,
+                'rank': rank,
+                'user_id': member,
                 'username': username,
-                'profile_picture': profile_pic,
-                'progress': participant.current_progress,
-                'status': participant.status,
-                'percentage': (participant.current_progress / challenge.target_value * 100) if challenge.target_value > 0 else 0
+                'profile_picture': None,
+                'progress': progress,
+                'status': row.status if row else None,
+                'percentage': (progress / target * 100) if target > 0 else 0
             })
-        
+
         result = challenge.to_dict()
         result['leaderboard'] = leaderboard
-        
+        result['leaderboard_total'] = total
+        result['my_rank'] = {'rank': my_rank[0], 'progress': my_rank[1]} if my_rank else None
+
         return jsonify({'success': True, 'challenge': result}), 200
         
     except Exception as e:
@@ -196,6 +229,21 @@ def get_challenge_details(challenge_id):
         return jsonify({'success': False, 'message': 'Failed to fetch challenge details'}), 500
 
 
+def _final_standings(challenge_id, user_id, offset, limit):
+    """Leaderboard page for a finalized challenge, read from final_rank"""
+    ranked = ChallengeParticipant.query.filter(
+        ChallengeParticipant.challenge_id == challenge_id,
+        ChallengeParticipant.final_rank.isnot(None)
+    )
+    page = ranked.order_by(ChallengeParticipant.final_rank).offset(offset).limit(limit).all()
+    mine = ranked.filter(ChallengeParticipant.user_id == user_id).first()
+    return (
+        [(p.final_rank, p.user_id, p.current_progress) for p in page],
+        ranked.count(),
+        (mine.final_rank, mine.current_progress) if mine else None,
+    )
+
+
 @challenges_bp.route('/challenges/<int:challenge_id>/update-progress', methods=['POST'])
 @login_required
 def update_challenge_progress(challenge_id):
@@ -215,20 +263,13 @@ def update_challenge_progress(challenge_id):
         if not challenge:
             return jsonify({'success': False, 'message': 'Challenge not found'}), 404
         
-        # Calculate progress based on challenge type
-        progress = calculate_challenge_progress(user_id, challenge)
-        participant.current_progress = progress
-        
-        # Check if completed
-        if progress >= challenge.target_value and participant.status == 'active':
-            participant.status = 'completed'
-            participant.completed_at = datetime.utcnow()
-        
+        # Recompute from history; marks completion and refreshes the leaderboard
+        recompute_challenge_progress(challenge, user_ids=[user_id])
         db.session.commit()
         
         return jsonify({
             'success': True,
-            'progress': progress,
+            'progress': participant.current_progress,
             'completed': participant.status == 'completed'
         }), 200
         
@@ -237,80 +278,3 @@ def update_challenge_progress(challenge_id):
         current_app.logger.error(f"Error updating challenge progress: {e}")
         return jsonify({'success': False, 'message': 'Failed to update progress'}), 500
 
-
-def calculate_challenge_progress(user_id, challenge):
-    """Calculate user's progress for a challenge"""
-    start_date = challenge.start_date
-    end_date = challenge.end_date
-    
-    if challenge.challenge_type == 'workout_count':
-        # Count workouts in date range
-        count = Workout.query.filter(
-            Workout.user_id == user_id,
-            Workout.date >= start_date.date(),
-            Workout.date <= end_date.date()
-        ).count()
-        return count
-    
-    elif challenge.challenge_type == 'total_volume':
-        # Sum total volume lifted
-        workouts = Workout.query.filter(
-            Workout.user_id == user_id,
-            Workout.date >= start_date.date(),
-            Workout.date <= end_date.date()
-        ).all()
-        
-        total_volume = 0
-        for workout in workouts:
-            exercises = WorkoutExercise.query.filter_by(workout_id=workout.id).all()
-            for ex in exercises:
-                if ex.weight and ex.reps and ex.sets:
-                    total_volume += ex.weight * ex.reps * ex.sets
-        return total_volume
-    
-    elif challenge.challenge_type == 'specific_exercise':
-        # Max weight for specific exercise
-        if not challenge.target_exercise_id:
-            return 0
-        
-        workouts = Workout.query.filter(
-            Workout.user_id == user_id,
-            Workout.date >= start_date.date(),
-            Workout.date <= end_date.date()
-        ).all()
-        
-        max_weight = 0
-        for workout in workouts:
-            exercises = WorkoutExercise.query.filter_by(
-                workout_id=workout.id,
-                exercise_id=challenge.target_exercise_id
-            ).all()
-            for ex in exercises:
-                if ex.weight and ex.weight > max_weight:
-                    max_weight = ex.weight
-        return max_weight
-    
-    elif challenge.challenge_type == 'streak':
-        # Workout streak days
-        workouts = Workout.query.filter(
-            Workout.user_id == user_id,
-            Workout.date >= start_date.date(),
-            Workout.date <= end_date.date()
-        ).order_by(Workout.date.desc()).all()
-        
-        if not workouts:
-            return 0
-        
-        streak = 1
-        last_date = workouts[0].date
-        
-        for workout in workouts[1:]:
-            if (last_date - workout.date).days == 1:
-                streak += 1
-                last_date = workout.date
-            else:
-                break
-        
-        return streak
-    
-    return 0
@@ -3,7 +3,9 @@ from database import db
 from models.daily_quest import DailyQuest, UserDailyQuest
 from api.auth import login_required
 from datetime import date, datetime
-from utils.gamification_helper import award_points
+from utils.gamification_helper import award_points_bulk
+from utils.quest_engine import EVALUATED_QUEST_TYPES
+from utils.quest_assignment import assign_quests_for_users, get_quest_catalog, invalidate_quest_catalog
 
 daily_quests_bp = Blueprint('daily_quests_bp', __name__)
 
@@ -16,17 +18,17 @@ def get_daily_quests():
         user_id = g.user['id']
         today = date.today()
         
-        # Check if user has quests assigned for today
-        user_quests = UserDailyQuest.query.filter_by(
-            user_id=user_id,
-            date_assigned=today
-        ).all()
+        # Quests are pre-assigned nightly; this is an indexed read on (user_id, date_assigned)
+        user_quests = _todays_quests(user_id, today)
         
-        # If no quests for today, assign new ones
+        # Users the nightly job skipped (new or long inactive) are assigned on demand
         if not user_quests:
-            user_quests = assign_daily_quests(user_id, today)
+            assign_daily_quests(user_id, today)
+            db.session.commit()
+            user_quests = _todays_quests(user_id, today)
         
-        result = [uq.to_dict() for uq in user_quests]
+        catalog = get_quest_catalog()
+        result = [uq.to_dict(catalog.get(uq.quest_id)) for uq in user_quests]
         
         return jsonify({
             'success': True,
@@ -35,10 +37,18 @@ def get_daily_quests():
         }), 200
         
     except Exception as e:
+        db.session.rollback()
         current_app.logger.error(f"Error fetching daily quests: {e}")
         return jsonify({'success': False, 'message': 'Failed to fetch daily quests'}), 500
 
 
+def _todays_quests(user_id, today):
+    return UserDailyQuest.query.filter_by(
+        user_id=user_id,
+        date_assigned=today
+    ).order_by(UserDailyQuest.id).all()
+
+
 @daily_quests_bp.route('/daily-quests/<int:quest_id>/complete', methods=['POST'])
 @login_required
 def complete_quest(quest_id):
@@ -56,27 +66,30 @@ def complete_quest(quest_id):
         
         if user_quest.is_completed:
             return jsonify({'success': False, 'message': 'Quest already completed'}), 400
+
+        if user_quest.quest.quest_type in EVALUATED_QUEST_TYPES:
+            return jsonify({'success': False, 'message': 'This quest completes automatically'}), 400
         
         # Mark as completed
         user_quest.is_completed = True
         user_quest.completed_at = datetime.utcnow()
         user_quest.current_progress = user_quest.quest.target_value
         
-        # Award points
-        points_awarded = award_points(
-            user_id=user_id,
-            reason='daily_quest_completed',
-            points=user_quest.quest.points_reward,
-            entity_type='quest',
-            entity_id=quest_id
-        )
+        # Award points through the same ledger path as evaluated quests
+        points_awarded = award_points_bulk([{
+            'user_id': user_id,
+            'reason': 'daily_quest_completed',
+            'points': user_quest.quest.points_reward,
+            'entity_type': 'quest',
+            'entity_id': quest_id
+        }])
         
         db.session.commit()
         
         return jsonify({
             'success': True,
             'message': 'Quest completed!',
-            'points_awarded': points_awarded['points_earned'] if points_awarded else 0
+            'points_awarded': points_awarded[user_id]['points_earned'] if points_awarded else 0
         }), 200
         
     except Exception as e:
@@ -86,33 +99,11 @@ def complete_quest(quest_id):
 
 
 def assign_daily_quests(user_id, quest_date):
-    """Assign 3 random daily quests to a user"""
-    # Get all active quests
-    all_quests = DailyQuest.query.filter_by(is_active=True).all()
-    
-    if not all_quests:
+    """Assign today's quests to one user, using the same picks as the nightly job"""
+    if not DailyQuest.query.filter_by(is_active=True).first():
         # Create default quests if none exist
         create_default_quests()
-        all_quests = DailyQuest.query.filter_by(is_active=True).all()
-    
-    # Select 3 random quests
-    import random
-    selected_quests = random.sample(all_quests, min(3, len(all_quests)))
-    
-    user_quests = []
-    for quest in selected_quests:
-        user_quest = UserDailyQuest(
-            user_id=user_id,
-            quest_id=quest.id,
-            date_assigned=quest_date,
-            current_progress=0,
-            is_completed=False
-        )
-        db.session.add(user_quest)
-        user_quests.append(user_quest)
-    
-    db.session.flush()
-    return user_quests
+    return assign_quests_for_users([user_id], quest_date)
 
 
 def create_default_quests():
@@ -173,37 +164,5 @@ def create_default_quests():
         db.session.add(quest)
     
     db.session.flush()
+    invalidate_quest_catalog()
 
-
-def update_quest_progress(user_id, quest_type, increment=1):
-    """Update progress for a specific quest type"""
-    today = date.today()
-    
-    user_quest = UserDailyQuest.query.join(DailyQuest).filter(
-        UserDailyQuest.user_id == user_id,
-        UserDailyQuest.date_assigned == today,
-        DailyQuest.quest_type == quest_type,
-        UserDailyQuest.is_completed == False
-    ).first()
-    
-    if user_quest:
-        user_quest.current_progress += increment
-        
-        # Auto-complete if target reached
-        if user_quest.current_progress >= user_quest.quest.target_value:
-            user_quest.is_completed = True
-            user_quest.completed_at = datetime.utcnow()
-            
-            # Award points
-            award_points(
-                user_id=user_id,
-                reason='daily_quest_completed',
-                points=user_quest.quest.points_reward,
-                entity_type='quest',
-                entity_id=user_quest.id
-            )
-        
-        db.session.flush()
-        return True
-    
-    return False
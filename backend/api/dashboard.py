@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db, cache
 from api.auth import login_required
-from datetime import datetime, timedelta
+from utils.local_time import local_today
+from datetime import timedelta
 
 dashboard_bp = Blueprint('dashboard_bp', __name__)
 
@@ -33,10 +34,10 @@ def get_dashboard():
             }
             
             # Today's stats
-            today = datetime.now().date()
+            today = local_today(user_id)
             
             result = conn.execute(
-                db.text("SELECT COUNT(*) FROM workouts WHERE user_id = :user_id AND date = :today"),
+                db.text("SELECT COUNT(*) FROM training_sessions WHERE user_id = :user_id AND local_date = :today"),
                 {"user_id": user_id, "today": today}
             )
             workouts_today = result.fetchone()[0]
@@ -45,7 +46,7 @@ def get_dashboard():
                 db.text("""
                     SELECT COUNT(*) FROM habit_logs hl
                     JOIN habits h ON hl.habit_id = h.id
-                    WHERE h.user_id = :user_id AND DATE(hl.timestamp) = :today
+                    WHERE h.user_id = :user_id AND hl.local_date = :today
                 """),
                 {"user_id": user_id, "today": today}
             )
@@ -59,12 +60,10 @@ def get_dashboard():
             # Recent workouts
             result = conn.execute(
                 db.text("""
-                    SELECT w.id, w.type, w.duration, w.date, COUNT(we.id) as exercise_count
+                    SELECT w.id, w.type, w.duration, w.date, w.exercise_count
                     FROM workouts w
-                    LEFT JOIN workout_exercises we ON we.workout_id = w.id
                     WHERE w.user_id = :user_id
-                    GROUP BY w.id
-                    ORDER BY w.date DESC, w.created_at DESC
+                    ORDER BY w.date DESC, w.id DESC
                     LIMIT 5
                 """),
                 {"user_id": user_id}
@@ -97,21 +96,27 @@ def get_dashboard():
             # Weekly activity
             week_start = today - timedelta(days=6)
             weekly_activity = []
+
+            # Strength and cardio sessions per day, one range read
+            result = conn.execute(
+                db.text("""
+                    SELECT local_date, COUNT(*) FROM training_sessions
+                    WHERE user_id = :user_id AND local_date >= :start AND local_date <= :today
+                    GROUP BY local_date
+                """),
+                {"user_id": user_id, "start": week_start, "today": today}
+            )
+            sessions_by_day = {str(row[0]): row[1] for row in result.fetchall()}
             
             for i in range(7):
                 day = week_start + timedelta(days=i)
-                
-                result = conn.execute(
-                    db.text("SELECT COUNT(*) FROM workouts WHERE user_id = :user_id AND date = :day"),
-                    {"user_id": user_id, "day": day}
-                )
-                workouts = result.fetchone()[0]
+                workouts = sessions_by_day.get(str(day), 0)
                 
                 result = conn.execute(
                     db.text("""
                         SELECT COUNT(*) FROM habit_logs hl
                         JOIN habits h ON hl.habit_id = h.id
-                        WHERE h.user_id = :user_id AND DATE(hl.timestamp) = :day
+                        WHERE h.user_id = :user_id AND hl.local_date = :day
                     """),
                     {"user_id": user_id, "day": day}
                 )
@@ -126,9 +131,9 @@ def get_dashboard():
             # Workout streak calculation
             result = conn.execute(
                 db.text("""
-                    SELECT DISTINCT date FROM workouts
+                    SELECT DISTINCT local_date FROM training_sessions
                     WHERE user_id = :user_id
-                    ORDER BY date DESC
+                    ORDER BY local_date DESC
                 """),
                 {"user_id": user_id}
             )
@@ -163,7 +168,7 @@ def get_dashboard():
                     WHERE h.user_id = :user_id
                     AND h.id NOT IN (
                         SELECT hl.habit_id FROM habit_logs hl
-                        WHERE DATE(hl.timestamp) = :today
+                        WHERE hl.local_date = :today
                     )
                     ORDER BY h.name ASC
                     LIMIT 3
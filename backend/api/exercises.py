@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
-from models import Exercise, Workout, WorkoutExercise
+from models import Exercise, WorkoutExercise
 from sqlalchemy import func
 from utils.logging import log_activity
 from api.auth import login_required
+from utils.catalog_cache import EXERCISES, SYSTEM_TEMPLATES, get_entry, invalidate_catalog
+from utils.exercise_similarity import get_substitutes
+from utils.last_performance import last_performance_map
 
 exercises_bp = Blueprint('exercises', __name__)
 
@@ -51,56 +54,43 @@ def create_exercise():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+def _exercise_catalog():
+    """Seeded (global) exercises; user-created ones change too often to cache per worker."""
+    return [e.to_dict() for e in Exercise.query.filter(Exercise.is_global == True).order_by(Exercise.name).all()]  # noqa: E712
+
+
+def _matches(ex, search, category, muscle_group):
+    return ((not search or search in ex['name'].lower())
+            and (not category or ex['category'] == category)
+            and (not muscle_group or ex['muscle_group'] == muscle_group))
+
+
 @exercises_bp.route('/exercises', methods=['GET'])
 @login_required
 def get_exercises():
     """
-    Fetch exercises visible to the current user.
-    Supports optional filters: search, category, muscle_group
+    Fetch exercises visible to the current user, each with the user's last
+    performance. Supports optional filters: search, category, muscle_group
     """
-    search = request.args.get('search', '').strip()
+    search = request.args.get('search', '').strip().lower()
     category = request.args.get('category', '').strip()
     muscle_group = request.args.get('muscle_group', '').strip()
     
     try:
-        # Names are globally unique — return all exercises
-        query = Exercise.query
-        
-        # Apply search filter
-        if search:
-            query = query.filter(Exercise.name.ilike(f"%{search}%"))
-        
-        # Apply category filter
-        if category:
-            query = query.filter(Exercise.category == category)
-        
-        # Apply muscle_group filter
-        if muscle_group:
-            query = query.filter(Exercise.muscle_group == muscle_group)
-        
-        # Execute query
-        exercises = query.order_by(Exercise.name).all()
-        
-        result = []
-        for exercise in exercises:
-            ex_dict = exercise.to_dict()
-            # Fetch last performance for this exercise
-            last_we = db.session.query(WorkoutExercise).join(
-                Workout, WorkoutExercise.workout_id == Workout.id
-            ).filter(
-                WorkoutExercise.exercise_id == exercise.id,
-                Workout.user_id == g.user['id']
-            ).order_by(Workout.date.desc(), Workout.created_at.desc()).first()
-            if last_we:
-                ex_dict['last_performance'] = {
-                    'weight': float(last_we.weight) if last_we.weight else None,
-                    'reps': last_we.reps,
-                    'sets': last_we.sets,
-                    'date': last_we.workout.date.isoformat() if last_we.workout and last_we.workout.date else None
-                }
-            else:
-                ex_dict['last_performance'] = None
-            result.append(ex_dict)
+        # Names are globally unique — the catalog is shared. Seeded rows are
+        # cached per worker; user-created rows are read fresh so every worker
+        # sees them as soon as they are committed.
+        catalog = get_entry(EXERCISES, 'global', _exercise_catalog).payload
+        created = [e.to_dict() for e in Exercise.query.filter(
+            db.or_(Exercise.is_global == False, Exercise.is_global.is_(None))  # noqa: E712
+        )]
+        last_performance = last_performance_map(g.user['id'])
+
+        result = [
+            {**ex, 'last_performance': last_performance.get(ex['id'])}
+            for ex in sorted(catalog + created, key=lambda ex: ex['name'].lower())
+            if _matches(ex, search, category, muscle_group)
+        ]
 
         return jsonify({"success": True, "exercises": result}), 200
         
@@ -125,6 +115,36 @@ def get_exercise(exercise_id):
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+@exercises_bp.route('/exercises/<int:exercise_id>/substitutes', methods=['GET'])
+@login_required
+def get_exercise_substitutes(exercise_id):
+    """
+    Similar exercises to swap in (same muscles, equipment, difficulty), from
+    the precomputed neighbour lists. ?personalize=true moves exercises the
+    user already performs up and includes their last performance.
+    """
+    limit = min(max(request.args.get('limit', 5, type=int), 1), 20)
+    personalize = request.args.get('personalize', '').lower() in ('1', 'true', 'yes')
+
+    try:
+        if not db.session.get(Exercise, exercise_id):
+            return jsonify({"success": False, "message": "Exercise not found"}), 404
+
+        substitutes = get_substitutes(exercise_id, g.user['id'] if personalize else None, limit)
+        return jsonify({
+            "success": True,
+            "exercise_id": exercise_id,
+            "substitutes": [
+                {**exercise.to_dict(), "score": score, "last_performance": last_performance}
+                for exercise, score, last_performance in substitutes
+            ]
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching exercise substitutes: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 @exercises_bp.route('/exercises/<int:exercise_id>', methods=['PUT'])
 @login_required
 def update_exercise(exercise_id):
@@ -148,6 +168,8 @@ def update_exercise(exercise_id):
         exercise.description = description
         
         db.session.commit()
+        invalidate_catalog(EXERCISES)
+        invalidate_catalog(SYSTEM_TEMPLATES)  # templates show exercise names
         
         log_activity(g.user['id'], "exercise_updated", "exercise", exercise_id)
         
@@ -168,9 +190,14 @@ def delete_exercise(exercise_id):
         if not exercise:
             return jsonify({"success": False, "message": "Exercise not found"}), 404
         
-        # WorkoutExercises will be deleted automatically via cascade
+        # Deleted through the session (not the FK cascade) so the flush hooks
+        # refresh workout counters, training sessions and the sync feed
+        for workout_exercise in WorkoutExercise.query.filter_by(exercise_id=exercise_id):
+            db.session.delete(workout_exercise)
         db.session.delete(exercise)
         db.session.commit()
+        invalidate_catalog(EXERCISES)
+        invalidate_catalog(SYSTEM_TEMPLATES)
         
         log_activity(g.user['id'], "exercise_deleted", "exercise", exercise_id)
         
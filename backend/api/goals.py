@@ -4,7 +4,15 @@ from models import Goal
 from models.goal_link import GoalLink
 from api.auth import login_required
 from utils.logging import log_activity
-from utils.goal_sync import recalculate_goal_progress
+from utils.goal_sync import recalculate_goal_progress, recalculate_goals, record_goal_snapshots
+from utils.goal_pace import compute_pace_info
+from utils.local_time import local_today
+from utils.rewards import on_goal_updated
+from utils.goal_forecast import (
+    FORECAST_METHODS, DEFAULT_METHOD, build_burnup, forecast_completion,
+    projection_series, stored_forecast,
+)
+from models.goal_progress_snapshot import GoalProgressSnapshot
 from datetime import date
 
 goals_bp = Blueprint('goals_bp', __name__)
@@ -40,6 +48,8 @@ def add_goal():
         )
 
         db.session.add(goal)
+        db.session.flush()
+        record_goal_snapshots({goal.id: goal.progress or 0}, local_today(user_id))
         db.session.commit()
 
         log_activity(user_id, "created", "goal", goal.id)
@@ -64,8 +74,10 @@ def get_goals():
     try:
         goals = Goal.query.filter_by(user_id=user_id).order_by(Goal.created_at.desc()).all()
 
+        pace_infos = compute_pace_info(goals)
+
         goals_list = []
-        for goal in goals:
+        for goal, pace_info in zip(goals, pace_infos):
             goal_dict = {
                 "id": goal.id,
                 "user_id": goal.user_id,
@@ -77,57 +89,10 @@ def get_goals():
                 "auto_sync": goal.auto_sync,
                 "created_at": goal.created_at.isoformat() if goal.created_at else None,
                 "updated_at": goal.updated_at.isoformat() if goal.updated_at else None,
-                "links_count": GoalLink.query.filter_by(goal_id=goal.id).count(),
+                "links_count": goal.links_count or 0,
+                "pace_info": pace_info,
+                "forecast": stored_forecast(goal),
             }
-
-            # Calculate pace info
-            pace_info = None
-            if goal.deadline and goal.progress < goal.target:
-                from datetime import date as date_type
-                deadline = goal.deadline if isinstance(goal.deadline, date_type) else date.fromisoformat(str(goal.deadline))
-                days_remaining = (deadline - date.today()).days
-                remaining = goal.target - goal.progress
-
-                if days_remaining > 0:
-                    days_elapsed = (date.today() - goal.created_at.date()).days if goal.created_at else 0
-                    if days_elapsed > 0:
-                        current_rate = goal.progress / days_elapsed  # progress per day
-                        required_rate = remaining / days_remaining
-
-                        if current_rate > 0:
-                            projected_completion_days = remaining / current_rate
-                            on_track = projected_completion_days <= days_remaining
-                        else:
-                            on_track = False
-                            projected_completion_days = None
-
-                        pace_info = {
-                            'days_remaining': days_remaining,
-                            'remaining_progress': remaining,
-                            'current_rate': round(current_rate, 2),
-                            'required_rate': round(required_rate, 2),
-                            'on_track': on_track,
-                            'status': 'on_track' if on_track else 'behind'
-                        }
-                    else:
-                        pace_info = {
-                            'days_remaining': days_remaining,
-                            'remaining_progress': remaining,
-                            'current_rate': 0,
-                            'required_rate': round(remaining / days_remaining, 2),
-                            'on_track': True,
-                            'status': 'just_started'
-                        }
-                elif days_remaining <= 0:
-                    pace_info = {
-                        'days_remaining': 0,
-                        'remaining_progress': remaining,
-                        'on_track': False,
-                        'status': 'overdue'
-                    }
-
-            goal_dict['pace_info'] = pace_info
-
             goals_list.append(goal_dict)
 
         return jsonify({"success": True, "goals": goals_list}), 200
@@ -176,52 +141,7 @@ def get_goal(goal_id):
             "links": links_list,
         }
 
-        # Calculate pace info
-        pace_info = None
-        if goal.deadline and goal.progress < goal.target:
-            from datetime import date as date_type
-            deadline = goal.deadline if isinstance(goal.deadline, date_type) else date.fromisoformat(str(goal.deadline))
-            days_remaining = (deadline - date.today()).days
-            remaining = goal.target - goal.progress
-
-            if days_remaining > 0:
-                days_elapsed = (date.today() - goal.created_at.date()).days if goal.created_at else 0
-                if days_elapsed > 0:
-                    current_rate = goal.progress / days_elapsed  # progress per day
-                    required_rate = remaining / days_remaining
-
-                    if current_rate > 0:
-                        projected_completion_days = remaining / current_rate
-                        on_track = projected_completion_days <= days_remaining
-                    else:
-                        on_track = False
-                        projected_completion_days = None
-
-                    pace_info = {
-                        'days_remaining': days_remaining,
-                        'remaining_progress': remaining,
-                        'current_rate': round(current_rate, 2),
-                        'required_rate': round(required_rate, 2),
-                        'on_track': on_track,
-                        'status': 'on_track' if on_track else 'behind'
-                    }
-                else:
-                    pace_info = {
-                        'days_remaining': days_remaining,
-                        'remaining_progress': remaining,
-                        'current_rate': 0,
-                        'required_rate': round(remaining / days_remaining, 2),
-                        'on_track': True,
-                        'status': 'just_started'
-                    }
-            elif days_remaining <= 0:
-                pace_info = {
-                    'days_remaining': 0,
-                    'remaining_progress': remaining,
-                    'on_track': False,
-                    'status': 'overdue'
-                }
-
+        pace_info = compute_pace_info([goal])[0]
         goal_dict['pace_info'] = pace_info
 
         return jsonify({"success": True, "goal": goal_dict}), 200
@@ -231,6 +151,50 @@ def get_goal(goal_id):
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+@goals_bp.route('/goals/<int:goal_id>/progress-history', methods=['GET'])
+@login_required
+def get_goal_progress_history(goal_id):
+    """
+    Burn-up series (daily progress) with a completion forecast.
+
+    Query params:
+        method: "ewma" (default) or "linear" (least squares over 28 days)
+    """
+    user_id = g.user['id']
+    method = request.args.get('method', DEFAULT_METHOD)
+    if method not in FORECAST_METHODS:
+        return jsonify({"success": False, "message": f"method must be one of: {', '.join(FORECAST_METHODS)}"}), 400
+
+    try:
+        goal = Goal.query.filter_by(id=goal_id, user_id=user_id).first()
+        if not goal:
+            return jsonify({"success": False, "message": "Goal not found"}), 404
+
+        snapshots = db.session.query(
+            GoalProgressSnapshot.snapshot_date, GoalProgressSnapshot.progress
+        ).filter_by(goal_id=goal_id).order_by(GoalProgressSnapshot.snapshot_date).all()
+
+        days, values = build_burnup(snapshots, goal.created_at)
+        forecast = forecast_completion(days, values, goal.target, goal.deadline, method)
+
+        return jsonify({
+            "success": True,
+            "goal_id": goal.id,
+            "target": goal.target,
+            "deadline": goal.deadline.isoformat() if goal.deadline else None,
+            "series": [
+                {"date": str(day), "progress": int(value)}
+                for day, value in zip(days, values)
+            ],
+            "forecast": forecast,
+            "projection": projection_series(days, values, forecast),
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching goal progress history: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 @goals_bp.route('/goals/<int:goal_id>', methods=['PUT'])
 @login_required
 def update_goal(goal_id):
@@ -251,6 +215,8 @@ def update_goal(goal_id):
             goal.target = data["target"]
         if data.get("progress") is not None:
             goal.progress = data["progress"]
+            record_goal_snapshots({goal.id: goal.progress}, local_today(user_id))
+            on_goal_updated(user_id)
         if data.get("deadline") is not None:
             goal.deadline = data["deadline"]
         if data.get("auto_sync") is not None:
@@ -325,6 +291,7 @@ def add_goal_link(goal_id):
 
         # Enable auto_sync when a link is added
         goal.auto_sync = True
+        goal.links_count = (goal.links_count or 0) + 1
 
         link = GoalLink(
             goal_id=goal_id,
@@ -397,10 +364,10 @@ def delete_goal_link(goal_id, link_id):
             return jsonify({"success": False, "message": "Link not found"}), 404
 
         db.session.delete(link)
+        goal.links_count = max((goal.links_count or 0) - 1, 0)
 
         # Disable auto_sync if no more links
-        remaining = GoalLink.query.filter_by(goal_id=goal_id).count()
-        if remaining <= 1:  # 1 because the delete hasn't flushed yet
+        if goal.links_count == 0:
             goal.auto_sync = False
 
         db.session.commit()
@@ -438,3 +405,28 @@ def recalculate_goal(goal_id):
         db.session.rollback()
         current_app.logger.error(f"Error recalculating goal: {e}")
         return jsonify({"success": False, "message": str(e)}), 500
+
+
+@goals_bp.route('/goals/recalculate', methods=['POST'])
+@login_required
+def recalculate_all_goals():
+    """Recalculate progress for all of the user's goals in one pass."""
+    user_id = g.user['id']
+
+    try:
+        results = recalculate_goals(user_ids=[user_id])
+        db.session.commit()
+
+        return jsonify({
+            "success": True,
+            "message": "Goal progress recalculated",
+            "goals": [
+                {"id": goal_id, "progress": r["progress"], "links_count": r["links_count"]}
+                for goal_id, r in results.items()
+            ],
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error recalculating goals: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
@@ -3,11 +3,18 @@ from database import db
 from models import Habit, HabitLog
 from api.auth import login_required
 from utils.logging import log_activity
-from utils.rewards import on_habit_logged
-from datetime import date, time
+from utils.rewards import on_habit_logged, on_habits_logged
+from utils.habit_calendar import record_completion, record_completions, current_streak, heatmap
+from utils.habit_reminders import schedule_reminder
+from utils.local_time import as_utc, local_date_for, local_today, user_timezone
+from utils.sync import record_changes
+from datetime import date, datetime, time
+from sqlalchemy.exc import IntegrityError
 
 habits_bp = Blueprint('habits_bp', __name__)
 
+MAX_CHECK_IN_HABITS = 50
+
 
 @habits_bp.route('/habits', methods=['POST'])
 @login_required
@@ -32,6 +39,7 @@ def add_habit():
             description=description,
             next_occurrence=next_occurrence
         )
+        schedule_reminder(habit, user_timezone(user_id))
         
         db.session.add(habit)
         db.session.commit()
@@ -57,6 +65,7 @@ def get_habits():
     
     try:
         habits = Habit.query.filter_by(user_id=user_id).order_by(Habit.created_at.desc()).all()
+        today = local_today(user_id)
         
         habits_list = []
         for habit in habits:
@@ -67,6 +76,8 @@ def get_habits():
                 "reminder_time": habit.reminder_time.strftime("%H:%M") if isinstance(habit.reminder_time, time) else str(habit.reminder_time),
                 "description": habit.description,
                 "next_occurrence": habit.next_occurrence.isoformat() if isinstance(habit.next_occurrence, date) else str(habit.next_occurrence),
+                "current_streak": current_streak(habit, today),
+                "longest_streak": habit.longest_streak,
                 "created_at": habit.created_at,
                 "updated_at": habit.updated_at
             })
@@ -129,6 +140,7 @@ def update_habit(habit_id):
             habit.description = data["description"]
         if data.get("next_occurrence") is not None:
             habit.next_occurrence = data["next_occurrence"]
+        schedule_reminder(habit, user_timezone(user_id))
 
         db.session.commit()
         
@@ -182,24 +194,33 @@ def log_habit(habit_id):
         if not habit:
             return jsonify({"success": False, "message": "Habit not found"}), 404
 
+        logged_at = as_utc(datetime.fromisoformat(timestamp)) if timestamp else datetime.utcnow()
+        local_date = local_date_for(user_id, logged_at)
+
         # Prevent duplicate logs on the same day
-        today = date.today()
-        existing_log = HabitLog.query.filter_by(habit_id=habit_id).filter(
-            db.func.date(HabitLog.timestamp) == today
-        ).first()
+        existing_log = HabitLog.query.filter_by(habit_id=habit_id, local_date=local_date).first()
         if existing_log:
             return jsonify({"success": False, "message": "Habit already logged today"}), 400
 
         # Create log
         habit_log = HabitLog(
             habit_id=habit_id,
-            timestamp=timestamp,
+            timestamp=logged_at,
+            local_date=local_date,
             completed=completed,
             amount=amount,
             notes=notes
         )
         
         db.session.add(habit_log)
+        try:
+            db.session.flush()
+        except IntegrityError:
+            # A concurrent request logged the same day first
+            db.session.rollback()
+            return jsonify({"success": False, "message": "Habit already logged today"}), 400
+        if habit_log.completed:
+            record_completion(habit, local_date)
         db.session.commit()
 
         # Award points, check achievements, sync goals
@@ -214,6 +235,133 @@ def log_habit(habit_id):
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+def _insert_new_logs(rows):
+    """
+    Insert habit logs in one statement, skipping habits already logged
+    for that local day. Returns the ids of the rows actually inserted.
+    """
+    if db.engine.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    stmt = insert(HabitLog).values(rows).on_conflict_do_nothing(
+        index_elements=['habit_id', 'local_date']
+    ).returning(HabitLog.id)
+    return [row.id for row in db.session.execute(stmt)]
+
+
+@habits_bp.route('/habits/check-in', methods=['POST'])
+@login_required
+def check_in_habits():
+    """
+    Log several habits at once (e.g. the evening check-in). Habits already
+    logged for the day are skipped, not rejected.
+
+    Body: {"logs": [{"habit_id", "completed"?, "amount"?, "notes"?}], "timestamp"?}
+    """
+    user_id = g.user['id']
+    data = request.get_json() or {}
+    entries = data.get("logs")
+    timestamp = data.get("timestamp")
+
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"success": False, "message": "logs must be a non-empty list"}), 400
+    if len(entries) > MAX_CHECK_IN_HABITS:
+        return jsonify({"success": False, "message": f"At most {MAX_CHECK_IN_HABITS} habits per check-in"}), 400
+
+    by_habit = {}
+    for entry in entries:
+        habit_id = entry.get("habit_id") if isinstance(entry, dict) else None
+        if not isinstance(habit_id, int):
+            return jsonify({"success": False, "message": "Each log needs an integer habit_id"}), 400
+        by_habit.setdefault(habit_id, entry)
+
+    try:
+        habits = {
+            habit.id: habit for habit in
+            Habit.query.filter(Habit.id.in_(list(by_habit)), Habit.user_id == user_id)
+        }
+        missing = sorted(set(by_habit) - set(habits))
+        if missing:
+            return jsonify({"success": False, "message": "Habit not found", "habit_ids": missing}), 404
+
+        logged_at = as_utc(datetime.fromisoformat(timestamp)) if timestamp else datetime.utcnow()
+        local_date = local_date_for(user_id, logged_at)
+        now = datetime.utcnow()
+
+        inserted_ids = _insert_new_logs([{
+            "habit_id": habit_id,
+            "timestamp": logged_at,
+            "local_date": local_date,
+            "completed": entry.get("completed", True),
+            "amount": entry.get("amount"),
+            "notes": entry.get("notes"),
+            "created_at": now,
+        } for habit_id, entry in by_habit.items()])
+
+        new_logs = HabitLog.query.filter(HabitLog.id.in_(inserted_ids)).all() if inserted_ids else []
+        record_changes(user_id, 'habit_log', inserted_ids)
+        record_completions([habits[log.habit_id] for log in new_logs if log.completed], local_date)
+        db.session.commit()
+
+        # Award points, check achievements, sync goals once for the batch
+        on_habits_logged(user_id, new_logs)
+        db.session.commit()
+
+        logged = sorted(log.habit_id for log in new_logs)
+        return jsonify({
+            "success": True,
+            "message": f"{len(logged)} habits logged",
+            "logged": logged,
+            "skipped": sorted(set(by_habit) - set(logged)),
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error checking in habits: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@habits_bp.route('/habits/heatmap', methods=['GET'])
+@login_required
+def get_habits_heatmap():
+    """
+    One year of completions for every habit. Each habit's `bits` is a
+    base64 bitset: bit n (least significant first in each byte) is
+    day-of-year n + 1.
+    """
+    user_id = g.user['id']
+    year = request.args.get('year', date.today().year, type=int)
+
+    try:
+        habits = Habit.query.filter_by(user_id=user_id).order_by(Habit.id).all()
+        habits_heatmap = heatmap(habits, year, local_today(user_id))
+        return jsonify({"success": True, "year": year, "habits": habits_heatmap}), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching habit heatmap: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@habits_bp.route('/habits/<int:habit_id>/heatmap', methods=['GET'])
+@login_required
+def get_habit_heatmap(habit_id):
+    user_id = g.user['id']
+    year = request.args.get('year', date.today().year, type=int)
+
+    try:
+        habit = Habit.query.filter_by(id=habit_id, user_id=user_id).first()
+        if not habit:
+            return jsonify({"success": False, "message": "Habit not found"}), 404
+
+        habit_heatmap = heatmap([habit], year, local_today(user_id))[0]
+        return jsonify({"success": True, "year": year, "habit": habit_heatmap}), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching habit heatmap: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 @habits_bp.route('/habits/<int:habit_id>/logs', methods=['GET'])
 @login_required
 def get_habit_logs(habit_id):
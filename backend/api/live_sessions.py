@@ -0,0 +1,166 @@
+from flask import Blueprint, request, jsonify, g, current_app
+from database import db
+from models.workout_program import ProgramWorkout
+from api.auth import login_required
+from utils.live_sessions import (
+    active_session, append_set, discard_session, finish_session, load_session,
+    normalize_set, release, start_session,
+)
+from utils.local_time import local_today
+from utils.logging import log_activity
+from utils.pr_tracker import check_and_update_prs
+from utils.rewards import on_workout_logged
+from datetime import date
+
+live_sessions_bp = Blueprint('live_sessions_bp', __name__)
+
+
+def _session_dict(row, sets):
+    session = row.to_dict() if row else {}
+    session['sets'] = sets
+    session['set_count'] = len(sets)
+    return session
+
+
+# Start a live session; one active session per user
+@live_sessions_bp.route('/live-sessions', methods=['POST'])
+@login_required
+def start_live_session():
+    user_id = g.user['id']
+    data = request.get_json(silent=True) or {}
+
+    try:
+        existing = active_session(user_id)
+        if existing:
+            return jsonify({
+                "success": False,
+                "message": "A live session is already in progress",
+                "session": existing.to_dict()
+            }), 409
+
+        program_workout_id = data.get('program_workout_id')
+        if program_workout_id is not None and (
+            not isinstance(program_workout_id, int) or not db.session.get(ProgramWorkout, program_workout_id)
+        ):
+            return jsonify({"success": False, "message": "Program workout not found"}), 404
+
+        row = start_session(user_id, data.get('type'), program_workout_id)
+        db.session.commit()
+        return jsonify({"success": True, "session": _session_dict(row, [])}), 201
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error starting live session: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+# The user's session in progress, with every set logged so far
+@live_sessions_bp.route('/live-sessions/active', methods=['GET'])
+@login_required
+def get_active_live_session():
+    user_id = g.user['id']
+    row = active_session(user_id)
+    if not row:
+        return jsonify({"success": True, "session": None}), 200
+
+    loaded = load_session(row.id, user_id)
+    return jsonify({"success": True, "session": _session_dict(row, loaded[1] if loaded else [])}), 200
+
+
+# Log one set; held in the session store, checkpointed to the database periodically
+@live_sessions_bp.route('/live-sessions/<int:session_id>/sets', methods=['POST'])
+@login_required
+def log_live_set(session_id):
+    user_id = g.user['id']
+    data = request.get_json(silent=True) or {}
+
+    try:
+        entry = normalize_set(data)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    try:
+        result = append_set(session_id, user_id, entry)
+        if result is None:
+            return jsonify({"success": False, "message": "Live session not found"}), 404
+
+        set_count, checkpointed = result
+        return jsonify({
+            "success": True,
+            "set": entry,
+            "set_count": set_count,
+            "checkpointed": checkpointed
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error logging live set: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+# Finish: the logged sets become a workout in one transaction
+@live_sessions_bp.route('/live-sessions/<int:session_id>/finish', methods=['POST'])
+@login_required
+def finish_live_session(session_id):
+    user_id = g.user['id']
+    data = request.get_json(silent=True) or {}
+
+    try:
+        workout_date = date.fromisoformat(data['date']) if data.get('date') else local_today(user_id)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "date must be YYYY-MM-DD"}), 400
+
+    try:
+        finished = finish_session(
+            session_id, user_id,
+            duration=data.get('duration'),
+            notes=data.get('notes'),
+            rpe=data.get('rpe'),
+            workout_date=workout_date,
+        )
+        if finished is None:
+            return jsonify({"success": False, "message": "Live session not found"}), 404
+
+        row, workout, workout_exercises = finished
+        db.session.commit()
+        release(session_id)
+
+        log_activity(user_id, "created", "workout", workout.id)
+        prs_achieved = check_and_update_prs(user_id, workout.id, workout_exercises)
+        on_workout_logged(user_id, workout, pr_count=len(prs_achieved or []),
+                          program_workout_id=row.program_workout_id)
+        db.session.commit()
+
+        return jsonify({
+            "success": True,
+            "session": row.to_dict(),
+            "workout_id": workout.id,
+            "workout": workout.to_dict(),
+            "prs_achieved": prs_achieved
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error finishing live session: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+# Discard a session without logging a workout
+@live_sessions_bp.route('/live-sessions/<int:session_id>', methods=['DELETE'])
+@login_required
+def discard_live_session(session_id):
+    user_id = g.user['id']
+
+    try:
+        row = discard_session(session_id, user_id)
+        if row is None:
+            return jsonify({"success": False, "message": "Live session not found"}), 404
+
+        db.session.commit()
+        release(session_id)
+        return jsonify({"success": True, "message": "Live session discarded"}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error discarding live session: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
@@ -1,8 +1,14 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
-from models.workout_program import WorkoutProgram, ProgramWorkout, ProgramExercise, ProgramEnrollment
+from models.workout_program import ProgramEnrollment
 from api.auth import login_required
-from datetime import date, datetime
+from utils.catalog_cache import PROGRAMS, catalog_response
+from utils.program_catalog import (
+    active_enrollments, find_workout, program_summaries, program_tree, public_programs
+)
+from utils.program_progress import adherence, advance_enrollment, todays_sessions
+from utils.local_time import local_today
+from datetime import date
 
 programs_bp = Blueprint('programs_bp', __name__)
 
@@ -10,13 +16,9 @@ programs_bp = Blueprint('programs_bp', __name__)
 @programs_bp.route('/programs', methods=['GET'])
 @login_required
 def get_programs():
-    """Get all public workout programs"""
+    """Get all public workout programs (pre-encoded, revalidated by ETag)"""
     try:
-        programs = WorkoutProgram.query.filter_by(is_public=True).all()
-        return jsonify({
-            'success': True,
-            'programs': [p.to_dict() for p in programs]
-        }), 200
+        return catalog_response(PROGRAMS, 'public', public_programs)
     except Exception as e:
         current_app.logger.error(f"Error fetching programs: {e}")
         return jsonify({'success': False, 'message': 'Failed to fetch programs'}), 500
@@ -27,19 +29,13 @@ def get_programs():
 def get_program_details(program_id):
     """Get detailed program information including all workouts"""
     try:
-        program = WorkoutProgram.query.get(program_id)
-        if not program:
+        tree = program_tree(program_id)
+        if not tree:
             return jsonify({'success': False, 'message': 'Program not found'}), 404
         
-        program_dict = program.to_dict()
-        program_dict['workouts'] = [w.to_dict() for w in program.workouts]
-        
-        # Check if user is enrolled
-        enrollment = ProgramEnrollment.query.filter_by(
-            user_id=g.user['id'],
-            program_id=program_id,
-            status='active'
-        ).first()
+        # Shared tree from the catalog cache; enrollment state is per user
+        program_dict = dict(tree)
+        enrollment = active_enrollments(g.user['id'], program_id).get(program_id)
         
         program_dict['is_enrolled'] = enrollment is not None
         if enrollment:
@@ -103,15 +99,15 @@ def get_my_enrollments():
     try:
         user_id = g.user['id']
         
-        enrollments = ProgramEnrollment.query.filter_by(
-            user_id=user_id,
-            status='active'
-        ).all()
+        enrollments = list(active_enrollments(user_id).values())
+        summaries = program_summaries()
+        stats = adherence(enrollments, local_today(user_id))
         
         result = []
         for e in enrollments:
             enrollment_dict = e.to_dict()
-            enrollment_dict['program'] = e.program.to_dict()
+            enrollment_dict['program'] = summaries.get(e.program_id)
+            enrollment_dict['adherence'] = stats[e.id]
             result.append(enrollment_dict)
         
         return jsonify({
@@ -140,19 +136,9 @@ def update_enrollment_progress(enrollment_id):
         if not enrollment:
             return jsonify({'success': False, 'message': 'Enrollment not found'}), 404
         
-        # Update progress
+        # Update progress (logged workouts also advance it, see utils/program_progress.py)
         if data.get('advance_day'):
-            enrollment.current_day += 1
-            
-            # Check if need to advance week
-            if enrollment.current_day > enrollment.program.workouts_per_week:
-                enrollment.current_day = 1
-                enrollment.current_week += 1
-                
-                # Check if program completed
-                if enrollment.current_week > enrollment.program.duration_weeks:
-                    enrollment.status = 'completed'
-                    enrollment.completed_at = datetime.utcnow()
+            advance_enrollment(enrollment, program_summaries()[enrollment.program_id])
         
         db.session.commit()
         
@@ -174,31 +160,69 @@ def get_current_workout(program_id):
     try:
         user_id = g.user['id']
         
-        enrollment = ProgramEnrollment.query.filter_by(
-            user_id=user_id,
-            program_id=program_id,
-            status='active'
-        ).first()
+        enrollment = active_enrollments(user_id, program_id).get(program_id)
         
         if not enrollment:
             return jsonify({'success': False, 'message': 'Not enrolled in this program'}), 404
         
-        # Get current workout
-        current_workout = ProgramWorkout.query.filter_by(
-            program_id=program_id,
-            week_number=enrollment.current_week,
-            day_number=enrollment.current_day
-        ).first()
+        # Get current workout from the cached program tree
+        tree = program_tree(program_id)
+        current_workout = find_workout(tree, enrollment.current_week, enrollment.current_day) if tree else None
         
         if not current_workout:
             return jsonify({'success': False, 'message': 'No workout found for current day'}), 404
         
         return jsonify({
             'success': True,
-            'workout': current_workout.to_dict(),
+            'workout': current_workout,
             'enrollment': enrollment.to_dict()
         }), 200
         
     except Exception as e:
         current_app.logger.error(f"Error fetching current workout: {e}")
         return jsonify({'success': False, 'message': 'Failed to fetch workout'}), 500
+
+
+@programs_bp.route('/programs/today', methods=['GET'])
+@login_required
+def get_todays_sessions():
+    """
+    Today's programmed session for each active enrollment, with exercises
+    resolved and the user's last performance for each.
+    """
+    try:
+        user_id = g.user['id']
+        sessions = todays_sessions(user_id, active_enrollments(user_id).values())
+        return jsonify({
+            'success': True,
+            'sessions': sessions
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching today's program sessions: {e}")
+        return jsonify({'success': False, 'message': 'Failed to fetch sessions'}), 500
+
+
+@programs_bp.route('/programs/enrollments/<int:enrollment_id>/adherence', methods=['GET'])
+@login_required
+def get_enrollment_adherence(enrollment_id):
+    """Sessions completed against those scheduled so far."""
+    try:
+        user_id = g.user['id']
+        enrollment = ProgramEnrollment.query.filter_by(
+            id=enrollment_id,
+            user_id=user_id
+        ).first()
+
+        if not enrollment:
+            return jsonify({'success': False, 'message': 'Enrollment not found'}), 404
+
+        return jsonify({
+            'success': True,
+            'enrollment': enrollment.to_dict(),
+            'adherence': adherence([enrollment], local_today(user_id))[enrollment.id]
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching enrollment adherence: {e}")
+        return jsonify({'success': False, 'message': 'Failed to fetch adherence'}), 500
@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
 from models.activity_reaction import ActivityReaction
-from models import User
+from models import User, SocialActivity
 from api.auth import login_required
+from utils.rewards import on_social_interaction
 
 reactions_bp = Blueprint('reactions_bp', __name__)
 
@@ -39,6 +40,10 @@ def add_reaction(activity_id):
             reaction_type=reaction_type
         )
         db.session.add(reaction)
+
+        activity = SocialActivity.query.get(activity_id)
+        if activity and activity.user_id != user_id:
+            on_social_interaction(user_id, 'like')
         db.session.commit()
         
         return jsonify({'success': True, 'action': 'added'}), 201
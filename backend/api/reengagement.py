@@ -1,10 +1,14 @@
 from flask import Blueprint, jsonify, g, current_app
 from database import db
-from models import Workout, HabitLog, Goal, UserPoint, PointTransaction, Habit
-from models.cardio_workout import CardioWorkout
+from models import HabitLog, Goal, UserPoint, PointTransaction, Habit
 from models.streak_freeze import StreakFreeze
+from models.training_session import TrainingSession
 from api.auth import login_required
-from datetime import datetime, timedelta
+from utils.local_time import local_today
+from utils.training_sessions import (
+    STREAK_WINDOW_DAYS, active_days, last_active_date, period_totals, training_streak
+)
+from datetime import timedelta
 from sqlalchemy import func
 
 reengagement_bp = Blueprint('reengagement_bp', __name__)
@@ -19,7 +23,7 @@ def get_streak_status():
     """Get current streak info with freeze availability."""
     try:
         user_id = g.user['id']
-        today = datetime.now().date()
+        today = local_today(user_id)
         week_ago = today - timedelta(days=7)
 
         # Calculate current streak
@@ -34,17 +38,9 @@ def get_streak_status():
         can_freeze = freezes_this_week < MAX_FREEZES_PER_WEEK
 
         # Check if today needs a freeze (no workout today, streak at risk)
-        has_workout_today = Workout.query.filter(
-            Workout.user_id == user_id,
-            Workout.date == today
-        ).first() is not None
+        trained_today = bool(active_days(user_id, today, today))
 
-        has_cardio_today = CardioWorkout.query.filter(
-            CardioWorkout.user_id == user_id,
-            func.date(CardioWorkout.date) == today
-        ).first() is not None
-
-        streak_at_risk = not has_workout_today and not has_cardio_today and streak > 0
+        streak_at_risk = not trained_today and streak > 0
 
         # Get user points for cost check
         user_points = UserPoint.query.filter_by(user_id=user_id).first()
@@ -72,7 +68,7 @@ def use_streak_freeze():
     """Use a streak freeze for today."""
     try:
         user_id = g.user['id']
-        today = datetime.now().date()
+        today = local_today(user_id)
         week_ago = today - timedelta(days=7)
 
         # Check if already frozen today
@@ -135,32 +131,19 @@ def get_weekly_recap():
     """Get a week-over-week comparison recap."""
     try:
         user_id = g.user['id']
-        today = datetime.now().date()
+        today = local_today(user_id)
 
         this_week_start = today - timedelta(days=7)
         last_week_start = today - timedelta(days=14)
 
         def week_stats(start, end):
-            workouts = Workout.query.filter(
-                Workout.user_id == user_id,
-                Workout.date >= start,
-                Workout.date < end
-            ).all()
-
-            cardio = CardioWorkout.query.filter(
-                CardioWorkout.user_id == user_id,
-                func.date(CardioWorkout.date) >= start,
-                func.date(CardioWorkout.date) < end
-            ).all()
-
-            total_workouts = len(workouts) + len(cardio)
-            total_duration = sum(w.duration or 0 for w in workouts) + sum(c.duration or 0 for c in cardio)
+            total_workouts, total_duration, total_volume = period_totals(user_id, start, end)
 
             habits_completed = HabitLog.query.join(HabitLog.habit).filter(
-                HabitLog.habit.has(user_id=user_id),
+                Habit.user_id == user_id,
                 HabitLog.completed == True,
-                HabitLog.timestamp >= start,
-                HabitLog.timestamp < end
+                HabitLog.local_date >= start,
+                HabitLog.local_date < end
             ).count()
 
             goals_completed = Goal.query.filter(
@@ -178,15 +161,6 @@ def get_weekly_recap():
                 PointTransaction.created_at < end
             ).scalar() or 0
 
-            # Calculate total volume from workouts
-            from models import WorkoutExercise
-            total_volume = 0
-            for w in workouts:
-                exercises = WorkoutExercise.query.filter_by(workout_id=w.id).all()
-                for ex in exercises:
-                    if ex.weight and ex.reps and ex.sets:
-                        total_volume += float(ex.weight) * ex.reps * ex.sets
-
             return {
                 'workouts': total_workouts,
                 'duration_minutes': total_duration,
@@ -210,14 +184,15 @@ def get_weekly_recap():
 
         # Find most active day this week
         workout_days = {}
-        workouts_this_week = Workout.query.filter(
-            Workout.user_id == user_id,
-            Workout.date >= this_week_start,
-            Workout.date < today
-        ).all()
-        for w in workouts_this_week:
-            day = w.date.strftime('%A')
-            workout_days[day] = workout_days.get(day, 0) + 1
+        for day, count in db.session.query(
+            TrainingSession.local_date, func.count(TrainingSession.id)
+        ).filter(
+            TrainingSession.user_id == user_id,
+            TrainingSession.local_date >= this_week_start,
+            TrainingSession.local_date < today
+        ).group_by(TrainingSession.local_date):
+            name = day.strftime('%A')
+            workout_days[name] = workout_days.get(name, 0) + count
         most_active_day = max(workout_days, key=workout_days.get) if workout_days else None
 
         # Streak info
@@ -244,24 +219,10 @@ def get_comeback_status():
     """Check if user has been inactive and offer comeback incentive."""
     try:
         user_id = g.user['id']
-        today = datetime.now().date()
+        today = local_today(user_id)
 
-        # Find last workout date
-        last_workout = Workout.query.filter_by(user_id=user_id).order_by(
-            Workout.date.desc()
-        ).first()
-
-        last_cardio = CardioWorkout.query.filter_by(user_id=user_id).order_by(
-            CardioWorkout.date.desc()
-        ).first()
-
-        last_active = None
-        if last_workout:
-            last_active = last_workout.date
-        if last_cardio:
-            cardio_date = last_cardio.date.date() if hasattr(last_cardio.date, 'date') else last_cardio.date
-            if not last_active or cardio_date > last_active:
-                last_active = cardio_date
+        # Find last workout or cardio date
+        last_active = last_active_date(user_id)
 
         if not last_active:
             return jsonify({
@@ -301,34 +262,12 @@ def get_comeback_status():
 def _calculate_streak_with_freezes(user_id):
     """Calculate workout streak accounting for freeze days."""
     try:
-        today = datetime.now().date()
-        streak = 0
-        current_date = today
-
-        while True:
-            workout_exists = Workout.query.filter(
-                Workout.user_id == user_id,
-                Workout.date == current_date
-            ).first()
-
-            cardio_exists = CardioWorkout.query.filter(
-                CardioWorkout.user_id == user_id,
-                func.date(CardioWorkout.date) == current_date
-            ).first()
-
-            freeze_exists = StreakFreeze.query.filter_by(
-                user_id=user_id, freeze_date=current_date
-            ).first()
-
-            if workout_exists or cardio_exists or freeze_exists:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
-
-            if streak > 365:
-                break
-
-        return streak
+        today = local_today(user_id)
+        freeze_days = [day for (day,) in db.session.query(StreakFreeze.freeze_date).filter(
+            StreakFreeze.user_id == user_id,
+            StreakFreeze.freeze_date > today - timedelta(days=STREAK_WINDOW_DAYS),
+            StreakFreeze.freeze_date <= today
+        )]
+        return training_streak(user_id, today, extra_days=freeze_days)
     except Exception:
         return 0
@@ -4,6 +4,7 @@ from models import User, Friendship, SocialActivity, ActivityLike, ActivityComme
 from api.auth import login_required
 from utils.logging import log_activity
 from utils.validators import validate_request, CommentSchema
+from utils.rewards import on_social_interaction
 from sqlalchemy import or_, and_, desc
 from datetime import datetime, timedelta, timezone
 
@@ -478,6 +479,7 @@ def like_activity(activity_id):
                 liker = User.query.get(user_id)
                 liker_name = f"{liker.firstname or ''} {liker.lastname or ''}".strip() or liker.email.split('@')[0]
                 notify_activity_liked(activity.user_id, liker_name, activity.action)
+                on_social_interaction(user_id, 'like')
 
         db.session.commit()
         return jsonify({'success': True, 'action': action, 'likes_count': activity.likes_count}), 200
@@ -537,6 +539,7 @@ def add_comment(activity_id):
             commenter = User.query.get(user_id)
             commenter_name = f"{commenter.firstname or ''} {commenter.lastname or ''}".strip() or commenter.email.split('@')[0]
             notify_activity_commented(activity.user_id, commenter_name, activity.action, data['comment'])
+            on_social_interaction(user_id, 'comment')
 
         db.session.commit()
 
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
 from api.auth import login_required
-from datetime import datetime, timedelta
+from utils.local_time import local_today
+from datetime import timedelta
 
 summary_bp = Blueprint('summary_bp', __name__)
 
@@ -15,7 +16,7 @@ def get_weekly_summary():
     try:
         with db.engine.connect() as conn:
             # Calculate week bounds
-            today = datetime.now().date()
+            today = local_today(user_id)
             week_start = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
             week_end = week_start + timedelta(days=6)
             week_number = week_start.isocalendar()[1]
@@ -46,7 +47,7 @@ def get_weekly_summary():
                     SELECT h.id, h.name, h.frequency, COUNT(hl.id) as logs_count
                     FROM habits h
                     LEFT JOIN habit_logs hl ON hl.habit_id = h.id 
-                        AND hl.timestamp >= :week_start AND hl.timestamp <= :week_end
+                        AND hl.local_date >= :week_start AND hl.local_date <= :week_end
                     WHERE h.user_id = :user_id
                     GROUP BY h.id, h.name, h.frequency
                 """),
@@ -154,7 +155,7 @@ def get_weekly_summary():
                     db.text("""
                         SELECT COUNT(*) FROM habit_logs hl
                         JOIN habits h ON hl.habit_id = h.id
-                        WHERE h.user_id = :user_id AND DATE(hl.timestamp) = :day_date
+                        WHERE h.user_id = :user_id AND hl.local_date = :day_date
                     """),
                     {"user_id": user_id, "day_date": day_date}
                 )
@@ -216,7 +217,7 @@ def send_weekly_summary_notification():
 
     try:
         with db.engine.connect() as conn:
-            today = datetime.now().date()
+            today = local_today(user_id)
             week_start = today - timedelta(days=today.weekday())
             week_end = week_start + timedelta(days=6)
 
@@ -239,7 +240,7 @@ def send_weekly_summary_notification():
                 db.text("""
                     SELECT COUNT(hl.id) FROM habit_logs hl
                     JOIN habits h ON hl.habit_id = h.id
-                    WHERE h.user_id = :uid AND hl.timestamp >= :ws AND hl.timestamp <= :we
+                    WHERE h.user_id = :uid AND hl.local_date >= :ws AND hl.local_date <= :we
                 """),
                 {"uid": user_id, "ws": week_start, "we": week_end}
             )
@@ -0,0 +1,115 @@
+from flask import Blueprint, request, jsonify, g, current_app
+from database import db
+from api.auth import login_required
+from utils.logging import log_activity
+from utils.pr_tracker import check_and_update_prs
+from utils.rewards import on_habits_logged, on_weight_logged, on_workouts_logged
+from utils.sync import (
+    CHANGES_PAGE_SIZE, MAX_CHANGES_PAGE_SIZE, MAX_KEY_LENGTH, MAX_OPERATIONS, OPERATIONS,
+    apply_batch, changes_since, decode_cursor, head_cursor,
+)
+
+sync_bp = Blueprint('sync_bp', __name__)
+
+
+def _run_rewards(user_id, applied):
+    """The post-write pipeline, once for everything the batch created."""
+    pr_counts, program_workout_ids = {}, {}
+    for workout, workout_exercises, program_workout_id in applied['workout']:
+        log_activity(user_id, "created", "workout", workout.id)
+        prs_achieved = check_and_update_prs(user_id, workout.id, workout_exercises)
+        pr_counts[workout.id] = len(prs_achieved or [])
+        program_workout_ids[workout.id] = program_workout_id
+    on_workouts_logged(user_id, [workout for workout, _, _ in applied['workout']],
+                       pr_counts, program_workout_ids)
+
+    # Streaks and quests are evaluated per day
+    by_day = {}
+    for habit_log in applied['habit_log']:
+        by_day.setdefault(habit_log.local_date, []).append(habit_log)
+    for day in sorted(by_day):
+        on_habits_logged(user_id, by_day[day])
+
+    for weight_log in applied['weight_log']:
+        on_weight_logged(user_id, weight_log.id)
+
+    for measurement, created in applied['body_measurement']:
+        log_activity(user_id, "created" if created else "updated", "body_measurement", measurement.id)
+
+
+@sync_bp.route('/sync', methods=['POST'])
+@login_required
+def sync_operations():
+    """
+    Replay queued offline writes in order. Each operation carries a
+    client-generated idempotency key; replays of an applied key are
+    answered with the original result and status "duplicate".
+
+    Body: {"operations": [{"key", "op", "data"}]}, op one of
+    workout.create, habit_log.create, weight_log.create, body_measurement.upsert
+    """
+    user_id = g.user['id']
+    data = request.get_json(silent=True) or {}
+    operations = data.get("operations")
+
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"success": False, "message": "operations must be a non-empty list"}), 400
+    if len(operations) > MAX_OPERATIONS:
+        return jsonify({"success": False, "message": f"At most {MAX_OPERATIONS} operations per sync"}), 400
+    for index, operation in enumerate(operations):
+        key = operation.get("key") if isinstance(operation, dict) else None
+        if not isinstance(key, str) or not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({"success": False,
+                            "message": f"Operation {index} needs a key of at most {MAX_KEY_LENGTH} characters"}), 400
+        if operation.get("op") not in OPERATIONS:
+            return jsonify({"success": False, "message": f"Operation {index} has an unknown op",
+                            "ops": sorted(OPERATIONS)}), 400
+        if not isinstance(operation.get("data", {}), dict):
+            return jsonify({"success": False, "message": f"Operation {index} data must be an object"}), 400
+
+    try:
+        results, applied = apply_batch(user_id, operations)
+        db.session.commit()
+
+        _run_rewards(user_id, applied)
+        db.session.commit()
+
+        return jsonify({
+            "success": True,
+            "applied": sum(1 for r in results if r['status'] == 'applied'),
+            "results": results
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error applying sync batch: {e}")
+        return jsonify({"success": False, "message": "Internal server error"}), 500
+
+
+@sync_bp.route('/sync/changes', methods=['GET'])
+@login_required
+def get_changes():
+    """
+    Workouts, habit logs, weight logs and measurements changed after
+    `cursor`. Without a cursor, returns only the current one: take it
+    before a full download, then poll with it.
+    """
+    user_id = g.user['id']
+    cursor = request.args.get('cursor')
+
+    try:
+        limit = min(int(request.args.get('limit', CHANGES_PAGE_SIZE)), MAX_CHANGES_PAGE_SIZE)
+        cursor = decode_cursor(cursor) if cursor is not None else None
+    except ValueError:
+        return jsonify({"success": False, "message": "cursor must come from this feed and limit must be an integer"}), 400
+    if limit < 1:
+        return jsonify({"success": False, "message": "limit must be at least 1"}), 400
+
+    try:
+        if cursor is None:
+            return jsonify({"success": True, "cursor": head_cursor(user_id)}), 200
+        return jsonify({"success": True, **changes_since(user_id, cursor, limit)}), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching sync changes: {e}")
+        return jsonify({"success": False, "message": "Internal server error"}), 500
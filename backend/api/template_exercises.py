@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
-from models import TemplateExercise, Exercise, WorkoutTemplate
+from models import TemplateExercise, WorkoutTemplate
 from api.auth import login_required
+from utils.workout_templates import load_template_exercises
 
 template_exercises_bp = Blueprint('template_exercises_bp', __name__)
 
@@ -75,20 +76,13 @@ def get_template_exercises(template_id):
         if not template:
             return jsonify({"success": False, "message": "Template not found"}), 404
         
-        # Get template exercises with exercise details
-        template_exercises = TemplateExercise.query.filter_by(
-            template_id=template_id
-        ).order_by(
-            TemplateExercise.order_index
-        ).all()
-        
+        # Get template exercises with exercise names in one query
         result = []
-        for te in template_exercises:
-            exercise = Exercise.query.get(te.exercise_id)
+        for te, name in load_template_exercises([template_id])[template_id]:
             result.append({
                 "id": te.id,
                 "exercise_id": te.exercise_id,
-                "name": exercise.name if exercise else None,
+                "name": name,
                 "sets": te.sets,
                 "reps": te.reps,
                 "weight": te.weight,
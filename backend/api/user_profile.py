@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify, g, current_app
 from database import db
 from models import UserProfile
 from api.auth import login_required
+from utils.habit_reminders import reschedule_user_reminders
+from utils.local_time import is_valid_timezone
+from zoneinfo import ZoneInfo
 
 user_bp = Blueprint('user_bp', __name__)
 
@@ -86,7 +89,8 @@ def get_profile():
             "height_cm": profile.height_cm,
             "current_weight_kg": profile.current_weight_kg,
             "goal_weight_kg": profile.goal_weight_kg,
-            "activity_level": profile.activity_level
+            "activity_level": profile.activity_level,
+            "timezone": profile.timezone
         }
 
         return jsonify({"success": True, **profile_data}), 200
@@ -122,6 +126,14 @@ def update_profile():
             profile.goal_weight_kg = data["goal_weight"]
         if data.get("activity_level") is not None:
             profile.activity_level = data["activity_level"]
+        if data.get("timezone") is not None:
+            if not is_valid_timezone(data["timezone"]):
+                db.session.rollback()
+                return jsonify({"success": False, "message": "Unknown timezone"}), 400
+            if data["timezone"] != profile.timezone:
+                # Reminders are stored as UTC instants of a local time
+                reschedule_user_reminders(user_id, ZoneInfo(data["timezone"]))
+            profile.timezone = data["timezone"]
 
         db.session.commit()
 
@@ -131,7 +143,8 @@ def update_profile():
             "height_cm": profile.height_cm,
             "current_weight_kg": profile.current_weight_kg,
             "goal_weight_kg": profile.goal_weight_kg,
-            "activity_level": profile.activity_level
+            "activity_level": profile.activity_level,
+            "timezone": profile.timezone
         }
         
         return jsonify({"success": True, "message": "Profile updated successfully", "profile": updated_profile_data}), 200
@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
-from models import WorkoutTemplate, TemplateExercise, Exercise
+from models import WorkoutTemplate
 from api.auth import login_required
+from utils.catalog_cache import SYSTEM_TEMPLATES, catalog_response, get_entry
+from utils.local_time import local_today
 from utils.logging import log_activity
+from utils.workout_templates import instantiate_template, load_template_exercises
+from datetime import date
 
 workout_templates_bp = Blueprint('workout_templates_bp', __name__)
 
@@ -39,20 +43,19 @@ def add_workout_template():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
-def _serialize_template(t):
-    """Serialize a WorkoutTemplate with its exercises."""
-    template_exercises = TemplateExercise.query.filter_by(
-        template_id=t.id
-    ).order_by(TemplateExercise.order_index).all()
+def _serialize_templates(templates):
+    """Serialize WorkoutTemplates with their exercises (two queries in total)."""
+    exercises = load_template_exercises([t.id for t in templates])
+    return [_serialize_template(t, exercises[t.id]) for t in templates]
 
+
+def _serialize_template(t, template_exercises):
+    """Serialize a WorkoutTemplate; template_exercises from load_template_exercises()."""
     exercises = []
-    for te in template_exercises:
-        exercise = Exercise.query.get(te.exercise_id)
-        if not exercise:
-            continue
+    for te, name in template_exercises:
         exercises.append({
             'exercise_id': te.exercise_id,
-            'name': exercise.name,
+            'name': name,
             'sets': te.sets,
             'reps': te.reps or '',
             'order_index': te.order_index,
@@ -76,6 +79,23 @@ def _serialize_template(t):
     }
 
 
+def _system_templates():
+    system = WorkoutTemplate.query.filter_by(is_system=True).order_by(WorkoutTemplate.name).all()
+    return {"success": True, "templates": _serialize_templates(system)}
+
+
+# Get system templates only — shared catalog, pre-encoded and revalidated by ETag
+@workout_templates_bp.route('/workout-templates/system', methods=['GET'])
+@login_required
+def get_system_templates():
+    try:
+        return catalog_response(SYSTEM_TEMPLATES, 'all', _system_templates)
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching system templates: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 # Get all templates — system templates + user's own templates
 @workout_templates_bp.route('/workout-templates', methods=['GET'])
 @login_required
@@ -83,11 +103,10 @@ def get_workout_templates():
     user_id = g.user['id']
 
     try:
-        system = WorkoutTemplate.query.filter_by(is_system=True).order_by(WorkoutTemplate.name).all()
         user_templates = WorkoutTemplate.query.filter_by(user_id=user_id, is_system=False).all()
 
-        system_list = [_serialize_template(t) for t in system]
-        user_list = [_serialize_template(t) for t in user_templates]
+        system_list = get_entry(SYSTEM_TEMPLATES, 'all', _system_templates).payload["templates"]
+        user_list = _serialize_templates(user_templates)
 
         # Keep legacy "templates" key pointing to user templates for backward compat
         return jsonify({
@@ -102,6 +121,62 @@ def get_workout_templates():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+# Plan a workout from a template — own or system — prefilled from last performance.
+# PRs and rewards wait for POST /workouts/<id>/complete.
+@workout_templates_bp.route('/workout-templates/<int:template_id>/start', methods=['POST'])
+@login_required
+def start_workout_from_template(template_id):
+    user_id = g.user['id']
+    data = request.get_json(silent=True) or {}
+
+    try:
+        workout_date = date.fromisoformat(data['date']) if data.get('date') else local_today(user_id)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "date must be YYYY-MM-DD"}), 400
+
+    try:
+        template = WorkoutTemplate.query.filter(
+            WorkoutTemplate.id == template_id,
+            (WorkoutTemplate.user_id == user_id) | (WorkoutTemplate.is_system == True)  # noqa: E712
+        ).first()
+
+        if not template:
+            return jsonify({"success": False, "message": "Template not found"}), 404
+
+        workout, exercises = instantiate_template(user_id, template, workout_date)
+        db.session.commit()
+
+        log_activity(user_id, "created", "workout", workout.id)
+
+        workout_dict = workout.to_dict()
+        workout_dict['exercises'] = [
+            {
+                'id': we.id,
+                'exercise_id': we.exercise_id,
+                'name': name,
+                'sets': we.sets,
+                'reps': we.reps,
+                'weight': float(we.weight) if we.weight is not None else None,
+                'duration': we.duration,
+                'rest_time': we.rest_time,
+                'notes': we.notes,
+                'last_performance': last_performance
+            }
+            for we, name, last_performance in exercises
+        ]
+
+        return jsonify({
+            "success": True,
+            "workout_id": workout.id,
+            "workout": workout_dict
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error starting workout from template: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 # Update template
 @workout_templates_bp.route('/workout-templates/<int:template_id>', methods=['PUT'])
 @login_required
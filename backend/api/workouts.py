@@ -1,17 +1,31 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from database import db
 from models import Workout, WorkoutExercise, Exercise
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import load_only
 from api.auth import login_required
 from utils.logging import log_activity
 from utils.validators import validate_request, WorkoutSchema
 from utils.rewards import on_workout_logged
-from utils.pr_tracker import check_and_update_prs
+from utils.pr_tracker import check_and_update_prs, find_affected_prs, recheck_edited_set, recompute_prs
+from utils.challenge_progress import refresh_user_challenges
 from sqlalchemy import desc
-from datetime import datetime
+from datetime import date, datetime
 
 workouts_bp = Blueprint('workouts_bp', __name__)
 
+MAX_PAGE_SIZE = 200
+
+
+def _encode_cursor(workout):
+    return f"{workout.date.isoformat()}.{workout.id}"
+
+
+def _decode_cursor(cursor):
+    """(date, id) from a cursor returned by GET /workouts; ValueError if malformed."""
+    day, _, workout_id = cursor.partition('.')
+    return date.fromisoformat(day), int(workout_id)
+
 @workouts_bp.route('/workouts', methods=['POST'])
 @login_required
 @validate_request(WorkoutSchema)
@@ -24,7 +38,7 @@ def create_workout():
             user_id=g.user['id'],
             type=data['type'],
             duration=data['duration'],
-            date=data.get('date', datetime.now().date()),
+            date=data.get('date') or datetime.now().date(),
             notes=data.get('notes'),
             rpe=data.get('rpe')
         )
@@ -34,6 +48,7 @@ def create_workout():
         
         # Add exercises if provided
         exercises_data = data.get('exercises', [])
+        workout_exercises = []
         for ex_data in exercises_data:
             exercise_id = ex_data.get('exercise_id')
             
@@ -59,16 +74,17 @@ def create_workout():
                 notes=ex_data.get('notes')
             )
             db.session.add(workout_exercise)
+            workout_exercises.append(workout_exercise)
         
         db.session.commit()
         log_activity(g.user['id'], "created", "workout", workout.id)
 
         # Check for PRs
-        workout_exercises = WorkoutExercise.query.filter_by(workout_id=workout.id).all()
         prs_achieved = check_and_update_prs(g.user['id'], workout.id, workout_exercises)
 
         # Award points, check achievements, sync goals
-        on_workout_logged(g.user['id'], workout)
+        on_workout_logged(g.user['id'], workout, pr_count=len(prs_achieved or []),
+                          program_workout_id=data.get('program_workout_id'))
         db.session.commit()
 
         return jsonify({
@@ -91,16 +107,51 @@ def create_workout():
 @workouts_bp.route('/workouts', methods=['GET'])
 @login_required
 def get_workouts():
+    """
+    Workout history, newest first. With ?limit= the list is paged by keyset:
+    pass the returned next_cursor as ?cursor= for the following page.
+    ?fields=id,date,type restricts the columns read and returned.
+    """
+    fields = Workout.LIST_FIELDS
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        unknown = sorted(set(fields) - set(Workout.LIST_FIELDS))
+        if unknown:
+            return jsonify({
+                "success": False,
+                "message": f"Unknown fields: {', '.join(unknown)}"
+            }), 400
+
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
     try:
-        workouts = Workout.query.filter_by(
-            user_id=g.user['id']
-        ).order_by(
-            desc(Workout.date), 
-            desc(Workout.created_at)
-        ).all()
-        
-        result = [workout.to_dict() for workout in workouts]
-        return jsonify({"success": True, "workouts": result}), 200
+        after = _decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid cursor"}), 400
+
+    try:
+        columns = {'date', *fields} - {'id'}
+        query = Workout.query.options(
+            load_only(*(getattr(Workout, name) for name in columns))
+        ).filter(
+            Workout.user_id == g.user['id']
+        )
+        if after:
+            query = query.filter(tuple_(Workout.date, Workout.id) < after)
+        query = query.order_by(desc(Workout.date), desc(Workout.id))
+
+        if limit or after:
+            limit = min(max(limit or 50, 1), MAX_PAGE_SIZE)
+            workouts = query.limit(limit + 1).all()
+            has_more = len(workouts) > limit
+            workouts = workouts[:limit]
+        else:
+            workouts = query.all()
+            has_more = False
+
+        result = [workout.to_dict(fields) for workout in workouts]
+        next_cursor = _encode_cursor(workouts[-1]) if has_more else None
+        return jsonify({"success": True, "workouts": result, "next_cursor": next_cursor}), 200
         
     except Exception as e:
         current_app.logger.error(f"Error fetching workouts: {e}")
@@ -187,6 +238,7 @@ def duplicate_workout(workout_id):
         db.session.add(new_workout)
         db.session.flush()
 
+        workout_exercises = []
         for original_exercise in original_workout.exercises:
             new_exercise = WorkoutExercise(
                 workout_id=new_workout.id,
@@ -199,12 +251,12 @@ def duplicate_workout(workout_id):
                 notes=original_exercise.notes
             )
             db.session.add(new_exercise)
+            workout_exercises.append(new_exercise)
 
         db.session.commit()
 
         log_activity(g.user['id'], "created", "workout", new_workout.id)
 
-        workout_exercises = WorkoutExercise.query.filter_by(workout_id=new_workout.id).all()
         prs_achieved = check_and_update_prs(g.user['id'], new_workout.id, workout_exercises)
 
         on_workout_logged(g.user['id'], new_workout)
@@ -293,13 +345,16 @@ def update_workout(workout_id):
             workout.type = data['type']
         if 'duration' in data:
             workout.duration = data['duration']
-        if 'date' in data:
+        if data.get('date'):
             workout.date = data['date']
         if 'notes' in data:
             workout.notes = data['notes']
         if 'rpe' in data:
             workout.rpe = data['rpe']
 
+        if 'date' in data:
+            db.session.flush()
+            refresh_user_challenges(g.user['id'])
         db.session.commit()
         log_activity(g.user['id'], "updated", "workout", workout_id)
         
@@ -332,7 +387,14 @@ def delete_workout(workout_id):
                 "message": "Workout not found"
             }), 404
         
+        affected_exercises = find_affected_prs(g.user['id'], workout.exercises.all())
+
         db.session.delete(workout)
+        db.session.flush()
+
+        # Drop or lower any PRs that were backed by this workout's sets
+        recompute_prs(g.user['id'], affected_exercises)
+        refresh_user_challenges(g.user['id'])
         db.session.commit()
         
         log_activity(g.user['id'], "deleted", "workout", workout_id)
@@ -351,6 +413,63 @@ def delete_workout(workout_id):
         }), 500
 
 
+@workouts_bp.route('/workouts/<int:workout_id>/complete', methods=['POST'])
+@login_required
+def complete_workout(workout_id):
+    """
+    Mark a planned workout (started from a template) as done. Its sets are
+    checked for PRs and the workout is rewarded now, not when it was planned.
+    """
+    data = request.get_json(silent=True) or {}
+
+    try:
+        workout = Workout.query.filter_by(
+            id=workout_id,
+            user_id=g.user['id']
+        ).with_for_update().first()
+
+        if not workout:
+            return jsonify({
+                "success": False,
+                "message": "Workout not found"
+            }), 404
+
+        if workout.completed_at:
+            return jsonify({
+                "success": False,
+                "message": "Workout is already completed"
+            }), 409
+
+        workout.completed_at = datetime.utcnow()
+        if data.get('duration') is not None:
+            workout.duration = data['duration']
+        db.session.commit()
+
+        log_activity(g.user['id'], "completed", "workout", workout.id)
+
+        workout_exercises = WorkoutExercise.query.filter_by(workout_id=workout.id).all()
+        prs_achieved = check_and_update_prs(g.user['id'], workout.id, workout_exercises)
+
+        on_workout_logged(g.user['id'], workout, pr_count=len(prs_achieved or []),
+                          program_workout_id=data.get('program_workout_id'))
+        db.session.commit()
+
+        return jsonify({
+            "success": True,
+            "message": "Workout completed",
+            "workout": workout.to_dict(),
+            "prs_achieved": prs_achieved
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error completing workout: {e}")
+        return jsonify({
+            "success": False,
+            "message": "Internal server error"
+        }), 500
+
+
 @workouts_bp.route('/workouts/<int:workout_id>/exercises', methods=['POST'])
 @login_required
 def add_exercise_to_workout(workout_id):
@@ -390,14 +509,22 @@ def add_exercise_to_workout(workout_id):
         )
         
         db.session.add(workout_exercise)
+        db.session.flush()
+        refresh_user_challenges(g.user['id'])
         db.session.commit()
         
         log_activity(g.user['id'], "added", "exercise_to_workout", workout_exercise.id)
+
+        # Sets added to a planned workout are checked when it is completed
+        prs_achieved = []
+        if workout.completed_at:
+            prs_achieved = check_and_update_prs(g.user['id'], workout_id, [workout_exercise])
         
         return jsonify({
             "success": True,
             "message": "Exercise added to workout successfully",
             "exercise": {
+                'id': workout_exercise.id,
                 'exercise_id': exercise.id,
                 'name': exercise.name,
                 'sets': workout_exercise.sets,
@@ -405,7 +532,8 @@ def add_exercise_to_workout(workout_id):
                 'weight': float(workout_exercise.weight) if workout_exercise.weight else None,
                 'duration': workout_exercise.duration,
                 'notes': workout_exercise.notes
-            }
+            },
+            "prs_achieved": prs_achieved
         }), 201
         
     except Exception as e:
@@ -414,4 +542,100 @@ def add_exercise_to_workout(workout_id):
         return jsonify({
             "success": False,
             "message": "Internal server error"
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+@workouts_bp.route('/workouts/<int:workout_id>/exercises/<int:workout_exercise_id>', methods=['PUT'])
+@login_required
+def update_workout_exercise(workout_id, workout_exercise_id):
+    """Edit a logged set; its exercise's PR is recomputed if weight, reps or sets changed"""
+    data = request.get_json()
+
+    try:
+        workout_exercise = WorkoutExercise.query.join(
+            Workout, WorkoutExercise.workout_id == Workout.id
+        ).filter(
+            WorkoutExercise.id == workout_exercise_id,
+            WorkoutExercise.workout_id == workout_id,
+            Workout.user_id == g.user['id']
+        ).first()
+
+        if not workout_exercise:
+            return jsonify({
+                "success": False,
+                "message": "Workout exercise not found"
+            }), 404
+
+        before = (workout_exercise.sets, workout_exercise.reps, workout_exercise.weight)
+        for field in ('sets', 'reps', 'weight', 'duration', 'rest_time', 'notes'):
+            if field in data:
+                setattr(workout_exercise, field, data[field])
+        db.session.flush()
+
+        # Notes, duration or rest changes leave the PR alone, as do edits to a plan
+        prs_achieved = []
+        if workout_exercise.workout.completed_at and (
+            workout_exercise.sets, workout_exercise.reps, workout_exercise.weight
+        ) != before:
+            prs_achieved = recheck_edited_set(g.user['id'], workout_exercise)
+            refresh_user_challenges(g.user['id'])
+        db.session.commit()
+
+        log_activity(g.user['id'], "updated", "exercise_in_workout", workout_exercise_id)
+
+        return jsonify({
+            "success": True,
+            "message": "Workout exercise updated successfully",
+            "prs_achieved": prs_achieved
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error updating workout exercise: {e}")
+        return jsonify({
+            "success": False,
+            "message": "Internal server error"
+        }), 500
+
+
+@workouts_bp.route('/workouts/<int:workout_id>/exercises/<int:workout_exercise_id>', methods=['DELETE'])
+@login_required
+def delete_workout_exercise(workout_id, workout_exercise_id):
+    """Remove a logged set; PRs it backed are recomputed from the remaining history"""
+    try:
+        workout_exercise = WorkoutExercise.query.join(
+            Workout, WorkoutExercise.workout_id == Workout.id
+        ).filter(
+            WorkoutExercise.id == workout_exercise_id,
+            WorkoutExercise.workout_id == workout_id,
+            Workout.user_id == g.user['id']
+        ).first()
+
+        if not workout_exercise:
+            return jsonify({
+                "success": False,
+                "message": "Workout exercise not found"
+            }), 404
+
+        affected_exercises = find_affected_prs(g.user['id'], [workout_exercise])
+
+        db.session.delete(workout_exercise)
+        db.session.flush()
+        recompute_prs(g.user['id'], affected_exercises)
+        refresh_user_challenges(g.user['id'])
+        db.session.commit()
+
+        log_activity(g.user['id'], "removed", "exercise_from_workout", workout_exercise_id)
+
+        return jsonify({
+            "success": True,
+            "message": "Exercise removed from workout successfully"
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error removing workout exercise: {e}")
+        return jsonify({
+            "success": False,
+            "message": "Internal server error"
+        }), 500
@@ -109,6 +109,14 @@ def create_app():
     from models.scheduled_workout import ScheduledWorkout
     from models.streak_freeze import StreakFreeze
     from models.refresh_token import RefreshToken
+    from models.goal_progress_snapshot import GoalProgressSnapshot
+    from models.habit_calendar import HabitCalendar
+    from models.training_session import TrainingSession
+    from models.exercise_similarity import ExerciseSimilarity
+    from models.live_workout_session import LiveWorkoutSession
+    from models.sync import SyncOperation, SyncChange
+    import utils.training_sessions  # registers the projection's flush hook
+    import utils.sync  # registers the change feed's flush hook
     # Configure CORS with specific origins
     FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
     DOMAIN_URL = os.getenv('DOMAIN_URL', '')
@@ -210,6 +218,8 @@ def create_app():
     from api.reengagement import reengagement_bp
     from api.exercise_bank import exercise_bank_bp
     from api.admin_templates import admin_templates_bp
+    from api.live_sessions import live_sessions_bp
+    from api.sync import sync_bp
 
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/v1')
@@ -245,6 +255,8 @@ def create_app():
     app.register_blueprint(reengagement_bp, url_prefix='/api/v1')
     app.register_blueprint(exercise_bank_bp, url_prefix='/api/v1')
     app.register_blueprint(admin_templates_bp, url_prefix='/api/v1')
+    app.register_blueprint(live_sessions_bp, url_prefix='/api/v1')
+    app.register_blueprint(sync_bp, url_prefix='/api/v1')
 
     # Health check endpoint
     @app.route('/health')
@@ -397,6 +409,10 @@ def create_app():
             total_posts = db.session.execute(db.text("SELECT COUNT(*) FROM social_activities")).scalar()
             SOCIAL_POSTS.set(total_posts or 0)
 
+            # Live workout sessions in progress
+            from utils.live_sessions import active_session_count
+            ACTIVE_WORKOUT_SESSIONS.set(active_session_count())
+
         except Exception as e:
             app.logger.error(f"Failed to update business metrics: {e}")
 
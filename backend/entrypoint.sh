@@ -58,6 +58,7 @@ echo "🌟 Starting Gunicorn server..."
 
 # Start Gunicorn with production settings
 exec gunicorn \
+    --config gunicorn.conf.py \
     --workers 4 \
     --worker-class gthread \
     --threads 2 \
@@ -0,0 +1,26 @@
+"""
+Gunicorn settings shared by every deployment (entrypoint.sh passes the
+per-environment flags).
+
+The app is imported once in the master (preload_app) and read-only data
+such as the exercise library is loaded there too. gc.freeze() then moves
+everything allocated so far into a permanent generation, so the collector
+in each forked worker never touches (and copies) those pages.
+"""
+import gc
+
+
+preload_app = True
+
+
+def when_ready(server):
+    from database import db
+    from utils.exercise_library import load_library
+
+    load_library()
+    # Workers must open their own connections, not inherit the master's
+    with server.app.wsgi().app_context():
+        db.engine.dispose()
+    gc.collect()
+    gc.freeze()
+    server.log.info("Preloaded app frozen for copy-on-write sharing")
@@ -0,0 +1,35 @@
+"""unique (user_id, date_assigned, quest_id) on user_daily_quests
+
+Revision ID: a3c4d5e6f7a8
+Revises: f2b3c4d5e6f7
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'a3c4d5e6f7a8'
+down_revision = 'f2b3c4d5e6f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Drop duplicate assignments, keeping the earliest row
+    op.execute("""
+        DELETE FROM user_daily_quests
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM user_daily_quests
+            GROUP BY user_id, date_assigned, quest_id
+        )
+    """)
+    # Leading (user_id, date_assigned) also serves the daily GET
+    op.create_unique_constraint(
+        'uq_user_daily_quests_user_date_quest',
+        'user_daily_quests',
+        ['user_id', 'date_assigned', 'quest_id'],
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_user_daily_quests_user_date_quest', 'user_daily_quests', type_='unique')
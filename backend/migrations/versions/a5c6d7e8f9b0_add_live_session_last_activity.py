@@ -0,0 +1,23 @@
+"""add last_activity_at to live_workout_sessions for abandonment
+
+Revision ID: a5c6d7e8f9b0
+Revises: f4b5c6d7e8f9
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'a5c6d7e8f9b0'
+down_revision = 'f4b5c6d7e8f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('live_workout_sessions', sa.Column('last_activity_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE live_workout_sessions SET last_activity_at = COALESCE(checkpointed_at, started_at)")
+
+
+def downgrade():
+    op.drop_column('live_workout_sessions', 'last_activity_at')
@@ -0,0 +1,26 @@
+"""add workout_id index on workout_exercises
+
+Revision ID: a9c0d1e2f3a4
+Revises: f8b9c0d1e2f3
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'a9c0d1e2f3a4'
+down_revision = 'f8b9c0d1e2f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'idx_workout_exercises_workout',
+        'workout_exercises',
+        ['workout_id'],
+    )
+
+
+def downgrade():
+    op.drop_index('idx_workout_exercises_workout', table_name='workout_exercises')
@@ -0,0 +1,31 @@
+"""add exercise_similarities for substitution suggestions
+
+Revision ID: b0d1e2f3a4b5
+Revises: a9c0d1e2f3a4
+Create Date: 2026-10-19
+
+Filled by scripts/compute_exercise_similarity.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b0d1e2f3a4b5'
+down_revision = 'a9c0d1e2f3a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'exercise_similarities',
+        sa.Column('exercise_id', sa.Integer(), sa.ForeignKey('exercises.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('similar_exercise_id', sa.Integer(), sa.ForeignKey('exercises.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('exercise_id', 'rank'),
+    )
+
+
+def downgrade():
+    op.drop_table('exercise_similarities')
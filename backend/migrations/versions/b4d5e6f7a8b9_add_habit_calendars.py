@@ -0,0 +1,102 @@
+"""add habit_calendars bitsets and per-habit streak columns
+
+Revision ID: b4d5e6f7a8b9
+Revises: a3c4d5e6f7a8
+Create Date: 2026-10-19
+
+"""
+from datetime import timedelta
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b4d5e6f7a8b9'
+down_revision = 'a3c4d5e6f7a8'
+branch_labels = None
+depends_on = None
+
+YEAR_BYTES = 46
+BACKFILL_BATCH = 1000
+
+
+def _streaks(days):
+    """(current, longest, last) over a sorted list of distinct dates."""
+    longest = run = 0
+    previous = None
+    for day in days:
+        run = run + 1 if previous and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+    return run, longest, previous
+
+
+def _backfill():
+    bind = op.get_bind()
+    calendars = sa.table(
+        'habit_calendars',
+        sa.column('habit_id', sa.Integer),
+        sa.column('year', sa.SmallInteger),
+        sa.column('bits', sa.LargeBinary),
+    )
+    habits = sa.table(
+        'habits',
+        sa.column('id', sa.Integer),
+        sa.column('current_streak', sa.Integer),
+        sa.column('longest_streak', sa.Integer),
+        sa.column('last_completed_on', sa.Date),
+    )
+    habit_ids = [row[0] for row in bind.execute(sa.text(
+        "SELECT DISTINCT habit_id FROM habit_logs WHERE completed ORDER BY habit_id"
+    ))]
+    for start in range(0, len(habit_ids), BACKFILL_BATCH):
+        batch = habit_ids[start:start + BACKFILL_BATCH]
+        rows = bind.execute(sa.text(
+            "SELECT DISTINCT habit_id, CAST(timestamp AS DATE) AS day FROM habit_logs "
+            "WHERE completed AND habit_id IN :ids ORDER BY habit_id, day"
+        ).bindparams(sa.bindparam('ids', expanding=True)), {'ids': batch})
+
+        days_by_habit = {}
+        for habit_id, day in rows:
+            days_by_habit.setdefault(habit_id, []).append(day)
+
+        bitsets = []
+        for habit_id, days in days_by_habit.items():
+            years = {}
+            for day in days:
+                bits = years.setdefault(day.year, bytearray(YEAR_BYTES))
+                i = day.timetuple().tm_yday - 1
+                bits[i >> 3] |= 1 << (i & 7)
+            bitsets.extend(
+                {'habit_id': habit_id, 'year': year, 'bits': bytes(bits)}
+                for year, bits in years.items()
+            )
+            current, longest, last = _streaks(days)
+            bind.execute(
+                habits.update().where(habits.c.id == habit_id).values(
+                    current_streak=current, longest_streak=longest, last_completed_on=last,
+                )
+            )
+        if bitsets:
+            op.bulk_insert(calendars, bitsets)
+
+
+def upgrade():
+    op.create_table(
+        'habit_calendars',
+        sa.Column('habit_id', sa.Integer(), sa.ForeignKey('habits.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('year', sa.SmallInteger(), nullable=False),
+        sa.Column('bits', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('habit_id', 'year'),
+    )
+    op.add_column('habits', sa.Column('current_streak', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('habits', sa.Column('longest_streak', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('habits', sa.Column('last_completed_on', sa.Date(), nullable=True))
+
+    _backfill()
+
+
+def downgrade():
+    op.drop_column('habits', 'last_completed_on')
+    op.drop_column('habits', 'longest_streak')
+    op.drop_column('habits', 'current_streak')
+    op.drop_table('habit_calendars')
@@ -0,0 +1,27 @@
+"""add txid to sync_changes; the feed is read in (txid, id) order
+
+Revision ID: b6d7e8f9a0c1
+Revises: a5c6d7e8f9b0
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b6d7e8f9a0c1'
+down_revision = 'a5c6d7e8f9b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are committed; 0 sorts them before every new transaction
+    op.add_column('sync_changes', sa.Column('txid', sa.BigInteger(), nullable=False, server_default='0'))
+    op.drop_index('idx_sync_changes_user_id', table_name='sync_changes')
+    op.create_index('idx_sync_changes_user_txid_id', 'sync_changes', ['user_id', 'txid', 'id'])
+
+
+def downgrade():
+    op.drop_index('idx_sync_changes_user_txid_id', table_name='sync_changes')
+    op.create_index('idx_sync_changes_user_id', 'sync_changes', ['user_id', 'id'])
+    op.drop_column('sync_changes', 'txid')
@@ -0,0 +1,26 @@
+"""add (exercise_id, workout_id) index on workout_exercises
+
+Revision ID: b7c1d2e3f4a5
+Revises: 1dd630bdd56b
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b7c1d2e3f4a5'
+down_revision = '1dd630bdd56b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'idx_workout_exercises_exercise_workout',
+        'workout_exercises',
+        ['exercise_id', 'workout_id'],
+    )
+
+
+def downgrade():
+    op.drop_index('idx_workout_exercises_exercise_workout', table_name='workout_exercises')
@@ -0,0 +1,36 @@
+"""link workouts to the program session they fulfilled
+
+Revision ID: c1e2f3a4b5c6
+Revises: b0d1e2f3a4b5
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c1e2f3a4b5c6'
+down_revision = 'b0d1e2f3a4b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('workouts', sa.Column('program_enrollment_id', sa.Integer(), nullable=True))
+    op.add_column('workouts', sa.Column('program_workout_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_workouts_program_enrollment_id', 'workouts', 'program_enrollments',
+        ['program_enrollment_id'], ['id'], ondelete='SET NULL',
+    )
+    op.create_foreign_key(
+        'fk_workouts_program_workout_id', 'workouts', 'program_workouts',
+        ['program_workout_id'], ['id'], ondelete='SET NULL',
+    )
+    op.create_index('ix_workouts_program_enrollment_id', 'workouts', ['program_enrollment_id'])
+
+
+def downgrade():
+    op.drop_index('ix_workouts_program_enrollment_id', table_name='workouts')
+    op.drop_constraint('fk_workouts_program_workout_id', 'workouts', type_='foreignkey')
+    op.drop_constraint('fk_workouts_program_enrollment_id', 'workouts', type_='foreignkey')
+    op.drop_column('workouts', 'program_workout_id')
+    op.drop_column('workouts', 'program_enrollment_id')
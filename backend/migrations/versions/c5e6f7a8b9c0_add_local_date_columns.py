@@ -0,0 +1,62 @@
+"""add local_date to habit_logs and cardio_workouts, user_profiles.timezone
+
+Revision ID: c5e6f7a8b9c0
+Revises: b4d5e6f7a8b9
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c5e6f7a8b9c0'
+down_revision = 'b4d5e6f7a8b9'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 50000
+
+
+def _backfill(table, column):
+    """Set local_date in id ranges so no single UPDATE holds locks for long.
+    No user has a timezone yet, so the local day is the UTC day."""
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text(f"SELECT MAX(id) FROM {table}")).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_BATCH):
+        bind.execute(sa.text(
+            f"UPDATE {table} SET local_date = CAST({column} AS DATE) "
+            f"WHERE id >= :start AND id < :end AND local_date IS NULL"
+        ), {'start': start, 'end': start + BACKFILL_BATCH})
+
+
+def upgrade():
+    op.add_column('user_profiles', sa.Column('timezone', sa.String(length=64), nullable=True))
+    op.add_column('habit_logs', sa.Column('local_date', sa.Date(), nullable=True))
+    op.add_column('cardio_workouts', sa.Column('local_date', sa.Date(), nullable=True))
+
+    _backfill('habit_logs', 'timestamp')
+    _backfill('cardio_workouts', 'COALESCE(date, created_at, NOW())')
+
+    # Same-day duplicates slipped past the old check-then-insert; keep the first
+    op.execute("""
+        DELETE FROM habit_logs
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY habit_id, local_date ORDER BY id) AS n
+                FROM habit_logs
+            ) ranked
+            WHERE ranked.n > 1
+        )
+    """)
+
+    op.alter_column('habit_logs', 'local_date', nullable=False)
+    op.alter_column('cardio_workouts', 'local_date', nullable=False)
+    op.create_unique_constraint('uq_habit_logs_habit_local_date', 'habit_logs', ['habit_id', 'local_date'])
+    op.create_index('idx_cardio_workouts_user_local_date', 'cardio_workouts', ['user_id', 'local_date'])
+
+
+def downgrade():
+    op.drop_index('idx_cardio_workouts_user_local_date', table_name='cardio_workouts')
+    op.drop_constraint('uq_habit_logs_habit_local_date', 'habit_logs', type_='unique')
+    op.drop_column('cardio_workouts', 'local_date')
+    op.drop_column('habit_logs', 'local_date')
+    op.drop_column('user_profiles', 'timezone')
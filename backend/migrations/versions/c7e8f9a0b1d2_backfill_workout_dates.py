@@ -0,0 +1,35 @@
+"""backfill NULL workout dates and make workouts.date NOT NULL
+
+Revision ID: c7e8f9a0b1d2
+Revises: b6d7e8f9a0c1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c7e8f9a0b1d2'
+down_revision = 'b6d7e8f9a0c1'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 50000
+
+
+def upgrade():
+    # GET /workouts pages on (date, id); a NULL date sorts first in DESC order
+    # and can't be encoded as a cursor. Use the UTC day the row was created.
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text("SELECT MAX(id) FROM workouts")).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_BATCH):
+        bind.execute(sa.text("""
+            UPDATE workouts
+            SET date = COALESCE(DATE(created_at), CURRENT_DATE)
+            WHERE date IS NULL AND id >= :start AND id < :end
+        """), {'start': start, 'end': start + BACKFILL_BATCH})
+
+    op.alter_column('workouts', 'date', existing_type=sa.Date(), nullable=False)
+
+
+def downgrade():
+    op.alter_column('workouts', 'date', existing_type=sa.Date(), nullable=True)
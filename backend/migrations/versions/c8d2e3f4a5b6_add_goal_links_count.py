@@ -0,0 +1,31 @@
+"""add maintained links_count to goals
+
+Revision ID: c8d2e3f4a5b6
+Revises: b7c1d2e3f4a5
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c8d2e3f4a5b6'
+down_revision = 'b7c1d2e3f4a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('goals', sa.Column('links_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('idx_goal_links_goal_id', 'goal_links', ['goal_id'])
+
+    # Backfill from existing links
+    op.execute("""
+        UPDATE goals SET links_count = counts.n
+        FROM (SELECT goal_id, COUNT(*) AS n FROM goal_links GROUP BY goal_id) AS counts
+        WHERE goals.id = counts.goal_id
+    """)
+
+
+def downgrade():
+    op.drop_index('idx_goal_links_goal_id', table_name='goal_links')
+    op.drop_column('goals', 'links_count')
@@ -0,0 +1,38 @@
+"""add live_workout_sessions for set-by-set logging
+
+Revision ID: d2f3a4b5c6d7
+Revises: c1e2f3a4b5c6
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd2f3a4b5c6d7'
+down_revision = 'c1e2f3a4b5c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'live_workout_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='active'),
+        sa.Column('workout_type', sa.String(length=100), nullable=True),
+        sa.Column('program_workout_id', sa.Integer(), sa.ForeignKey('program_workouts.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('document', sa.JSON(), nullable=True),
+        sa.Column('set_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('checkpointed_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('workout_id', sa.Integer(), sa.ForeignKey('workouts.id', ondelete='SET NULL'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('idx_live_workout_sessions_user_status', 'live_workout_sessions', ['user_id', 'status'])
+
+
+def downgrade():
+    op.drop_index('idx_live_workout_sessions_user_status', table_name='live_workout_sessions')
+    op.drop_table('live_workout_sessions')
@@ -0,0 +1,42 @@
+"""add habits.next_reminder_at for the reminder worker
+
+Revision ID: d6f7a8b9c0d1
+Revises: c5e6f7a8b9c0
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd6f7a8b9c0d1'
+down_revision = 'c5e6f7a8b9c0'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 50000
+
+
+def upgrade():
+    op.add_column('habits', sa.Column('next_reminder_at', sa.DateTime(), nullable=True))
+
+    # Local occurrence date + reminder time in the owner's timezone, as naive UTC
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text("SELECT MAX(id) FROM habits")).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_BATCH):
+        bind.execute(sa.text("""
+            UPDATE habits h
+            SET next_reminder_at = ((h.next_occurrence + h.reminder_time)
+                AT TIME ZONE COALESCE(up.timezone, 'UTC')) AT TIME ZONE 'UTC'
+            FROM users u
+            LEFT JOIN user_profiles up ON up.user_id = u.id
+            WHERE u.id = h.user_id
+              AND h.id >= :start AND h.id < :end
+              AND h.next_occurrence IS NOT NULL AND h.reminder_time IS NOT NULL
+        """), {'start': start, 'end': start + BACKFILL_BATCH})
+
+    op.create_index('idx_habits_next_reminder_at', 'habits', ['next_reminder_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('idx_habits_next_reminder_at', table_name='habits')
+    op.drop_column('habits', 'next_reminder_at')
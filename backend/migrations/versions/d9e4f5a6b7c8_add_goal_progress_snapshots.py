@@ -0,0 +1,44 @@
+"""add goal progress snapshots and precomputed forecasts
+
+Revision ID: d9e4f5a6b7c8
+Revises: c8d2e3f4a5b6
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd9e4f5a6b7c8'
+down_revision = 'c8d2e3f4a5b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('goal_progress_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('goal_id', sa.Integer(), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('recorded_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['goal_id'], ['goals.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('goal_id', 'snapshot_date', name='uq_goal_snapshot_date')
+    )
+
+    op.add_column('goals', sa.Column('forecast_rate', sa.Float(), nullable=True))
+    op.add_column('goals', sa.Column('forecast_completion_date', sa.Date(), nullable=True))
+    op.add_column('goals', sa.Column('forecasted_at', sa.DateTime(), nullable=True))
+
+    # Seed today's progress so every existing goal has a starting point
+    op.execute("""
+        INSERT INTO goal_progress_snapshots (goal_id, snapshot_date, progress, recorded_at)
+        SELECT id, CURRENT_DATE, COALESCE(progress, 0), NOW() FROM goals
+    """)
+
+
+def downgrade():
+    op.drop_column('goals', 'forecasted_at')
+    op.drop_column('goals', 'forecast_completion_date')
+    op.drop_column('goals', 'forecast_rate')
+    op.drop_table('goal_progress_snapshots')
@@ -0,0 +1,32 @@
+"""add challenge_participants lookup and leaderboard indexes
+
+Revision ID: e1a2b3c4d5e6
+Revises: d9e4f5a6b7c8
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e1a2b3c4d5e6'
+down_revision = 'd9e4f5a6b7c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'idx_challenge_participants_user_status',
+        'challenge_participants',
+        ['user_id', 'status'],
+    )
+    op.create_index(
+        'idx_challenge_participants_leaderboard',
+        'challenge_participants',
+        ['challenge_id', 'current_progress'],
+    )
+
+
+def downgrade():
+    op.drop_index('idx_challenge_participants_leaderboard', table_name='challenge_participants')
+    op.drop_index('idx_challenge_participants_user_status', table_name='challenge_participants')
@@ -0,0 +1,47 @@
+"""add sync_operations and sync_changes for offline sync
+
+Revision ID: e3a4b5c6d7e8
+Revises: d2f3a4b5c6d7
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e3a4b5c6d7e8'
+down_revision = 'd2f3a4b5c6d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sync_operations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=100), nullable=False),
+        sa.Column('op_type', sa.String(length=50), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'idempotency_key', name='uq_sync_operations_user_key'),
+    )
+    op.create_table(
+        'sync_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('entity_type', sa.String(length=30), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('idx_sync_changes_user_id', 'sync_changes', ['user_id', 'id'])
+    op.create_index('ix_sync_changes_created_at', 'sync_changes', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_sync_changes_created_at', table_name='sync_changes')
+    op.drop_index('idx_sync_changes_user_id', table_name='sync_changes')
+    op.drop_table('sync_changes')
+    op.drop_table('sync_operations')
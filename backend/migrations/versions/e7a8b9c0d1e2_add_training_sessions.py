@@ -0,0 +1,67 @@
+"""add training_sessions projection over workouts and cardio_workouts
+
+Revision ID: e7a8b9c0d1e2
+Revises: d6f7a8b9c0d1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e7a8b9c0d1e2'
+down_revision = 'd6f7a8b9c0d1'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 50000
+
+_BACKFILL = {
+    'workouts': """
+        INSERT INTO training_sessions
+            (user_id, kind, source_id, local_date, activity, duration, volume, distance, created_at)
+        SELECT w.user_id, 'strength', w.id, COALESCE(w.date, CAST(w.created_at AS DATE)), w.type, w.duration,
+               COALESCE(SUM(we.weight * we.reps * we.sets), 0), NULL, NOW()
+        FROM workouts w
+        LEFT JOIN workout_exercises we ON we.workout_id = w.id
+        WHERE w.id >= :start AND w.id < :end
+        GROUP BY w.id
+    """,
+    'cardio_workouts': """
+        INSERT INTO training_sessions
+            (user_id, kind, source_id, local_date, activity, duration, volume, distance, created_at)
+        SELECT c.user_id, 'cardio', c.id, c.local_date, c.cardio_type, c.duration, 0, c.distance, NOW()
+        FROM cardio_workouts c
+        WHERE c.id >= :start AND c.id < :end
+    """,
+}
+
+
+def upgrade():
+    op.create_table(
+        'training_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('local_date', sa.Date(), nullable=False),
+        sa.Column('activity', sa.String(length=100), nullable=True),
+        sa.Column('duration', sa.Integer(), nullable=True),
+        sa.Column('volume', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('distance', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'source_id', name='uq_training_sessions_kind_source'),
+    )
+
+    bind = op.get_bind()
+    for table, statement in _BACKFILL.items():
+        max_id = bind.execute(sa.text(f"SELECT MAX(id) FROM {table}")).scalar() or 0
+        for start in range(0, max_id + 1, BACKFILL_BATCH):
+            bind.execute(sa.text(statement), {'start': start, 'end': start + BACKFILL_BATCH})
+
+    op.create_index('idx_training_sessions_user_local_date', 'training_sessions', ['user_id', 'local_date'])
+
+
+def downgrade():
+    op.drop_index('idx_training_sessions_user_local_date', table_name='training_sessions')
+    op.drop_table('training_sessions')
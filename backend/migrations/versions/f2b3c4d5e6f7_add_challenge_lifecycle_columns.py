@@ -0,0 +1,35 @@
+"""add challenge participant_count, finalization and final_rank columns
+
+Revision ID: f2b3c4d5e6f7
+Revises: e1a2b3c4d5e6
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f2b3c4d5e6f7'
+down_revision = 'e1a2b3c4d5e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('challenges', sa.Column('participant_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('challenges', sa.Column('finalized_at', sa.DateTime(), nullable=True))
+    op.add_column('challenge_participants', sa.Column('final_rank', sa.Integer(), nullable=True))
+    op.create_index('idx_challenges_status_end_date', 'challenges', ['status', 'end_date'])
+
+    # Backfill from existing participants
+    op.execute("""
+        UPDATE challenges SET participant_count = counts.n
+        FROM (SELECT challenge_id, COUNT(*) AS n FROM challenge_participants GROUP BY challenge_id) AS counts
+        WHERE challenges.id = counts.challenge_id
+    """)
+
+
+def downgrade():
+    op.drop_index('idx_challenges_status_end_date', table_name='challenges')
+    op.drop_column('challenge_participants', 'final_rank')
+    op.drop_column('challenges', 'finalized_at')
+    op.drop_column('challenges', 'participant_count')
@@ -0,0 +1,34 @@
+"""add completed_at to workouts; NULL marks a planned workout
+
+Revision ID: f4b5c6d7e8f9
+Revises: e3a4b5c6d7e8
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f4b5c6d7e8f9'
+down_revision = 'e3a4b5c6d7e8'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 50000
+
+
+def upgrade():
+    op.add_column('workouts', sa.Column('completed_at', sa.DateTime(), nullable=True))
+
+    # Every existing workout was logged, not planned
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text("SELECT MAX(id) FROM workouts")).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_BATCH):
+        bind.execute(sa.text("""
+            UPDATE workouts
+            SET completed_at = COALESCE(created_at, CURRENT_TIMESTAMP)
+            WHERE id >= :start AND id < :end
+        """), {'start': start, 'end': start + BACKFILL_BATCH})
+
+
+def downgrade():
+    op.drop_column('workouts', 'completed_at')
@@ -0,0 +1,53 @@
+"""add exercise_count, total_sets and total_volume to workouts
+
+Revision ID: f8b9c0d1e2f3
+Revises: e7a8b9c0d1e2
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f8b9c0d1e2f3'
+down_revision = 'e7a8b9c0d1e2'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 50000
+
+
+def upgrade():
+    op.add_column('workouts', sa.Column('exercise_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('workouts', sa.Column('total_sets', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('workouts', sa.Column('total_volume', sa.Float(), nullable=False, server_default='0'))
+
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text("SELECT MAX(id) FROM workouts")).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_BATCH):
+        bind.execute(sa.text("""
+            UPDATE workouts w
+            SET exercise_count = t.exercise_count,
+                total_sets = t.total_sets,
+                total_volume = t.total_volume
+            FROM (
+                SELECT workout_id,
+                       COUNT(*) AS exercise_count,
+                       COALESCE(SUM(sets), 0) AS total_sets,
+                       COALESCE(SUM(weight * reps * sets), 0) AS total_volume
+                FROM workout_exercises
+                WHERE workout_id >= :start AND workout_id < :end
+                GROUP BY workout_id
+            ) t
+            WHERE w.id = t.workout_id
+        """), {'start': start, 'end': start + BACKFILL_BATCH})
+
+    op.drop_index('idx_workouts_user_date', table_name='workouts')
+    op.create_index('idx_workouts_user_date_id', 'workouts', ['user_id', 'date', 'id'])
+
+
+def downgrade():
+    op.drop_index('idx_workouts_user_date_id', table_name='workouts')
+    op.create_index('idx_workouts_user_date', 'workouts', ['user_id', 'date'])
+    op.drop_column('workouts', 'total_volume')
+    op.drop_column('workouts', 'total_sets')
+    op.drop_column('workouts', 'exercise_count')
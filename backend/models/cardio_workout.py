@@ -2,6 +2,12 @@ from database import db
 from datetime import datetime
 
 
+def _utc_day(context):
+    """Default local_date for rows written without a timezone: the UTC day."""
+    moment = context.get_current_parameters().get('date')
+    return (moment or datetime.utcnow()).date()
+
+
 class CardioWorkout(db.Model):
     __tablename__ = 'cardio_workouts'
     
@@ -17,7 +23,13 @@ class CardioWorkout(db.Model):
     elevation_gain = db.Column(db.Float)  # in meters
     notes = db.Column(db.Text)
     date = db.Column(db.DateTime, default=datetime.utcnow)
+    # Day of `date` in the user's timezone (utils/local_time.py)
+    local_date = db.Column(db.Date, nullable=False, default=_utc_day)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_cardio_workouts_user_local_date', 'user_id', 'local_date'),
+    )
     
     user = db.relationship('User', backref='cardio_workouts')
     
@@ -35,5 +47,6 @@ class CardioWorkout(db.Model):
             'elevation_gain': float(self.elevation_gain) if self.elevation_gain else None,
             'notes': self.notes,
             'date': self.date.isoformat() if self.date else None,
+            'local_date': self.local_date.isoformat() if self.local_date else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
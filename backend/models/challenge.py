@@ -4,6 +4,9 @@ from datetime import datetime
 
 class Challenge(db.Model):
     __tablename__ = 'challenges'
+    __table_args__ = (
+        db.Index('idx_challenges_status_end_date', 'status', 'end_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -17,6 +20,8 @@ class Challenge(db.Model):
     is_public = db.Column(db.Boolean, default=False)
     status = db.Column(db.String(20), default='active')  # active, completed, cancelled
     winner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    participant_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    finalized_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -40,12 +45,17 @@ class Challenge(db.Model):
             'status': self.status,
             'winner_id': self.winner_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'participant_count': len(self.participants)
+            'participant_count': self.participant_count or 0,
+            'finalized_at': self.finalized_at.isoformat() if self.finalized_at else None
         }
 
 
 class ChallengeParticipant(db.Model):
     __tablename__ = 'challenge_participants'
+    __table_args__ = (
+        db.Index('idx_challenge_participants_user_status', 'user_id', 'status'),
+        db.Index('idx_challenge_participants_leaderboard', 'challenge_id', 'current_progress'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     challenge_id = db.Column(db.Integer, db.ForeignKey('challenges.id'), nullable=False)
@@ -54,6 +64,7 @@ class ChallengeParticipant(db.Model):
     status = db.Column(db.String(20), default='active')  # active, completed, withdrawn
     joined_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
+    final_rank = db.Column(db.Integer, nullable=True)  # set when the challenge is finalized
     
     # Relationships
     challenge = db.relationship('Challenge', back_populates='participants')
@@ -67,5 +78,6 @@ class ChallengeParticipant(db.Model):
             'current_progress': self.current_progress,
             'status': self.status,
             'joined_at': self.joined_at.isoformat() if self.joined_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'final_rank': self.final_rank
         }
@@ -29,6 +29,9 @@ class DailyQuest(db.Model):
 
 class UserDailyQuest(db.Model):
     __tablename__ = 'user_daily_quests'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'date_assigned', 'quest_id', name='uq_user_daily_quests_user_date_quest'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -41,8 +44,9 @@ class UserDailyQuest(db.Model):
     quest = db.relationship('DailyQuest', backref='user_assignments')
     user = db.relationship('User', backref='daily_quests')
     
-    def to_dict(self):
-        quest_data = self.quest.to_dict() if self.quest else {}
+    def to_dict(self, quest_data=None):
+        if quest_data is None:
+            quest_data = self.quest.to_dict() if self.quest else {}
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -0,0 +1,19 @@
+from database import db
+from datetime import datetime
+
+
+class ExerciseSimilarity(db.Model):
+    """
+    Precomputed "swap this exercise" neighbours: the top-k most similar
+    exercises by muscles, equipment, category and difficulty, ranked from
+    1. Rebuilt offline by scripts/compute_exercise_similarity.py.
+    """
+    __tablename__ = 'exercise_similarities'
+
+    exercise_id = db.Column(db.Integer, db.ForeignKey('exercises.id', ondelete='CASCADE'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    similar_exercise_id = db.Column(db.Integer, db.ForeignKey('exercises.id', ondelete='CASCADE'), nullable=False)
+    score = db.Column(db.Float, nullable=False)  # cosine similarity, 0-1
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    similar_exercise = db.relationship('Exercise', foreign_keys=[similar_exercise_id])
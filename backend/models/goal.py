@@ -14,6 +14,12 @@ class Goal(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     auto_sync = db.Column(db.Boolean, default=False)
+    links_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Maintained on link add/remove
+
+    # Precomputed nightly by scripts/forecast_goals.py
+    forecast_rate = db.Column(db.Float)  # Projected progress per day
+    forecast_completion_date = db.Column(db.Date)
+    forecasted_at = db.Column(db.DateTime)
 
     __table_args__ = (
         db.Index('idx_goals_user_id', 'user_id'),
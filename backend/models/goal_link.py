@@ -12,4 +12,8 @@ class GoalLink(db.Model):
     contribution_value = db.Column(db.Integer, default=1)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('idx_goal_links_goal_id', 'goal_id'),
+    )
+
     goal = db.relationship("Goal", back_populates="goal_links")
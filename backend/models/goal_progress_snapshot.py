@@ -0,0 +1,25 @@
+from database import db
+from datetime import datetime
+
+
+class GoalProgressSnapshot(db.Model):
+    """Goal progress at the end of a day; one row per goal per day (upserted)."""
+    __tablename__ = 'goal_progress_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    goal_id = db.Column(db.Integer, db.ForeignKey('goals.id', ondelete='CASCADE'), nullable=False)
+    snapshot_date = db.Column(db.Date, nullable=False)
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    recorded_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    goal = db.relationship('Goal', backref=db.backref('progress_snapshots', cascade='all, delete-orphan', passive_deletes=True))
+
+    __table_args__ = (
+        db.UniqueConstraint('goal_id', 'snapshot_date', name='uq_goal_snapshot_date'),
+    )
+
+    def to_dict(self):
+        return {
+            'date': self.snapshot_date.isoformat(),
+            'progress': self.progress,
+        }
@@ -11,11 +11,18 @@ class Habit(db.Model):
     reminder_time = db.Column(db.Time)
     description = db.Column(db.Text)
     next_occurrence = db.Column(db.Date)
+    # UTC instant of the next reminder; maintained by utils/habit_reminders.py
+    next_reminder_at = db.Column(db.DateTime)
+    # Maintained by utils/habit_calendar.py on each completion
+    current_streak = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    longest_streak = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_completed_on = db.Column(db.Date)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     __table_args__ = (
         db.Index('idx_habits_user_id', 'user_id'),
+        db.Index('idx_habits_next_reminder_at', 'next_reminder_at', 'id'),
     )
 
     user = db.relationship("User", back_populates="habits")
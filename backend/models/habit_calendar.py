@@ -0,0 +1,17 @@
+from database import db
+from datetime import datetime
+
+
+class HabitCalendar(db.Model):
+    """
+    One year of a habit's completed days as a bitset: bit n (least significant
+    bit first within each byte) is day-of-year n + 1.
+    """
+    __tablename__ = 'habit_calendars'
+
+    habit_id = db.Column(db.Integer, db.ForeignKey('habits.id', ondelete='CASCADE'), primary_key=True)
+    year = db.Column(db.SmallInteger, primary_key=True, autoincrement=False)
+    bits = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    habit = db.relationship('Habit', backref=db.backref('calendars', cascade='all, delete-orphan', passive_deletes=True))
@@ -1,6 +1,13 @@
 from database import db
 from datetime import datetime
 
+
+def _utc_day(context):
+    """Default local_date for rows written without a timezone: the UTC day."""
+    moment = context.get_current_parameters().get('timestamp')
+    return (moment or datetime.utcnow()).date()
+
+
 class HabitLog(db.Model):
     __tablename__ = "habit_logs"
 
@@ -10,8 +17,14 @@ class HabitLog(db.Model):
     amount = db.Column(db.Numeric(6, 2))  # Optional quantity (e.g., ml, minutes)
     notes = db.Column(db.Text)
     completed = db.Column(db.Boolean, default=True)
+    # Day of `timestamp` in the user's timezone (utils/local_time.py)
+    local_date = db.Column(db.Date, nullable=False, default=_utc_day)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.UniqueConstraint('habit_id', 'local_date', name='uq_habit_logs_habit_local_date'),
+    )
+
     # Relationships
     habit = db.relationship("Habit", back_populates="logs")
 
@@ -23,6 +36,7 @@ class HabitLog(db.Model):
             'id': self.id,
             'habit_id': self.habit_id,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'local_date': self.local_date.isoformat() if self.local_date else None,
             'amount': float(self.amount) if self.amount else None,
             'notes': self.notes,
             'completed': self.completed
@@ -0,0 +1,43 @@
+from database import db
+from datetime import datetime
+
+
+class LiveWorkoutSession(db.Model):
+    """
+    An in-progress workout logged set by set. The live document is held in
+    Redis (or process memory) by utils/live_sessions.py; this row owns the
+    session id and a periodic checkpoint of the logged sets, and records the
+    Workout it became on finish.
+    """
+    __tablename__ = 'live_workout_sessions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='active')  # active, finished, discarded
+    workout_type = db.Column(db.String(100))
+    program_workout_id = db.Column(db.Integer, db.ForeignKey('program_workouts.id', ondelete='SET NULL'))
+    document = db.Column(db.JSON)  # {"sets": [...]} as of the last checkpoint
+    set_count = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    checkpointed_at = db.Column(db.DateTime)
+    last_activity_at = db.Column(db.DateTime, default=datetime.utcnow)  # start or latest checkpoint
+    finished_at = db.Column(db.DateTime)
+    workout_id = db.Column(db.Integer, db.ForeignKey('workouts.id', ondelete='SET NULL'))
+
+    __table_args__ = (
+        db.Index('idx_live_workout_sessions_user_status', 'user_id', 'status'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'workout_type': self.workout_type,
+            'program_workout_id': self.program_workout_id,
+            'set_count': self.set_count,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'checkpointed_at': self.checkpointed_at.isoformat() if self.checkpointed_at else None,
+            'last_activity_at': self.last_activity_at.isoformat() if self.last_activity_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'workout_id': self.workout_id
+        }
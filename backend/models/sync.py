@@ -0,0 +1,42 @@
+from database import db
+from datetime import datetime
+
+
+class SyncOperation(db.Model):
+    """
+    A client-keyed write applied through POST /sync. A replay of the same
+    idempotency key returns `result` instead of applying the write again.
+    """
+    __tablename__ = 'sync_operations'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    idempotency_key = db.Column(db.String(100), nullable=False)
+    op_type = db.Column(db.String(50), nullable=False)
+    result = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'idempotency_key', name='uq_sync_operations_user_key'),
+    )
+
+
+class SyncChange(db.Model):
+    """
+    One row per write to a synced entity (utils/sync.py records them on
+    flush). (txid, id) is the cursor clients pass to GET /sync/changes.
+    """
+    __tablename__ = 'sync_changes'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    entity_type = db.Column(db.String(30), nullable=False)  # workout, habit_log, weight_log, body_measurement
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # Writing transaction's txid_current() on Postgres, 0 on SQLite
+    txid = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        db.Index('idx_sync_changes_user_txid_id', 'user_id', 'txid', 'id'),
+    )
@@ -0,0 +1,28 @@
+from database import db
+from datetime import datetime
+
+
+class TrainingSession(db.Model):
+    """
+    Read-side projection with one row per strength workout or cardio
+    session, kept in sync on flush by utils/training_sessions.py. Streaks,
+    recaps and activity charts read this table instead of merging
+    workouts and cardio_workouts in Python.
+    """
+    __tablename__ = 'training_sessions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # strength, cardio
+    source_id = db.Column(db.Integer, nullable=False)  # workouts.id or cardio_workouts.id
+    local_date = db.Column(db.Date, nullable=False)
+    activity = db.Column(db.String(100))  # workout type or cardio type
+    duration = db.Column(db.Integer)  # in minutes
+    volume = db.Column(db.Float, nullable=False, default=0)  # sum of weight x reps x sets
+    distance = db.Column(db.Float)  # in kilometers
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'source_id', name='uq_training_sessions_kind_source'),
+        db.Index('idx_training_sessions_user_local_date', 'user_id', 'local_date'),
+    )
@@ -12,6 +12,7 @@ class UserProfile(db.Model):
     current_weight_kg = db.Column(db.Numeric)
     goal_weight_kg = db.Column(db.Numeric)
     activity_level = db.Column(db.String)
+    timezone = db.Column(db.String(64))  # IANA name; None means UTC
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,5 +1,6 @@
 from database import db
 from datetime import datetime
+from sqlalchemy.ext.hybrid import hybrid_property
 
 class Workout(db.Model):
     __tablename__ = "workouts"
@@ -8,31 +9,54 @@ class Workout(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     type = db.Column(db.String(100))
     duration = db.Column(db.Integer)  # in minutes
-    date = db.Column(db.Date, index=True)
+    # Never NULL, so (date, id) is always a usable keyset cursor
+    date = db.Column(db.Date, nullable=False, default=lambda: datetime.utcnow().date(), index=True)
     notes = db.Column(db.Text)
     rpe = db.Column(db.Integer)  # Rate of Perceived Exertion (1-10)
+    # Maintained from workout_exercises by utils/workout_totals.py
+    exercise_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_sets = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_volume = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    # Programmed session this workout fulfilled (set by utils/program_progress.py)
+    program_enrollment_id = db.Column(db.Integer, db.ForeignKey("program_enrollments.id", ondelete="SET NULL"), index=True)
+    program_workout_id = db.Column(db.Integer, db.ForeignKey("program_workouts.id", ondelete="SET NULL"))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # NULL while a workout started from a template is only planned
+    completed_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
     user = db.relationship("User", back_populates="workouts")
     exercises = db.relationship("WorkoutExercise", back_populates="workout", cascade="all, delete-orphan", lazy='dynamic')
 
-    # Composite index for common queries
+    # Composite index for common queries; id breaks ties for keyset pagination
     __table_args__ = (
-        db.Index('idx_workouts_user_date', 'user_id', 'date'),
+        db.Index('idx_workouts_user_date_id', 'user_id', 'date', 'id'),
+    )
+
+    LIST_FIELDS = (
+        'id', 'type', 'duration', 'date', 'notes', 'rpe', 'created_at',
+        'exercise_count', 'total_sets', 'total_volume', 'program_workout_id',
+        'completed_at',
     )
 
     def __repr__(self):
         return f"<Workout {self.type} on {self.date}>"
+
+    @hybrid_property
+    def is_completed(self):
+        """Planned workouts are left out of every count, total and record."""
+        return self.completed_at is not None
+
+    @is_completed.expression
+    def is_completed(cls):
+        return cls.completed_at.isnot(None)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'type': self.type,
-            'duration': self.duration,
-            'date': self.date.isoformat() if self.date else None,
-            'notes': self.notes,
-            'rpe': self.rpe,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'exercise_count': self.exercises.count()
-        }
\ No newline at end of file
+    def to_dict(self, fields=None):
+        """Serialize; `fields` limits output to a subset of LIST_FIELDS."""
+        data = {}
+        for field in fields or self.LIST_FIELDS:
+            value = getattr(self, field)
+            if field in ('date', 'created_at', 'completed_at'):
+                value = value.isoformat() if value else None
+            data[field] = value
+        return data
\ No newline at end of file
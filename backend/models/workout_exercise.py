@@ -15,3 +15,10 @@ class WorkoutExercise(db.Model):
 
     workout = db.relationship("Workout", back_populates="exercises")
     exercise = db.relationship("Exercise")
+
+    # Per-exercise history lookups (PR recomputation, progression), and a
+    # workout's sets (counters, the picker's last-performance map)
+    __table_args__ = (
+        db.Index('idx_workout_exercises_exercise_workout', 'exercise_id', 'workout_id'),
+        db.Index('idx_workout_exercises_workout', 'workout_id'),
+    )
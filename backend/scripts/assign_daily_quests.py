@@ -0,0 +1,44 @@
+"""
+Nightly job: pre-assign daily quests to every active user.
+
+Run from the backend directory shortly before midnight (e.g. from cron):
+    python scripts/assign_daily_quests.py [--date YYYY-MM-DD] [--chunk-size 1000] [--workers 4]
+
+Assigns quests for tomorrow by default with one INSERT ... SELECT per chunk,
+so the first GET /daily-quests of the day is a plain read. Users who already
+have quests for the date are skipped, so it is safe to re-run.
+"""
+import sys
+import os
+import argparse
+from datetime import date, timedelta
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.batch_jobs import run_in_chunks
+from utils.quest_assignment import active_user_ids, assign_quests_for_users
+
+
+def run(day=None, chunk_size=1000, workers=4):
+    day = day or date.today() + timedelta(days=1)
+    app = create_app()
+    with app.app_context():
+        user_ids = active_user_ids(day)
+
+    results, failed = run_in_chunks(
+        app, user_ids, partial(assign_quests_for_users, day=day),
+        chunk_size=chunk_size, workers=workers, label='users'
+    )
+    print(f"\nDone. {sum(results)} quests assigned for {day}, {failed} chunks failed.")
+    return failed == 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--date', type=date.fromisoformat, default=None)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.date, args.chunk_size, args.workers) else 1)
@@ -0,0 +1,135 @@
+"""
+Benchmark: exercise library startup time and per-worker memory.
+
+Run from the backend directory (Linux; reads /proc):
+    python scripts/benchmark_exercise_library.py [--workers 4]
+
+Compares the old layout (the library as a Python dict literal imported by
+each worker) with the JSON data file, and measures how much memory each
+forked worker dirties after a full GC pass with and without gc.freeze() in
+the parent, as under gunicorn preload_app.
+"""
+import sys
+import os
+import gc
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.exercise_library import DATA_PATH
+
+
+_LITERAL_IMPORT = """
+import sys, time
+sys.dont_write_bytecode = True
+sys.path.insert(0, {dir!r})
+start = time.perf_counter()
+import exercise_library_literal
+print(time.perf_counter() - start)
+"""
+
+_JSON_LOAD = """
+import sys, time
+sys.path.insert(0, {dir!r})
+start = time.perf_counter()
+from utils.exercise_library import get_library
+get_library()
+print(time.perf_counter() - start)
+"""
+
+
+def _rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def _private_dirty_kb():
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Private_Dirty:'):
+                return int(line.split()[1])
+    return 0
+
+
+def _time_subprocess(code, runs=5):
+    timings = [float(subprocess.check_output([sys.executable, '-c', code], text=True)) for _ in range(runs)]
+    return min(timings)
+
+
+def _worker_private_kb(freeze, workers):
+    """Average memory dirtied by forked children that run a full collection."""
+    from utils.exercise_library import get_library
+    get_library()
+    gc.collect()
+    if freeze:
+        gc.freeze()
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            before = _private_dirty_kb()
+            gc.collect()
+            os.write(write_fd, f"{_private_dirty_kb() - before}\n".encode())
+            os._exit(0)
+        pids.append(pid)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        values = [int(line) for line in f.read().split()]
+    if freeze:
+        gc.unfreeze()
+    return sum(values) / len(values)
+
+
+def _load_in_child(freeze, workers):
+    """Run one fork measurement in a fresh interpreter so runs do not interfere."""
+    code = (
+        f"import sys; sys.path.insert(0, {os.path.dirname(os.path.dirname(os.path.abspath(__file__)))!r}); "
+        f"from scripts.benchmark_exercise_library import _worker_private_kb; "
+        f"print(_worker_private_kb({freeze}, {workers}))"
+    )
+    return float(subprocess.check_output([sys.executable, '-c', code], text=True))
+
+
+def run(workers=4):
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(DATA_PATH, encoding='utf-8') as f:
+        library = json.load(f)['exercises']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'exercise_library_literal.py'), 'w') as f:
+            f.write(f"EXERCISE_LIBRARY = {library!r}\n")
+        literal_s = _time_subprocess(_LITERAL_IMPORT.format(dir=tmp))
+    json_s = _time_subprocess(_JSON_LOAD.format(dir=backend_dir))
+
+    before = _rss_kb()
+    from utils.exercise_library import get_library
+    get_library()
+    loaded_kb = _rss_kb() - before
+
+    unfrozen_kb = _load_in_child(False, workers)
+    frozen_kb = _load_in_child(True, workers)
+
+    print(f"Library entries:                 {len(library)}")
+    print(f"Import as dict literal (cold):   {literal_s * 1000:.1f} ms per worker")
+    print(f"Load from JSON (lazy):           {json_s * 1000:.1f} ms, once in the master")
+    print(f"RSS of the loaded library:       {loaded_kb} KB")
+    print(f"Dirtied per worker after GC:     {unfrozen_kb:.0f} KB without gc.freeze, "
+          f"{frozen_kb:.0f} KB with gc.freeze ({workers} workers)")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.workers) else 1)
@@ -0,0 +1,42 @@
+"""
+Recompute exercise substitution neighbours.
+
+Run from the backend directory after seeding or editing exercises:
+    python scripts/compute_exercise_similarity.py [--top-k 10]
+
+Encodes every exercise by muscles, equipment, category and difficulty,
+finds its most similar exercises by cosine similarity and replaces
+exercise_similarities in one transaction (see utils/exercise_similarity.py).
+"""
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from database import db
+from utils.exercise_similarity import TOP_K, rebuild_similarities
+
+
+def run(top_k=TOP_K):
+    app = create_app()
+    with app.app_context():
+        start = time.perf_counter()
+        try:
+            rows = rebuild_similarities(top_k)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Failed: {e}")
+            return False
+    print(f"Done. {rows} neighbour rows written in {time.perf_counter() - start:.1f}s.")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--top-k', type=int, default=TOP_K)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.top_k) else 1)
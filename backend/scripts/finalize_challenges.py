@@ -0,0 +1,40 @@
+"""
+Scheduled job: finalize challenges whose end_date has passed.
+
+Run from the backend directory (e.g. from cron every 15 minutes):
+    python scripts/finalize_challenges.py [--chunk-size 200] [--workers 2]
+
+Each chunk ranks participants, marks the challenge completed with its
+winner, awards points and sends result notifications in one transaction.
+Already-finalized challenges are skipped, so overlapping runs are safe.
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.batch_jobs import run_in_chunks
+from utils.challenge_lifecycle import expired_challenge_ids, finalize_challenges
+
+
+def run(chunk_size=200, workers=2):
+    app = create_app()
+    with app.app_context():
+        challenge_ids = expired_challenge_ids()
+
+    results, failed = run_in_chunks(
+        app, challenge_ids, finalize_challenges,
+        chunk_size=chunk_size, workers=workers, label='challenges'
+    )
+    print(f"\nDone. {sum(results)} challenges finalized, {failed} chunks failed.")
+    return failed == 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.chunk_size, args.workers) else 1)
@@ -0,0 +1,41 @@
+"""
+Nightly job: precompute completion forecasts for every active goal.
+
+Run from the backend directory (e.g. from cron, after recalculate_goals.py):
+    python scripts/forecast_goals.py [--method ewma|linear] [--chunk-size 500] [--workers 4]
+
+Forecasts are stored on the goal (forecast_rate, forecast_completion_date)
+so GET /goals reads them instead of recomputing. Safe to re-run.
+"""
+import sys
+import os
+import argparse
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.batch_jobs import all_user_ids, run_in_chunks
+from utils.goal_forecast import FORECAST_METHODS, DEFAULT_METHOD, forecast_goals_for_users
+
+
+def run(method=DEFAULT_METHOD, chunk_size=500, workers=4):
+    app = create_app()
+    with app.app_context():
+        user_ids = all_user_ids()
+
+    results, failed = run_in_chunks(
+        app, user_ids, partial(forecast_goals_for_users, method=method),
+        chunk_size=chunk_size, workers=workers, label='users'
+    )
+    print(f"\nDone. {sum(results)} goals forecast, {failed} chunks failed.")
+    return failed == 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--method', choices=FORECAST_METHODS, default=DEFAULT_METHOD)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.method, args.chunk_size, args.workers) else 1)
@@ -0,0 +1,71 @@
+"""
+Long-running worker: send habit reminders as they come due.
+
+Run from the backend directory (the `reminders` service in docker-compose):
+    python scripts/habit_reminder_worker.py [--tick 5] [--refill 60]
+
+Keeps the next few minutes of reminders in an in-memory heap, refilled
+from the next_reminder_at index, and sends everything due on each tick in
+one transaction (see utils/habit_reminders.py). Stops cleanly on SIGTERM;
+a restart resumes from the database, so nothing is sent twice.
+"""
+import sys
+import os
+import time
+import signal
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from database import db
+from utils.habit_reminders import ReminderWheel, dispatch_reminders
+
+
+_stopping = False
+
+
+def _stop(signum, frame):
+    global _stopping
+    _stopping = True
+
+
+def run(tick=5.0, refill=60.0):
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    app = create_app()
+    wheel = ReminderWheel()
+    last_refill = 0.0
+    with app.app_context():
+        while not _stopping:
+            now = datetime.utcnow()
+            try:
+                if wheel.needs_refill(now) or time.monotonic() - last_refill >= refill:
+                    wheel.refill(now)
+                    db.session.commit()
+                    last_refill = time.monotonic()
+
+                due = wheel.pop_due(now)
+                if due:
+                    sent, stale = dispatch_reminders(due, now)
+                    db.session.commit()
+                    app.logger.info(f"Habit reminders: {sent} sent, {stale} skipped as stale")
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Habit reminder tick failed: {e}")
+                # Rebuild from the database on the next tick
+                wheel.horizon = None
+
+            time.sleep(min(tick, wheel.seconds_until_next(datetime.utcnow())) or 0.1)
+    print("Reminder worker stopped.")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--tick', type=float, default=5.0)
+    parser.add_argument('--refill', type=float, default=60.0)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.tick, args.refill) else 1)
@@ -0,0 +1,31 @@
+"""
+Rebuild the live challenge leaderboards from challenge_participants.
+
+Run from the backend directory after a Redis flush or restore:
+    python scripts/rebuild_leaderboards.py [--challenge-id 123 ...]
+
+Boards are also rebuilt lazily on first read, so this only warms them.
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.leaderboards import rebuild_active_leaderboards
+
+
+def run(challenge_ids=None):
+    app = create_app()
+    with app.app_context():
+        entries = rebuild_active_leaderboards(challenge_ids)
+    print(f"Done. {entries} leaderboard entries loaded.")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--challenge-id', type=int, action='append', dest='challenge_ids')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.challenge_ids) else 1)
@@ -0,0 +1,40 @@
+"""
+Rebuild personal records for every user from their full workout history.
+
+Run from the backend directory:
+    python scripts/rebuild_personal_records.py [--chunk-size 500] [--workers 4]
+
+Users are processed in chunks of ids; each chunk is rebuilt with one windowed
+query and committed in its own transaction, and chunks run in parallel
+threads (each with its own app context and DB session). Safe to re-run.
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.batch_jobs import all_user_ids, run_in_chunks
+from utils.pr_tracker import rebuild_prs_for_users
+
+
+def rebuild(chunk_size=500, workers=4):
+    app = create_app()
+    with app.app_context():
+        user_ids = all_user_ids()
+
+    results, failed = run_in_chunks(
+        app, user_ids, rebuild_prs_for_users,
+        chunk_size=chunk_size, workers=workers, label='users'
+    )
+    print(f"\nDone. {sum(results)} records written, {failed} chunks failed.")
+    return failed == 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    sys.exit(0 if rebuild(args.chunk_size, args.workers) else 1)
@@ -0,0 +1,43 @@
+"""
+Nightly job: recalculate progress and links_count for every user's goals.
+
+Run from the backend directory (e.g. from cron):
+    python scripts/recalculate_goals.py [--chunk-size 500] [--workers 4]
+
+Each chunk of users is recalculated with one grouped query and one bulk
+UPDATE of the goals whose values changed. Safe to re-run.
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.batch_jobs import all_user_ids, run_in_chunks
+from utils.goal_sync import recalculate_goals
+
+
+def _recalculate_chunk(user_ids):
+    return len(recalculate_goals(user_ids=user_ids))
+
+
+def run(chunk_size=500, workers=4):
+    app = create_app()
+    with app.app_context():
+        user_ids = all_user_ids()
+
+    results, failed = run_in_chunks(
+        app, user_ids, _recalculate_chunk,
+        chunk_size=chunk_size, workers=workers, label='users'
+    )
+    print(f"\nDone. {sum(results)} goals recalculated, {failed} chunks failed.")
+    return failed == 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.chunk_size, args.workers) else 1)
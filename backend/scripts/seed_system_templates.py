@@ -15,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app import create_app
 from database import db
 from models import WorkoutTemplate, TemplateExercise, Exercise
+from utils.catalog_cache import SYSTEM_TEMPLATES as SYSTEM_TEMPLATES_CATALOG, invalidate_catalog
 from sqlalchemy import func
 from datetime import datetime
 
@@ -407,6 +408,8 @@ def seed():
             print(f"  [OK]   '{tdata['name']}' — {exercises_added}/{len(tdata['exercises'])} exercises")
             seeded += 1
 
+        if seeded:
+            invalidate_catalog(SYSTEM_TEMPLATES_CATALOG)
         print(f"\nDone. Seeded: {seeded}, Skipped (already exist): {skipped}")
 
 
@@ -5,6 +5,8 @@ Run: python seed_exercises.py
 from app import create_app
 from database import db
 from models import Exercise
+from utils.catalog_cache import EXERCISES as EXERCISES_CATALOG, invalidate_catalog
+from utils.exercise_search import invalidate_exercise_bank
 
 EXERCISES = [
     # CHEST
@@ -117,6 +119,9 @@ def seed():
             db.session.add(exercise)
             added += 1
         db.session.commit()
+        if added:
+            invalidate_exercise_bank()
+            invalidate_catalog(EXERCISES_CATALOG)
         print(f"Seeded {added} exercises ({skipped} already existed)")
 
 
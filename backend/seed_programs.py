@@ -5,6 +5,7 @@ Run: python seed_programs.py
 from app import create_app
 from database import db
 from models.workout_program import WorkoutProgram, ProgramWorkout, ProgramExercise
+from utils.catalog_cache import PROGRAMS as PROGRAMS_CATALOG, invalidate_catalog
 
 
 # Helper: 'compound' or 'isolation' determines rest and progression
@@ -304,6 +305,8 @@ def seed():
             print(f"  Added: {prog_info['name']}")
 
         db.session.commit()
+        if added:
+            invalidate_catalog(PROGRAMS_CATALOG)
         print(f"\nSeeded {added} programs ({skipped} already existed)")
 
 
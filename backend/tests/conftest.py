@@ -162,6 +162,14 @@ def db(app):
             _db.session.execute(table.delete())
         _db.session.commit()
 
+    # Per-process catalog responses were built from the rows just deleted
+    from utils.catalog_cache import clear_local
+    clear_local()
+
+    # Live session ids are reused once their rows are gone
+    from utils.live_sessions import reset_store
+    reset_store()
+
 
 # ---------------------------------------------------------------------------
 # HTTP client fixture
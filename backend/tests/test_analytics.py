@@ -16,6 +16,7 @@ Endpoints covered:
 Pure logic functions tested in isolation:
   _calculate_workout_streak   (from api.analytics)
   _calculate_streak_with_freezes (from api.reengagement)
+  training_sessions projection  (utils/training_sessions.py)
 
 Strategy:
   - All DB interactions use the in-memory SQLite fixture from conftest.py.
@@ -1020,3 +1021,67 @@ class TestWeeklyRecap:
     def test_no_workouts_most_active_day_is_none(self, client, auth_headers, db):
         resp = client.get("/api/v1/weekly-recap", headers=_auth(auth_headers))
         assert resp.get_json()["most_active_day"] is None
+
+
+# ---------------------------------------------------------------------------
+# training_sessions projection
+# ---------------------------------------------------------------------------
+
+class TestTrainingSessions:
+    """The projection follows writes to workouts, exercises and cardio."""
+
+    def _session(self, kind, source_id):
+        from models.training_session import TrainingSession
+        return TrainingSession.query.filter_by(kind=kind, source_id=source_id).one_or_none()
+
+    def test_workout_and_exercises_projected(self, app, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        workout = _insert_workout(db, uid, date=TODAY, duration=50, workout_type="Push")
+        exercise = _insert_exercise(db, uid)
+        _insert_workout_exercise(db, workout.id, exercise.id, sets=3, reps=10, weight=100.0)
+        row = _insert_workout_exercise(db, workout.id, exercise.id, sets=1, reps=5, weight=120.0)
+
+        session = self._session("strength", workout.id)
+        assert (session.user_id, session.local_date, session.activity) == (uid, TODAY, "Push")
+        assert session.duration == 50
+        assert session.volume == 3600.0
+
+        db.session.delete(row)
+        workout.duration = 40
+        db.session.commit()
+        session = self._session("strength", workout.id)
+        assert (session.duration, session.volume) == (40, 3000.0)
+
+        db.session.delete(workout)
+        db.session.commit()
+        assert self._session("strength", workout.id) is None
+
+    def test_rolled_back_workout_not_projected(self, app, db, auth_headers):
+        from models import Workout
+        from models.training_session import TrainingSession
+        db.session.add(Workout(user_id=auth_headers["_user_id"], type="Pull", date=TODAY))
+        db.session.flush()
+        assert TrainingSession.query.count() == 1
+        db.session.rollback()
+        assert TrainingSession.query.count() == 0
+
+    def test_cardio_counts_in_streak_and_recap(self, client, db, auth_headers):
+        from api.analytics import _calculate_workout_streak
+        from models.cardio_workout import CardioWorkout
+        uid = auth_headers["_user_id"]
+        _insert_workout(db, uid, date=TODAY - datetime.timedelta(days=1), duration=45)
+        cardio = CardioWorkout(
+            user_id=uid, cardio_type="running", duration=30, distance=5.0,
+            date=datetime.datetime.combine(TODAY - datetime.timedelta(days=2), datetime.time(12)),
+        )
+        db.session.add(cardio)
+        db.session.commit()
+
+        assert self._session("cardio", cardio.id).distance == 5.0
+        _insert_workout(db, uid, date=TODAY)
+        assert _calculate_workout_streak(uid) == 3
+
+        resp = client.get("/api/v1/weekly-recap", headers=_auth(auth_headers))
+        this_week = resp.get_json()["this_week"]
+        assert this_week["workouts"] == 2
+        assert this_week["duration_minutes"] == 75
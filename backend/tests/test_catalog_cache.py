@@ -0,0 +1,91 @@
+"""
+test_catalog_cache.py - Tests for backend/utils/catalog_cache.py and the
+                        catalog endpoints served through it
+
+Endpoints covered:
+  GET  /api/v1/exercise-library/all        (ETag, 304, gzip)
+  GET  /api/v1/programs
+  GET  /api/v1/workout-templates/system    (invalidated by admin edits)
+  POST /api/v1/admin/templates
+
+Seed scripts: seed_exercises, seed_programs, scripts/seed_system_templates
+"""
+
+import gzip
+import json
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+class TestCatalogResponses:
+
+    def test_etag_revalidation_and_gzip(self, client, auth_headers):
+        url = "/api/v1/exercise-library/all"
+        resp = client.get(url, headers=_auth(auth_headers))
+        assert resp.status_code == 200
+        assert resp.headers.get("Content-Encoding") is None
+        etag = resp.headers["ETag"]
+        assert resp.headers["Vary"] == "Accept-Encoding"
+
+        resp = client.get(url, headers={**_auth(auth_headers), "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+        resp = client.get(url, headers={**_auth(auth_headers), "Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        gzip_etag = resp.headers["ETag"]
+        assert gzip_etag == etag[:-1] + '-gz"'
+        data = json.loads(gzip.decompress(resp.data))
+        assert data["count"] == len(data["exercises"]) > 0
+
+        # Either representation's tag revalidates; the 304 names the one it would send
+        resp = client.get(url, headers={**_auth(auth_headers), "If-None-Match": gzip_etag})
+        assert resp.status_code == 304
+        assert resp.headers["ETag"] == etag
+
+    def test_programs_served_from_catalog(self, client, db, auth_headers):
+        from models.workout_program import WorkoutProgram
+        db.session.add(WorkoutProgram(name="5x5", difficulty="beginner", duration_weeks=8,
+                                      workouts_per_week=3, is_public=True))
+        db.session.commit()
+
+        resp = client.get("/api/v1/programs", headers=_auth(auth_headers))
+        assert [p["name"] for p in resp.get_json()["programs"]] == ["5x5"]
+        assert resp.headers["Cache-Control"] == "private, no-cache"
+
+    def test_admin_edit_invalidates_system_templates(self, client, db, auth_headers):
+        from models import User
+        user = db.session.get(User, auth_headers["_user_id"])
+        user.is_admin = True
+        db.session.commit()
+
+        url = "/api/v1/workout-templates/system"
+        resp = client.get(url, headers=_auth(auth_headers))
+        assert resp.get_json()["templates"] == []
+        etag = resp.headers["ETag"]
+
+        resp = client.post("/api/v1/admin/templates", json={"name": "Full Body A"},
+                           headers=_auth(auth_headers))
+        assert resp.status_code == 201
+
+        resp = client.get(url, headers={**_auth(auth_headers), "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert [t["name"] for t in resp.get_json()["templates"]] == ["Full Body A"]
+
+        resp = client.get("/api/v1/workout-templates", headers=_auth(auth_headers))
+        assert [t["name"] for t in resp.get_json()["system_templates"]] == ["Full Body A"]
+
+    def test_seed_scripts_invalidate_their_catalogs(self, app, db, monkeypatch):
+        import importlib
+        from utils.catalog_cache import EXERCISES, PROGRAMS, SYSTEM_TEMPLATES, catalog_version, clear_local
+        for module, catalog in [("seed_exercises", EXERCISES), ("seed_programs", PROGRAMS),
+                                ("scripts.seed_system_templates", SYSTEM_TEMPLATES)]:
+            script = importlib.import_module(module)
+            monkeypatch.setattr(script, "create_app", lambda: app)
+            with app.app_context():
+                before = catalog_version(catalog)
+                script.seed()
+                clear_local()  # re-read the shared version, not this worker's copy
+                assert catalog_version(catalog) == before + 1, module
@@ -0,0 +1,361 @@
+"""
+test_challenges.py - Tests for backend/api/challenges.py,
+                     backend/utils/challenge_progress.py and
+
+                     backend/utils/challenge_lifecycle.py
+
+Endpoints covered:
+  GET  /api/v1/challenges                      (participant_count column)
+  GET  /api/v1/challenges/<challenge_id>       (sorted-set leaderboard)
+  POST /api/v1/workouts                        (progress applied on log)
+  DELETE /api/v1/workouts/<workout_id>         (progress recomputed)
+  POST /api/v1/challenges/<challenge_id>/join  (existing history credited)
+
+Pure logic functions tested in isolation:
+  apply_workout_to_challenges
+  recompute_challenge_progress
+  finalize_challenges, award_points_bulk
+  MemoryLeaderboardStore
+"""
+
+import datetime
+
+import pytest
+
+
+TODAY = datetime.date.today()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_leaderboards(monkeypatch):
+    """Ids are reused between tests, so every test gets an empty board store."""
+    import utils.leaderboards
+    monkeypatch.setattr(utils.leaderboards, "_store", utils.leaderboards.MemoryLeaderboardStore())
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _challenge(db, user_id, challenge_type, target=100, exercise_id=None, join=True, days=30):
+    from models.challenge import Challenge, ChallengeParticipant
+    start = datetime.datetime.combine(TODAY - datetime.timedelta(days=10), datetime.time())
+    challenge = Challenge(
+        creator_id=user_id, challenge_type=challenge_type, title="Challenge",
+        target_value=target, target_exercise_id=exercise_id,
+        start_date=start, end_date=start + datetime.timedelta(days=days), status="active",
+        participant_count=1 if join else 0,
+    )
+    db.session.add(challenge)
+    db.session.flush()
+    if join:
+        db.session.add(ChallengeParticipant(
+            challenge_id=challenge.id, user_id=user_id, current_progress=0, status="active",
+        ))
+    db.session.commit()
+    return challenge
+
+
+def _exercise(db, user_id, name="Bench"):
+    from models import Exercise
+    exercise = Exercise(user_id=user_id, name=name)
+    db.session.add(exercise)
+    db.session.commit()
+    return exercise
+
+
+def _workout(db, user_id, days_ago=0, sets=()):
+    """sets: (exercise_id, sets, reps, weight)"""
+    from models import Workout, WorkoutExercise
+    workout = Workout(
+        user_id=user_id, type="Strength", duration=30,
+        date=TODAY - datetime.timedelta(days=days_ago),
+    )
+    db.session.add(workout)
+    db.session.flush()
+    for exercise_id, n_sets, reps, weight in sets:
+        db.session.add(WorkoutExercise(
+            workout_id=workout.id, exercise_id=exercise_id, sets=n_sets, reps=reps, weight=weight,
+        ))
+    db.session.commit()
+    return workout
+
+
+def _progress(db, challenge, user_id):
+    from models.challenge import ChallengeParticipant
+    return ChallengeParticipant.query.filter_by(
+        challenge_id=challenge.id, user_id=user_id
+    ).first()
+
+
+class TestIncrementalProgress:
+
+    def test_logging_a_workout_updates_every_active_challenge(self, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        bench = _exercise(db, uid)
+        count = _challenge(db, uid, "workout_count", target=1)
+        volume = _challenge(db, uid, "total_volume", target=10_000)
+        heaviest = _challenge(db, uid, "specific_exercise", target=200, exercise_id=bench.id)
+
+        resp = client.post("/api/v1/workouts", json={
+            "type": "Strength", "duration": 45,
+            "exercises": [
+                {"exercise_id": bench.id, "sets": 3, "reps": 5, "weight": 100},
+                {"exercise_id": bench.id, "sets": 1, "reps": 2, "weight": 120},
+            ],
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+
+        assert _progress(db, count, uid).current_progress == 1
+        assert _progress(db, count, uid).status == "completed"
+        assert _progress(db, volume, uid).current_progress == 1500 + 240
+        assert _progress(db, heaviest, uid).current_progress == 120
+
+    def test_delta_matches_full_recompute(self, app, db, auth_headers):
+        from utils.challenge_progress import apply_workout_to_challenges, recompute_challenge_progress
+        uid = auth_headers["_user_id"]
+        bench = _exercise(db, uid)
+        volume = _challenge(db, uid, "total_volume", target=1e9)
+        for days_ago, weight in [(3, 50), (2, 60), (0, 70)]:
+            workout = _workout(db, uid, days_ago, [(bench.id, 2, 10, weight)])
+            apply_workout_to_challenges(uid, workout)
+        db.session.commit()
+
+        incremental = _progress(db, volume, uid).current_progress
+        assert recompute_challenge_progress(volume, commit_rows=False) == {uid: incremental}
+        assert incremental == 2 * 10 * (50 + 60 + 70)
+
+    def test_workouts_outside_window_are_ignored(self, app, db, auth_headers):
+        from utils.challenge_progress import apply_workout_to_challenges
+        uid = auth_headers["_user_id"]
+        count = _challenge(db, uid, "workout_count")
+        old = _workout(db, uid, days_ago=30)
+
+        assert apply_workout_to_challenges(uid, old) == []
+        assert _progress(db, count, uid).current_progress == 0
+
+
+class TestRecompute:
+
+    def test_streak_uses_run_ending_at_latest_workout(self, app, db, auth_headers, make_user):
+        from utils.challenge_progress import recompute_challenge_progress
+        uid = auth_headers["_user_id"]
+        other = make_user()
+        streak = _challenge(db, uid, "streak")
+        for days_ago in [9, 8, 7, 6, 3, 2, 2, 1]:
+            _workout(db, uid, days_ago)
+        _workout(db, other.id, 0)
+
+        assert recompute_challenge_progress(streak, user_ids=[uid, other.id], commit_rows=False) == {
+            uid: 3, other.id: 1,
+        }
+
+    def test_deleting_a_workout_recomputes_progress(self, client, db, auth_headers):
+        from utils.challenge_progress import recompute_challenge_progress
+        uid = auth_headers["_user_id"]
+        bench = _exercise(db, uid)
+        volume = _challenge(db, uid, "total_volume")
+        _workout(db, uid, 1, [(bench.id, 1, 10, 10)])
+        drop = _workout(db, uid, 0, [(bench.id, 1, 10, 20)])
+        recompute_challenge_progress(volume)
+        db.session.commit()
+        assert _progress(db, volume, uid).current_progress == 300
+
+        resp = client.delete(f"/api/v1/workouts/{drop.id}", headers=_auth(auth_headers))
+        assert resp.status_code == 200
+        assert _progress(db, volume, uid).current_progress == 100
+
+    def test_join_credits_existing_history(self, client, db, auth_headers, make_user):
+        uid = auth_headers["_user_id"]
+        creator = make_user()
+        count = _challenge(db, creator.id, "workout_count", join=False)
+        _workout(db, uid, 2)
+        _workout(db, uid, 1)
+
+        resp = client.post(f"/api/v1/challenges/{count.id}/join", headers=_auth(auth_headers))
+        assert resp.status_code == 200
+        assert _progress(db, count, uid).current_progress == 2
+
+
+class TestLifecycle:
+
+    def _participant(self, db, challenge, user_id, progress, status="active"):
+        from models.challenge import ChallengeParticipant
+        db.session.add(ChallengeParticipant(
+            challenge_id=challenge.id, user_id=user_id, current_progress=progress, status=status,
+        ))
+        challenge.participant_count += 1
+        db.session.commit()
+
+    def test_expired_challenges_are_ranked_and_rewarded(self, app, db, auth_headers, make_user):
+        from models import Notification, PointTransaction, UserPoint
+        from models.challenge import Challenge
+        from utils.challenge_lifecycle import expired_challenge_ids, finalize_challenges
+        uid = auth_headers["_user_id"]
+        runner_up, quitter = make_user(), make_user()
+        expired = _challenge(db, uid, "workout_count", target=5, days=5)
+        winner = _progress(db, expired, uid)
+        winner.current_progress, winner.status = 6, "completed"
+        self._participant(db, expired, runner_up.id, 3)
+        self._participant(db, expired, quitter.id, 9, status="withdrawn")
+        running = _challenge(db, uid, "workout_count")
+
+        assert expired_challenge_ids() == [expired.id]
+        assert finalize_challenges([expired.id, running.id]) == 1
+        db.session.commit()
+
+        challenge = db.session.get(Challenge, expired.id)
+        assert challenge.status == "completed"
+        assert challenge.winner_id == uid
+        assert _progress(db, expired, uid).final_rank == 1
+        assert _progress(db, expired, runner_up.id).final_rank == 2
+        assert _progress(db, expired, quitter.id).final_rank is None
+        assert db.session.get(Challenge, running.id).status == "active"
+
+        ledger = sorted(t.reason for t in PointTransaction.query.filter_by(user_id=uid))
+        assert ledger == ["challenge_completed", "challenge_won"]
+        assert UserPoint.query.filter_by(user_id=uid).one().total_points == 225
+        assert Notification.query.filter_by(type="challenge_result").count() == 2
+
+        # A second run finds nothing left to do
+        assert finalize_challenges([expired.id]) == 0
+
+    def test_bulk_points_add_to_existing_totals(self, app, db, auth_headers):
+        from models import PointTransaction, UserPoint
+        from utils.gamification_helper import award_points_bulk
+        uid = auth_headers["_user_id"]
+        db.session.add(UserPoint(user_id=uid, total_points=90, level=1, points_to_next_level=10))
+        db.session.commit()
+
+        results = award_points_bulk([
+            {"user_id": uid, "reason": "challenge_completed"},
+            {"user_id": uid, "reason": "custom", "points": 5},
+        ])
+        db.session.commit()
+
+        assert results[uid]["new_total"] == 170
+        assert results[uid]["leveled_up"] is True
+        assert UserPoint.query.filter_by(user_id=uid).one().level == 2
+        assert PointTransaction.query.count() == 2
+
+    def test_listing_reports_maintained_participant_count(self, client, db, auth_headers, make_user):
+        uid = auth_headers["_user_id"]
+        creator = make_user()
+        challenge = _challenge(db, creator.id, "workout_count")
+        challenge.is_public = True
+        db.session.commit()
+
+        listed = client.get("/api/v1/challenges", headers=_auth(auth_headers)).get_json()
+        assert listed["public_challenges"][0]["participant_count"] == 1
+
+        client.post(f"/api/v1/challenges/{challenge.id}/join", headers=_auth(auth_headers))
+        listed = client.get("/api/v1/challenges", headers=_auth(auth_headers)).get_json()
+        assert listed["my_challenges"][0]["participant_count"] == 2
+        assert listed["public_challenges"] == []
+
+
+class TestLeaderboards:
+
+    def test_memory_store_breaks_ties_by_user_id(self):
+        from utils.leaderboards import MemoryLeaderboardStore
+        store = MemoryLeaderboardStore()
+        store.replace(1, {10: 5.0, 11: 9.0, 12: 5.0, 9: 5.0})
+        store.set_scores(1, {13: 7.0})
+
+        assert store.top(1, 0, 3) == [(11, 9.0), (13, 7.0), (9, 5.0)]
+        assert store.top(1, 3, 10) == [(10, 5.0), (12, 5.0)]
+        assert store.rank(1, 10) == (4, 5.0)
+        assert store.rank(1, 99) is None
+
+    def test_memory_board_expires_and_is_rebuilt(self, app, db, auth_headers, make_user, monkeypatch):
+        import utils.leaderboards as leaderboards
+        from models.challenge import ChallengeParticipant
+        uid = auth_headers["_user_id"]
+        challenge = _challenge(db, uid, "workout_count")
+        monkeypatch.setattr(leaderboards, "_store", leaderboards.MemoryLeaderboardStore(ttl=0))
+        assert leaderboards.leaderboard_page(challenge.id)[1] == 1
+
+        # Joined through another worker: nothing was published to this board
+        db.session.add(ChallengeParticipant(
+            challenge_id=challenge.id, user_id=make_user().id, current_progress=3, status="active",
+        ))
+        db.session.commit()
+
+        assert leaderboards.leaderboard_page(challenge.id, uid)[1:] == (2, (2, 0))
+
+    def test_store_failure_falls_back_to_sql_ranking(self, client, db, auth_headers, make_user, monkeypatch):
+        import utils.leaderboards as leaderboards
+        from models.challenge import ChallengeParticipant
+        uid = auth_headers["_user_id"]
+        challenge = _challenge(db, uid, "workout_count", join=False)
+        others = [make_user() for _ in range(3)]
+        for user, progress in zip(others, [4, 8, 4]):
+            db.session.add(ChallengeParticipant(
+                challenge_id=challenge.id, user_id=user.id, current_progress=progress, status="active",
+            ))
+        db.session.add(ChallengeParticipant(
+            challenge_id=challenge.id, user_id=uid, current_progress=1, status="active",
+        ))
+        db.session.commit()
+        expected = leaderboards.leaderboard_page(challenge.id, others[2].id, 0, 2)
+
+        class BrokenStore:
+            def __getattr__(self, name):
+                raise ConnectionError("redis down")
+
+        monkeypatch.setattr(leaderboards, "_store", BrokenStore())
+        entries, total, my_rank = leaderboards.leaderboard_page(challenge.id, others[2].id, 0, 2)
+
+        assert (entries, total, my_rank) == expected
+        assert [e[1] for e in entries] == [others[1].id, others[0].id]
+        assert my_rank == (3, 4.0)
+
+    def test_details_page_and_my_rank(self, client, db, auth_headers, make_user):
+        from models.challenge import ChallengeParticipant
+        uid = auth_headers["_user_id"]
+        challenge = _challenge(db, uid, "workout_count", join=False)
+        others = [make_user() for _ in range(3)]
+        for user, progress in zip(others, [4, 8, 6]):
+            db.session.add(ChallengeParticipant(
+                challenge_id=challenge.id, user_id=user.id, current_progress=progress, status="active",
+            ))
+        db.session.add(ChallengeParticipant(
+            challenge_id=challenge.id, user_id=uid, current_progress=1, status="active",
+        ))
+        db.session.commit()
+
+        resp = client.get(f"/api/v1/challenges/{challenge.id}?limit=2", headers=_auth(auth_headers))
+        data = resp.get_json()["challenge"]
+        assert [e["user_id"] for e in data["leaderboard"]] == [others[1].id, others[2].id]
+        assert data["leaderboard"][0]["rank"] == 1
+        assert data["leaderboard_total"] == 4
+        assert data["my_rank"] == {"rank": 4, "progress": 1}
+
+    def test_logged_workout_moves_user_up_after_commit(self, client, db, auth_headers, make_user):
+        from models.challenge import ChallengeParticipant
+        from utils.leaderboards import leaderboard_page
+        uid = auth_headers["_user_id"]
+        rival = make_user()
+        challenge = _challenge(db, uid, "workout_count")
+        db.session.add(ChallengeParticipant(
+            challenge_id=challenge.id, user_id=rival.id, current_progress=1, status="active",
+        ))
+        db.session.commit()
+        assert leaderboard_page(challenge.id, uid)[2] == (2, 0)
+
+        client.post("/api/v1/workouts", json={"type": "Run", "duration": 20}, headers=_auth(auth_headers))
+        client.post("/api/v1/workouts", json={"type": "Run", "duration": 20}, headers=_auth(auth_headers))
+
+        assert leaderboard_page(challenge.id, uid)[2] == (1, 2)
+
+    def test_rolled_back_progress_is_not_published(self, app, db, auth_headers):
+        from utils.leaderboards import get_store, leaderboard_page, queue_score_updates
+        uid = auth_headers["_user_id"]
+        challenge = _challenge(db, uid, "workout_count")
+        leaderboard_page(challenge.id)
+
+        queue_score_updates(challenge.id, {uid: 50})
+        db.session.rollback()
+        db.session.commit()
+
+        assert get_store().rank(challenge.id, uid) == (1, 0)
@@ -0,0 +1,222 @@
+"""
+test_daily_quests.py - Tests for backend/api/daily_quests.py,
+                       backend/utils/quest_engine.py and
+                       backend/utils/quest_assignment.py
+
+Endpoints covered:
+  GET  /api/v1/daily-quests                      (pre-assigned read, on-demand fallback)
+  POST /api/v1/workouts                          (workout quests advance)
+  POST /api/v1/habits/<habit_id>/log             (habit quests advance)
+  POST /api/v1/daily-quests/<quest_id>/complete  (evaluated quests refused)
+
+Pure logic functions tested in isolation:
+  evaluate_quest_event
+  assign_quests_for_users, get_quest_catalog
+"""
+
+import datetime
+
+import pytest
+
+
+TODAY = datetime.date.today()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_catalog(monkeypatch):
+    """Quest ids are reused between tests, so the catalog cache starts empty."""
+    import utils.quest_assignment
+    from database import cache
+    monkeypatch.setattr(utils.quest_assignment, "_catalog", {"version": None, "checked_at": 0.0, "quests": {}})
+    cache.delete(utils.quest_assignment._VERSION_KEY)
+
+
+def _catalog_quests(db, n):
+    from models.daily_quest import DailyQuest
+    quests = [DailyQuest(quest_type=f"type_{i}", title=f"Quest {i}") for i in range(n)]
+    db.session.add_all(quests)
+    db.session.commit()
+    return quests
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _assign(db, user_id, quest_type, target=1, points=50, day=TODAY):
+    from models.daily_quest import DailyQuest, UserDailyQuest
+    quest = DailyQuest.query.filter_by(quest_type=quest_type).first()
+    if not quest:
+        quest = DailyQuest(quest_type=quest_type, title=quest_type, points_reward=points, target_value=target)
+        db.session.add(quest)
+        db.session.flush()
+    user_quest = UserDailyQuest(user_id=user_id, quest_id=quest.id, date_assigned=day, current_progress=0)
+    db.session.add(user_quest)
+    db.session.commit()
+    return user_quest
+
+
+def _reload(db, user_quest):
+    from models.daily_quest import UserDailyQuest
+    return db.session.get(UserDailyQuest, user_quest.id)
+
+
+class TestQuestEvaluation:
+
+    def test_workout_completes_quests_with_one_ledger_write(self, client, db, auth_headers):
+        from models import Exercise, PointTransaction
+        uid = auth_headers["_user_id"]
+        exercises = [Exercise(user_id=uid, name=f"Ex {i}") for i in range(2)]
+        db.session.add_all(exercises)
+        db.session.commit()
+        workout_quest = _assign(db, uid, "workout_count", points=50)
+        streak_quest = _assign(db, uid, "streak_maintain", points=100)
+        variety_quest = _assign(db, uid, "exercise_count", target=5)
+
+        resp = client.post("/api/v1/workouts", json={
+            "type": "Strength", "duration": 30,
+            "exercises": [{"exercise_id": e.id, "sets": 1, "reps": 5, "weight": 50} for e in exercises],
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+
+        assert _reload(db, workout_quest).is_completed is True
+        assert _reload(db, streak_quest).is_completed is True
+        assert _reload(db, variety_quest).current_progress == 2
+        assert _reload(db, variety_quest).is_completed is False
+        ledger = PointTransaction.query.filter_by(reason="daily_quest_completed").all()
+        assert sorted(t.points for t in ledger) == [50, 100]
+
+    def test_habit_quest_progresses_towards_target(self, client, db, auth_headers):
+        from models import Habit
+        uid = auth_headers["_user_id"]
+        habit = Habit(user_id=uid, name="Read", frequency="daily")
+        db.session.add(habit)
+        db.session.commit()
+        quest = _assign(db, uid, "habit_count", target=3)
+
+        client.post(f"/api/v1/habits/{habit.id}/log", json={}, headers=_auth(auth_headers))
+
+        assert _reload(db, quest).current_progress == 1
+        assert _reload(db, quest).is_completed is False
+
+    def test_only_todays_open_quests_move(self, app, db, auth_headers):
+        from utils.quest_engine import evaluate_quest_event
+        uid = auth_headers["_user_id"]
+        yesterday = _assign(db, uid, "log_weight", day=TODAY - datetime.timedelta(days=1))
+        today = _assign(db, uid, "log_weight")
+
+        assert evaluate_quest_event(uid, "weight_logged") == [today]
+        assert evaluate_quest_event(uid, "weight_logged") == []
+        db.session.commit()
+        assert _reload(db, yesterday).current_progress == 0
+
+    def test_quests_use_the_users_local_day(self, app, db, auth_headers):
+        from models import UserProfile
+        from utils.local_time import local_today
+        from utils.quest_engine import evaluate_quest_event
+        uid = auth_headers["_user_id"]
+        db.session.add(UserProfile(user_id=uid, timezone="Pacific/Kiritimati"))
+        db.session.commit()
+        quest = _assign(db, uid, "log_weight", day=local_today(uid))
+
+        assert evaluate_quest_event(uid, "weight_logged") == [quest]
+
+    def test_backdated_workout_does_not_count_for_today(self, app, db, auth_headers):
+        from utils.quest_engine import evaluate_quest_event
+        uid = auth_headers["_user_id"]
+        quests = [_assign(db, uid, t) for t in ("workout_count", "log_workout", "workout_streak")]
+        backdated = type("W", (), {"type": "Run", "date": TODAY - datetime.timedelta(days=3)})()
+        workout = type("W", (), {"type": "Run", "date": TODAY})()
+
+        assert evaluate_quest_event(uid, "workout_logged", workout=backdated) == []
+        assert evaluate_quest_event(uid, "workout_logged", workout=workout) == quests
+
+    def test_goal_quest_needs_a_linked_goal(self, app, db, auth_headers):
+        from models import Goal, GoalLink
+        from utils.quest_engine import evaluate_quest_event
+        uid = auth_headers["_user_id"]
+        quest = _assign(db, uid, "goal_progress")
+        workout = type("W", (), {"type": "Run", "date": TODAY})()
+
+        assert evaluate_quest_event(uid, "workout_logged", workout=workout) == []
+
+        goal = Goal(user_id=uid, name="Run more", type="count", target=10, auto_sync=True)
+        db.session.add(goal)
+        db.session.flush()
+        db.session.add(GoalLink(goal_id=goal.id, entity_type="workout", linked_workout_type="Run"))
+        db.session.commit()
+
+        assert evaluate_quest_event(uid, "workout_logged", workout=workout) == [quest]
+
+    def test_evaluated_quests_cannot_be_completed_by_client(self, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        evaluated = _assign(db, uid, "workout_count")
+        manual = _assign(db, uid, "drink_water")
+
+        resp = client.post(f"/api/v1/daily-quests/{evaluated.id}/complete", headers=_auth(auth_headers))
+        assert resp.status_code == 400
+        resp = client.post(f"/api/v1/daily-quests/{manual.id}/complete", headers=_auth(auth_headers))
+        assert resp.status_code == 200
+
+
+class TestQuestAssignment:
+
+    def test_batch_assigns_three_distinct_quests_per_user(self, app, db, auth_headers, make_user):
+        from models.daily_quest import UserDailyQuest
+        from utils.quest_assignment import assign_quests_for_users
+        _catalog_quests(db, 8)
+        users = [auth_headers["_user_id"]] + [make_user().id for _ in range(5)]
+        tomorrow = TODAY + datetime.timedelta(days=1)
+
+        assert assign_quests_for_users(users, day=tomorrow) == 18
+        # Re-running leaves existing assignments alone
+        assert assign_quests_for_users(users, day=tomorrow) == 0
+        db.session.commit()
+
+        picks = {}
+        for row in UserDailyQuest.query.filter_by(date_assigned=tomorrow):
+            picks.setdefault(row.user_id, set()).add(row.quest_id)
+        assert all(len(p) == 3 for p in picks.values())
+        # Seeded per user, so not everyone gets the same three
+        assert len({frozenset(p) for p in picks.values()}) > 1
+
+    def test_picks_are_stable_for_a_user_and_day(self, app, db, auth_headers):
+        from models.daily_quest import UserDailyQuest
+        from utils.quest_assignment import assign_quests_for_users
+        uid = auth_headers["_user_id"]
+        _catalog_quests(db, 10)
+
+        assign_quests_for_users([uid], day=TODAY)
+        first = {r.quest_id for r in UserDailyQuest.query.filter_by(user_id=uid)}
+        UserDailyQuest.query.delete()
+        assign_quests_for_users([uid], day=TODAY)
+        assert {r.quest_id for r in UserDailyQuest.query.filter_by(user_id=uid)} == first
+
+    def test_get_reads_preassigned_quests(self, client, db, auth_headers):
+        from utils.quest_assignment import assign_quests_for_users
+        uid = auth_headers["_user_id"]
+        _catalog_quests(db, 4)
+        assign_quests_for_users([uid], day=TODAY)
+        db.session.commit()
+
+        first = client.get("/api/v1/daily-quests", headers=_auth(auth_headers)).get_json()
+        second = client.get("/api/v1/daily-quests", headers=_auth(auth_headers)).get_json()
+        assert len(first["quests"]) == 3
+        assert first["quests"] == second["quests"]
+        assert all(q["quest"]["title"].startswith("Quest") for q in first["quests"])
+
+    def test_get_assigns_on_demand_and_persists(self, client, db, auth_headers):
+        from models.daily_quest import UserDailyQuest
+        resp = client.get("/api/v1/daily-quests", headers=_auth(auth_headers))
+        assert len(resp.get_json()["quests"]) == 3
+        assert UserDailyQuest.query.filter_by(user_id=auth_headers["_user_id"]).count() == 3
+
+    def test_catalog_reloads_after_invalidation(self, app, db):
+        from utils.quest_assignment import get_quest_catalog, invalidate_quest_catalog
+        _catalog_quests(db, 2)
+        assert len(get_quest_catalog()) == 2
+
+        _catalog_quests(db, 1)
+        assert len(get_quest_catalog()) == 2
+        invalidate_quest_catalog()
+        assert len(get_quest_catalog()) == 3
@@ -0,0 +1,114 @@
+"""
+test_exercise_search.py - Tests for backend/utils/exercise_search.py and the
+                          catalog search endpoints
+
+Endpoints covered:
+  GET /api/v1/exercise-library/search   (fuzzy match, facet counts)
+  GET /api/v1/exercise-bank             (in-memory index, facet filters)
+
+Pure logic functions tested in isolation:
+  SearchIndex.search
+"""
+
+import pytest
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_bank(app):
+    from database import cache
+    import utils.exercise_search as exercise_search
+    exercise_search._bank.update(version=None, checked_at=0.0, index=None)
+    cache.delete(exercise_search._BANK_VERSION_KEY)
+    yield
+
+
+def _index():
+    from utils.exercise_search import SearchIndex
+    docs = [
+        ("Bench Press", ["Chest", "Triceps"], "Barbell", "intermediate"),
+        ("Incline Bench Press", ["Chest"], "Barbell", "intermediate"),
+        ("Dumbbell Bench Press", ["Chest"], "Dumbbells", "beginner"),
+        ("Barbell Squat", ["Quads", "Glutes"], "Barbell", "intermediate"),
+        ("Romanian Deadlift", ["Hamstrings"], "Barbell", "advanced"),
+    ]
+    return SearchIndex(
+        {"name": name, "muscle_group": muscles, "equipment": equipment,
+         "category": "Strength", "difficulty": difficulty, "item": name}
+        for name, muscles, equipment, difficulty in docs
+    )
+
+
+class TestSearchIndex:
+
+    def test_prefix_matches_as_you_type(self):
+        results, total, _ = _index().search("ben")
+        assert results == ["Bench Press", "Dumbbell Bench Press", "Incline Bench Press"]
+        assert total == 3
+
+    def test_typos_are_tolerated_and_ranked_below_exact(self):
+        results, _, _ = _index().search("benhc pres")
+        assert results[0] == "Bench Press"
+        assert "Barbell Squat" not in results
+
+        results, _, _ = _index().search("squatt")
+        assert results == ["Barbell Squat"]
+
+    def test_every_term_must_match(self):
+        results, _, _ = _index().search("romanian bench")
+        assert results == []
+
+    def test_facet_filters_and_disjunctive_counts(self):
+        results, _, facets = _index().search("bench", {"equipment": "barbell"})
+        assert results == ["Bench Press", "Incline Bench Press"]
+        # Equipment counts ignore the equipment filter itself
+        equipment = {c["value"]: c["count"] for c in facets["equipment"]}
+        assert equipment == {"Barbell": 2, "Dumbbells": 1}
+        difficulty = {c["value"]: c["count"] for c in facets["difficulty"]}
+        assert difficulty == {"intermediate": 2}
+
+    def test_empty_query_lists_filtered_catalog_by_name(self):
+        results, total, _ = _index().search("", {"muscle_group": "CHEST"})
+        assert results == ["Bench Press", "Dumbbell Bench Press", "Incline Bench Press"]
+        assert total == 3
+
+
+class TestCatalogEndpoints:
+
+    def _global_exercise(self, db, user_id, name, muscle, equipment):
+        from models import Exercise
+        ex = Exercise(user_id=user_id, name=name, category="Strength",
+                      muscle_group=muscle, equipment=equipment, is_global=True)
+        db.session.add(ex)
+        db.session.commit()
+        return ex
+
+    def test_library_search_with_typo(self, client, auth_headers):
+        resp = client.get("/api/v1/exercise-library/search?q=deadlfit", headers=_auth(auth_headers))
+        data = resp.get_json()
+        assert resp.status_code == 200
+        assert any(r["name"] == "Deadlift" for r in data["results"])
+        assert "muscle_group" in data["facets"]
+
+    def test_bank_filters_and_invalidation(self, client, db, auth_headers):
+        from utils.exercise_search import invalidate_exercise_bank
+        uid = auth_headers["_user_id"]
+        self._global_exercise(db, uid, "Bench Press", "Chest, Triceps", "Barbell")
+        self._global_exercise(db, uid, "Push-ups", "Chest", "Bodyweight")
+
+        resp = client.get("/api/v1/exercise-bank?muscle=triceps", headers=_auth(auth_headers))
+        data = resp.get_json()
+        assert [e["name"] for e in data["exercises"]] == ["Bench Press"]
+        assert data["exercises"][0]["difficulty"] == "intermediate"
+
+        # Partial values match, as they did before the index
+        resp = client.get("/api/v1/exercise-bank?equipment=bar&muscle=tri", headers=_auth(auth_headers))
+        assert [e["name"] for e in resp.get_json()["exercises"]] == ["Bench Press"]
+
+        self._global_exercise(db, uid, "Pull-ups", "Lats", "Bodyweight")
+        invalidate_exercise_bank()
+        resp = client.get("/api/v1/exercise-bank?search=pul", headers=_auth(auth_headers))
+        assert [e["name"] for e in resp.get_json()["exercises"]] == ["Pull-ups"]
@@ -0,0 +1,165 @@
+"""
+test_exercises.py - Tests for backend/api/exercises.py and the picker's
+                    last-performance map in backend/utils/last_performance.py
+
+Endpoints covered:
+  GET  /api/v1/exercises          (cached catalog + per-user last performance)
+  POST /api/v1/exercises/create   (invalidates the catalog)
+  DELETE /api/v1/exercises/<exercise_id>  (workout counters refreshed)
+  GET  /api/v1/exercises/<exercise_id>/substitutes
+
+Pure logic functions tested in isolation:
+  exercise_features, feature_matrix, top_k_neighbors
+"""
+
+import datetime
+
+
+TODAY = datetime.date.today()
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _log(db, user_id, exercise, date, *sets):
+    from models import Workout, WorkoutExercise
+    w = Workout(user_id=user_id, type="Strength", duration=45, date=date)
+    db.session.add(w)
+    db.session.flush()
+    for s, reps, weight in sets:
+        db.session.add(WorkoutExercise(workout_id=w.id, exercise_id=exercise.id,
+                                       sets=s, reps=reps, weight=weight))
+    db.session.commit()
+    return w
+
+
+class TestExercisePicker:
+
+    def test_last_performance_per_exercise(self, client, db, auth_headers, make_user):
+        from models import Exercise
+        uid = auth_headers["_user_id"]
+        bench = Exercise(user_id=uid, name="Bench Press", category="Strength")
+        squat = Exercise(user_id=uid, name="Squat", category="Strength")
+        db.session.add_all([bench, squat])
+        db.session.commit()
+
+        _log(db, uid, bench, TODAY - datetime.timedelta(days=7), (3, 5, 100))
+        _log(db, uid, bench, TODAY, (3, 8, 90), (1, 3, 110))
+        # Someone else's newer set must not leak in
+        _log(db, make_user().id, bench, TODAY + datetime.timedelta(days=1), (5, 5, 200))
+
+        resp = client.get("/api/v1/exercises", headers=_auth(auth_headers))
+        assert resp.status_code == 200
+        by_name = {e["name"]: e["last_performance"] for e in resp.get_json()["exercises"]}
+        assert by_name["Bench Press"] == {
+            "weight": 110.0, "reps": 3, "sets": 1,
+            "date": TODAY.isoformat(), "workout_count": 2,
+        }
+        assert by_name["Squat"] is None
+
+    def test_filters_and_catalog_invalidation(self, client, auth_headers):
+        headers = _auth(auth_headers)
+        client.post("/api/v1/exercises/create", json={"name": "Deadlift", "category": "Strength"}, headers=headers)
+        resp = client.get("/api/v1/exercises?search=dead", headers=headers)
+        assert [e["name"] for e in resp.get_json()["exercises"]] == ["Deadlift"]
+
+        client.post("/api/v1/exercises/create", json={"name": "Plank", "category": "Core"}, headers=headers)
+        resp = client.get("/api/v1/exercises?category=Core", headers=headers)
+        assert [e["name"] for e in resp.get_json()["exercises"]] == ["Plank"]
+
+    def test_user_exercises_bypass_the_worker_cache(self, client, db, auth_headers, make_user):
+        from models import Exercise
+        headers = _auth(auth_headers)
+        db.session.add(Exercise(user_id=auth_headers["_user_id"], name="Squat", is_global=True))
+        db.session.commit()
+        assert [e["name"] for e in client.get("/api/v1/exercises", headers=headers).get_json()["exercises"]] == ["Squat"]
+
+        # Created by another worker: this worker's catalog version is not re-checked
+        db.session.add(Exercise(user_id=make_user().id, name="Arnold Press"))
+        db.session.commit()
+        resp = client.get("/api/v1/exercises", headers=headers)
+        assert [e["name"] for e in resp.get_json()["exercises"]] == ["Arnold Press", "Squat"]
+
+    def test_delete_refreshes_workout_totals(self, client, db, auth_headers):
+        from models import Exercise, Workout, WorkoutExercise
+        from models.training_session import TrainingSession
+        uid = auth_headers["_user_id"]
+        bench = Exercise(user_id=uid, name="Bench Press", category="Strength")
+        squat = Exercise(user_id=uid, name="Squat", category="Strength")
+        db.session.add_all([bench, squat])
+        db.session.commit()
+        workout = _log(db, uid, bench, TODAY, (3, 5, 100))
+        db.session.add(WorkoutExercise(workout_id=workout.id, exercise_id=squat.id, sets=2, reps=5, weight=120))
+        db.session.commit()
+
+        resp = client.delete(f"/api/v1/exercises/{bench.id}", headers=_auth(auth_headers))
+        assert resp.status_code == 200
+
+        workout = db.session.get(Workout, workout.id)
+        db.session.refresh(workout)
+        assert (workout.exercise_count, workout.total_sets, workout.total_volume) == (1, 2, 1200)
+        session = TrainingSession.query.filter_by(kind="strength", source_id=workout.id).one()
+        assert session.volume == 1200
+        assert WorkoutExercise.query.filter_by(exercise_id=bench.id).count() == 0
+
+
+class TestSubstitutes:
+
+    def _exercises(self, db, user_id):
+        from models import Exercise
+        # Names outside the library, so only these columns are features
+        rows = [
+            ("Barbell Bench Press", "Chest, Triceps", "Barbell"),
+            ("Dumbbell Floor Press", "Chest, Triceps", "Dumbbell"),
+            ("Machine Floor Press", "Chest, Triceps", "Machine"),
+            ("Barbell Squat", "Quads, Glutes", "Barbell"),
+        ]
+        exercises = [Exercise(user_id=user_id, name=name, category="Strength",
+                              muscle_group=muscles, equipment=equipment)
+                     for name, muscles, equipment in rows]
+        db.session.add_all(exercises)
+        db.session.commit()
+        return exercises
+
+    def test_neighbors_by_cosine_similarity(self):
+        from types import SimpleNamespace
+        from utils.exercise_similarity import exercise_features, feature_matrix, top_k_neighbors
+
+        def ex(muscles, equipment, category="Strength"):
+            return SimpleNamespace(muscle_group=muscles, equipment=equipment, category=category)
+
+        matrix = feature_matrix([
+            exercise_features(ex("Chest, Triceps", "Barbell")),
+            exercise_features(ex("Chest, Triceps", "Dumbbell")),
+            exercise_features(ex("Upper Chest", "Barbell")),
+            exercise_features(ex("", "", "")),
+        ])
+        indices, scores = top_k_neighbors(matrix, k=2)
+        assert list(indices[0]) == [1, 2]
+        assert 0 < scores[0, 1] < scores[0, 0] < 1
+        # No features, no neighbours
+        assert list(indices[3]) == [-1, -1]
+
+    def test_endpoint_and_personalized_reranking(self, client, db, auth_headers):
+        from utils.exercise_similarity import rebuild_similarities
+        uid = auth_headers["_user_id"]
+        bench, dumbbell, machine, squat = self._exercises(db, uid)
+        assert rebuild_similarities(k=3) == 12
+        db.session.commit()
+
+        url = f"/api/v1/exercises/{bench.id}/substitutes"
+        resp = client.get(url, headers=_auth(auth_headers))
+        names = [e["name"] for e in resp.get_json()["substitutes"]]
+        # Equally similar; ties keep exercise order
+        assert names[:2] == ["Dumbbell Floor Press", "Machine Floor Press"]
+
+        for n in range(5):
+            _log(db, uid, machine, TODAY - datetime.timedelta(days=n), (3, 8, 60))
+        resp = client.get(url + "?personalize=true", headers=_auth(auth_headers))
+        top = resp.get_json()["substitutes"][0]
+        assert top["name"] == "Machine Floor Press"
+        assert top["last_performance"]["workout_count"] == 5
+
+        resp = client.get("/api/v1/exercises/999999/substitutes", headers=_auth(auth_headers))
+        assert resp.status_code == 404
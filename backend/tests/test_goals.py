@@ -0,0 +1,329 @@
+"""
+test_goals.py - Tests for backend/api/goals.py, batch recalculation in
+                backend/utils/goal_sync.py and backend/utils/goal_pace.py
+
+Endpoints covered:
+  GET  /api/v1/goals
+  POST /api/v1/goals/<goal_id>/links
+  DELETE /api/v1/goals/<goal_id>/links/<link_id>
+  POST /api/v1/goals/<goal_id>/recalculate
+  POST /api/v1/goals/recalculate
+  GET  /api/v1/goals/<goal_id>/progress-history
+
+Pure logic functions tested in isolation:
+  recalculate_goals
+  compute_pace_info
+  record_goal_snapshots
+  build_burnup, forecast_completion, forecast_goals_for_users
+"""
+
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+
+TODAY = datetime.date.today()
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _goal(db, user_id, target=10, progress=0, **kwargs):
+    from models import Goal
+    goal = Goal(user_id=user_id, name="Goal", type="count", target=target, progress=progress, **kwargs)
+    db.session.add(goal)
+    db.session.commit()
+    return goal
+
+
+def _link(db, goal, entity_type, entity_id=None, workout_type=None, value=1):
+    from models import GoalLink
+    link = GoalLink(
+        goal_id=goal.id, entity_type=entity_type, entity_id=entity_id,
+        linked_workout_type=workout_type, contribution_value=value,
+    )
+    goal.links_count = (goal.links_count or 0) + 1
+    db.session.add(link)
+    db.session.commit()
+    return link
+
+
+def _workout(db, user_id, workout_type="Strength"):
+    from models import Workout
+    w = Workout(user_id=user_id, type=workout_type, duration=30, date=TODAY)
+    db.session.add(w)
+    db.session.commit()
+    return w
+
+
+def _habit_logs(db, user_id, count, completed=True):
+    from models import Habit, HabitLog
+    habit = Habit(user_id=user_id, name="Read", frequency="daily")
+    db.session.add(habit)
+    db.session.flush()
+    # One log per day; a habit can't be logged twice on the same local day
+    for i in range(count):
+        db.session.add(HabitLog(
+            habit_id=habit.id, completed=completed,
+            local_date=TODAY - datetime.timedelta(days=i),
+        ))
+    db.session.commit()
+    return habit
+
+
+class TestRecalculateGoals:
+
+    def test_workout_and_habit_links_summed_in_one_pass(self, app, db, auth_headers):
+        from utils.goal_sync import recalculate_goals
+        uid = auth_headers["_user_id"]
+        for t in ["Strength", "Strength", "Cardio"]:
+            _workout(db, uid, t)
+        habit = _habit_logs(db, uid, 4)
+        _habit_logs(db, uid, 2, completed=False)
+
+        strength = _goal(db, uid, target=5)
+        _link(db, strength, "workout", workout_type="Strength", value=2)
+        mixed = _goal(db, uid, target=100)
+        _link(db, mixed, "workout")
+        _link(db, mixed, "habit", entity_id=habit.id, value=3)
+
+        results = recalculate_goals(user_ids=[uid])
+        db.session.commit()
+
+        assert results[strength.id]["progress"] == 4
+        assert results[mixed.id]["progress"] == 3 + 12
+        assert results[mixed.id]["links_count"] == 2
+
+    def test_goal_without_links_keeps_manual_progress(self, app, db, auth_headers):
+        from models import Goal
+        from utils.goal_sync import recalculate_goals
+        uid = auth_headers["_user_id"]
+        manual = _goal(db, uid, progress=7)
+
+        recalculate_goals(user_ids=[uid])
+        db.session.commit()
+
+        assert db.session.get(Goal, manual.id).progress == 7
+
+    def test_completed_flag_and_user_isolation(self, app, db, auth_headers, make_user):
+        from utils.goal_sync import recalculate_goals
+        uid = auth_headers["_user_id"]
+        other = make_user()
+        _workout(db, uid)
+        _workout(db, other.id)
+        goal = _goal(db, uid, target=1)
+        _link(db, goal, "workout")
+        other_goal = _goal(db, other.id, target=1)
+        _link(db, other_goal, "workout")
+
+        results = recalculate_goals(user_ids=[uid])
+
+        assert results[goal.id]["completed"] is True
+        assert other_goal.id not in results
+
+    def test_single_goal_endpoint_and_batch_endpoint(self, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        _workout(db, uid)
+        _workout(db, uid)
+        goal = _goal(db, uid)
+        _link(db, goal, "workout")
+
+        resp = client.post(f"/api/v1/goals/{goal.id}/recalculate", headers=_auth(auth_headers))
+        assert resp.get_json()["progress"] == 2
+
+        resp = client.post("/api/v1/goals/recalculate", headers=_auth(auth_headers))
+        assert resp.status_code == 200
+        assert resp.get_json()["goals"] == [{"id": goal.id, "progress": 2, "links_count": 1}]
+
+    def test_planned_workouts_do_not_count(self, app, db, auth_headers):
+        from sqlalchemy import null
+        from utils.goal_sync import recalculate_goals
+        uid = auth_headers["_user_id"]
+        _workout(db, uid)
+        planned = _workout(db, uid)
+        planned.completed_at = null()
+        db.session.commit()
+        goal = _goal(db, uid)
+        _link(db, goal, "workout")
+
+        assert recalculate_goals(user_ids=[uid])[goal.id]["progress"] == 1
+
+
+class TestLinksCount:
+
+    def test_links_count_maintained_on_add_and_delete(self, client, db, auth_headers):
+        from models import Goal
+        goal = _goal(db, auth_headers["_user_id"])
+
+        resp = client.post(
+            f"/api/v1/goals/{goal.id}/links",
+            json={"entity_type": "workout"},
+            headers=_auth(auth_headers),
+        )
+        link_id = resp.get_json()["link_id"]
+        goals = client.get("/api/v1/goals", headers=_auth(auth_headers)).get_json()["goals"]
+        assert goals[0]["links_count"] == 1
+
+        client.delete(f"/api/v1/goals/{goal.id}/links/{link_id}", headers=_auth(auth_headers))
+        refreshed = db.session.get(Goal, goal.id)
+        assert refreshed.links_count == 0
+        assert refreshed.auto_sync is False
+
+
+class TestComputePaceInfo:
+
+    def _goal(self, target, progress, deadline_days=None, age_days=0):
+        return SimpleNamespace(
+            target=target,
+            progress=progress,
+            deadline=TODAY + datetime.timedelta(days=deadline_days) if deadline_days is not None else None,
+            created_at=datetime.datetime.combine(TODAY - datetime.timedelta(days=age_days), datetime.time()),
+        )
+
+    def test_statuses(self):
+        from utils.goal_pace import compute_pace_info
+        result = compute_pace_info([
+            self._goal(10, 2),                                    # no deadline
+            self._goal(10, 10, deadline_days=5),                  # already complete
+            self._goal(10, 2, deadline_days=-1, age_days=10),     # overdue
+            self._goal(10, 0, deadline_days=10),                  # created today
+            self._goal(10, 5, deadline_days=10, age_days=5),      # 1/day, needs 0.5/day
+            self._goal(10, 1, deadline_days=2, age_days=10),      # 0.1/day, needs 4.5/day
+        ], today=TODAY)
+
+        assert result[0] is None and result[1] is None
+        assert result[2]["status"] == "overdue"
+        assert result[3]["status"] == "just_started"
+        assert result[4] == {
+            "days_remaining": 10, "remaining_progress": 5, "current_rate": 1.0,
+            "required_rate": 0.5, "on_track": True, "status": "on_track",
+        }
+        assert result[5]["status"] == "behind"
+
+    def test_empty_list(self):
+        from utils.goal_pace import compute_pace_info
+        assert compute_pace_info([]) == []
+
+
+class TestGoalSnapshots:
+
+    def test_recalculation_snapshots_on_each_owners_local_day(self, app, db, auth_headers, make_user):
+        from models import UserProfile
+        from models.goal_progress_snapshot import GoalProgressSnapshot
+        from utils.goal_sync import recalculate_goals
+        from utils.local_time import local_today
+        uid = auth_headers["_user_id"]
+        other = make_user()
+        db.session.add(UserProfile(user_id=uid, timezone="Pacific/Kiritimati"))
+        db.session.add(UserProfile(user_id=other.id, timezone="Pacific/Pago_Pago"))
+        goals = {}
+        for user_id in (uid, other.id):
+            _workout(db, user_id)
+            goals[user_id] = _goal(db, user_id)
+            _link(db, goals[user_id], "workout")
+
+        recalculate_goals()
+        db.session.commit()
+
+        for user_id, goal in goals.items():
+            snapshot = GoalProgressSnapshot.query.filter_by(goal_id=goal.id).one()
+            assert (snapshot.snapshot_date, snapshot.progress) == (local_today(user_id), 1)
+
+    def test_one_row_per_goal_per_day(self, app, db, auth_headers):
+        from models.goal_progress_snapshot import GoalProgressSnapshot
+        from utils.goal_sync import record_goal_snapshots
+        goal = _goal(db, auth_headers["_user_id"])
+
+        record_goal_snapshots({goal.id: 1}, TODAY)
+        record_goal_snapshots({goal.id: 3}, TODAY)
+        record_goal_snapshots({goal.id: 4}, day=TODAY + datetime.timedelta(days=1))
+        db.session.commit()
+
+        rows = GoalProgressSnapshot.query.order_by(GoalProgressSnapshot.snapshot_date).all()
+        assert [(r.snapshot_date, r.progress) for r in rows] == [
+            (TODAY, 3), (TODAY + datetime.timedelta(days=1), 4),
+        ]
+
+    def test_create_and_manual_update_record_snapshots(self, client, db, auth_headers):
+        from models.goal_progress_snapshot import GoalProgressSnapshot
+        resp = client.post(
+            "/api/v1/goals",
+            json={"name": "Run", "goal_type": "count", "target": 10, "progress": 2},
+            headers=_auth(auth_headers),
+        )
+        goal_id = resp.get_json()["goal_id"]
+        client.put(f"/api/v1/goals/{goal_id}", json={"progress": 5}, headers=_auth(auth_headers))
+
+        snapshots = GoalProgressSnapshot.query.filter_by(goal_id=goal_id).all()
+        assert [s.progress for s in snapshots] == [5]
+
+
+class TestGoalForecast:
+
+    def _series(self, points):
+        from utils.goal_forecast import build_burnup
+        start = TODAY - datetime.timedelta(days=9)
+        snapshots = [(start + datetime.timedelta(days=d), p) for d, p in points]
+        return build_burnup(snapshots, today=TODAY)
+
+    def test_burnup_forward_fills_to_today(self):
+        days, values = self._series([(0, 1), (3, 4)])
+        assert days.size == 10
+        assert values.tolist() == [1, 1, 1, 4, 4, 4, 4, 4, 4, 4]
+
+    def test_linear_forecast_on_steady_progress(self):
+        from utils.goal_forecast import forecast_completion
+        days, values = self._series([(d, d) for d in range(10)])
+        deadline = TODAY + datetime.timedelta(days=20)
+
+        forecast = forecast_completion(days, values, target=19, deadline=deadline, method="linear")
+
+        assert forecast["rate_per_day"] == pytest.approx(1.0)
+        assert forecast["completion_date"] == (TODAY + datetime.timedelta(days=10)).isoformat()
+        assert forecast["on_track"] is True
+
+    def test_ewma_weights_recent_gains(self):
+        from utils.goal_forecast import forecast_completion
+        # Fast start, stalled recently
+        days, values = self._series([(0, 0), (1, 5), (2, 8), (3, 9)])
+        forecast = forecast_completion(days, values, target=20, method="ewma")
+        linear = forecast_completion(days, values, target=20, method="linear")
+        assert 0 < forecast["rate_per_day"] < linear["rate_per_day"]
+
+    def test_stalled_goal_has_no_completion_date(self):
+        from utils.goal_forecast import forecast_completion
+        days, values = self._series([(0, 3)])
+        forecast = forecast_completion(days, values, target=10, deadline=TODAY)
+        assert forecast["completion_date"] is None
+        assert forecast["on_track"] is False
+
+    def test_nightly_batch_stores_forecast_read_by_goals_page(self, client, db, auth_headers):
+        from utils.goal_sync import record_goal_snapshots
+        from utils.goal_forecast import forecast_goals_for_users
+        uid = auth_headers["_user_id"]
+        goal = _goal(db, uid, target=20, progress=10)
+        for d in range(10):
+            record_goal_snapshots({goal.id: d + 1}, day=TODAY - datetime.timedelta(days=9 - d))
+        db.session.commit()
+
+        assert forecast_goals_for_users([uid], method="linear") == 1
+        db.session.commit()
+
+        goals = client.get("/api/v1/goals", headers=_auth(auth_headers)).get_json()["goals"]
+        assert goals[0]["forecast"]["rate_per_day"] == pytest.approx(1.0)
+        assert goals[0]["forecast"]["completion_date"] == (TODAY + datetime.timedelta(days=10)).isoformat()
+
+    def test_progress_history_endpoint(self, client, db, auth_headers):
+        goal = _goal(db, auth_headers["_user_id"], target=5, progress=1)
+        resp = client.get(f"/api/v1/goals/{goal.id}/progress-history", headers=_auth(auth_headers))
+        data = resp.get_json()
+        assert resp.status_code == 200
+        assert data["series"][-1]["date"] == TODAY.isoformat()
+        assert data["forecast"]["method"] == "ewma"
+
+        resp = client.get(
+            f"/api/v1/goals/{goal.id}/progress-history?method=magic", headers=_auth(auth_headers)
+        )
+        assert resp.status_code == 400
@@ -0,0 +1,322 @@
+"""
+test_habits.py - Tests for backend/api/habits.py and backend/utils/habit_calendar.py
+
+Endpoints covered:
+  POST /api/v1/habits/<habit_id>/log      (calendar bit and streak updated,
+                                          local_date in the user's timezone)
+  POST /api/v1/habits/check-in            (batch log, one reward pass)
+  GET  /api/v1/habits/heatmap             (base64 bitset per habit)
+  GET  /api/v1/habits/<habit_id>/heatmap
+  POST /api/v1/habits                     (next_reminder_at scheduled)
+  PUT  /api/v1/profile                    (reminders rescheduled on timezone change)
+
+Pure logic functions tested in isolation:
+  record_completion, current_streak, consistency_rate
+  to_local_date
+  next_occurrence_after, ReminderWheel, dispatch_reminders
+"""
+
+import base64
+import datetime
+
+
+TODAY = datetime.date.today()
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _days_ago(n):
+    return TODAY - datetime.timedelta(days=n)
+
+
+def _habit(db, user_id, name="Read", created_days_ago=0):
+    from models import Habit
+    habit = Habit(
+        user_id=user_id, name=name, frequency="daily",
+        created_at=datetime.datetime.combine(_days_ago(created_days_ago), datetime.time()),
+    )
+    db.session.add(habit)
+    db.session.commit()
+    return habit
+
+
+def _bit(encoded, day):
+    bits = base64.b64decode(encoded)
+    i = day.timetuple().tm_yday - 1
+    return bool(bits[i >> 3] & (1 << (i & 7)))
+
+
+class TestHabitCalendar:
+
+    def test_log_sets_bit_and_streak(self, client, db, auth_headers):
+        habit = _habit(db, auth_headers["_user_id"])
+
+        resp = client.post(f"/api/v1/habits/{habit.id}/log", json={}, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+
+        resp = client.get(f"/api/v1/habits/{habit.id}/heatmap", headers=_auth(auth_headers))
+        entry = resp.get_json()["habit"]
+        assert entry["current_streak"] == 1
+        assert entry["longest_streak"] == 1
+        assert _bit(entry["bits"], datetime.datetime.utcnow().date())
+
+    def test_back_dated_day_joins_streaks(self, app, db, auth_headers):
+        from utils.habit_calendar import record_completion, current_streak
+        habit = _habit(db, auth_headers["_user_id"])
+
+        for day in (_days_ago(4), _days_ago(3), _days_ago(1), TODAY):
+            record_completion(habit, day)
+        assert (habit.current_streak, habit.longest_streak) == (2, 2)
+
+        record_completion(habit, _days_ago(2))
+        assert (habit.current_streak, habit.longest_streak) == (5, 5)
+        assert current_streak(habit) == 5
+        # Recording a day twice changes nothing
+        record_completion(habit, _days_ago(2))
+        assert habit.current_streak == 5
+
+    def test_streak_across_new_year(self, app, db, auth_headers):
+        from utils.habit_calendar import record_completion
+        habit = _habit(db, auth_headers["_user_id"])
+
+        record_completion(habit, datetime.date(2025, 12, 30))
+        record_completion(habit, datetime.date(2025, 12, 31))
+        record_completion(habit, datetime.date(2026, 1, 1))
+        assert habit.longest_streak == 3
+
+    def test_completion_committed_by_another_request_is_kept(self, app, db, auth_headers):
+        from models.habit import Habit
+        from models.habit_calendar import HabitCalendar
+        from utils.habit_calendar import record_completion, set_day
+        habit = _habit(db, auth_headers["_user_id"])
+        record_completion(habit, datetime.date(2026, 3, 10))
+        db.session.commit()
+        row = db.session.get(HabitCalendar, (habit.id, 2026))
+
+        # Another worker logs the 11th behind this session's loaded objects
+        db.session.execute(HabitCalendar.__table__.update().where(
+            HabitCalendar.habit_id == habit.id
+        ).values(bits=set_day(row.bits, datetime.date(2026, 3, 11))))
+        db.session.execute(Habit.__table__.update().where(Habit.id == habit.id).values(
+            current_streak=2, longest_streak=2, last_completed_on=datetime.date(2026, 3, 11),
+        ))
+
+        record_completion(habit, datetime.date(2026, 3, 12))
+        assert (habit.current_streak, habit.longest_streak) == (3, 3)
+
+    def test_broken_streak_reads_as_zero(self, app, db, auth_headers):
+        from utils.habit_calendar import record_completion, current_streak
+        habit = _habit(db, auth_headers["_user_id"])
+        record_completion(habit, _days_ago(3))
+
+        assert habit.current_streak == 1
+        assert current_streak(habit) == 0
+
+    def test_heatmap_lists_every_habit(self, client, db, auth_headers):
+        from utils.habit_calendar import record_completion
+        uid = auth_headers["_user_id"]
+        logged = _habit(db, uid, "Stretch")
+        _habit(db, uid, "Journal")
+        record_completion(logged, datetime.date(TODAY.year, 1, 9))
+        db.session.commit()
+
+        resp = client.get(f"/api/v1/habits/heatmap?year={TODAY.year}", headers=_auth(auth_headers))
+        habits = {h["name"]: h for h in resp.get_json()["habits"]}
+        assert _bit(habits["Stretch"]["bits"], datetime.date(TODAY.year, 1, 9))
+        assert not _bit(habits["Stretch"]["bits"], datetime.date(TODAY.year, 1, 10))
+        assert base64.b64decode(habits["Journal"]["bits"]) == bytes(46)
+
+    def test_consistency_rate_over_window(self, app, db, auth_headers):
+        from utils.habit_calendar import record_completion, consistency_rate
+        uid = auth_headers["_user_id"]
+        habit = _habit(db, uid, created_days_ago=60)
+        for n in range(27):
+            record_completion(habit, _days_ago(n))
+        db.session.commit()
+
+        assert consistency_rate(uid) == 27 / 30
+        # Not enough history yet for a fair rate
+        assert consistency_rate(uid, days=90) == 0.0
+        young = _habit(db, uid, "New", created_days_ago=0)
+        record_completion(young, TODAY)
+        db.session.commit()
+        assert consistency_rate(uid) == 28 / 31
+
+
+class TestLocalDate:
+
+    def test_log_uses_profile_timezone(self, client, db, auth_headers):
+        from models import HabitLog, UserProfile
+        uid = auth_headers["_user_id"]
+        db.session.add(UserProfile(user_id=uid, timezone="Pacific/Auckland"))
+        habit = _habit(db, uid)
+
+        resp = client.post(f"/api/v1/habits/{habit.id}/log", json={
+            "timestamp": "2026-03-01T20:00:00+00:00",
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+
+        log = HabitLog.query.filter_by(habit_id=habit.id).one()
+        assert log.local_date == datetime.date(2026, 3, 2)
+        assert log.timestamp == datetime.datetime(2026, 3, 1, 20, 0)
+
+    def test_second_log_on_same_local_day_refused(self, client, db, auth_headers):
+        habit = _habit(db, auth_headers["_user_id"])
+
+        first = client.post(f"/api/v1/habits/{habit.id}/log", json={
+            "timestamp": "2026-03-01T08:00:00",
+        }, headers=_auth(auth_headers))
+        second = client.post(f"/api/v1/habits/{habit.id}/log", json={
+            "timestamp": "2026-03-01T21:00:00",
+        }, headers=_auth(auth_headers))
+        assert first.status_code == 201
+        assert second.status_code == 400
+
+    def test_naive_times_are_utc(self):
+        from zoneinfo import ZoneInfo
+        from utils.local_time import to_local_date
+        moment = datetime.datetime(2026, 3, 1, 3, 0)
+        assert to_local_date(moment, ZoneInfo("UTC")) == datetime.date(2026, 3, 1)
+        assert to_local_date(moment, ZoneInfo("America/New_York")) == datetime.date(2026, 2, 28)
+
+
+class TestCheckIn:
+
+    def test_logs_every_habit_with_one_reward_pass(self, client, db, auth_headers):
+        from models import HabitLog, PointTransaction, UserPoint
+        uid = auth_headers["_user_id"]
+        habits = [_habit(db, uid, f"Habit {i}") for i in range(4)]
+
+        resp = client.post("/api/v1/habits/check-in", json={
+            "logs": [{"habit_id": h.id} for h in habits] + [{"habit_id": habits[0].id}],
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+        assert resp.get_json()["logged"] == sorted(h.id for h in habits)
+
+        assert HabitLog.query.count() == 4
+        assert PointTransaction.query.filter_by(reason="habit_completed").count() == 4
+        assert UserPoint.query.filter_by(user_id=uid).one().total_points == 40
+        assert all(h.current_streak == 1 for h in habits)
+
+    def test_already_logged_habits_are_skipped(self, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        done, pending = _habit(db, uid, "Done"), _habit(db, uid, "Pending")
+        client.post(f"/api/v1/habits/{done.id}/log", json={}, headers=_auth(auth_headers))
+
+        resp = client.post("/api/v1/habits/check-in", json={
+            "logs": [{"habit_id": done.id}, {"habit_id": pending.id, "notes": "late"}],
+        }, headers=_auth(auth_headers))
+        data = resp.get_json()
+        assert data["logged"] == [pending.id]
+        assert data["skipped"] == [done.id]
+
+    def test_other_users_habits_rejected(self, client, db, auth_headers, make_user):
+        from models import HabitLog
+        mine = _habit(db, auth_headers["_user_id"])
+        theirs = _habit(db, make_user().id)
+
+        resp = client.post("/api/v1/habits/check-in", json={
+            "logs": [{"habit_id": mine.id}, {"habit_id": theirs.id}],
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 404
+        assert resp.get_json()["habit_ids"] == [theirs.id]
+        assert HabitLog.query.count() == 0
+
+    def test_habit_quests_advance_by_batch_size(self, client, db, auth_headers):
+        from models.daily_quest import DailyQuest, UserDailyQuest
+        uid = auth_headers["_user_id"]
+        habits = [_habit(db, uid, f"Habit {i}") for i in range(3)]
+        quest = DailyQuest(quest_type="habit_count", title="Three habits", target_value=3)
+        db.session.add(quest)
+        db.session.flush()
+        db.session.add(UserDailyQuest(user_id=uid, quest_id=quest.id, date_assigned=TODAY))
+        db.session.commit()
+
+        client.post("/api/v1/habits/check-in", json={
+            "logs": [{"habit_id": h.id} for h in habits],
+        }, headers=_auth(auth_headers))
+        assert UserDailyQuest.query.one().is_completed is True
+
+
+class TestReminders:
+
+    def _reminder_habit(self, db, user_id, due_at, frequency="daily", name="Stretch"):
+        from models import Habit
+        habit = Habit(
+            user_id=user_id, name=name, frequency=frequency,
+            reminder_time=due_at.time(), next_occurrence=due_at.date(), next_reminder_at=due_at,
+        )
+        db.session.add(habit)
+        db.session.commit()
+        return habit
+
+    def test_new_habit_scheduled_in_user_timezone(self, client, db, auth_headers):
+        from models import Habit, UserProfile
+        uid = auth_headers["_user_id"]
+        db.session.add(UserProfile(user_id=uid, timezone="America/New_York"))
+        db.session.commit()
+
+        resp = client.post("/api/v1/habits", json={
+            "name": "Walk", "frequency": "daily", "description": "Evening walk",
+            "reminder_time": "20:30", "next_occurrence": "2026-07-01",
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+        habit = db.session.get(Habit, resp.get_json()["habit_id"])
+        assert habit.next_reminder_at == datetime.datetime(2026, 7, 2, 0, 30)
+
+    def test_timezone_change_reschedules_reminders(self, client, db, auth_headers):
+        from models import UserProfile
+        uid = auth_headers["_user_id"]
+        db.session.add(UserProfile(user_id=uid, timezone="UTC"))
+        db.session.commit()
+        habit = self._reminder_habit(db, uid, datetime.datetime(2026, 7, 1, 20, 30))
+
+        resp = client.put("/api/v1/profile", json={"timezone": "America/New_York"},
+                          headers=_auth(auth_headers))
+        assert resp.status_code == 200
+        db.session.refresh(habit)
+        assert habit.next_reminder_at == datetime.datetime(2026, 7, 2, 0, 30)
+
+    def test_next_occurrence_rules(self):
+        from utils.habit_reminders import next_occurrence_after
+        day = datetime.date(2026, 1, 31)
+        assert next_occurrence_after(day, "daily") == datetime.date(2026, 2, 1)
+        assert next_occurrence_after(day, "weekly") == datetime.date(2026, 2, 7)
+        assert next_occurrence_after(day, "monthly") == datetime.date(2026, 2, 28)
+        assert next_occurrence_after(datetime.date(2026, 12, 15), "monthly") == datetime.date(2027, 1, 15)
+
+    def test_due_reminders_sent_once_and_advanced(self, app, db, auth_headers):
+        from models import Notification
+        from utils.habit_reminders import ReminderWheel, dispatch_reminders
+        now = datetime.datetime(2026, 7, 1, 8, 0, 30)
+        due = self._reminder_habit(db, auth_headers["_user_id"], datetime.datetime(2026, 7, 1, 8, 0))
+        later = self._reminder_habit(db, auth_headers["_user_id"], datetime.datetime(2026, 7, 1, 9, 0), name="Later")
+
+        wheel = ReminderWheel()
+        assert wheel.refill(now) == 1
+        ids = wheel.pop_due(now)
+        assert ids == [due.id]
+        assert dispatch_reminders(ids, now) == (1, 0)
+        db.session.commit()
+
+        # A restarted worker replaying the same ids sends nothing
+        assert dispatch_reminders(ids, now) == (0, 0)
+        assert Notification.query.filter_by(type="habit_reminder").count() == 1
+        assert due.next_occurrence == datetime.date(2026, 7, 2)
+        assert due.next_reminder_at == datetime.datetime(2026, 7, 2, 8, 0)
+        assert later.next_reminder_at == datetime.datetime(2026, 7, 1, 9, 0)
+
+    def test_stale_reminders_skipped_and_caught_up(self, app, db, auth_headers):
+        from models import Notification
+        from utils.habit_reminders import dispatch_reminders
+        now = datetime.datetime(2026, 7, 20, 12, 0)
+        habit = self._reminder_habit(
+            db, auth_headers["_user_id"], datetime.datetime(2026, 7, 1, 8, 0), frequency="weekly"
+        )
+
+        assert dispatch_reminders([habit.id], now) == (0, 1)
+        db.session.commit()
+        assert Notification.query.count() == 0
+        assert habit.next_occurrence == datetime.date(2026, 7, 22)
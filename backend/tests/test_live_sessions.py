@@ -0,0 +1,192 @@
+"""
+test_live_sessions.py - Tests for backend/api/live_sessions.py and
+                        backend/utils/live_sessions.py
+
+Endpoints covered:
+  POST   /api/v1/live-sessions                       (one active session per user)
+  GET    /api/v1/live-sessions/active
+  POST   /api/v1/live-sessions/<session_id>/sets     (checkpointing, recovery,
+                                                      memory store, abandonment)
+  POST   /api/v1/live-sessions/<session_id>/finish   (one workout, collapsed sets)
+  DELETE /api/v1/live-sessions/<session_id>
+
+Pure logic functions tested in isolation:
+  collapse_sets
+"""
+
+import datetime
+
+import pytest
+
+
+@pytest.fixture
+def shared_store(monkeypatch):
+    """A memory store that behaves like Redis: one copy every worker sees."""
+    import utils.live_sessions as live_sessions
+
+    class SharedMemoryStore(live_sessions.MemorySessionStore):
+        shared = True
+
+    monkeypatch.setattr(live_sessions, "_store", SharedMemoryStore())
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _exercises(db, user_id, *names):
+    from models import Exercise
+    exercises = [Exercise(user_id=user_id, name=name) for name in names]
+    db.session.add_all(exercises)
+    db.session.commit()
+    return [e.id for e in exercises]
+
+
+def _start(client, auth_headers, **data):
+    resp = client.post("/api/v1/live-sessions", json=data, headers=_auth(auth_headers))
+    assert resp.status_code == 201
+    return resp.get_json()["session"]["id"]
+
+
+def _log(client, auth_headers, session_id, **data):
+    return client.post(f"/api/v1/live-sessions/{session_id}/sets", json=data, headers=_auth(auth_headers))
+
+
+class TestCollapseSets:
+
+    def test_consecutive_identical_sets_are_counted(self):
+        from utils.live_sessions import collapse_sets
+        sets = [
+            {"exercise_id": 1, "reps": 8, "weight": 60.0},
+            {"exercise_id": 1, "reps": 8, "weight": 60.0},
+            {"exercise_id": 1, "reps": 6, "weight": 60.0},
+            {"exercise_id": 2, "reps": 10, "weight": None},
+            {"exercise_id": 1, "reps": 6, "weight": 60.0},
+        ]
+        rows = collapse_sets(sets)
+        assert [(r["exercise_id"], r["sets"], r["reps"]) for r in rows] == [
+            (1, 2, 8), (1, 1, 6), (2, 1, 10), (1, 1, 6),
+        ]
+
+
+class TestLiveSessions:
+
+    def test_sets_are_held_then_checkpointed(self, client, db, auth_headers, shared_store):
+        from models.live_workout_session import LiveWorkoutSession
+        from utils.live_sessions import CHECKPOINT_EVERY_SETS
+        (bench,) = _exercises(db, auth_headers["_user_id"], "Bench Press")
+        session_id = _start(client, auth_headers, type="Push")
+
+        for n in range(1, CHECKPOINT_EVERY_SETS):
+            data = _log(client, auth_headers, session_id, exercise_id=bench, reps=8, weight=60).get_json()
+            assert (data["set_count"], data["checkpointed"]) == (n, False)
+        db.session.expire_all()
+        assert db.session.get(LiveWorkoutSession, session_id).set_count == 0
+
+        data = _log(client, auth_headers, session_id, exercise_id=bench, reps=8, weight=60).get_json()
+        assert data["checkpointed"] is True
+        db.session.expire_all()
+        row = db.session.get(LiveWorkoutSession, session_id)
+        assert row.set_count == CHECKPOINT_EVERY_SETS
+        assert len(row.document["sets"]) == CHECKPOINT_EVERY_SETS
+
+    def test_lost_store_recovers_from_checkpoint(self, client, db, auth_headers, shared_store, monkeypatch):
+        import utils.live_sessions as live_sessions
+        (bench,) = _exercises(db, auth_headers["_user_id"], "Bench Press")
+        session_id = _start(client, auth_headers)
+        for _ in range(live_sessions.CHECKPOINT_EVERY_SETS + 1):
+            _log(client, auth_headers, session_id, exercise_id=bench, reps=5, weight=100)
+
+        # Eviction loses the held document; only the unsaved set is gone
+        monkeypatch.setattr(live_sessions, "_store", type(live_sessions.get_store())())
+        data = client.get("/api/v1/live-sessions/active", headers=_auth(auth_headers)).get_json()
+        assert data["session"]["set_count"] == live_sessions.CHECKPOINT_EVERY_SETS
+        data = _log(client, auth_headers, session_id, exercise_id=bench, reps=5, weight=100).get_json()
+        assert data["set_count"] == live_sessions.CHECKPOINT_EVERY_SETS + 1
+
+    def test_memory_store_checkpoints_every_set(self, client, db, auth_headers, monkeypatch):
+        import utils.live_sessions as live_sessions
+        from models.live_workout_session import LiveWorkoutSession
+        (bench,) = _exercises(db, auth_headers["_user_id"], "Bench Press")
+        session_id = _start(client, auth_headers)
+        data = _log(client, auth_headers, session_id, exercise_id=bench, reps=5, weight=100).get_json()
+        assert data["checkpointed"] is True
+
+        # Another worker has its own (empty) memory; the next set follows the first
+        worker_a = live_sessions.get_store()
+        live_sessions.reset_store()
+        assert _log(client, auth_headers, session_id, exercise_id=bench, reps=5).get_json()["set_count"] == 2
+
+        # Back on the first worker, its stale copy is replaced from the row
+        monkeypatch.setattr(live_sessions, "_store", worker_a)
+        assert _log(client, auth_headers, session_id, exercise_id=bench, reps=5).get_json()["set_count"] == 3
+        db.session.expire_all()
+        assert db.session.get(LiveWorkoutSession, session_id).set_count == 3
+
+    def test_abandonment_counts_from_last_activity(self, client, db, auth_headers):
+        from models.live_workout_session import LiveWorkoutSession
+        from utils.live_sessions import ABANDONED_AFTER
+        (bench,) = _exercises(db, auth_headers["_user_id"], "Bench Press")
+        session_id = _start(client, auth_headers)
+        row = db.session.get(LiveWorkoutSession, session_id)
+        row.started_at = datetime.datetime.utcnow() - ABANDONED_AFTER - datetime.timedelta(hours=1)
+        db.session.commit()
+
+        # Started long ago but still being logged: not abandoned
+        assert _log(client, auth_headers, session_id, exercise_id=bench, reps=5).status_code == 201
+        assert client.post("/api/v1/live-sessions", headers=_auth(auth_headers)).status_code == 409
+
+        row.last_activity_at = datetime.datetime.utcnow() - ABANDONED_AFTER - datetime.timedelta(minutes=1)
+        db.session.commit()
+        assert client.post("/api/v1/live-sessions", headers=_auth(auth_headers)).status_code == 201
+
+    def test_finish_creates_one_workout(self, client, db, auth_headers):
+        from models import Workout, WorkoutExercise
+        bench, row = _exercises(db, auth_headers["_user_id"], "Bench Press", "Barbell Row")
+        session_id = _start(client, auth_headers, type="Upper")
+        for exercise_id, reps in [(bench, 8), (bench, 8), (bench, 8), (row, 10), (row, 9)]:
+            _log(client, auth_headers, session_id, exercise_id=exercise_id, reps=reps, weight=60)
+        # Unknown exercises are dropped rather than failing the finish
+        _log(client, auth_headers, session_id, exercise_id=999999, reps=1)
+
+        resp = client.post(f"/api/v1/live-sessions/{session_id}/finish", json={"duration": 40},
+                           headers=_auth(auth_headers))
+        assert resp.status_code == 201
+        data = resp.get_json()
+        assert data["session"]["status"] == "finished"
+
+        workout = db.session.get(Workout, data["workout_id"])
+        assert (workout.type, workout.duration, workout.date) == ("Upper", 40, datetime.date.today())
+        assert workout.total_sets == 5
+        rows = WorkoutExercise.query.filter_by(workout_id=workout.id).order_by(WorkoutExercise.id).all()
+        assert [(r.exercise_id, r.sets, r.reps) for r in rows] == [(bench, 3, 8), (row, 1, 10), (row, 1, 9)]
+
+        # Finished sessions accept no more sets and cannot finish twice
+        assert _log(client, auth_headers, session_id, exercise_id=bench, reps=8).status_code == 404
+        assert client.post(f"/api/v1/live-sessions/{session_id}/finish",
+                           headers=_auth(auth_headers)).status_code == 404
+
+    def test_one_active_session_and_gauge(self, client, db, auth_headers, make_user):
+        from utils.live_sessions import active_session_count
+        session_id = _start(client, auth_headers)
+        assert client.post("/api/v1/live-sessions", headers=_auth(auth_headers)).status_code == 409
+        assert active_session_count() == 1
+
+        assert client.delete(f"/api/v1/live-sessions/{session_id}", headers=_auth(auth_headers)).status_code == 200
+        assert active_session_count() == 0
+        assert client.get("/api/v1/live-sessions/active", headers=_auth(auth_headers)).get_json()["session"] is None
+
+    def test_other_users_sessions_are_hidden(self, client, db, auth_headers, make_user):
+        from utils.live_sessions import start_session
+        other = make_user()
+        theirs = start_session(other.id)
+        db.session.commit()
+        (bench,) = _exercises(db, auth_headers["_user_id"], "Bench Press")
+
+        assert _log(client, auth_headers, theirs.id, exercise_id=bench, reps=5).status_code == 404
+        assert client.delete(f"/api/v1/live-sessions/{theirs.id}", headers=_auth(auth_headers)).status_code == 404
+
+    def test_invalid_set_is_rejected(self, client, db, auth_headers):
+        session_id = _start(client, auth_headers)
+        assert _log(client, auth_headers, session_id, reps=5).status_code == 400
+        assert _log(client, auth_headers, session_id, exercise_id=1, reps=-1).status_code == 400
@@ -0,0 +1,213 @@
+"""
+test_personal_records.py - Tests for PR maintenance in backend/utils/pr_tracker.py
+                           and the workout edit/delete paths in backend/api/workouts.py
+
+Endpoints covered:
+  DELETE /api/v1/workouts/<workout_id>
+  PUT    /api/v1/workouts/<workout_id>/exercises/<workout_exercise_id>
+  DELETE /api/v1/workouts/<workout_id>/exercises/<workout_exercise_id>
+
+Pure logic functions tested in isolation:
+  recompute_prs
+  rebuild_prs_for_users
+
+Strategy:
+  - PRs are seeded through check_and_update_prs so the tests exercise the same
+    baseline the create path produces, then a bogus set is removed or edited.
+"""
+
+import datetime
+import pytest
+
+
+TODAY = datetime.date.today()
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _log_sets(db, user_id, exercise_id, sets, date=None):
+    """Insert a workout with the given (weight, reps) sets and run PR detection."""
+    from models import Workout, WorkoutExercise
+    from utils.pr_tracker import check_and_update_prs
+
+    workout = Workout(user_id=user_id, type="Strength", duration=60, date=date or TODAY)
+    db.session.add(workout)
+    db.session.flush()
+    rows = []
+    for weight, reps in sets:
+        we = WorkoutExercise(
+            workout_id=workout.id, exercise_id=exercise_id, sets=1, reps=reps, weight=weight
+        )
+        db.session.add(we)
+        rows.append(we)
+    db.session.commit()
+    check_and_update_prs(user_id, workout.id, rows)
+    return workout, rows
+
+
+def _exercise(db, user_id, name="Bench Press"):
+    from models import Exercise
+    e = Exercise(user_id=user_id, name=name)
+    db.session.add(e)
+    db.session.commit()
+    return e
+
+
+def _pr(user_id, exercise_id):
+    from models.personal_record import PersonalRecord
+    return PersonalRecord.query.filter_by(user_id=user_id, exercise_id=exercise_id).first()
+
+
+class TestDeleteWorkoutRecomputesPRs:
+
+    def test_deleting_bogus_workout_restores_previous_pr(self, app, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ex = _exercise(db, uid)
+        _log_sets(db, uid, ex.id, [(100, 5)], date=TODAY - datetime.timedelta(days=3))
+        bogus, _ = _log_sets(db, uid, ex.id, [(500, 5)])
+        assert _pr(uid, ex.id).max_weight == 500
+
+        resp = client.delete(f"/api/v1/workouts/{bogus.id}", headers=_auth(auth_headers))
+        assert resp.status_code == 200
+
+        pr = _pr(uid, ex.id)
+        assert pr.max_weight == 100
+        assert pr.max_reps == 5
+        assert pr.best_one_rep_max == pytest.approx(100 * (1 + 5 / 30))
+
+    def test_deleting_only_workout_removes_pr(self, app, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ex = _exercise(db, uid)
+        workout, _ = _log_sets(db, uid, ex.id, [(80, 8)])
+
+        client.delete(f"/api/v1/workouts/{workout.id}", headers=_auth(auth_headers))
+
+        assert _pr(uid, ex.id) is None
+
+    def test_unrelated_workout_delete_leaves_pr_untouched(self, app, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ex = _exercise(db, uid)
+        best, _ = _log_sets(db, uid, ex.id, [(120, 10)], date=TODAY - datetime.timedelta(days=1))
+        light, _ = _log_sets(db, uid, ex.id, [(60, 5)])
+
+        client.delete(f"/api/v1/workouts/{light.id}", headers=_auth(auth_headers))
+
+        pr = _pr(uid, ex.id)
+        assert pr.max_weight == 120
+        assert pr.workout_id == best.id
+
+
+class TestSetEditsRecomputePRs:
+
+    def test_lowering_backing_set_lowers_pr(self, app, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ex = _exercise(db, uid)
+        _log_sets(db, uid, ex.id, [(100, 5)], date=TODAY - datetime.timedelta(days=2))
+        workout, rows = _log_sets(db, uid, ex.id, [(500, 5)])
+
+        resp = client.put(
+            f"/api/v1/workouts/{workout.id}/exercises/{rows[0].id}",
+            json={"weight": 105},
+            headers=_auth(auth_headers),
+        )
+        assert resp.status_code == 200
+        assert _pr(uid, ex.id).max_weight == 105
+
+    def test_raising_set_reports_new_pr(self, app, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ex = _exercise(db, uid)
+        _log_sets(db, uid, ex.id, [(100, 5)], date=TODAY - datetime.timedelta(days=2))
+        workout, rows = _log_sets(db, uid, ex.id, [(90, 5)])
+
+        resp = client.put(
+            f"/api/v1/workouts/{workout.id}/exercises/{rows[0].id}",
+            json={"weight": 110},
+            headers=_auth(auth_headers),
+        )
+        assert resp.get_json()["prs_achieved"]
+        assert _pr(uid, ex.id).max_weight == 110
+
+    def test_notes_edit_on_backing_set_reports_nothing(self, app, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ex = _exercise(db, uid)
+        workout, rows = _log_sets(db, uid, ex.id, [(100, 5)])
+        pr_id = _pr(uid, ex.id).id
+
+        resp = client.put(
+            f"/api/v1/workouts/{workout.id}/exercises/{rows[0].id}",
+            json={"notes": "felt easy", "rest_time": 90, "weight": 100},
+            headers=_auth(auth_headers),
+        )
+        assert resp.get_json()["prs_achieved"] == []
+        pr = _pr(uid, ex.id)
+        assert (pr.id, pr.max_weight) == (pr_id, 100)
+
+    def test_only_beaten_metrics_are_reported(self, app, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ex = _exercise(db, uid)
+        workout, rows = _log_sets(db, uid, ex.id, [(100, 5)])
+        pr_id = _pr(uid, ex.id).id
+
+        # The set behind the record, and the only history: more reps at the same weight
+        resp = client.put(
+            f"/api/v1/workouts/{workout.id}/exercises/{rows[0].id}",
+            json={"reps": 6},
+            headers=_auth(auth_headers),
+        )
+        prs = resp.get_json()["prs_achieved"]
+        assert prs[0]["pr_types"] == ["max_reps", "max_volume", "one_rep_max"]
+        pr = _pr(uid, ex.id)
+        assert (pr.id, pr.max_weight, pr.max_reps) == (pr_id, 100, 6)
+
+    def test_removing_set_recomputes_pr(self, app, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ex = _exercise(db, uid)
+        workout, rows = _log_sets(db, uid, ex.id, [(100, 5), (500, 1)])
+
+        resp = client.delete(
+            f"/api/v1/workouts/{workout.id}/exercises/{rows[1].id}",
+            headers=_auth(auth_headers),
+        )
+        assert resp.status_code == 200
+        pr = _pr(uid, ex.id)
+        assert pr.max_weight == 100
+        assert pr.workout_exercise_id == rows[0].id
+
+    def test_other_users_set_returns_404(self, app, client, db, auth_headers, make_user):
+        other = make_user()
+        ex = _exercise(db, other.id)
+        workout, rows = _log_sets(db, other.id, ex.id, [(100, 5)])
+
+        resp = client.delete(
+            f"/api/v1/workouts/{workout.id}/exercises/{rows[0].id}",
+            headers=_auth(auth_headers),
+        )
+        assert resp.status_code == 404
+
+
+class TestRebuildPRsForUsers:
+
+    def test_rebuild_fixes_stale_and_missing_records(self, app, db, auth_headers, make_user):
+        from models.personal_record import PersonalRecord
+        from utils.pr_tracker import rebuild_prs_for_users
+        uid = auth_headers["_user_id"]
+        other = make_user()
+        bench = _exercise(db, uid, "Bench Press")
+        squat = _exercise(db, uid, "Squat")
+        _log_sets(db, uid, bench.id, [(100, 5)])
+        _log_sets(db, other.id, squat.id, [(140, 3)])
+
+        # Corrupt one record and drop the other
+        _pr(uid, bench.id).max_weight = 999
+        db.session.delete(_pr(other.id, squat.id))
+        db.session.commit()
+
+        written = rebuild_prs_for_users([uid, other.id])
+        db.session.commit()
+
+        assert written == 2
+        assert _pr(uid, bench.id).max_weight == 100
+        assert _pr(other.id, squat.id).max_weight == 140
+        assert PersonalRecord.query.count() == 2
@@ -0,0 +1,171 @@
+"""
+test_programs.py - Tests for backend/api/programs.py and the cached program
+                   trees in backend/utils/program_catalog.py
+
+Endpoints covered:
+  GET  /api/v1/programs/<program_id>                  (cached tree + enrollment)
+  POST /api/v1/programs/<program_id>/enroll
+  GET  /api/v1/programs/my-enrollments
+  GET  /api/v1/programs/<program_id>/current-workout
+  GET  /api/v1/programs/today                         (batched exercise resolution)
+  GET  /api/v1/programs/enrollments/<enrollment_id>/adherence
+  POST /api/v1/workouts                               (links and advances enrollments)
+"""
+
+import datetime
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+@contextmanager
+def _count_queries(db):
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _program(db, weeks=2, per_week=2):
+    from models.workout_program import WorkoutProgram, ProgramWorkout, ProgramExercise
+    program = WorkoutProgram(name="Upper/Lower", difficulty="beginner", duration_weeks=weeks,
+                             workouts_per_week=per_week, is_public=True)
+    db.session.add(program)
+    db.session.flush()
+    # Inserted out of order; the tree sorts by week, day and order_index
+    for week in range(weeks, 0, -1):
+        for day in range(per_week, 0, -1):
+            workout = ProgramWorkout(program_id=program.id, week_number=week, day_number=day,
+                                     name=f"W{week}D{day}")
+            db.session.add(workout)
+            db.session.flush()
+            for order in (2, 1):
+                db.session.add(ProgramExercise(program_workout_id=workout.id, sets=3, reps="8",
+                                               exercise_name=f"Lift {order}", order_index=order))
+    db.session.commit()
+    return program
+
+
+class TestProgramCatalog:
+
+    def test_tree_loads_in_three_queries_then_from_cache(self, app, db):
+        from utils.program_catalog import program_tree
+        program_id = _program(db).id
+        db.session.expire_all()
+
+        with app.test_request_context(), _count_queries(db) as statements:
+            tree = program_tree(program_id)
+            assert len(statements) == 3
+            assert program_tree(program_id) is tree
+            assert len(statements) == 3
+
+        assert [w["name"] for w in tree["workouts"]] == ["W1D1", "W1D2", "W2D1", "W2D2"]
+        assert [e["exercise_name"] for e in tree["workouts"][0]["exercises"]] == ["Lift 1", "Lift 2"]
+
+    def test_details_enrollment_and_current_workout(self, client, db, auth_headers):
+        program = _program(db)
+        headers = _auth(auth_headers)
+
+        data = client.get(f"/api/v1/programs/{program.id}", headers=headers).get_json()
+        assert data["program"]["is_enrolled"] is False
+        assert len(data["program"]["workouts"]) == 4
+
+        assert client.post(f"/api/v1/programs/{program.id}/enroll", headers=headers).status_code == 201
+        data = client.get(f"/api/v1/programs/{program.id}", headers=headers).get_json()
+        assert data["program"]["is_enrolled"] is True
+        assert data["program"]["enrollment"]["current_week"] == 1
+
+        data = client.get("/api/v1/programs/my-enrollments", headers=headers).get_json()
+        assert [e["program"]["name"] for e in data["enrollments"]] == ["Upper/Lower"]
+
+        data = client.get(f"/api/v1/programs/{program.id}/current-workout", headers=headers).get_json()
+        assert data["workout"]["name"] == "W1D1"
+
+        assert client.get("/api/v1/programs/999999", headers=headers).status_code == 404
+
+
+class TestEnrollmentProgress:
+
+    def _setup(self, client, db, auth_headers):
+        from models import Exercise
+        uid = auth_headers["_user_id"]
+        db.session.add_all([Exercise(user_id=uid, name="Lift 1"), Exercise(user_id=uid, name="Lift 2")])
+        program = _program(db)
+        client.post(f"/api/v1/programs/{program.id}/enroll", headers=_auth(auth_headers))
+        return program
+
+    def _log(self, client, auth_headers, names, **extra):
+        from models import Exercise
+        exercises = [{"exercise_id": Exercise.query.filter_by(name=n).one().id, "sets": 3, "reps": 8, "weight": 50}
+                     for n in names]
+        resp = client.post("/api/v1/workouts", json={
+            "type": "Strength", "duration": 45, "exercises": exercises, **extra,
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+        return resp.get_json()["workout_id"]
+
+    def _enrollment(self, db, program):
+        from models.workout_program import ProgramEnrollment
+        db.session.expire_all()
+        return ProgramEnrollment.query.filter_by(program_id=program.id).one()
+
+    def test_matching_workout_advances_enrollment(self, client, db, auth_headers):
+        from models import Workout
+        program = self._setup(client, db, auth_headers)
+
+        # One of two planned exercises meets the threshold
+        workout_id = self._log(client, auth_headers, ["Lift 1"])
+        enrollment = self._enrollment(db, program)
+        assert (enrollment.current_week, enrollment.current_day) == (1, 2)
+        workout = db.session.get(Workout, workout_id)
+        assert workout.program_enrollment_id == enrollment.id
+
+        # Naming a later session jumps past it; the last one completes the program
+        last = [w for w in program.workouts if (w.week_number, w.day_number) == (2, 2)][0]
+        self._log(client, auth_headers, [], program_workout_id=last.id)
+        enrollment = self._enrollment(db, program)
+        assert enrollment.status == "completed"
+
+    def test_unrelated_workout_is_not_linked(self, client, db, auth_headers):
+        from models import Exercise, Workout
+        program = self._setup(client, db, auth_headers)
+        db.session.add(Exercise(user_id=auth_headers["_user_id"], name="Rowing"))
+        db.session.commit()
+
+        workout_id = self._log(client, auth_headers, ["Rowing"])
+        assert db.session.get(Workout, workout_id).program_workout_id is None
+        enrollment = self._enrollment(db, program)
+        assert (enrollment.current_week, enrollment.current_day) == (1, 1)
+
+    def test_adherence_and_todays_session(self, client, db, auth_headers):
+        program = self._setup(client, db, auth_headers)
+        enrollment = self._enrollment(db, program)
+        enrollment.start_date = datetime.date.today() - datetime.timedelta(days=13)
+        db.session.commit()
+        self._log(client, auth_headers, ["Lift 1", "Lift 2"])
+
+        data = client.get(f"/api/v1/programs/enrollments/{enrollment.id}/adherence",
+                          headers=_auth(auth_headers)).get_json()
+        assert data["adherence"] == {
+            "sessions_completed": 1, "sessions_scheduled": 4, "sessions_total": 4,
+            "adherence_rate": 0.25, "percent_complete": 25.0,
+            "last_session_date": datetime.date.today().isoformat(),
+        }
+
+        data = client.get("/api/v1/programs/today", headers=_auth(auth_headers)).get_json()
+        session = data["sessions"][0]
+        assert session["workout"]["name"] == "W1D2"
+        lift = session["workout"]["exercises"][0]
+        assert lift["exercise_id"] is not None
+        assert lift["last_performance"]["weight"] == 50.0
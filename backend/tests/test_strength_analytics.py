@@ -0,0 +1,145 @@
+"""
+test_strength_analytics.py - Tests for backend/utils/strength_analytics.py
+
+Pure logic functions tested in isolation:
+  one_rep_max, aggregate_sessions, rolling_best, trend_slope,
+  detect_plateau, lttb_indices, analyze_progression
+  load_exercise_history
+
+Endpoint covered:
+  GET /api/v1/analytics/exercise-progression/<exercise_id>?formula=&max_points=
+"""
+
+import datetime
+import numpy as np
+import pytest
+
+from utils.strength_analytics import (
+    one_rep_max,
+    aggregate_sessions,
+    rolling_best,
+    trend_slope,
+    detect_plateau,
+    lttb_indices,
+    analyze_progression,
+    load_exercise_history,
+)
+
+
+def _history(rows):
+    """rows: list of (workout_id, date, sets, reps, weight)"""
+    return {
+        'workout_id': np.array([r[0] for r in rows], dtype=np.int64),
+        'date': np.array([r[1] for r in rows], dtype='datetime64[D]'),
+        'sets': np.array([r[2] for r in rows], dtype=np.float64),
+        'reps': np.array([r[3] for r in rows], dtype=np.float64),
+        'weight': np.array([r[4] for r in rows], dtype=np.float64),
+        'duration': np.zeros(len(rows)),
+    }
+
+
+class TestOneRepMax:
+
+    def test_epley_brzycki_lombardi(self):
+        assert one_rep_max(100, 10, 'epley') == pytest.approx(133.33, rel=1e-3)
+        assert one_rep_max(100, 10, 'brzycki') == pytest.approx(133.33, rel=1e-3)
+        assert one_rep_max(100, 10, 'lombardi') == pytest.approx(125.89, rel=1e-3)
+
+    def test_invalid_sets_are_nan(self):
+        result = one_rep_max([0, 100, 100], [5, 0, 40], 'brzycki')
+        assert np.isnan(result).all()
+
+    def test_unknown_formula_raises(self):
+        with pytest.raises(ValueError):
+            one_rep_max(100, 5, 'mayhew')
+
+
+class TestSessionStats:
+
+    def test_sets_collapse_to_one_row_per_workout(self):
+        history = _history([
+            (1, '2026-01-01', 1, 5, 100),
+            (1, '2026-01-01', 1, 3, 110),
+            (2, '2026-01-08', 3, 5, 105),
+        ])
+        sessions = aggregate_sessions(history)
+        assert sessions['weight'].tolist() == [110, 105]
+        assert sessions['volume'].tolist() == [500 + 330, 1575]
+
+    def test_rolling_best_all_time_and_window(self):
+        values = np.array([100, np.nan, 90, 120, 80, 85])
+        assert rolling_best(values).tolist()[2:] == [100, 120, 120, 120]
+        assert rolling_best(values, window=2).tolist()[3:] == [120, 120, 85]
+
+    def test_trend_slope_per_week(self):
+        dates = np.array(['2026-01-01', '2026-01-08', '2026-01-15'], dtype='datetime64[D]')
+        assert trend_slope(dates, np.array([100.0, 102.5, 105.0])) == pytest.approx(2.5)
+
+    def test_plateau_after_stalled_sessions(self):
+        dates = np.arange(np.datetime64('2026-01-01'), np.datetime64('2026-03-01'), 7)
+        values = np.r_[np.linspace(100, 120, 3), np.full(dates.size - 3, 119.0)]
+        result = detect_plateau(dates, values)
+        assert result['is_plateau'] is True
+        assert result['sessions_since_best'] == dates.size - 3
+
+    def test_no_plateau_while_improving(self):
+        dates = np.arange(np.datetime64('2026-01-01'), np.datetime64('2026-03-01'), 7)
+        values = np.linspace(100, 140, dates.size)
+        assert detect_plateau(dates, values)['is_plateau'] is False
+
+
+class TestLTTB:
+
+    def test_keeps_endpoints_and_bounds_size(self):
+        x = np.arange(10_000, dtype=np.float64)
+        y = np.sin(x / 100)
+        keep = lttb_indices(x, y, 200)
+        assert keep.size == 200
+        assert keep[0] == 0 and keep[-1] == 9_999
+        assert np.all(np.diff(keep) > 0)
+
+    def test_short_series_untouched(self):
+        assert lttb_indices(np.arange(5.0), np.arange(5.0), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+class TestAnalyzeProgression:
+
+    def test_large_history_is_downsampled(self):
+        start = datetime.date(2000, 1, 1)
+        rows = [
+            (i, start + datetime.timedelta(days=i), 3, 5, 60 + (i % 50))
+            for i in range(12_000)
+        ]
+        result = analyze_progression(_history(rows), max_points=300)
+        assert len(result['progression']) == 300
+        assert result['stats']['total_sessions'] == 12_000
+        assert result['analysis']['downsampled'] is True
+
+    def test_endpoint_rejects_unknown_formula(self, client, auth_headers, db):
+        from models import Exercise
+        exercise = Exercise(user_id=auth_headers["_user_id"], name="Squat")
+        db.session.add(exercise)
+        db.session.commit()
+
+        resp = client.get(
+            f"/api/v1/analytics/exercise-progression/{exercise.id}?formula=bogus",
+            headers={"Authorization": auth_headers["Authorization"]},
+        )
+        assert resp.status_code == 400
+
+    def test_history_skips_planned_workouts(self, app, db, auth_headers):
+        from sqlalchemy import null
+        from models import Exercise, Workout, WorkoutExercise
+        uid = auth_headers["_user_id"]
+        exercise = Exercise(user_id=uid, name="Squat")
+        done = Workout(user_id=uid, type="Strength", date=datetime.date(2024, 1, 1))
+        planned = Workout(user_id=uid, type="Strength", date=datetime.date(2024, 1, 2), completed_at=null())
+        db.session.add_all([exercise, done, planned])
+        db.session.flush()
+        for workout in (done, planned):
+            db.session.add(WorkoutExercise(workout_id=workout.id, exercise_id=exercise.id,
+                                           sets=3, reps=5, weight=100))
+        db.session.commit()
+
+        history = load_exercise_history(uid, exercise.id)
+        assert history['workout_id'].tolist() == [done.id]
@@ -0,0 +1,177 @@
+"""
+test_sync.py - Tests for backend/api/sync.py and backend/utils/sync.py
+
+Endpoints covered:
+  POST /api/v1/sync            (ordered, idempotent, per-operation failures)
+  GET  /api/v1/sync/changes    (delta read after a cursor, tombstones)
+"""
+
+import datetime
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _sync(client, auth_headers, *operations):
+    resp = client.post("/api/v1/sync", json={"operations": list(operations)}, headers=_auth(auth_headers))
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()["results"]
+
+
+def _changes(client, auth_headers, cursor=None, **params):
+    if cursor is not None:
+        params["cursor"] = cursor
+    resp = client.get("/api/v1/sync/changes", query_string=params, headers=_auth(auth_headers))
+    assert resp.status_code == 200
+    return resp.get_json()
+
+
+class TestSyncBatch:
+
+    def test_replayed_keys_are_not_applied_twice(self, client, db, auth_headers):
+        from models import Exercise, Workout, WeightLog
+        uid = auth_headers["_user_id"]
+        db.session.add(Exercise(user_id=uid, name="Bench Press"))
+        db.session.commit()
+
+        operations = [
+            {"key": "w-1", "op": "workout.create", "data": {
+                "type": "Strength", "duration": 45, "date": "2026-10-01",
+                "exercises": [{"exercise_name": "bench press", "sets": 3, "reps": 8, "weight": 60},
+                              {"exercise_id": 999999, "sets": 1}],
+            }},
+            {"key": "wt-1", "op": "weight_log.create", "data": {"weight_kg": 80.5, "date": "2026-10-01"}},
+        ]
+        first = _sync(client, auth_headers, *operations)
+        assert [r["status"] for r in first] == ["applied", "applied"]
+
+        # The client lost the response and replays the whole queue
+        again = _sync(client, auth_headers, *operations)
+        assert [r["status"] for r in again] == ["duplicate", "duplicate"]
+        assert [r["id"] for r in again] == [r["id"] for r in first]
+
+        workouts = Workout.query.filter_by(user_id=uid).all()
+        assert len(workouts) == 1
+        assert workouts[0].date == datetime.date(2026, 10, 1)
+        assert workouts[0].total_sets == 3
+        assert WeightLog.query.filter_by(user_id=uid).count() == 1
+
+    def test_failed_operation_does_not_block_the_rest(self, client, db, auth_headers):
+        from models import Habit, HabitLog
+        uid = auth_headers["_user_id"]
+        habit = Habit(user_id=uid, name="Stretch", frequency="daily")
+        db.session.add(habit)
+        db.session.commit()
+
+        results = _sync(
+            client, auth_headers,
+            {"key": "h-1", "op": "habit_log.create", "data": {"habit_id": habit.id}},
+            {"key": "h-2", "op": "habit_log.create", "data": {"habit_id": habit.id}},
+            {"key": "w-1", "op": "workout.create", "data": {"type": "Run"}},
+            {"key": "m-1", "op": "body_measurement.upsert", "data": {"weight_kg": 81, "waist": 85}},
+        )
+        assert [r["status"] for r in results] == ["applied", "failed", "failed", "applied"]
+        assert results[1]["message"] == "Habit already logged that day"
+        assert "duration" in results[2]["errors"]
+        assert HabitLog.query.filter_by(habit_id=habit.id).count() == 1
+
+        # A failed key can be retried once corrected
+        results = _sync(client, auth_headers,
+                        {"key": "w-1", "op": "workout.create", "data": {"type": "Run", "duration": 30}})
+        assert results[0]["status"] == "applied"
+
+    def test_invalid_envelope_is_rejected(self, client, db, auth_headers):
+        for body in ({}, {"operations": [{"op": "workout.create"}]},
+                     {"operations": [{"key": "k", "op": "workout.delete"}]}):
+            resp = client.post("/api/v1/sync", json=body, headers=_auth(auth_headers))
+            assert resp.status_code == 400
+
+
+class TestChangeFeed:
+
+    def test_changes_since_cursor(self, client, db, auth_headers, make_user):
+        from models import Workout
+        uid = auth_headers["_user_id"]
+        cursor = _changes(client, auth_headers)["cursor"]
+
+        results = _sync(
+            client, auth_headers,
+            {"key": "w-1", "op": "workout.create", "data": {"type": "Strength", "duration": 40}},
+            {"key": "w-2", "op": "workout.create", "data": {"type": "Yoga", "duration": 30}},
+            {"key": "wt-1", "op": "weight_log.create", "data": {"weight_kg": 80}},
+        )
+        # Another user's writes never appear in this feed
+        other = make_user()
+        db.session.add(Workout(user_id=other.id, type="Other", duration=10))
+        db.session.commit()
+
+        data = _changes(client, auth_headers, cursor)
+        assert sorted(w["type"] for w in data["changes"]["workouts"]) == ["Strength", "Yoga"]
+        assert [w["weight_kg"] for w in data["changes"]["weight_logs"]] == [80.0]
+        assert data["has_more"] is False
+
+        # Nothing new: same cursor, empty changes
+        cursor = data["cursor"]
+        data = _changes(client, auth_headers, cursor)
+        assert data["cursor"] == cursor
+        assert data["changes"]["workouts"] == []
+
+        # An edit and a delete show up as a row and a tombstone
+        yoga_id = results[1]["id"]
+        client.put(f"/api/v1/workouts/{results[0]['id']}", json={"type": "Strength", "duration": 55},
+                   headers=_auth(auth_headers))
+        client.delete(f"/api/v1/workouts/{yoga_id}", headers=_auth(auth_headers))
+        data = _changes(client, auth_headers, cursor)
+        assert [w["duration"] for w in data["changes"]["workouts"]] == [55]
+        assert data["deleted"]["workouts"] == [yoga_id]
+        assert Workout.query.filter_by(user_id=uid).count() == 1
+
+    def test_paging_and_check_in(self, client, db, auth_headers):
+        from models import Habit
+        uid = auth_headers["_user_id"]
+        habits = [Habit(user_id=uid, name=f"H{n}", frequency="daily") for n in range(3)]
+        db.session.add_all(habits)
+        db.session.commit()
+
+        # Batch check-in inserts through Core and records its own feed rows
+        client.post("/api/v1/habits/check-in", json={"logs": [{"habit_id": h.id} for h in habits]},
+                    headers=_auth(auth_headers))
+        page = _changes(client, auth_headers, 0, limit=2)
+        assert page["has_more"] is True
+        assert len(page["changes"]["habit_logs"]) == 2
+        page = _changes(client, auth_headers, page["cursor"], limit=2)
+        assert page["has_more"] is False
+        assert len(page["changes"]["habit_logs"]) == 1
+
+    def test_in_flight_transactions_are_not_skipped(self, client, db, auth_headers, monkeypatch):
+        import utils.sync
+        from models import WeightLog
+        from models.sync import SyncChange
+        uid = auth_headers["_user_id"]
+        early, late = (WeightLog(user_id=uid, weight_kg=kg, date=datetime.date.today()) for kg in (80, 81))
+        db.session.add_all([early, late])
+        db.session.commit()
+        SyncChange.query.delete()
+        # The older transaction (txid 7) flushed after the newer one (txid 9) took a lower id
+        db.session.add_all([
+            SyncChange(user_id=uid, entity_type="weight_log", entity_id=late.id, txid=9),
+            SyncChange(user_id=uid, entity_type="weight_log", entity_id=early.id, txid=7),
+        ])
+        db.session.commit()
+
+        # txid 7 still in flight: the committed txid 9 row waits behind it
+        monkeypatch.setattr(utils.sync, "_watermark", lambda: 7)
+        data = _changes(client, auth_headers, "0.0")
+        assert data["changes"]["weight_logs"] == []
+        assert data["cursor"] == "0.0"
+
+        monkeypatch.setattr(utils.sync, "_watermark", lambda: 10)
+        data = _changes(client, auth_headers, data["cursor"], limit=1)
+        assert [w["weight_kg"] for w in data["changes"]["weight_logs"]] == [80.0]
+        data = _changes(client, auth_headers, data["cursor"])
+        assert [w["weight_kg"] for w in data["changes"]["weight_logs"]] == [81.0]
+
+    def test_bad_cursor(self, client, db, auth_headers):
+        resp = client.get("/api/v1/sync/changes?cursor=abc", headers=_auth(auth_headers))
+        assert resp.status_code == 400
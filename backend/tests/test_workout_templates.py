@@ -0,0 +1,150 @@
+"""
+test_workout_templates.py - Tests for backend/api/workout_templates.py and
+                            backend/utils/workout_templates.py
+
+Endpoints covered:
+  GET  /api/v1/workout-templates                      (constant query count)
+  POST /api/v1/workout-templates/<template_id>/start  (instantiate + progression)
+  POST /api/v1/workouts/<workout_id>/complete         (PRs and rewards for the plan)
+
+Pure logic functions tested in isolation:
+  parse_rep_range, suggest_progression
+"""
+
+import datetime
+
+from sqlalchemy import event
+
+
+TODAY = datetime.date.today()
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _template(db, user_id, name, rows):
+    from models import Exercise, WorkoutTemplate, TemplateExercise
+    template = WorkoutTemplate(user_id=user_id, name=name, duration_minutes=50)
+    db.session.add(template)
+    db.session.flush()
+    for order, (exercise_name, sets, reps) in enumerate(rows, 1):
+        exercise = Exercise.query.filter_by(name=exercise_name).first()
+        if not exercise:
+            exercise = Exercise(user_id=user_id, name=exercise_name)
+            db.session.add(exercise)
+            db.session.flush()
+        db.session.add(TemplateExercise(template_id=template.id, exercise_id=exercise.id,
+                                        sets=sets, reps=reps, order_index=order))
+    db.session.commit()
+    return template
+
+
+class TestProgression:
+
+    def test_parse_rep_range(self):
+        from utils.workout_templates import parse_rep_range
+        assert parse_rep_range("8-12") == (8, 12)
+        assert parse_rep_range("10") == (10, 10)
+        assert parse_rep_range("AMRAP") is None
+        assert parse_rep_range(None) is None
+
+    def test_double_progression(self):
+        from utils.workout_templates import WEIGHT_INCREMENT, suggest_progression
+        # Top of the range reached: more weight, back to the bottom
+        assert suggest_progression((8, 12), {"weight": 60.0, "reps": 12}) == (8, 60.0 + WEIGHT_INCREMENT)
+        # Inside the range: same weight, one more rep
+        assert suggest_progression((8, 12), {"weight": 60.0, "reps": 9}) == (10, 60.0)
+        # Never performed: template values
+        assert suggest_progression((8, 12), None, template_weight=20) == (8, 20.0)
+
+
+class TestStartFromTemplate:
+
+    def test_start_prefills_from_last_performance(self, client, db, auth_headers):
+        from models import Workout
+        uid = auth_headers["_user_id"]
+        template = _template(db, uid, "Push A", [("Bench Press", 3, "8-12"), ("Dips", 3, "10")])
+
+        resp = client.post(f"/api/v1/workout-templates/{template.id}/start", headers=_auth(auth_headers))
+        assert resp.status_code == 201
+        first = resp.get_json()["workout"]
+        assert [e["name"] for e in first["exercises"]] == ["Bench Press", "Dips"]
+        assert [e["reps"] for e in first["exercises"]] == [8, 10]
+        assert first["exercise_count"] == 2
+
+        # Log the bench at the top of the range, then start again
+        bench_row = first["exercises"][0]
+        client.put(f"/api/v1/workouts/{first['id']}/exercises/{bench_row['id']}",
+                   json={"sets": 3, "reps": 12, "weight": 60}, headers=_auth(auth_headers))
+        client.post(f"/api/v1/workouts/{first['id']}/complete", headers=_auth(auth_headers))
+
+        resp = client.post(f"/api/v1/workout-templates/{template.id}/start",
+                           json={"date": TODAY.isoformat()}, headers=_auth(auth_headers))
+        bench = resp.get_json()["workout"]["exercises"][0]
+        assert (bench["reps"], bench["weight"]) == (8, 62.5)
+        assert bench["last_performance"]["reps"] == 12
+
+        workout = db.session.get(Workout, resp.get_json()["workout_id"])
+        assert workout.total_sets == 6
+
+    def test_start_is_a_plan_until_completed(self, client, db, auth_headers, monkeypatch):
+        import utils.rewards
+        from models.personal_record import PersonalRecord
+        awarded = []
+        monkeypatch.setattr(utils.rewards, "award_points", lambda *args, **kwargs: awarded.append(kwargs))
+        uid = auth_headers["_user_id"]
+        template = _template(db, uid, "Push A", [("Bench Press", 3, "8-12")])
+        resp = client.post("/api/v1/workouts", json={
+            "type": "Strength", "duration": 45,
+            "exercises": [{"exercise_name": "Bench Press", "sets": 3, "reps": 12, "weight": 60}],
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+        assert len(awarded) == 1
+
+        resp = client.post(f"/api/v1/workout-templates/{template.id}/start", headers=_auth(auth_headers))
+        planned = resp.get_json()["workout"]
+        assert planned["completed_at"] is None
+        assert planned["exercises"][0]["weight"] == 62.5
+        assert "prs_achieved" not in resp.get_json()
+        assert PersonalRecord.query.filter_by(user_id=uid).one().max_weight == 60
+        assert len(awarded) == 1
+
+        resp = client.post(f"/api/v1/workouts/{planned['id']}/complete", headers=_auth(auth_headers))
+        assert resp.status_code == 200
+        assert resp.get_json()["workout"]["completed_at"] is not None
+        assert "max_weight" in resp.get_json()["prs_achieved"][0]["pr_types"]
+        assert PersonalRecord.query.filter_by(user_id=uid).one().max_weight == 62.5
+        assert awarded[-1]["entity_id"] == planned["id"]
+
+        resp = client.post(f"/api/v1/workouts/{planned['id']}/complete", headers=_auth(auth_headers))
+        assert resp.status_code == 409
+
+    def test_other_users_templates_are_hidden(self, client, db, auth_headers, make_user):
+        other = make_user()
+        template = _template(db, other.id, "Theirs", [("Squat", 5, "5")])
+        resp = client.post(f"/api/v1/workout-templates/{template.id}/start", headers=_auth(auth_headers))
+        assert resp.status_code == 404
+
+    def test_listing_is_constant_query(self, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        def _count():
+            statements.clear()
+            event.listen(db.engine, "before_cursor_execute", _record)
+            try:
+                client.get("/api/v1/workout-templates", headers=_auth(auth_headers))
+            finally:
+                event.remove(db.engine, "before_cursor_execute", _record)
+            return len(statements)
+
+        _template(db, uid, "A", [("Squat", 5, "5"), ("Lunge", 3, "10")])
+        _count()  # warms the cached system templates
+        few = _count()
+        for n in range(5):
+            _template(db, uid, f"B{n}", [("Squat", 5, "5"), ("Row", 3, "10"), ("Curl", 3, "12")])
+        assert _count() == few
@@ -0,0 +1,121 @@
+"""
+test_workouts.py - Tests for backend/api/workouts.py list views and the
+                   per-workout counters in backend/utils/workout_totals.py
+
+Endpoints covered:
+  POST   /api/v1/workouts                     (counters set on create)
+  GET    /api/v1/workouts                     (keyset pages, fields= projection)
+  POST   /api/v1/workouts/<workout_id>/exercises
+  DELETE /api/v1/workouts/<workout_id>/exercises/<workout_exercise_id>
+"""
+
+import datetime
+
+
+TODAY = datetime.date.today()
+
+
+def _auth(auth_headers):
+    return {"Authorization": auth_headers["Authorization"]}
+
+
+def _exercise(db, user_id, name="Bench Press"):
+    from models import Exercise
+    e = Exercise(user_id=user_id, name=name)
+    db.session.add(e)
+    db.session.commit()
+    return e
+
+
+def _workout(db, user_id, date, workout_type="Strength"):
+    from models import Workout
+    w = Workout(user_id=user_id, type=workout_type, duration=45, date=date)
+    db.session.add(w)
+    db.session.commit()
+    return w
+
+
+class TestWorkoutCounters:
+
+    def test_counters_follow_exercise_changes(self, client, db, auth_headers):
+        from models import Workout
+        uid = auth_headers["_user_id"]
+        bench = _exercise(db, uid)
+
+        resp = client.post("/api/v1/workouts", json={
+            "type": "Push", "duration": 60, "date": TODAY.isoformat(),
+            "exercises": [
+                {"exercise_id": bench.id, "sets": 3, "reps": 10, "weight": 100},
+                {"exercise_id": bench.id, "sets": 2, "reps": 5, "weight": 120},
+            ],
+        }, headers=_auth(auth_headers))
+        assert resp.status_code == 201
+        created = resp.get_json()["workout"]
+        assert (created["exercise_count"], created["total_sets"], created["total_volume"]) == (2, 5, 4200.0)
+
+        workout_id = resp.get_json()["workout_id"]
+        resp = client.post(f"/api/v1/workouts/{workout_id}/exercises", json={
+            "exercise_id": bench.id, "sets": 1, "reps": 1, "weight": 140,
+        }, headers=_auth(auth_headers))
+        added_id = resp.get_json()["exercise"]["id"]
+        workout = db.session.get(Workout, workout_id)
+        assert (workout.exercise_count, workout.total_sets, workout.total_volume) == (3, 6, 4340.0)
+
+        client.delete(f"/api/v1/workouts/{workout_id}/exercises/{added_id}", headers=_auth(auth_headers))
+        db.session.expire_all()
+        workout = db.session.get(Workout, workout_id)
+        assert (workout.exercise_count, workout.total_sets, workout.total_volume) == (2, 5, 4200.0)
+
+
+class TestWorkoutList:
+
+    def test_unpaged_list_returns_everything(self, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        for n in range(3):
+            _workout(db, uid, TODAY - datetime.timedelta(days=n))
+
+        resp = client.get("/api/v1/workouts", headers=_auth(auth_headers))
+        data = resp.get_json()
+        assert len(data["workouts"]) == 3
+        assert data["next_cursor"] is None
+
+    def test_keyset_pages_cover_history_once(self, client, db, auth_headers):
+        uid = auth_headers["_user_id"]
+        ids = [_workout(db, uid, TODAY - datetime.timedelta(days=n // 2)).id for n in range(5)]
+
+        seen, cursor = [], None
+        while True:
+            url = "/api/v1/workouts?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            data = client.get(url, headers=_auth(auth_headers)).get_json()
+            seen.extend(w["id"] for w in data["workouts"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        # Newest day first, higher id first within a day
+        assert seen == [ids[1], ids[0], ids[3], ids[2], ids[4]]
+
+    def test_every_workout_has_a_cursor_date(self, client, db, auth_headers):
+        from models import Workout
+        uid = auth_headers["_user_id"]
+        undated = _workout(db, uid, None)
+        _workout(db, uid, TODAY)
+        assert undated.date == datetime.datetime.utcnow().date()
+
+        client.put(f"/api/v1/workouts/{undated.id}", json={"date": None}, headers=_auth(auth_headers))
+        assert db.session.get(Workout, undated.id).date is not None
+
+        data = client.get("/api/v1/workouts?limit=1", headers=_auth(auth_headers)).get_json()
+        assert data["next_cursor"] is not None
+
+    def test_fields_projection(self, client, db, auth_headers):
+        _workout(db, auth_headers["_user_id"], TODAY)
+
+        resp = client.get("/api/v1/workouts?fields=id,type", headers=_auth(auth_headers))
+        assert set(resp.get_json()["workouts"][0]) == {"id", "type"}
+
+        resp = client.get("/api/v1/workouts?fields=id,password", headers=_auth(auth_headers))
+        assert resp.status_code == 400
+
+    def test_malformed_cursor_rejected(self, client, auth_headers):
+        resp = client.get("/api/v1/workouts?cursor=yesterday", headers=_auth(auth_headers))
+        assert resp.status_code == 400
@@ -6,6 +6,7 @@ from models import Workout, HabitLog, Goal, UserPoint, Habit, ProgressPhoto
 from database import db
 from datetime import datetime, timedelta
 from sqlalchemy import func
+from utils.habit_calendar import consistency_rate
 
 
 def get_achievement_progress(user_id):
@@ -16,7 +17,7 @@ def get_achievement_progress(user_id):
     progress = {}
 
     # Workout counts
-    workout_count = Workout.query.filter_by(user_id=user_id).count()
+    workout_count = Workout.query.filter(Workout.user_id == user_id, Workout.is_completed).count()
     progress['first_workout'] = min(workout_count, 1)
     progress['workouts_10'] = min(workout_count, 10)
     progress['workouts_50'] = min(workout_count, 50)
@@ -25,19 +26,22 @@ def get_achievement_progress(user_id):
 
     # Workout variety
     distinct_types = db.session.query(Workout.type).filter(
-        Workout.user_id == user_id
+        Workout.user_id == user_id,
+        Workout.is_completed,
     ).distinct().count()
     progress['variety_seeker'] = min(distinct_types, 10)
 
     # Early bird / Night owl (based on created_at time)
     early_count = Workout.query.filter(
         Workout.user_id == user_id,
+        Workout.is_completed,
         func.extract('hour', Workout.created_at) < 9
     ).count()
     progress['early_bird'] = min(early_count, 20)
 
     night_count = Workout.query.filter(
         Workout.user_id == user_id,
+        Workout.is_completed,
         func.extract('hour', Workout.created_at) >= 20
     ).count()
     progress['night_owl'] = min(night_count, 20)
@@ -54,8 +58,8 @@ def get_achievement_progress(user_id):
     progress['habits_created_5'] = min(habit_count, 5)
     progress['habits_created_10'] = min(habit_count, 10)
 
-    # Consistency King: placeholder (would need rolling 30-day calc)
-    progress['habit_consistency_90'] = 0
+    # Consistency King: rolling 30-day completion rate, as a percentage
+    progress['habit_consistency_90'] = min(int(consistency_rate(user_id) * 100), 90)
 
     # Goal counts
     goal_count = Goal.query.filter_by(user_id=user_id).count()
@@ -87,18 +91,18 @@ def get_achievement_progress(user_id):
 
     # Workout streaks
     workout_dates = db.session.query(Workout.date).filter(
-        Workout.user_id == user_id
+        Workout.user_id == user_id,
+        Workout.is_completed,
     ).distinct().order_by(Workout.date.desc()).all()
     workout_streak = _calculate_streak({d[0] for d in workout_dates})
     progress['streak_workout_7'] = min(workout_streak, 7)
     progress['streak_workout_14'] = min(workout_streak, 14)
     progress['streak_workout_30'] = min(workout_streak, 30)
 
-    # Habit streaks (approximate: consecutive days with any habit logged)
-    habit_dates = db.session.query(func.date(HabitLog.timestamp)).join(
-        Habit, HabitLog.habit_id == Habit.id
-    ).filter(Habit.user_id == user_id).distinct().all()
-    habit_streak = _calculate_streak({d[0] for d in habit_dates})
+    # Habit streaks: the longest run on any single habit
+    habit_streak = db.session.query(func.max(Habit.longest_streak)).filter(
+        Habit.user_id == user_id
+    ).scalar() or 0
     progress['streak_habit_7'] = min(habit_streak, 7)
     progress['streak_habit_30'] = min(habit_streak, 30)
     progress['streak_habit_60'] = min(habit_streak, 60)
@@ -113,6 +117,7 @@ def get_achievement_progress(user_id):
     # Weekend Warrior: Saturdays worked out (approximate count)
     sat_count = Workout.query.filter(
         Workout.user_id == user_id,
+        Workout.is_completed,
         func.extract('dow', Workout.date) == 6
     ).count()
     progress['weekend_warrior'] = min(sat_count, 10)
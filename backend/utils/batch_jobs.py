@@ -0,0 +1,56 @@
+"""
+Helpers for offline batch jobs (scripts/*).
+
+Jobs split user ids into chunks and process each chunk in its own app
+context, DB session and transaction, optionally across worker threads.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from database import db
+
+
+def chunked(ids, chunk_size):
+    ids = list(ids)
+    return [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+
+def all_user_ids():
+    from models import User
+    return [row.id for row in db.session.query(User.id).order_by(User.id)]
+
+
+def _run_chunk(app, fn, chunk):
+    with app.app_context():
+        try:
+            result = fn(chunk)
+            db.session.commit()
+            return result
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
+
+
+def run_in_chunks(app, ids, fn, chunk_size=500, workers=4, label='items'):
+    """
+    Call fn(chunk) for each chunk of ids, committing per chunk.
+    Prints one progress line per chunk. Returns (results, failed_chunk_count).
+    """
+    chunks = chunked(ids, chunk_size)
+    print(f"Processing {len(ids)} {label} in {len(chunks)} chunks ({workers} workers)")
+
+    results = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = {pool.submit(_run_chunk, app, fn, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                result = future.result()
+                results.append(result)
+                print(f"  [OK] {label} {chunk[0]}-{chunk[-1]}: {result}")
+            except Exception as e:
+                failed += 1
+                print(f"  [FAIL] {label} {chunk[0]}-{chunk[-1]}: {e}")
+
+    return results, failed
@@ -0,0 +1,150 @@
+"""
+Pre-encoded responses for global, read-mostly catalog endpoints (exercise
+library, exercise bank, programs, system templates). get_entry() also
+serves the cached payload to endpoints that merge in per-user data.
+
+Each catalog has a version in the shared cache. A worker builds a
+response body once per (catalog, key) and version, encodes it to JSON,
+gzip and (when the optional brotli package is installed) brotli, and hashes
+it into a strong ETag, suffixed per encoding. Requests are answered from
+those bytes: 304 when If-None-Match matches, otherwise the best encoding
+the client accepts.
+Writers (seed scripts, admin endpoints) call invalidate_catalog() after
+committing, which bumps the version so every worker rebuilds on its next
+check.
+"""
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, request
+from database import cache
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+
+EXERCISE_LIBRARY = 'exercise_library'
+EXERCISE_BANK = 'exercise_bank'
+EXERCISES = 'exercises'
+PROGRAMS = 'programs'
+SYSTEM_TEMPLATES = 'system_templates'
+
+# How long a worker trusts its copy before re-checking the shared version
+VERSION_CHECK_SECONDS = 30
+# Bound on cached bodies per process (filtered variants add up)
+MAX_ENTRIES = 256
+# Strong ETags must differ per Content-Encoding (RFC 9110 8.8.3)
+ENCODING_ETAG_SUFFIXES = {None: '', 'gzip': '-gz', 'br': '-br'}
+
+_VERSION_KEY_PREFIX = 'catalog_version:'
+
+_entries = OrderedDict()
+_checked = {}
+_lock = threading.Lock()
+
+
+def _version_key(catalog):
+    return f"{_VERSION_KEY_PREFIX}{catalog}"
+
+
+def catalog_version(catalog):
+    """The catalog's shared version, re-read at most every VERSION_CHECK_SECONDS."""
+    now = time.monotonic()
+    with _lock:
+        checked = _checked.get(catalog)
+        if checked and now - checked[1] < VERSION_CHECK_SECONDS:
+            return checked[0]
+
+    version = cache.get(_version_key(catalog))
+    if version is None:
+        version = 1
+        cache.set(_version_key(catalog), version, timeout=0)
+    with _lock:
+        _checked[catalog] = (version, now)
+    return version
+
+
+def invalidate_catalog(catalog):
+    """Bump the catalog's version after its data changes; caller has committed."""
+    version = cache.get(_version_key(catalog)) or 1
+    cache.set(_version_key(catalog), version + 1, timeout=0)
+    with _lock:
+        _checked.pop(catalog, None)
+        for key in [k for k in _entries if k[0] == catalog]:
+            del _entries[key]
+
+
+def clear_local():
+    """Drop this process's cached bodies and version checks (shared versions are kept)."""
+    with _lock:
+        _entries.clear()
+        _checked.clear()
+
+
+class CatalogEntry:
+    """One pre-encoded response body."""
+
+    def __init__(self, version, payload):
+        self.version = version
+        self.payload = payload
+        self.body = current_app.json.dumps(payload).encode('utf-8')
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        self.gzip = gzip.compress(self.body, compresslevel=9)
+        self.brotli = brotli.compress(self.body) if brotli else None
+
+
+def get_entry(catalog, key, build, version=None):
+    """
+    The cached entry for (catalog, key), rebuilt from build() -> payload
+    when the catalog version moved. `version` overrides the shared one for
+    catalogs versioned elsewhere (e.g. the library data file).
+    """
+    version = catalog_version(catalog) if version is None else version
+    with _lock:
+        entry = _entries.get((catalog, key))
+        if entry is not None and entry.version == version:
+            _entries.move_to_end((catalog, key))
+            return entry
+
+    entry = CatalogEntry(version, build())
+    with _lock:
+        _entries[(catalog, key)] = entry
+        _entries.move_to_end((catalog, key))
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return entry
+
+
+def catalog_response(catalog, key, build, version=None):
+    """
+    Serve (catalog, key) as a 304 or pre-compressed 200 response. Each
+    encoding gets its own strong ETag (<hash>, <hash>-gz, <hash>-br); any of
+    them revalidates, since they name the same payload.
+    """
+    entry = get_entry(catalog, key, build, version)
+
+    accepted = request.accept_encodings
+    if entry.brotli is not None and accepted['br']:
+        body, encoding = entry.brotli, 'br'
+    elif accepted['gzip']:
+        body, encoding = entry.gzip, 'gzip'
+    else:
+        body, encoding = entry.body, None
+    etag = entry.etag + ENCODING_ETAG_SUFFIXES[encoding]
+
+    if any(entry.etag + suffix in request.if_none_match for suffix in ENCODING_ETAG_SUFFIXES.values()):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(body, status=200, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Behind login, so private; no-cache makes clients revalidate with the ETag
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
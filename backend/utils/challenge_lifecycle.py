@@ -0,0 +1,136 @@
+"""
+Challenge lifecycle: finalizing challenges whose end_date has passed.
+
+Run periodically by scripts/finalize_challenges.py. Each batch ranks all
+participants with one windowed query, then writes ranks, challenge status,
+the points ledger and result notifications with bulk statements, and
+drops the challenge's live leaderboard.
+"""
+from datetime import datetime
+from sqlalchemy import func, update
+from database import db
+from models.challenge import Challenge, ChallengeParticipant
+from utils.gamification_helper import award_points_bulk
+from utils.notifications import create_notifications_bulk
+from utils.leaderboards import queue_leaderboard_drop
+
+
+def expired_challenge_ids(now=None):
+    """Ids of challenges still marked active after their end_date."""
+    now = now or datetime.utcnow()
+    rows = db.session.query(Challenge.id).filter(
+        Challenge.status == 'active',
+        Challenge.end_date <= now,
+    ).order_by(Challenge.id)
+    return [row.id for row in rows]
+
+
+def _ranked_participants(challenge_ids):
+    """
+    (challenge_id, participant_id, user_id, progress, status, rank) for every
+    non-withdrawn participant. Ties on progress go to whoever got there first.
+    """
+    rank = func.row_number().over(
+        partition_by=ChallengeParticipant.challenge_id,
+        order_by=(
+            ChallengeParticipant.current_progress.desc(),
+            ChallengeParticipant.completed_at.is_(None),
+            ChallengeParticipant.completed_at.asc(),
+            ChallengeParticipant.joined_at.asc(),
+            ChallengeParticipant.id.asc(),
+        ),
+    ).label('rank')
+
+    return db.session.query(
+        ChallengeParticipant.challenge_id,
+        ChallengeParticipant.id,
+        ChallengeParticipant.user_id,
+        ChallengeParticipant.current_progress,
+        ChallengeParticipant.status,
+        rank,
+    ).filter(
+        ChallengeParticipant.challenge_id.in_(challenge_ids),
+        ChallengeParticipant.status != 'withdrawn',
+    ).all()
+
+
+def _result_message(title, rank, ranked_count, completed, won):
+    if won:
+        return f"You won the challenge \"{title}\"!"
+    placing = f"You finished #{rank} of {ranked_count} in \"{title}\""
+    return f"{placing} and completed the target." if completed else f"{placing}."
+
+
+def finalize_challenges(challenge_ids, now=None):
+    """
+    Close out the given challenges if they are still active and past their
+    end_date. Rows locked by a concurrent run are skipped. Caller commits.
+    Returns the number of challenges finalized.
+    """
+    now = now or datetime.utcnow()
+    challenges = Challenge.query.filter(
+        Challenge.id.in_(challenge_ids),
+        Challenge.status == 'active',
+        Challenge.end_date <= now,
+    ).with_for_update(skip_locked=True).all()
+    if not challenges:
+        return 0
+
+    by_id = {challenge.id: challenge for challenge in challenges}
+    ranked = _ranked_participants(list(by_id))
+
+    ranked_counts = {}
+    for challenge_id, *_ in ranked:
+        ranked_counts[challenge_id] = ranked_counts.get(challenge_id, 0) + 1
+
+    winners = {}
+    participant_updates = []
+    awards = []
+    notifications = []
+    for challenge_id, participant_id, user_id, progress, status, rank in ranked:
+        challenge = by_id[challenge_id]
+        completed = status == 'completed'
+        won = rank == 1 and (progress or 0) > 0
+        if won:
+            winners[challenge_id] = user_id
+
+        participant_updates.append({'id': participant_id, 'final_rank': rank})
+        if completed:
+            awards.append({
+                'user_id': user_id, 'reason': 'challenge_completed',
+                'entity_type': 'challenge', 'entity_id': challenge_id,
+            })
+        if won:
+            awards.append({
+                'user_id': user_id, 'reason': 'challenge_won',
+                'entity_type': 'challenge', 'entity_id': challenge_id,
+            })
+        notifications.append({
+            'user_id': user_id,
+            'type': 'challenge_result',
+            'message': _result_message(challenge.title, rank, ranked_counts[challenge_id], completed, won),
+            'priority': 'high' if won or completed else 'normal',
+            'entity_type': 'challenge',
+            'entity_id': challenge_id,
+        })
+
+    db.session.execute(update(Challenge), [
+        {
+            'id': challenge.id,
+            'status': 'completed',
+            'winner_id': winners.get(challenge.id),
+            'finalized_at': now,
+            'updated_at': now,
+        }
+        for challenge in challenges
+    ])
+    if participant_updates:
+        db.session.execute(update(ChallengeParticipant), participant_updates)
+    award_points_bulk(awards)
+    create_notifications_bulk(notifications)
+
+    # Final standings are served from final_rank from now on
+    for challenge in challenges:
+        queue_leaderboard_drop(challenge.id)
+
+    return len(challenges)
@@ -0,0 +1,214 @@
+"""
+Challenge progress maintenance.
+
+Progress is applied incrementally when a workout is logged (the delta for
+that one workout), so leaderboards read current_progress directly. Full
+recomputes (edits, deletes, repairs) use set-based SQL aggregates over all
+participants of a challenge at once.
+"""
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func, literal_column
+from database import db
+from models import Workout, WorkoutExercise
+from models.challenge import Challenge, ChallengeParticipant
+from utils.leaderboards import queue_score_updates
+
+
+# Participant statuses that still accrue progress
+COUNTING_STATUSES = ('active', 'completed')
+
+
+def _mark_completion(participant, challenge):
+    if (participant.status == 'active'
+            and challenge.target_value
+            and participant.current_progress >= challenge.target_value):
+        participant.status = 'completed'
+        participant.completed_at = datetime.utcnow()
+
+
+def _active_participations(user_id, day):
+    """The user's participant rows in active challenges whose window covers day."""
+    return db.session.query(ChallengeParticipant, Challenge).join(
+        Challenge, Challenge.id == ChallengeParticipant.challenge_id
+    ).filter(
+        ChallengeParticipant.user_id == user_id,
+        ChallengeParticipant.status.in_(COUNTING_STATUSES),
+        Challenge.status == 'active',
+        func.date(Challenge.start_date) <= day,
+        func.date(Challenge.end_date) >= day,
+    ).all()
+
+
+def apply_workout_to_challenges(user_id, workout):
+    """
+    Apply one newly logged workout to every active challenge the user is in.
+    Two queries regardless of history size; streak challenges are recomputed
+    for this user only. Caller commits.
+    """
+    if not workout.date:
+        return []
+
+    participations = _active_participations(user_id, workout.date)
+    if not participations:
+        return []
+
+    # Per-exercise totals for just this workout
+    volume_expr = WorkoutExercise.weight * WorkoutExercise.reps * WorkoutExercise.sets
+    per_exercise = db.session.query(
+        WorkoutExercise.exercise_id,
+        func.sum(volume_expr),
+        func.max(WorkoutExercise.weight),
+    ).filter(
+        WorkoutExercise.workout_id == workout.id
+    ).group_by(WorkoutExercise.exercise_id).all()
+
+    workout_volume = sum(float(volume or 0) for _, volume, _ in per_exercise)
+    max_weight_by_exercise = {ex_id: float(w or 0) for ex_id, _, w in per_exercise}
+
+    updated = []
+    for participant, challenge in participations:
+        current = participant.current_progress or 0
+
+        if challenge.challenge_type == 'workout_count':
+            participant.current_progress = current + 1
+        elif challenge.challenge_type == 'total_volume':
+            participant.current_progress = current + workout_volume
+        elif challenge.challenge_type == 'specific_exercise':
+            top = max_weight_by_exercise.get(challenge.target_exercise_id, 0)
+            participant.current_progress = max(current, top)
+        elif challenge.challenge_type == 'streak':
+            streaks = recompute_challenge_progress(challenge, user_ids=[user_id], commit_rows=False)
+            participant.current_progress = streaks.get(user_id, 0)
+        else:
+            continue
+
+        _mark_completion(participant, challenge)
+        queue_score_updates(challenge.id, {user_id: participant.current_progress})
+        updated.append(challenge.id)
+
+    db.session.flush()
+    return updated
+
+
+def _window_filter(query, challenge):
+    return query.filter(
+        Workout.date >= challenge.start_date.date(),
+        Workout.date <= challenge.end_date.date(),
+        Workout.is_completed,
+    )
+
+
+def _day_number(column):
+    """Integer day number for a DATE column, for gaps-and-islands arithmetic."""
+    if db.engine.dialect.name == 'sqlite':
+        return func.julianday(column)
+    return column - literal_column("DATE '1970-01-01'")
+
+
+def _streak_query(challenge, user_ids):
+    """
+    Gaps-and-islands: consecutive workout days share (day_number - row_number).
+    Returns (user_id, length) for the island ending on each user's latest day.
+    """
+    days = _window_filter(
+        db.session.query(Workout.user_id.label('user_id'), Workout.date.label('day'))
+        .filter(Workout.user_id.in_(user_ids)),
+        challenge
+    ).distinct().subquery()
+
+    islands = db.session.query(
+        days.c.user_id,
+        days.c.day,
+        (_day_number(days.c.day) - func.row_number().over(
+            partition_by=days.c.user_id, order_by=days.c.day
+        )).label('grp'),
+    ).subquery()
+
+    runs = db.session.query(
+        islands.c.user_id,
+        func.count().label('length'),
+        func.row_number().over(
+            partition_by=islands.c.user_id, order_by=func.max(islands.c.day).desc()
+        ).label('recency'),
+    ).group_by(islands.c.user_id, islands.c.grp).subquery()
+
+    return db.session.query(runs.c.user_id, runs.c.length).filter(runs.c.recency == 1)
+
+
+def _aggregate_query(challenge, user_ids):
+    """One grouped query returning (user_id, progress) for every given user."""
+    base = db.session.query(Workout.user_id).filter(Workout.user_id.in_(user_ids))
+
+    if challenge.challenge_type == 'workout_count':
+        query = base.add_columns(func.count(Workout.id))
+    elif challenge.challenge_type == 'total_volume':
+        query = base.join(WorkoutExercise, WorkoutExercise.workout_id == Workout.id).add_columns(
+            func.sum(WorkoutExercise.weight * WorkoutExercise.reps * WorkoutExercise.sets)
+        )
+    elif challenge.challenge_type == 'specific_exercise':
+        if not challenge.target_exercise_id:
+            return []
+        query = base.join(WorkoutExercise, WorkoutExercise.workout_id == Workout.id).filter(
+            WorkoutExercise.exercise_id == challenge.target_exercise_id
+        ).add_columns(func.max(WorkoutExercise.weight))
+    elif challenge.challenge_type == 'streak':
+        return _streak_query(challenge, user_ids).all()
+    else:
+        return []
+
+    return _window_filter(query, challenge).group_by(Workout.user_id).all()
+
+
+def recompute_challenge_progress(challenge, user_ids=None, commit_rows=True):
+    """
+    Recompute progress from history with SQL aggregates for the given
+    participants (all counting participants by default).
+
+    Returns {user_id: progress}. With commit_rows, participant rows are
+    updated (and completion marked); caller commits.
+    """
+    participants = []
+    if user_ids is None or commit_rows:
+        query = ChallengeParticipant.query.filter(
+            ChallengeParticipant.challenge_id == challenge.id,
+            ChallengeParticipant.status.in_(COUNTING_STATUSES),
+        )
+        if user_ids is not None:
+            query = query.filter(ChallengeParticipant.user_id.in_(user_ids))
+        participants = query.all()
+        user_ids = [p.user_id for p in participants]
+
+    if not user_ids:
+        return {}
+
+    progress = {user_id: float(value or 0) for user_id, value in _aggregate_query(challenge, user_ids)}
+
+    if commit_rows:
+        for participant in participants:
+            participant.current_progress = progress.get(participant.user_id, 0)
+            _mark_completion(participant, challenge)
+        queue_score_updates(challenge.id, {p.user_id: p.current_progress for p in participants})
+        db.session.flush()
+
+    return {user_id: progress.get(user_id, 0) for user_id in user_ids}
+
+
+def refresh_user_challenges(user_id):
+    """
+    Recompute every active challenge the user participates in, after a
+    workout edit or delete that cannot be expressed as a delta. Caller commits.
+    """
+    try:
+        challenges = Challenge.query.join(
+            ChallengeParticipant, Challenge.id == ChallengeParticipant.challenge_id
+        ).filter(
+            ChallengeParticipant.user_id == user_id,
+            ChallengeParticipant.status.in_(COUNTING_STATUSES),
+            Challenge.status == 'active',
+        ).all()
+        for challenge in challenges:
+            recompute_challenge_progress(challenge, user_ids=[user_id])
+    except Exception as e:
+        current_app.logger.error(f"Error refreshing challenges for user {user_id}: {e}")
+        raise
@@ -0,0 +1,90 @@
+"""
+The exercise library (form instructions and metadata per exercise), loaded
+lazily from data/exercise_library.json.
+
+Entries are keyed by the lowercase DB exercise name and carry muscle_groups,
+equipment, category, difficulty and four phase lists: setup, lifting,
+lowering and completion (lowering is [] for isometric holds). A search
+index (utils/exercise_search.py) is built alongside on first load.
+
+The data file is versioned: bump "version" whenever its contents change so
+cached responses keyed on library_version() are invalidated. Under gunicorn the
+library is loaded once in the master (see gunicorn.conf.py) and frozen out of
+the garbage collector, so forked workers share its pages copy-on-write.
+"""
+import json
+import os
+import threading
+from utils.exercise_search import SearchIndex
+
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'exercise_library.json')
+
+_library = None
+_version = None
+_index = None
+_lock = threading.Lock()
+
+
+def load_library():
+    """Load eagerly, e.g. in the gunicorn master before workers fork."""
+    return get_library()
+
+
+def _load():
+    global _library, _version, _index
+    with open(DATA_PATH, encoding='utf-8') as f:
+        document = json.load(f)
+    exercises = document['exercises']
+    _index = SearchIndex(
+        {
+            'name': name,
+            'muscle_group': details['muscle_groups'],
+            'equipment': details['equipment'],
+            'category': details.get('category', ''),
+            'difficulty': details['difficulty'],
+            'item': serialize_entry(name, details),
+        }
+        for name, details in exercises.items()
+    )
+    _version = document['version']
+    _library = exercises
+
+
+def get_library():
+    """{lowercase exercise name: details}, loaded on first use."""
+    if _library is None:
+        with _lock:
+            if _library is None:
+                _load()
+    return _library
+
+
+def library_index():
+    """SearchIndex over the library, built with it at load time."""
+    get_library()
+    return _index
+
+
+def library_version():
+    get_library()
+    return _version
+
+
+def get_entry(name):
+    """Library details for an exercise name (any case), or None."""
+    return get_library().get(name.lower().strip())
+
+
+def serialize_entry(name, details):
+    return {
+        'name': name.title(),
+        'muscle_groups': details['muscle_groups'],
+        'equipment': details['equipment'],
+        'category': details.get('category', ''),
+        'difficulty': details['difficulty'],
+        'setup': details['setup'],
+        'lifting': details['lifting'],
+        'lowering': details['lowering'],
+        'completion': details['completion'],
+    }
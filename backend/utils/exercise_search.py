@@ -0,0 +1,289 @@
+"""
+In-memory search over the exercise catalogs.
+
+SearchIndex tokenizes each document's name and builds its postings maps
+once, at load time:
+
+  prefixes   token prefix -> doc ids      (search-as-you-type)
+  token_docs token -> doc ids             (exact matches)
+  trigrams   padded trigram -> tokens     (typo-tolerant candidates)
+  facets     facet -> value -> doc ids    (filters and counts)
+
+A query matches a document when every query token matches one of its name
+tokens exactly, as a prefix, or within a small edit distance (typos and
+swapped letters, with candidates found through shared trigrams). Documents are ranked by the summed match quality, then by
+name. Facet counts are disjunctive: each facet's counts apply every filter
+except its own, so a UI can show how many results picking another value
+would give.
+"""
+import re
+import threading
+import time
+from collections import defaultdict
+from database import cache
+
+
+FACETS = ('muscle_group', 'equipment', 'category', 'difficulty')
+
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+FUZZY_SCORE = 1.0
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+# Query-string parameter for each facet
+FACET_PARAMS = {
+    'muscle': 'muscle_group',
+    'equipment': 'equipment',
+    'category': 'category',
+    'difficulty': 'difficulty',
+}
+
+
+def filters_from_args(args):
+    """Facet filters from request args (?muscle=&equipment=&category=&difficulty=)."""
+    return {facet: args.get(param, '') for param, facet in FACET_PARAMS.items() if args.get(param)}
+
+
+def normalize(text):
+    return _TOKEN.findall((text or '').lower())
+
+
+def _trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_edits(token):
+    return 0 if len(token) <= 2 else 1 if len(token) <= 5 else 2
+
+
+def _within_edits(a, b, limit):
+    """
+    Edit distance between a and b is at most `limit`, counting an adjacent
+    transposition as one edit (optimal string alignment).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return False
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], before[j - 2] + 1)
+        # A transposition reaches back two rows, so both must exceed the limit
+        if min(current) > limit and min(previous) > limit:
+            return False
+        before, previous = previous, current
+    return previous[-1] <= limit
+
+
+class SearchIndex:
+    """
+    Index over `documents`, each a dict with 'name', optional facet values
+    (a string or list per FACETS entry) and an 'item' payload. Results are
+    the matching documents' items. Filters on `substring_facets` match every
+    value containing the filter text; other facets match values exactly.
+    """
+
+    def __init__(self, documents, substring_facets=()):
+        self.documents = list(documents)
+        self.substring_facets = frozenset(substring_facets)
+        self.prefixes = defaultdict(set)
+        self.token_docs = defaultdict(set)
+        self.trigrams = defaultdict(set)
+        self.facets = {facet: defaultdict(set) for facet in FACETS}
+        self.facet_labels = {facet: {} for facet in FACETS}
+
+        for doc_id, doc in enumerate(self.documents):
+            for token in normalize(doc['name']):
+                self.token_docs[token].add(doc_id)
+                for end in range(1, len(token) + 1):
+                    self.prefixes[token[:end]].add(doc_id)
+                for gram in _trigrams(token):
+                    self.trigrams[gram].add(token)
+            for facet in FACETS:
+                values = doc.get(facet) or []
+                for value in [values] if isinstance(values, str) else values:
+                    key = value.strip().lower()
+                    if key:
+                        self.facets[facet][key].add(doc_id)
+                        self.facet_labels[facet].setdefault(key, value.strip())
+
+        self._order = sorted(range(len(self.documents)), key=lambda d: self.documents[d]['name'].lower())
+        self._all = set(range(len(self.documents)))
+
+    def _fuzzy_tokens(self, term):
+        """Indexed tokens within edit distance of `term`, with their similarity."""
+        limit = _max_edits(term)
+        if not limit:
+            return {}
+        grams = _trigrams(term)
+        shared = defaultdict(int)
+        for gram in grams:
+            for token in self.trigrams.get(gram, ()):
+                shared[token] += 1
+        matches = {}
+        for token, count in shared.items():
+            similarity = count / (len(grams) + len(_trigrams(token)) - count)
+            if similarity >= MIN_TRIGRAM_SIMILARITY and _within_edits(term, token, limit):
+                matches[token] = similarity
+        return matches
+
+    def _match(self, terms):
+        """{doc_id: score} for documents matching every term."""
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for doc_id in self.prefixes.get(term, ()):
+                term_scores[doc_id] = PREFIX_SCORE
+            for doc_id in self.token_docs.get(term, ()):
+                term_scores[doc_id] = EXACT_SCORE
+            for token, similarity in self._fuzzy_tokens(term).items():
+                for doc_id in self.token_docs[token]:
+                    term_scores[doc_id] = max(term_scores.get(doc_id, 0), FUZZY_SCORE * similarity)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return {}
+        return scores
+
+    def _facet_docs(self, facet, value):
+        values = self.facets[facet]
+        if facet not in self.substring_facets:
+            return values.get(value, set())
+        docs = set()
+        for key, key_docs in values.items():
+            if value in key:
+                docs |= key_docs
+        return docs
+
+    def _filtered(self, candidates, filters, skip=None):
+        for facet, value in filters.items():
+            if facet != skip:
+                candidates = candidates & self._facet_docs(facet, value)
+        return candidates
+
+    def search(self, query='', filters=None, limit=None):
+        """
+        Returns (results, total, facet_counts). `filters` maps facet name to
+        a value (case-insensitive); facet_counts maps facet to
+        [{'value', 'count'}] sorted by count.
+        """
+        filters = {
+            facet: value.strip().lower()
+            for facet, value in (filters or {}).items()
+            if facet in FACETS and value and value.strip()
+        }
+        terms = normalize(query)
+        scores = self._match(terms) if terms else None
+        candidates = set(scores) if scores is not None else self._all
+
+        matched = self._filtered(candidates, filters)
+        if scores is None:
+            ranked = [d for d in self._order if d in matched]
+        else:
+            ranked = sorted(matched, key=lambda d: (-scores[d], self.documents[d]['name'].lower()))
+
+        facet_counts = {}
+        for facet in FACETS:
+            within = self._filtered(candidates, filters, skip=facet)
+            counts = [
+                {'value': self.facet_labels[facet][value], 'count': len(docs & within)}
+                for value, docs in self.facets[facet].items()
+            ]
+            facet_counts[facet] = sorted(
+                (c for c in counts if c['count']), key=lambda c: (-c['count'], c['value'])
+            )
+
+        total = len(ranked)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.documents[d]['item'] for d in ranked], total, facet_counts
+
+
+# ---------------------------------------------------------------------------
+# Exercise bank (global exercises joined to the library)
+# ---------------------------------------------------------------------------
+
+_BANK_VERSION_KEY = 'exercise_bank_version'
+# How long a worker trusts its index before re-checking the shared version
+VERSION_CHECK_SECONDS = 30
+
+_bank = {'version': None, 'checked_at': 0.0, 'index': None}
+_bank_lock = threading.Lock()
+
+
+def _bank_version():
+    version = cache.get(_BANK_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.set(_BANK_VERSION_KEY, version, timeout=0)
+    return version
+
+
+def invalidate_exercise_bank():
+    """Bump the bank version after global exercises change; workers rebuild on next check."""
+    cache.set(_BANK_VERSION_KEY, _bank_version() + 1, timeout=0)
+    with _bank_lock:
+        _bank['checked_at'] = 0.0
+
+
+def bank_version():
+    """Version the current bank index was built from."""
+    get_bank_index()
+    return _bank['version']
+
+
+def _bank_document(exercise, lib_data):
+    muscle_groups = [m.strip() for m in (exercise.muscle_group or '').split(',') if m.strip()]
+    item = {
+        'id': str(exercise.id),
+        'name': exercise.name,
+        'category': exercise.category or '',
+        'muscle_groups': muscle_groups,
+        'equipment': exercise.equipment or '',
+        'difficulty': lib_data.get('difficulty', ''),
+        'setup': lib_data.get('setup', []),
+        'lifting': lib_data.get('lifting', []),
+        'lowering': lib_data.get('lowering', []),
+        'completion': lib_data.get('completion', []),
+    }
+    return {
+        'name': exercise.name,
+        'muscle_group': muscle_groups,
+        'equipment': item['equipment'],
+        'category': item['category'],
+        'difficulty': item['difficulty'],
+        'item': item,
+    }
+
+
+def get_bank_index():
+    """SearchIndex over global exercises, rebuilt when the bank version changes."""
+    from models import Exercise
+    from utils.exercise_library import get_entry
+
+    now = time.monotonic()
+    with _bank_lock:
+        if _bank['index'] is not None and now - _bank['checked_at'] < VERSION_CHECK_SECONDS:
+            return _bank['index']
+
+    version = _bank_version()
+    with _bank_lock:
+        if version != _bank['version']:
+            exercises = Exercise.query.filter(Exercise.is_global == True).order_by(Exercise.name).all()
+            # ?muscle= and ?equipment= have always matched substrings here
+            _bank['index'] = SearchIndex(
+                (_bank_document(ex, get_entry(ex.name) or {}) for ex in exercises),
+                substring_facets=('muscle_group', 'equipment'),
+            )
+            _bank['version'] = version
+        _bank['checked_at'] = now
+        return _bank['index']
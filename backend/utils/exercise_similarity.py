@@ -0,0 +1,172 @@
+"""
+Exercise similarity for substitution ("swap this exercise") suggestions.
+
+Each exercise is encoded as a weighted feature vector over its muscles
+(primary muscle weighted highest, plus the muscle's body region so "Upper
+Chest" still matches "Chest"), equipment, category and difficulty, taken
+from the Exercise row and its library entry. Vectors are L2-normalised, so
+a matrix product gives cosine similarity; the top-k neighbours of every
+exercise are computed offline in row blocks and stored in
+exercise_similarities, where a lookup is a primary-key range read.
+"""
+import numpy as np
+from datetime import datetime
+from sqlalchemy.orm import joinedload
+from database import db
+from models import Exercise
+from models.exercise_similarity import ExerciseSimilarity
+from utils.exercise_library import get_entry
+from utils.last_performance import last_performance_map
+
+
+TOP_K = 10
+
+FEATURE_WEIGHTS = {
+    'primary_muscle': 1.5,
+    'muscle': 1.0,
+    'region': 0.5,
+    'equipment': 0.8,
+    'category': 0.4,
+    'difficulty': 0.2,
+}
+
+# Rows of the similarity matrix computed at once (bounds peak memory)
+BLOCK_ROWS = 1024
+
+# Re-ranking: neighbours the user already performs move up, by up to this
+# much once they have been logged in FAMILIAR_WORKOUTS workouts
+PERFORMED_BOOST = 0.15
+FAMILIAR_WORKOUTS = 5
+
+
+def _clean(value):
+    return (value or '').strip().lower()
+
+
+def exercise_features(exercise, lib_data=None):
+    """{feature: weight} for an Exercise, enriched from its library entry."""
+    lib_data = lib_data or {}
+    muscles = [_clean(m) for m in (exercise.muscle_group or '').split(',')]
+    muscles += [_clean(m) for m in lib_data.get('muscle_groups', [])]
+
+    features = {}
+    seen = []
+    for muscle in muscles:
+        if muscle and muscle not in seen:
+            seen.append(muscle)
+    for position, muscle in enumerate(seen):
+        kind = 'primary_muscle' if position == 0 else 'muscle'
+        features[f"muscle:{muscle}"] = FEATURE_WEIGHTS[kind]
+        region = f"region:{muscle.split()[-1]}"
+        features[region] = max(features.get(region, 0), FEATURE_WEIGHTS['region'])
+
+    for kind, value in (
+        ('equipment', exercise.equipment or lib_data.get('equipment')),
+        ('category', exercise.category or lib_data.get('category')),
+        ('difficulty', lib_data.get('difficulty')),
+    ):
+        if _clean(value):
+            features[f"{kind}:{_clean(value)}"] = FEATURE_WEIGHTS[kind]
+    return features
+
+
+def feature_matrix(feature_dicts):
+    """Row-normalised (n, vocabulary) float32 matrix; featureless rows stay zero."""
+    vocabulary = {}
+    for features in feature_dicts:
+        for key in features:
+            vocabulary.setdefault(key, len(vocabulary))
+
+    matrix = np.zeros((len(feature_dicts), len(vocabulary)), dtype=np.float32)
+    for row, features in enumerate(feature_dicts):
+        for key, weight in features.items():
+            matrix[row, vocabulary[key]] = weight
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def top_k_neighbors(matrix, k=TOP_K):
+    """
+    (indices, scores) arrays of shape (n, k): each row's most similar other
+    rows by cosine similarity, best first. Ties keep matrix order; slots
+    without a positive match have index -1.
+    """
+    n = matrix.shape[0]
+    k = min(k, max(n - 1, 0))
+    indices = np.full((n, k), -1, dtype=np.int64)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if not k:
+        return indices, scores
+
+    for start in range(0, n, BLOCK_ROWS):
+        end = min(start + BLOCK_ROWS, n)
+        # Rounded as stored, so float32 noise cannot reorder true ties
+        block = np.round(matrix[start:end] @ matrix.T, 4)
+        block[np.arange(end - start), np.arange(start, end)] = -1.0  # never yourself
+        order = np.argsort(-block, axis=1, kind='stable')[:, :k]
+        best = np.take_along_axis(block, order, axis=1)
+        positive = best > 0
+        indices[start:end] = np.where(positive, order, -1)
+        scores[start:end] = np.where(positive, best, 0)
+    return indices, scores
+
+
+def rebuild_similarities(k=TOP_K):
+    """
+    Recompute every exercise's neighbours and replace exercise_similarities.
+    Returns the number of rows written; the caller commits.
+    """
+    exercises = Exercise.query.order_by(Exercise.id).all()
+    matrix = feature_matrix([exercise_features(ex, get_entry(ex.name)) for ex in exercises])
+    indices, scores = top_k_neighbors(matrix, k)
+
+    computed_at = datetime.utcnow()
+    rows = [
+        {
+            'exercise_id': exercises[row].id,
+            'rank': rank + 1,
+            'similar_exercise_id': exercises[col].id,
+            'score': round(float(scores[row, rank]), 4),
+            'computed_at': computed_at,
+        }
+        for row in range(len(exercises))
+        for rank, col in enumerate(indices[row])
+        if col >= 0
+    ]
+
+    ExerciseSimilarity.query.delete(synchronize_session=False)
+    if rows:
+        db.session.bulk_insert_mappings(ExerciseSimilarity, rows)
+    return len(rows)
+
+
+def get_substitutes(exercise_id, user_id=None, limit=5):
+    """
+    [(Exercise, score, last_performance)] best first. With user_id,
+    neighbours the user has performed are boosted by how often they have
+    been logged (see PERFORMED_BOOST), and last_performance is filled in.
+    """
+    neighbours = ExerciseSimilarity.query.filter_by(
+        exercise_id=exercise_id
+    ).order_by(ExerciseSimilarity.rank).options(
+        joinedload(ExerciseSimilarity.similar_exercise)
+    ).all()
+
+    performed = {}
+    if user_id is not None and neighbours:
+        performed = last_performance_map(user_id, [n.similar_exercise_id for n in neighbours])
+
+    def ranked_score(neighbour):
+        history = performed.get(neighbour.similar_exercise_id)
+        if not history:
+            return neighbour.score
+        familiarity = min(history['workout_count'], FAMILIAR_WORKOUTS) / FAMILIAR_WORKOUTS
+        return neighbour.score + PERFORMED_BOOST * familiarity
+
+    ranked = sorted(neighbours, key=lambda n: (-ranked_score(n), n.rank))
+    return [
+        (n.similar_exercise, n.score, performed.get(n.similar_exercise_id))
+        for n in ranked[:limit]
+    ]
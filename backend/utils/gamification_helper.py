@@ -4,6 +4,7 @@ from models.user_achievement import UserAchievement
 from models.point_transaction import PointTransaction
 from flask import current_app
 from datetime import datetime
+from sqlalchemy import insert, update
 
 # Point values for each action
 POINT_VALUES = {
@@ -12,6 +13,8 @@ POINT_VALUES = {
     "goal_completed": 50,
     "weight_logged": 5,
     "achievement_earned": 25,
+    "challenge_completed": 75,
+    "challenge_won": 150,
 }
 
 # Achievement definitions: key -> (name, description, type, check_function_name)
@@ -206,6 +209,10 @@ ACHIEVEMENT_DEFINITIONS = {
 }
 
 
+# Total-points thresholds for the points_* achievements
+POINTS_MILESTONES = {500: "points_500", 1000: "points_1000", 5000: "points_5000"}
+
+
 def _get_or_create_user_points(user_id):
     """Get or create the UserPoint record for a user."""
     user_points = UserPoint.query.filter_by(user_id=user_id).first()
@@ -288,6 +295,88 @@ def award_points(user_id, reason, points=None, entity_type=None, entity_id=None)
         raise
 
 
+def award_points_bulk(awards):
+    """
+    Award points to many users at once: one ledger INSERT, one read and one
+    bulk UPDATE of user_points, regardless of how many awards there are.
+
+    awards: iterable of dicts with user_id, reason, and optional points,
+    entity_type, entity_id. Returns {user_id: result} in award_points' shape
+    (one result per user, summed over their awards). Caller commits.
+    """
+    rows = []
+    for award in awards:
+        points = award.get("points")
+        if points is None:
+            points = POINT_VALUES.get(award["reason"], 0)
+        if points > 0:
+            rows.append({
+                "user_id": award["user_id"],
+                "points": points,
+                "reason": award["reason"],
+                "entity_type": award.get("entity_type"),
+                "entity_id": award.get("entity_id"),
+                "created_at": datetime.utcnow(),
+            })
+    if not rows:
+        return {}
+
+    try:
+        earned = {}
+        for row in rows:
+            earned[row["user_id"]] = earned.get(row["user_id"], 0) + row["points"]
+
+        db.session.execute(insert(PointTransaction), rows)
+
+        existing = {
+            up.user_id: up for up in
+            UserPoint.query.filter(UserPoint.user_id.in_(earned)).all()
+        }
+        new_rows = []
+        updates = []
+        results = {}
+        crossed = {}
+        for user_id, points in earned.items():
+            user_points = existing.get(user_id)
+            old_level = user_points.level if user_points else 1
+            old_total = user_points.total_points if user_points else 0
+            total = old_total + points
+            new_level, points_to_next = _calculate_level(total)
+
+            values = {"total_points": total, "level": new_level, "points_to_next_level": points_to_next}
+            if user_points:
+                updates.append({"id": user_points.id, **values})
+            else:
+                new_rows.append({"user_id": user_id, "updated_at": datetime.utcnow(), **values})
+
+            results[user_id] = {
+                "points_earned": points,
+                "new_total": total,
+                "level": new_level,
+                "points_to_next_level": points_to_next,
+                "leveled_up": new_level > old_level,
+            }
+            crossed[user_id] = any(old_total < t <= total for t in POINTS_MILESTONES)
+
+        if updates:
+            db.session.execute(update(UserPoint), updates)
+        if new_rows:
+            db.session.execute(insert(UserPoint), new_rows)
+
+        # Milestone checks are per-user; only run them where something changed
+        for user_id, result in results.items():
+            if result["leveled_up"]:
+                check_level_achievements(user_id, result["level"])
+            if crossed[user_id]:
+                check_points_achievements(user_id, result["new_total"])
+
+        return results
+
+    except Exception as e:
+        current_app.logger.error(f"Error awarding bulk points to {len(rows)} recipients: {e}")
+        raise
+
+
 def _has_achievement(user_id, achievement_key):
     """Check if user already has a specific achievement."""
     return UserAchievement.query.filter_by(
@@ -334,7 +423,8 @@ def check_workout_achievements(user_id, workout_count):
     try:
         from models import Workout
         distinct_types = db.session.query(Workout.type).filter(
-            Workout.user_id == user_id
+            Workout.user_id == user_id,
+            Workout.is_completed,
         ).distinct().count()
         if distinct_types >= 10:
             achievement = _grant_achievement(user_id, "variety_seeker")
@@ -346,7 +436,7 @@ def check_workout_achievements(user_id, workout_count):
     return earned
 
 
-def check_habit_achievements(user_id, total_habit_logs):
+def check_habit_achievements(user_id, total_habit_logs, consistency_rate=0.0):
     """Check and grant habit-related achievements."""
     earned = []
     thresholds = {1: "first_habit_log", 50: "habits_logged_50"}
@@ -356,6 +446,11 @@ def check_habit_achievements(user_id, total_habit_logs):
             if achievement:
                 earned.append(achievement)
 
+    if consistency_rate >= 0.9:
+        achievement = _grant_achievement(user_id, "habit_consistency_90")
+        if achievement:
+            earned.append(achievement)
+
     # Habit creation milestones
     try:
         from models import Habit
@@ -431,7 +526,7 @@ def check_level_achievements(user_id, current_level):
 def check_points_achievements(user_id, total_points):
     """Check and grant points milestone achievements."""
     earned = []
-    thresholds = {500: "points_500", 1000: "points_1000", 5000: "points_5000"}
+    thresholds = POINTS_MILESTONES
     for threshold, key in thresholds.items():
         if total_points >= threshold:
             achievement = _grant_achievement(user_id, key)
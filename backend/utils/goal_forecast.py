@@ -0,0 +1,193 @@
+"""
+Goal burn-up series and completion forecasting.
+
+Daily progress snapshots are forward-filled onto a daily grid and the
+completion date is projected from either a least-squares fit over a recent
+window or an EWMA of daily gains, all in NumPy. Forecasts for active goals
+are precomputed nightly (scripts/forecast_goals.py) and stored on the goal.
+"""
+from datetime import date, datetime
+import math
+import numpy as np
+from sqlalchemy import update
+from database import db
+from models.goal import Goal
+from models.goal_progress_snapshot import GoalProgressSnapshot
+
+
+FORECAST_METHODS = ('ewma', 'linear')
+DEFAULT_METHOD = 'ewma'
+
+# Days of history the least-squares fit looks at
+LINEAR_WINDOW_DAYS = 28
+# EWMA span in days (alpha = 2 / (span + 1))
+EWMA_SPAN_DAYS = 14
+# Forecasts further out than this are reported as "not converging"
+MAX_FORECAST_DAYS = 3650
+
+
+def build_burnup(snapshots, created_at=None, today=None):
+    """
+    Forward-fill (date, progress) snapshots onto a daily grid ending today.
+
+    If the goal predates its first snapshot, the series starts at the
+    creation date with zero progress. Returns (days, progress) arrays.
+    """
+    today = np.datetime64(today or date.today(), 'D')
+    if not snapshots and created_at is None:
+        return np.array([], dtype='datetime64[D]'), np.array([], dtype=np.float64)
+
+    snap_days = np.array([d for d, _ in snapshots], dtype='datetime64[D]')
+    snap_values = np.array([p or 0 for _, p in snapshots], dtype=np.float64)
+
+    if created_at is not None:
+        created = np.datetime64(created_at.date() if isinstance(created_at, datetime) else created_at, 'D')
+        if snap_days.size == 0 or created < snap_days[0]:
+            snap_days = np.r_[created, snap_days]
+            snap_values = np.r_[0.0, snap_values]
+
+    start = snap_days[0]
+    end = max(today, snap_days[-1])
+    grid = np.arange(start, end + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+    idx = np.searchsorted(snap_days, grid, side='right') - 1
+    return grid, snap_values[idx]
+
+
+def _linear_rate(days, values, window=LINEAR_WINDOW_DAYS):
+    recent = days >= days[-1] - np.timedelta64(window, 'D')
+    x = (days[recent] - days[recent][0]).astype(np.float64)
+    if x.size < 2:
+        return None
+    return float(np.polyfit(x, values[recent], 1)[0])
+
+
+def _ewma_rate(values, span=EWMA_SPAN_DAYS):
+    gains = np.diff(values)
+    if gains.size == 0:
+        return None
+    alpha = 2.0 / (span + 1)
+    weights = (1 - alpha) ** np.arange(gains.size)[::-1]
+    return float(np.dot(weights, gains) / weights.sum())
+
+
+def forecast_completion(days, values, target, deadline=None, method=DEFAULT_METHOD):
+    """
+    Project when the goal reaches target from its burn-up series.
+    Returns a dict with the daily rate, projected completion date and
+    whether that lands on or before the deadline.
+    """
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Unknown forecast method: {method}")
+
+    forecast = {
+        'method': method,
+        'rate_per_day': None,
+        'completion_date': None,
+        'on_track': None,
+    }
+    if days.size == 0 or target is None:
+        return forecast
+
+    current = values[-1]
+    if current >= target:
+        forecast.update({'rate_per_day': 0.0, 'completion_date': str(days[-1]), 'on_track': True})
+        return forecast
+
+    rate = _linear_rate(days, values) if method == 'linear' else _ewma_rate(values)
+    if rate is None:
+        return forecast
+
+    forecast['rate_per_day'] = round(rate, 3)
+    if rate > 0:
+        # Tolerance keeps fit noise (e.g. 0.9999999/day) from adding a day
+        days_needed = math.ceil((target - current) / rate - 1e-6)
+        if days_needed <= MAX_FORECAST_DAYS:
+            completion = days[-1] + np.timedelta64(days_needed, 'D')
+            forecast['completion_date'] = str(completion)
+
+    if deadline is not None:
+        completion = forecast['completion_date']
+        forecast['on_track'] = completion is not None and completion <= deadline.isoformat()
+    return forecast
+
+
+def projection_series(days, values, forecast, points=8):
+    """Evenly spaced projected (date, progress) points from today to completion."""
+    if not forecast.get('completion_date') or not forecast.get('rate_per_day'):
+        return []
+    end = np.datetime64(forecast['completion_date'], 'D')
+    span = int((end - days[-1]).astype(np.int64))
+    if span <= 0:
+        return []
+    offsets = np.unique(np.linspace(0, span, min(points, span + 1)).round().astype(np.int64))
+    projected = values[-1] + offsets * forecast['rate_per_day']
+    return [
+        {'date': str(days[-1] + np.timedelta64(int(o), 'D')), 'progress': round(float(p), 2)}
+        for o, p in zip(offsets, projected)
+    ]
+
+
+def _load_snapshots(goal_ids):
+    """{goal_id: [(date, progress), ...]} ordered by date, in one query."""
+    rows = db.session.query(
+        GoalProgressSnapshot.goal_id,
+        GoalProgressSnapshot.snapshot_date,
+        GoalProgressSnapshot.progress,
+    ).filter(
+        GoalProgressSnapshot.goal_id.in_(goal_ids)
+    ).order_by(
+        GoalProgressSnapshot.goal_id, GoalProgressSnapshot.snapshot_date
+    ).all()
+
+    by_goal = {}
+    for goal_id, day, progress in rows:
+        by_goal.setdefault(goal_id, []).append((day, progress))
+    return by_goal
+
+
+def forecast_goals_for_users(user_ids, method=DEFAULT_METHOD, today=None):
+    """
+    Precompute forecasts for every active goal of the given users: two reads
+    (goals, snapshots) and one bulk UPDATE. Caller commits.
+    Returns the number of goals forecast.
+    """
+    goals = Goal.query.filter(
+        Goal.user_id.in_(user_ids),
+        Goal.target.isnot(None),
+        db.func.coalesce(Goal.progress, 0) < Goal.target,
+    ).all()
+    if not goals:
+        return 0
+
+    snapshots = _load_snapshots([goal.id for goal in goals])
+    now = datetime.utcnow()
+
+    updates = []
+    for goal in goals:
+        days, values = build_burnup(snapshots.get(goal.id, []), goal.created_at, today)
+        forecast = forecast_completion(days, values, goal.target, goal.deadline, method)
+        completion = forecast['completion_date']
+        updates.append({
+            'id': goal.id,
+            'forecast_rate': forecast['rate_per_day'],
+            'forecast_completion_date': date.fromisoformat(completion) if completion else None,
+            'forecasted_at': now,
+            # Keep updated_at stable; it tracks user-visible goal changes
+            'updated_at': goal.updated_at,
+        })
+
+    db.session.execute(update(Goal), updates)
+    return len(updates)
+
+
+def stored_forecast(goal):
+    """The nightly forecast as stored on the goal, in the API's shape."""
+    if goal.forecasted_at is None:
+        return None
+    completion = goal.forecast_completion_date
+    return {
+        'rate_per_day': goal.forecast_rate,
+        'completion_date': completion.isoformat() if completion else None,
+        'on_track': (completion is not None and completion <= goal.deadline) if goal.deadline else None,
+        'forecasted_at': goal.forecasted_at.isoformat(),
+    }
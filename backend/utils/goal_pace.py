@@ -0,0 +1,90 @@
+"""
+Pace / on-track projection for goals.
+
+Computed for a whole list of goals at once with NumPy so the goals page
+costs the same regardless of how many goals a user has.
+"""
+from datetime import date, datetime
+import numpy as np
+
+
+def _as_date(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def compute_pace_info(goals, today=None):
+    """
+    Return one pace_info dict (or None) per goal, in order.
+
+    Assumes linear progress since the goal was created: the current rate is
+    progress per elapsed day, and a goal is on track if that rate finishes
+    the remaining progress before the deadline.
+    """
+    today = today or date.today()
+    n = len(goals)
+    if n == 0:
+        return []
+
+    today_ord = today.toordinal()
+    target = np.array([g.target if g.target is not None else np.nan for g in goals], dtype=np.float64)
+    progress = np.array([g.progress or 0 for g in goals], dtype=np.float64)
+    deadlines = [_as_date(g.deadline) for g in goals]
+    created = [_as_date(g.created_at) for g in goals]
+    has_deadline = np.array([d is not None for d in deadlines])
+    deadline_ord = np.array([d.toordinal() if d else today_ord for d in deadlines], dtype=np.int64)
+    created_ord = np.array([c.toordinal() if c else today_ord for c in created], dtype=np.int64)
+
+    days_remaining = deadline_ord - today_ord
+    days_elapsed = today_ord - created_ord
+    remaining = target - progress
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        current_rate = np.where(days_elapsed > 0, progress / days_elapsed, 0.0)
+        required_rate = np.where(days_remaining > 0, remaining / days_remaining, 0.0)
+        projected_days = np.where(current_rate > 0, remaining / current_rate, np.inf)
+
+    applicable = has_deadline & (progress < target)
+    overdue = applicable & (days_remaining <= 0)
+    just_started = applicable & ~overdue & (days_elapsed <= 0)
+    on_track = (current_rate > 0) & (projected_days <= days_remaining)
+
+    def _num(value):
+        value = float(value)
+        return int(value) if value.is_integer() else value
+
+    result = []
+    for i in range(n):
+        if not applicable[i]:
+            result.append(None)
+        elif overdue[i]:
+            result.append({
+                'days_remaining': 0,
+                'remaining_progress': _num(remaining[i]),
+                'on_track': False,
+                'status': 'overdue',
+            })
+        elif just_started[i]:
+            result.append({
+                'days_remaining': int(days_remaining[i]),
+                'remaining_progress': _num(remaining[i]),
+                'current_rate': 0,
+                'required_rate': round(float(required_rate[i]), 2),
+                'on_track': True,
+                'status': 'just_started',
+            })
+        else:
+            result.append({
+                'days_remaining': int(days_remaining[i]),
+                'remaining_progress': _num(remaining[i]),
+                'current_rate': round(float(current_rate[i]), 2),
+                'required_rate': round(float(required_rate[i]), 2),
+                'on_track': bool(on_track[i]),
+                'status': 'on_track' if on_track[i] else 'behind',
+            })
+    return result
@@ -3,10 +3,55 @@ from models.goal import Goal
 from models.goal_link import GoalLink
 from models.workout import Workout
 from models.habit_log import HabitLog
+from models.goal_progress_snapshot import GoalProgressSnapshot
 from flask import current_app
+from sqlalchemy import func, literal, union_all, update
+from datetime import datetime
+from utils.local_time import local_today, local_today_by_user
 
 
-def sync_goal_progress(user_id, entity_type, entity_id=None, entity_value=None):
+def record_goal_snapshots(progress_by_goal, day):
+    """
+    Upsert `day`'s progress for each goal id in {goal_id: progress}; pass the
+    owner's local_today(). Repeated changes on the same day overwrite that
+    day's row, so the table holds at most one row per goal per day. Caller
+    commits.
+    """
+    if not progress_by_goal:
+        return
+
+    if db.engine.dialect.name == 'postgresql':
+        # One statement, so concurrent recalculations of the same day cannot collide
+        from sqlalchemy.dialects.postgresql import insert
+        now = datetime.utcnow()
+        stmt = insert(GoalProgressSnapshot).values([
+            {'goal_id': goal_id, 'snapshot_date': day, 'progress': progress, 'recorded_at': now}
+            for goal_id, progress in progress_by_goal.items()
+        ])
+        db.session.execute(stmt.on_conflict_do_update(
+            constraint='uq_goal_snapshot_date',
+            set_={'progress': stmt.excluded.progress, 'recorded_at': stmt.excluded.recorded_at},
+        ))
+        return
+
+    # SQLite (tests): select, then update or insert
+    existing = GoalProgressSnapshot.query.filter(
+        GoalProgressSnapshot.goal_id.in_(list(progress_by_goal)),
+        GoalProgressSnapshot.snapshot_date == day,
+    ).all()
+    for snapshot in existing:
+        snapshot.progress = progress_by_goal[snapshot.goal_id]
+
+    seen = {snapshot.goal_id for snapshot in existing}
+    db.session.add_all([
+        GoalProgressSnapshot(goal_id=goal_id, snapshot_date=day, progress=progress)
+        for goal_id, progress in progress_by_goal.items()
+        if goal_id not in seen
+    ])
+    db.session.flush()
+
+
+def sync_goal_progress(user_id, entity_type, entity_id=None, entity_value=None, entity_ids=None):
     """
     Sync goal progress when a workout or habit is logged.
 
@@ -15,6 +60,7 @@ def sync_goal_progress(user_id, entity_type, entity_id=None, entity_value=None):
         entity_type: 'workout' or 'habit'
         entity_id: workout_id or habit_id
         entity_value: workout type string (for workout-type matching)
+        entity_ids: habit_ids logged together (batch check-in), instead of entity_id
     """
     try:
         # Find auto-sync goals with matching links
@@ -34,20 +80,23 @@ def sync_goal_progress(user_id, entity_type, entity_id=None, entity_value=None):
                 )
             )
         elif entity_type == 'habit':
-            query = query.filter(GoalLink.entity_id == entity_id)
+            query = query.filter(GoalLink.entity_id.in_(entity_ids or [entity_id]))
 
         linked = query.all()
         completed_goals = []
+        changed = {}
 
         for link, goal in linked:
             old_progress = goal.progress or 0
             goal.progress = old_progress + link.contribution_value
+            changed[goal.id] = goal.progress
 
             # Check if goal just completed
             if old_progress < goal.target and goal.progress >= goal.target:
                 completed_goals.append(goal)
 
         db.session.flush()
+        record_goal_snapshots(changed, local_today(user_id))
         return completed_goals
 
     except Exception as e:
@@ -55,34 +104,124 @@ def sync_goal_progress(user_id, entity_type, entity_id=None, entity_value=None):
         raise
 
 
-def recalculate_goal_progress(goal_id, user_id):
-    """Recalculate goal progress from scratch based on all linked entities."""
+def _goal_totals_query(user_ids=None, goal_ids=None):
+    """
+    One grouped statement returning
+    (goal_id, user_id, target, progress, links_count, computed, links)
+    for every goal in scope. Link contributions from workouts and habit logs,
+    plus the link count, are unioned per goal and summed; goals without links
+    come back with links = 0.
+    """
+    workout_part = db.session.query(
+        GoalLink.goal_id.label('goal_id'),
+        GoalLink.contribution_value.label('amount'),
+        literal(0).label('links'),
+    ).join(
+        Goal, Goal.id == GoalLink.goal_id
+    ).join(
+        Workout, db.and_(
+            Workout.user_id == Goal.user_id,
+            Workout.is_completed,
+            db.or_(
+                GoalLink.linked_workout_type.is_(None),
+                Workout.type == GoalLink.linked_workout_type,
+            ),
+        )
+    ).filter(GoalLink.entity_type == 'workout')
+
+    habit_part = db.session.query(
+        GoalLink.goal_id.label('goal_id'),
+        GoalLink.contribution_value.label('amount'),
+        literal(0).label('links'),
+    ).join(
+        Goal, Goal.id == GoalLink.goal_id
+    ).join(
+        HabitLog, db.and_(
+            HabitLog.habit_id == GoalLink.entity_id,
+            HabitLog.completed == True,
+        )
+    ).filter(GoalLink.entity_type == 'habit')
+
+    link_part = db.session.query(
+        GoalLink.goal_id.label('goal_id'),
+        literal(0).label('amount'),
+        literal(1).label('links'),
+    ).join(Goal, Goal.id == GoalLink.goal_id)
+
+    parts = [workout_part, habit_part, link_part]
+    if user_ids is not None:
+        parts = [p.filter(Goal.user_id.in_(user_ids)) for p in parts]
+    if goal_ids is not None:
+        parts = [p.filter(Goal.id.in_(goal_ids)) for p in parts]
+
+    contributions = union_all(*[p.statement for p in parts]).subquery()
+
+    query = db.session.query(
+        Goal.id,
+        Goal.user_id,
+        Goal.target,
+        Goal.progress,
+        Goal.links_count,
+        func.coalesce(func.sum(contributions.c.amount), 0).label('computed'),
+        func.coalesce(func.sum(contributions.c.links), 0).label('links'),
+    ).outerjoin(
+        contributions, contributions.c.goal_id == Goal.id
+    ).group_by(Goal.id, Goal.user_id, Goal.target, Goal.progress, Goal.links_count)
+
+    if user_ids is not None:
+        query = query.filter(Goal.user_id.in_(user_ids))
+    if goal_ids is not None:
+        query = query.filter(Goal.id.in_(goal_ids))
+    return query
+
+
+def recalculate_goals(user_ids=None, goal_ids=None):
+    """
+    Recalculate progress and links_count for every goal in scope from all
+    linked entities, with one read and one bulk UPDATE of the rows that
+    changed. Goals without links keep their manually set progress. Caller commits.
+
+    Returns {goal_id: {'progress', 'links_count', 'completed'}} where
+    completed marks goals that crossed their target in this pass.
+    """
     try:
-        links = GoalLink.query.filter_by(goal_id=goal_id).all()
-        total_progress = 0
-
-        for link in links:
-            if link.entity_type == 'workout':
-                query = Workout.query.filter_by(user_id=user_id)
-                if link.linked_workout_type:
-                    query = query.filter_by(type=link.linked_workout_type)
-                count = query.count()
-                total_progress += count * link.contribution_value
-
-            elif link.entity_type == 'habit':
-                count = HabitLog.query.filter_by(
-                    habit_id=link.entity_id,
-                    completed=True,
-                ).count()
-                total_progress += count * link.contribution_value
-
-        goal = Goal.query.filter_by(id=goal_id, user_id=user_id).first()
-        if goal:
-            goal.progress = total_progress
-            db.session.flush()
-
-        return total_progress
+        results = {}
+        updates = []
+        owners = {}
+        rows = _goal_totals_query(user_ids, goal_ids)
+        for goal_id, user_id, target, progress, links_count, computed, links in rows:
+            computed = int(computed)
+            links = int(links)
+            old_progress = progress or 0
+            new_progress = computed if links else old_progress
+
+            results[goal_id] = {
+                'progress': new_progress,
+                'links_count': links,
+                'completed': target is not None and old_progress < target <= new_progress,
+            }
+            if new_progress != progress or links != links_count:
+                updates.append({'id': goal_id, 'progress': new_progress, 'links_count': links})
+                owners[goal_id] = user_id
+
+        if updates:
+            db.session.execute(update(Goal), updates)
+            # Each snapshot is dated on its owner's local day
+            by_user = {}
+            for u in updates:
+                by_user.setdefault(owners[u['id']], {})[u['id']] = u['progress']
+            days = local_today_by_user(list(by_user))
+            for user_id, progress_by_goal in by_user.items():
+                record_goal_snapshots(progress_by_goal, days[user_id])
+        return results
 
     except Exception as e:
-        current_app.logger.error(f"Error recalculating goal {goal_id}: {e}")
+        current_app.logger.error(f"Error recalculating goals (users={user_ids}, goals={goal_ids}): {e}")
         raise
+
+
+def recalculate_goal_progress(goal_id, user_id):
+    """Recalculate goal progress from scratch based on all linked entities."""
+    results = recalculate_goals(user_ids=[user_id], goal_ids=[goal_id])
+    goal = results.get(goal_id)
+    return goal['progress'] if goal else 0
@@ -0,0 +1,198 @@
+"""
+Per-habit completion calendars and streaks.
+
+Each habit keeps one 46-byte bitset per year (models/habit_calendar.py)
+plus its current and longest streak on the habit row. log_habit sets the
+day's bit and updates the streaks in the same transaction, so streaks,
+completion rates and the heatmap are read without scanning habit_logs.
+Writers lock the habit row first, so concurrent logs for one habit (on any
+day, including the first of a new year) apply one after the other.
+"""
+import base64
+from datetime import date, timedelta
+from database import db
+from models.habit import Habit
+from models.habit_calendar import HabitCalendar
+from utils.local_time import local_today
+
+
+YEAR_BYTES = 46  # 366 bits
+
+# Window for the rolling completion rate behind habit_consistency_90
+CONSISTENCY_DAYS = 30
+
+
+def _index(day):
+    return day.timetuple().tm_yday - 1
+
+
+def day_is_set(bits, day):
+    i = _index(day)
+    return bool(bits[i >> 3] & (1 << (i & 7)))
+
+
+def set_day(bits, day):
+    """Copy of `bits` with `day` marked complete."""
+    out = bytearray(bits or bytes(YEAR_BYTES))
+    i = _index(day)
+    out[i >> 3] |= 1 << (i & 7)
+    return bytes(out)
+
+
+def encode_bits(bits):
+    return base64.b64encode(bits or bytes(YEAR_BYTES)).decode('ascii')
+
+
+class _Calendars:
+    """A habit's year rows, loaded on first use."""
+
+    def __init__(self, habit_id):
+        self.habit_id = habit_id
+        self.rows = {}
+
+    def row(self, year):
+        if year not in self.rows:
+            self.rows[year] = db.session.get(HabitCalendar, (self.habit_id, year))
+        return self.rows[year]
+
+    def is_set(self, day):
+        row = self.row(day.year)
+        return row is not None and day_is_set(row.bits, day)
+
+    def run(self, day, step):
+        """Consecutive completed days starting after `day`, walking by `step` days."""
+        count = 0
+        day += timedelta(days=step)
+        while self.is_set(day):
+            count += 1
+            day += timedelta(days=step)
+        return count
+
+
+def _lock_habits(habits, day):
+    """
+    SELECT ... FOR UPDATE the habit rows (in id order), then reload them and
+    their calendars around `day`, so the read-modify-write below sees every
+    completion committed by a request that held the lock before us.
+    """
+    ids = sorted(habit.id for habit in habits)
+    Habit.query.filter(Habit.id.in_(ids)).order_by(Habit.id).with_for_update().populate_existing().all()
+    HabitCalendar.query.filter(
+        HabitCalendar.habit_id.in_(ids),
+        HabitCalendar.year.between(day.year - 1, day.year + 1),
+    ).populate_existing().all()
+
+
+def record_completion(habit, day):
+    """
+    Mark `day` complete for `habit` and update its streaks. Days may arrive
+    out of order (back-dated logs). Caller commits. Returns the habit.
+    """
+    _lock_habits([habit], day)
+    return _record_locked(habit, day)
+
+
+def _record_locked(habit, day):
+    calendars = _Calendars(habit.id)
+    row = calendars.row(day.year)
+    if row is None:
+        row = HabitCalendar(habit_id=habit.id, year=day.year, bits=set_day(None, day))
+        db.session.add(row)
+        calendars.rows[day.year] = row
+    elif day_is_set(row.bits, day):
+        return habit
+    else:
+        row.bits = set_day(row.bits, day)
+
+    run = calendars.run(day, -1) + 1 + calendars.run(day, 1)
+    habit.longest_streak = max(habit.longest_streak or 0, run)
+
+    last = habit.last_completed_on
+    if last is None or day >= last:
+        habit.last_completed_on = day + timedelta(days=calendars.run(day, 1))
+        habit.current_streak = run
+    elif day >= last - timedelta(days=habit.current_streak or 0):
+        # Back-dated day that joins the streak ending at last_completed_on
+        habit.current_streak = calendars.run(last, -1) + 1
+    return habit
+
+
+def record_completions(habits, day):
+    """
+    record_completion for several habits on the same day. They are locked
+    and their calendars loaded in one query each, so the per-habit lookups
+    hit the session.
+    """
+    if not habits:
+        return
+    _lock_habits(habits, day)
+    for habit in habits:
+        _record_locked(habit, day)
+
+
+def current_streak(habit, today=None):
+    """The stored streak, or 0 if it was broken before yesterday."""
+    today = today or date.today()
+    last = habit.last_completed_on
+    if last is None or last < today - timedelta(days=1):
+        return 0
+    return habit.current_streak or 0
+
+
+def _count_days(by_year, start, end):
+    """Completed days in [start, end] given {year: bits}."""
+    count = 0
+    day = start
+    while day <= end:
+        bits = by_year.get(day.year)
+        if bits and day_is_set(bits, day):
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+def consistency_rate(user_id, today=None, days=CONSISTENCY_DAYS):
+    """
+    Share of habit-days completed over the last `days` days across the
+    user's habits, counting each habit only from the day it was created.
+    Users with less than one window of habit-days score 0.
+    """
+    today = today or local_today(user_id)
+    window_start = today - timedelta(days=days - 1)
+    habits = Habit.query.filter_by(user_id=user_id).all()
+    if not habits:
+        return 0.0
+
+    bits = {}
+    for row in HabitCalendar.query.filter(
+        HabitCalendar.habit_id.in_([habit.id for habit in habits]),
+        HabitCalendar.year.between(window_start.year, today.year),
+    ):
+        bits.setdefault(row.habit_id, {})[row.year] = row.bits
+
+    done = possible = 0
+    for habit in habits:
+        created = habit.created_at.date() if habit.created_at else window_start
+        start = max(window_start, created)
+        if start > today:
+            continue
+        possible += (today - start).days + 1
+        done += _count_days(bits.get(habit.id, {}), start, today)
+    return done / possible if possible >= days else 0.0
+
+
+def heatmap(habits, year, today=None):
+    """Encoded bitsets and streaks for the given habits in one year."""
+    rows = HabitCalendar.query.filter(
+        HabitCalendar.habit_id.in_([habit.id for habit in habits]),
+        HabitCalendar.year == year,
+    ).all() if habits else []
+    bits = {row.habit_id: row.bits for row in rows}
+    return [{
+        'habit_id': habit.id,
+        'name': habit.name,
+        'bits': encode_bits(bits.get(habit.id)),
+        'current_streak': current_streak(habit, today),
+        'longest_streak': habit.longest_streak or 0,
+        'last_completed_on': habit.last_completed_on.isoformat() if habit.last_completed_on else None,
+    } for habit in habits]
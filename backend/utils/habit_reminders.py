@@ -0,0 +1,185 @@
+"""
+Habit reminder scheduling and dispatch.
+
+Each habit with a reminder_time and next_occurrence stores the UTC instant
+its next reminder is due (next_reminder_at), computed in the user's
+timezone. The reminder worker (scripts/habit_reminder_worker.py) keeps the
+reminders due in the next few minutes in an in-memory heap, refilled from
+the next_reminder_at index, and on every tick sends everything due with
+one notification insert and one bulk update that advances each habit to
+its next occurrence.
+
+Sending and advancing happen in the same transaction, and a tick re-reads
+its habits with FOR UPDATE SKIP LOCKED before sending, so a restart (or a
+second worker) never sends the same occurrence twice.
+"""
+import calendar
+import heapq
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy import tuple_, update
+from database import db
+from models import Habit, UserProfile
+from utils.local_time import DEFAULT_TIMEZONE, as_utc, is_valid_timezone
+from utils.notifications import create_notifications_bulk
+
+
+# How far ahead each refill loads reminders into the heap
+LOOKAHEAD = timedelta(minutes=5)
+# Reminders more overdue than this (e.g. after downtime) are skipped, not sent
+MAX_LATENESS = timedelta(hours=1)
+REFILL_PAGE_SIZE = 5000
+
+
+def _zone(name):
+    return ZoneInfo(name if name and is_valid_timezone(name) else DEFAULT_TIMEZONE)
+
+
+def reminder_at(occurrence, reminder_time, tz):
+    """UTC instant of a local occurrence date and reminder time, or None."""
+    if occurrence is None or reminder_time is None:
+        return None
+    local = datetime.combine(occurrence, reminder_time).replace(tzinfo=tz)
+    return as_utc(local.astimezone(timezone.utc))
+
+
+def next_occurrence_after(occurrence, frequency):
+    """The occurrence following `occurrence` for a daily, weekly or monthly habit."""
+    if frequency == 'weekly':
+        return occurrence + timedelta(days=7)
+    if frequency == 'monthly':
+        year, month = divmod(occurrence.month, 12)
+        year, month = occurrence.year + year, month + 1
+        day = min(occurrence.day, calendar.monthrange(year, month)[1])
+        return occurrence.replace(year=year, month=month, day=day)
+    return occurrence + timedelta(days=1)
+
+
+def schedule_reminder(habit, tz):
+    """Recompute habit.next_reminder_at after its schedule fields change."""
+    # Request payloads assign ISO strings; store the parsed values
+    if isinstance(habit.next_occurrence, str):
+        habit.next_occurrence = date.fromisoformat(habit.next_occurrence)
+    if isinstance(habit.reminder_time, str):
+        habit.reminder_time = time.fromisoformat(habit.reminder_time)
+    habit.next_reminder_at = reminder_at(habit.next_occurrence, habit.reminder_time, tz)
+
+
+def reschedule_user_reminders(user_id, tz):
+    """Recompute next_reminder_at for all of a user's habits, e.g. after a timezone change."""
+    habits = Habit.query.filter(
+        Habit.user_id == user_id,
+        Habit.next_occurrence.isnot(None),
+        Habit.reminder_time.isnot(None),
+    ).all()
+    for habit in habits:
+        schedule_reminder(habit, tz)
+    return len(habits)
+
+
+def _advance(occurrence, reminder_time, frequency, tz, now):
+    """First occurrence after `occurrence` whose reminder is still in the future."""
+    occurrence = next_occurrence_after(occurrence, frequency)
+    due = reminder_at(occurrence, reminder_time, tz)
+    while due <= now:
+        occurrence = next_occurrence_after(occurrence, frequency)
+        due = reminder_at(occurrence, reminder_time, tz)
+    return occurrence, due
+
+
+class ReminderWheel:
+    """Min-heap of (due_at, habit_id) for reminders due before `horizon`."""
+
+    def __init__(self, lookahead=LOOKAHEAD):
+        self.lookahead = lookahead
+        self.heap = []
+        self.horizon = None
+
+    def needs_refill(self, now):
+        return self.horizon is None or now + self.lookahead / 2 >= self.horizon
+
+    def refill(self, now):
+        """
+        Reload everything due before now + lookahead, in pages along the
+        (next_reminder_at, id) index. Rebuilding (rather than appending)
+        picks up habits whose schedule was edited since the last refill.
+        """
+        horizon = now + self.lookahead
+        heap = []
+        cursor = None
+        while True:
+            query = db.session.query(Habit.next_reminder_at, Habit.id).filter(
+                Habit.next_reminder_at.isnot(None),
+                Habit.next_reminder_at <= horizon,
+            )
+            if cursor:
+                query = query.filter(tuple_(Habit.next_reminder_at, Habit.id) > cursor)
+            page = query.order_by(Habit.next_reminder_at, Habit.id).limit(REFILL_PAGE_SIZE).all()
+            heap.extend((row.next_reminder_at, row.id) for row in page)
+            if len(page) < REFILL_PAGE_SIZE:
+                break
+            cursor = tuple(page[-1])
+        heapq.heapify(heap)
+        self.heap = heap
+        self.horizon = horizon
+        return len(heap)
+
+    def pop_due(self, now):
+        """Habit ids whose reminder is due at or before `now`."""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap)[1])
+        return due
+
+    def seconds_until_next(self, now, idle=30.0):
+        if not self.heap:
+            return idle
+        return max(0.0, min(idle, (self.heap[0][0] - now).total_seconds()))
+
+
+def dispatch_reminders(habit_ids, now=None):
+    """
+    Send and advance the reminders for `habit_ids` that are still due.
+    Rows locked by another worker, or already advanced, are skipped.
+    Caller commits. Returns (sent, skipped_as_stale).
+    """
+    now = now or datetime.utcnow()
+    if not habit_ids:
+        return 0, 0
+
+    rows = db.session.query(
+        Habit.id, Habit.user_id, Habit.name, Habit.frequency,
+        Habit.reminder_time, Habit.next_occurrence, Habit.next_reminder_at,
+        UserProfile.timezone,
+    ).outerjoin(
+        UserProfile, UserProfile.user_id == Habit.user_id
+    ).filter(
+        Habit.id.in_(habit_ids),
+        Habit.next_reminder_at <= now,
+    ).with_for_update(of=Habit, skip_locked=True).all()
+
+    notifications = []
+    advances = []
+    stale = 0
+    for row in rows:
+        if now - row.next_reminder_at > MAX_LATENESS:
+            stale += 1
+        else:
+            notifications.append({
+                'user_id': row.user_id,
+                'type': 'habit_reminder',
+                'message': f"Time for your habit: {row.name}",
+                'entity_type': 'habit',
+                'entity_id': row.id,
+                'action_url': '/habits',
+                'scheduled_for': row.next_reminder_at,
+            })
+        occurrence, due = _advance(
+            row.next_occurrence, row.reminder_time, row.frequency, _zone(row.timezone), now
+        )
+        advances.append({'id': row.id, 'next_occurrence': occurrence, 'next_reminder_at': due})
+
+    create_notifications_bulk(notifications)
+    if advances:
+        db.session.execute(update(Habit), advances)
+    return len(notifications), stale
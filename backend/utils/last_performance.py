@@ -0,0 +1,57 @@
+"""
+The user's most recent set of every exercise, for the exercise picker.
+
+One windowed pass over the user's workouts replaces a query per exercise.
+Served by idx_workouts_user_date_id (the user's workouts) and
+idx_workout_exercises_workout (their sets).
+"""
+from sqlalchemy import func
+from database import db
+from models import Workout, WorkoutExercise
+
+
+def last_performance_map(user_id, exercise_ids=None):
+    """
+    {exercise_id: {'weight', 'reps', 'sets', 'date', 'workout_count'}} for
+    every exercise the user has logged (or just `exercise_ids`). "Most
+    recent" orders by workout date, then creation time, then set id.
+    """
+    exercise = WorkoutExercise.exercise_id
+    ranked = db.session.query(
+        exercise.label('exercise_id'),
+        WorkoutExercise.weight.label('weight'),
+        WorkoutExercise.reps.label('reps'),
+        WorkoutExercise.sets.label('sets'),
+        Workout.date.label('date'),
+        func.row_number().over(
+            partition_by=exercise,
+            order_by=(Workout.date.desc(), Workout.created_at.desc(), WorkoutExercise.id.desc())
+        ).label('rn'),
+        # Distinct workouts per exercise without COUNT(DISTINCT) as a window:
+        # ascending + descending dense ranks of the same key sum to n + 1
+        (
+            func.dense_rank().over(partition_by=exercise, order_by=WorkoutExercise.workout_id.asc())
+            + func.dense_rank().over(partition_by=exercise, order_by=WorkoutExercise.workout_id.desc())
+            - 1
+        ).label('workout_count'),
+    ).join(
+        Workout, WorkoutExercise.workout_id == Workout.id
+    ).filter(
+        Workout.user_id == user_id,
+        Workout.is_completed,
+    )
+    if exercise_ids is not None:
+        ranked = ranked.filter(exercise.in_(exercise_ids))
+    ranked = ranked.subquery()
+
+    rows = db.session.query(ranked).filter(ranked.c.rn == 1).all()
+    return {
+        row.exercise_id: {
+            'weight': float(row.weight) if row.weight else None,
+            'reps': row.reps,
+            'sets': row.sets,
+            'date': row.date.isoformat() if row.date else None,
+            'workout_count': row.workout_count,
+        }
+        for row in rows
+    }
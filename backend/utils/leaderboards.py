@@ -0,0 +1,266 @@
+"""
+Live challenge leaderboards kept in sorted sets.
+
+Each active challenge has one sorted set (member = user id, score =
+current_progress) in Redis when REDIS_URL is configured, or in process
+memory otherwise. Progress writes queue score updates on the DB session and
+they are published only after the transaction commits, so a rolled-back
+write never reaches the board. A missing board (restart, eviction) is
+rebuilt from challenge_participants on first read, and a failing Redis
+falls back to ranking in SQL for that call only.
+
+Memory boards only see the updates committed through their own worker, so
+they expire after BOARD_TTL_SECONDS and are rebuilt on the next read.
+
+Every backend orders by progress descending, then user id ascending. Redis
+holds the negated progress against a zero-padded member, so ZRANGE's
+ascending (score, member) order is that order.
+"""
+import threading
+import time
+from flask import current_app
+from sqlalchemy import and_, event, or_
+from database import db, _REDIS_URL
+from models.challenge import Challenge, ChallengeParticipant
+
+
+KEY_PREFIX = 'uptrakk:challenge_leaderboard:v2:'
+_PENDING_KEY = 'leaderboard_updates'
+BOARD_TTL_SECONDS = 60
+
+
+def _key(challenge_id):
+    return f"{KEY_PREFIX}{challenge_id}"
+
+
+def _member(user_id):
+    # Zero-padded so ties order by user id, not by string
+    return f"{user_id:012d}"
+
+
+def _sort_key(user_id, score):
+    """Progress descending, then user id ascending; shared by every backend."""
+    return -score, user_id
+
+
+class MemoryLeaderboardStore:
+    """Process-local store with the same interface as the Redis store."""
+
+    def __init__(self, ttl=BOARD_TTL_SECONDS):
+        self.ttl = ttl
+        self._boards = {}
+        self._built_at = {}
+        self._lock = threading.Lock()
+
+    def exists(self, challenge_id):
+        # An expired board reads as missing so leaderboard_page() rebuilds it
+        with self._lock:
+            built_at = self._built_at.get(challenge_id)
+            return built_at is not None and time.monotonic() - built_at < self.ttl
+
+    def set_scores(self, challenge_id, scores):
+        with self._lock:
+            self._boards.setdefault(challenge_id, {}).update(scores)
+            self._built_at.setdefault(challenge_id, time.monotonic())
+
+    def replace(self, challenge_id, scores):
+        with self._lock:
+            self._boards[challenge_id] = dict(scores)
+            self._built_at[challenge_id] = time.monotonic()
+
+    def delete(self, challenge_id):
+        with self._lock:
+            self._boards.pop(challenge_id, None)
+            self._built_at.pop(challenge_id, None)
+
+    def _ordered(self, board):
+        return sorted(board.items(), key=lambda item: _sort_key(*item))
+
+    def top(self, challenge_id, offset, limit):
+        with self._lock:
+            ordered = self._ordered(self._boards.get(challenge_id, {}))
+        return ordered[offset:offset + limit]
+
+    def rank(self, challenge_id, user_id):
+        with self._lock:
+            board = self._boards.get(challenge_id, {})
+            if user_id not in board:
+                return None
+            score = board[user_id]
+            mine = _sort_key(user_id, score)
+            ahead = sum(1 for member, s in board.items() if _sort_key(member, s) < mine)
+        return ahead + 1, score
+
+    def size(self, challenge_id):
+        with self._lock:
+            return len(self._boards.get(challenge_id, {}))
+
+
+class RedisLeaderboardStore:
+    """Sorted sets in Redis, shared by every worker."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def exists(self, challenge_id):
+        return bool(self.client.exists(_key(challenge_id)))
+
+    @staticmethod
+    def _mapping(scores):
+        return {_member(u): -float(s) for u, s in scores.items()}
+
+    def set_scores(self, challenge_id, scores):
+        if scores:
+            self.client.zadd(_key(challenge_id), self._mapping(scores))
+
+    def replace(self, challenge_id, scores):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(_key(challenge_id))
+        if scores:
+            pipe.zadd(_key(challenge_id), self._mapping(scores))
+        pipe.execute()
+
+    def delete(self, challenge_id):
+        self.client.delete(_key(challenge_id))
+
+    def top(self, challenge_id, offset, limit):
+        rows = self.client.zrange(_key(challenge_id), offset, offset + limit - 1, withscores=True)
+        return [(int(member), -score + 0.0) for member, score in rows]
+
+    def rank(self, challenge_id, user_id):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrank(_key(challenge_id), _member(user_id))
+        pipe.zscore(_key(challenge_id), _member(user_id))
+        rank, score = pipe.execute()
+        if rank is None:
+            return None
+        return rank + 1, -score + 0.0
+
+    def size(self, challenge_id):
+        return self.client.zcard(_key(challenge_id))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide store: Redis if configured, else memory."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_store()
+    return _store
+
+
+def _create_store():
+    if _REDIS_URL:
+        # No memory fallback: one failed ping would pin this worker to its own
+        # board. The client reconnects on its own; while Redis is down each
+        # leaderboard_page() call ranks in SQL instead.
+        import redis
+        return RedisLeaderboardStore(redis.from_url(_REDIS_URL, decode_responses=True))
+    return MemoryLeaderboardStore()
+
+
+def queue_score_updates(challenge_id, scores):
+    """Publish {user_id: progress} for a challenge once the session commits."""
+    pending = db.session.info.setdefault(_PENDING_KEY, {})
+    if challenge_id in pending and pending[challenge_id] is None:
+        return  # board is being dropped in this transaction
+    pending.setdefault(challenge_id, {}).update(scores)
+
+
+def queue_leaderboard_drop(challenge_id):
+    """Delete a challenge's board once the session commits (e.g. on finalization)."""
+    db.session.info.setdefault(_PENDING_KEY, {})[challenge_id] = None
+
+
+@event.listens_for(db.session, 'after_commit')
+def _publish_pending(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        store = get_store()
+        for challenge_id, scores in pending.items():
+            if scores is None:
+                store.delete(challenge_id)
+            # Only extend boards that exist; a missing one is rebuilt on read
+            elif store.exists(challenge_id):
+                store.set_scores(challenge_id, scores)
+    except Exception as e:
+        current_app.logger.error(f"Error publishing leaderboard updates: {e}")
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def rebuild_leaderboard(challenge_id):
+    """Reload a challenge's board from challenge_participants."""
+    rows = db.session.query(
+        ChallengeParticipant.user_id, ChallengeParticipant.current_progress
+    ).filter(
+        ChallengeParticipant.challenge_id == challenge_id,
+        ChallengeParticipant.status != 'withdrawn',
+    ).all()
+    get_store().replace(challenge_id, {user_id: progress or 0 for user_id, progress in rows})
+    return len(rows)
+
+
+def rebuild_active_leaderboards(challenge_ids=None):
+    """Rebuild boards for the given (default: all active) challenges."""
+    if challenge_ids is None:
+        challenge_ids = [row.id for row in db.session.query(Challenge.id).filter(Challenge.status == 'active')]
+    return sum(rebuild_leaderboard(challenge_id) for challenge_id in challenge_ids)
+
+
+def leaderboard_page(challenge_id, user_id=None, offset=0, limit=50):
+    """
+    Top entries for one page plus the viewer's rank, from the sorted set
+    (or SQL if the store fails). Returns (entries, total, my_rank) where
+    entries are (rank, user_id, score) and my_rank is (rank, score) or None.
+    """
+    try:
+        store = get_store()
+        if not store.exists(challenge_id):
+            rebuild_leaderboard(challenge_id)
+
+        entries = [
+            (offset + i + 1, member, score)
+            for i, (member, score) in enumerate(store.top(challenge_id, offset, limit))
+        ]
+        my_rank = store.rank(challenge_id, user_id) if user_id is not None else None
+        return entries, store.size(challenge_id), my_rank
+    except Exception as e:
+        current_app.logger.error(f"Leaderboard store failed, ranking in SQL: {e}")
+        return _sql_leaderboard_page(challenge_id, user_id, offset, limit)
+
+
+def _sql_leaderboard_page(challenge_id, user_id, offset, limit):
+    """leaderboard_page() from challenge_participants, in the same order."""
+    progress = db.func.coalesce(ChallengeParticipant.current_progress, 0)
+    ranked = db.session.query(ChallengeParticipant.user_id, progress).filter(
+        ChallengeParticipant.challenge_id == challenge_id,
+        ChallengeParticipant.status != 'withdrawn',
+    )
+    entries = [
+        (offset + i + 1, member, float(score))
+        for i, (member, score) in enumerate(
+            ranked.order_by(progress.desc(), ChallengeParticipant.user_id.asc()).offset(offset).limit(limit)
+        )
+    ]
+
+    my_rank = None
+    mine = ranked.filter(ChallengeParticipant.user_id == user_id).first() if user_id is not None else None
+    if mine:
+        score = float(mine[1])
+        ahead = ranked.filter(or_(
+            progress > score,
+            and_(progress == score, ChallengeParticipant.user_id < user_id),
+        )).count()
+        my_rank = (ahead + 1, score)
+    return entries, ranked.count(), my_rank
@@ -0,0 +1,411 @@
+"""
+Live workout sessions: set-by-set logging without a commit per tap.
+
+The session's logged sets live in Redis when REDIS_URL is configured (a
+list per session plus a small meta hash, both expiring after
+SESSION_TTL_SECONDS of inactivity). Appending a set is one store round trip
+and no database write. Every CHECKPOINT_EVERY_SETS sets or
+CHECKPOINT_SECONDS, the sets are checkpointed to live_workout_sessions, so
+a lost store (restart, eviction) is re-seeded from the last checkpoint. If
+Redis is configured but unreachable the request fails; there is no silent
+fallback to memory.
+
+Without REDIS_URL the sets are held in process memory, which other workers
+cannot see, so every set is checkpointed under the row's lock and a held
+copy is used only while it matches the row's set_count.
+
+Finishing turns the sets into one Workout and its WorkoutExercise rows in a
+single transaction.
+"""
+import json
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from database import db, _REDIS_URL
+from models import Exercise, Workout, WorkoutExercise
+from models.live_workout_session import LiveWorkoutSession
+
+
+KEY_PREFIX = 'uptrakk:live_session:'
+SESSION_TTL_SECONDS = 12 * 3600
+CHECKPOINT_EVERY_SETS = 5
+CHECKPOINT_SECONDS = 60
+# Active sessions untouched this long are abandoned: not counted, replaced on start.
+# Measured from last_activity_at, which every checkpoint advances.
+ABANDONED_AFTER = timedelta(seconds=SESSION_TTL_SECONDS)
+
+
+def _meta_key(session_id):
+    return f"{KEY_PREFIX}{session_id}"
+
+
+def _sets_key(session_id):
+    return f"{KEY_PREFIX}{session_id}:sets"
+
+
+class MemorySessionStore:
+    """Process-local store with the same interface as the Redis store."""
+
+    # Other workers cannot see these sets
+    shared = False
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self, session_id, meta, sets=()):
+        with self._lock:
+            self._sessions[session_id] = (dict(meta), list(sets))
+
+    def get(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return (dict(entry[0]), list(entry[1])) if entry else None
+
+    def append(self, session_id, entry):
+        """(set_count, meta) after appending, or None if the session is not held."""
+        with self._lock:
+            held = self._sessions.get(session_id)
+            if held is None:
+                return None
+            held[1].append(entry)
+            return len(held[1]), dict(held[0])
+
+    def update_meta(self, session_id, **fields):
+        with self._lock:
+            if session_id in self._sessions:
+                self._sessions[session_id][0].update(fields)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+class RedisSessionStore:
+    """A list of JSON-encoded sets and a meta hash per session, shared by every worker."""
+
+    shared = True
+
+    def __init__(self, client):
+        self.client = client
+
+    @staticmethod
+    def _meta(raw):
+        return {
+            'user_id': int(raw['user_id']),
+            'checkpointed_sets': int(raw.get('checkpointed_sets', 0)),
+            'checkpointed_at': float(raw.get('checkpointed_at', 0)),
+        }
+
+    def create(self, session_id, meta, sets=()):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(_sets_key(session_id))
+        pipe.hset(_meta_key(session_id), mapping={k: str(v) for k, v in meta.items()})
+        if sets:
+            pipe.rpush(_sets_key(session_id), *[json.dumps(s) for s in sets])
+        pipe.expire(_meta_key(session_id), SESSION_TTL_SECONDS)
+        pipe.expire(_sets_key(session_id), SESSION_TTL_SECONDS)
+        pipe.execute()
+
+    def get(self, session_id):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(_meta_key(session_id))
+        pipe.lrange(_sets_key(session_id), 0, -1)
+        meta, sets = pipe.execute()
+        if not meta:
+            return None
+        return self._meta(meta), [json.loads(s) for s in sets]
+
+    def append(self, session_id, entry):
+        meta = self.client.hgetall(_meta_key(session_id))
+        if not meta:
+            return None
+        pipe = self.client.pipeline(transaction=True)
+        pipe.rpush(_sets_key(session_id), json.dumps(entry))
+        pipe.expire(_meta_key(session_id), SESSION_TTL_SECONDS)
+        pipe.expire(_sets_key(session_id), SESSION_TTL_SECONDS)
+        count = pipe.execute()[0]
+        return count, self._meta(meta)
+
+    def update_meta(self, session_id, **fields):
+        if self.client.exists(_meta_key(session_id)):
+            self.client.hset(_meta_key(session_id), mapping={k: str(v) for k, v in fields.items()})
+
+    def delete(self, session_id):
+        self.client.delete(_meta_key(session_id), _sets_key(session_id))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide store: Redis if configured, else memory."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_store()
+    return _store
+
+
+def reset_store():
+    """Forget this process's store (and any sets held in memory); the next get_store() creates a new one."""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+def _create_store():
+    if _REDIS_URL:
+        # No memory fallback: a worker pinned to its own memory would lose the
+        # sets logged through every other worker. The client reconnects on its
+        # own, so requests fail only while Redis is down.
+        import redis
+        return RedisSessionStore(redis.from_url(_REDIS_URL, decode_responses=True))
+    return MemorySessionStore()
+
+
+def _int_field(data, name, low, high, required=False):
+    value = data.get(name)
+    if value is None:
+        if required:
+            raise ValueError(f"{name} is required")
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+        raise ValueError(f"{name} must be an integer")
+    if not low <= value <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return int(value)
+
+
+def normalize_set(data):
+    """A logged set from request JSON; ValueError with a message if invalid."""
+    weight = data.get('weight')
+    if weight is not None:
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not 0 <= weight <= 1000:
+            raise ValueError("weight must be a number between 0 and 1000")
+    notes = data.get('notes')
+    if notes is not None and (not isinstance(notes, str) or len(notes) > 500):
+        raise ValueError("notes must be text of at most 500 characters")
+    return {
+        'exercise_id': _int_field(data, 'exercise_id', 1, 2 ** 31 - 1, required=True),
+        'reps': _int_field(data, 'reps', 0, 1000),
+        'weight': float(weight) if weight is not None else None,
+        'duration': _int_field(data, 'duration', 0, 86400),
+        'rpe': _int_field(data, 'rpe', 1, 10),
+        'notes': notes,
+        'logged_at': datetime.utcnow().isoformat(),
+    }
+
+
+def collapse_sets(sets):
+    """
+    WorkoutExercise rows for a list of logged sets: consecutive sets of the
+    same exercise at the same reps and weight become one row with `sets`
+    counted; anything else starts a new row.
+    """
+    rows = []
+    for entry in sets:
+        last = rows[-1] if rows else None
+        if (last and last['exercise_id'] == entry['exercise_id']
+                and last['reps'] == entry['reps'] and last['weight'] == entry['weight']
+                and not entry.get('notes')):
+            last['sets'] += 1
+            if entry.get('duration'):
+                last['duration'] = (last['duration'] or 0) + entry['duration']
+            continue
+        rows.append({
+            'exercise_id': entry['exercise_id'],
+            'sets': 1,
+            'reps': entry['reps'],
+            'weight': entry['weight'],
+            'duration': entry.get('duration'),
+            'notes': entry.get('notes'),
+        })
+    return rows
+
+
+def _active_query(user_id):
+    return LiveWorkoutSession.query.filter(
+        LiveWorkoutSession.user_id == user_id,
+        LiveWorkoutSession.status == 'active',
+        LiveWorkoutSession.last_activity_at >= datetime.utcnow() - ABANDONED_AFTER,
+    )
+
+
+def active_session(user_id):
+    """The user's current (non-abandoned) active session row, or None."""
+    return _active_query(user_id).order_by(LiveWorkoutSession.id.desc()).first()
+
+
+def active_session_count():
+    """Sessions in progress across all users, for the ACTIVE_WORKOUT_SESSIONS gauge."""
+    return LiveWorkoutSession.query.filter(
+        LiveWorkoutSession.status == 'active',
+        LiveWorkoutSession.last_activity_at >= datetime.utcnow() - ABANDONED_AFTER,
+    ).count()
+
+
+def start_session(user_id, workout_type=None, program_workout_id=None):
+    """
+    Open a session for the user, discarding any abandoned ones. Returns the
+    row; the caller commits.
+    """
+    LiveWorkoutSession.query.filter(
+        LiveWorkoutSession.user_id == user_id,
+        LiveWorkoutSession.status == 'active',
+        LiveWorkoutSession.last_activity_at < datetime.utcnow() - ABANDONED_AFTER,
+    ).update({'status': 'discarded'}, synchronize_session=False)
+
+    now = datetime.utcnow()
+    row = LiveWorkoutSession(
+        user_id=user_id,
+        status='active',
+        workout_type=workout_type,
+        program_workout_id=program_workout_id,
+        document={'sets': []},
+        set_count=0,
+        started_at=now,
+        last_activity_at=now,
+    )
+    db.session.add(row)
+    db.session.flush()
+    get_store().create(row.id, {'user_id': user_id, 'checkpointed_sets': 0, 'checkpointed_at': time.time()})
+    return row
+
+
+def load_session(session_id, user_id, lock=False):
+    """
+    (meta, sets) for the user's active session, re-seeding the store from
+    the last checkpoint if it lost the session (or, for the memory store,
+    holds an older copy than the row). None if there is no such active
+    session. `lock` holds the row FOR UPDATE until the caller commits.
+    """
+    store = get_store()
+    held = store.get(session_id)
+    if held is not None and held[0]['user_id'] != user_id:
+        return None
+    if held is not None and store.shared:
+        return held
+
+    query = _active_query(user_id).filter(LiveWorkoutSession.id == session_id)
+    row = (query.with_for_update() if lock else query).first()
+    if row is None:
+        return None
+    # Appends only grow the list, so an equal count means the same sets
+    if held is not None and len(held[1]) == row.set_count:
+        return held
+    sets = (row.document or {}).get('sets', [])
+    meta = {'user_id': user_id, 'checkpointed_sets': len(sets), 'checkpointed_at': time.time()}
+    store.create(session_id, meta, sets)
+    return meta, sets
+
+
+def checkpoint(session_id):
+    """Write the held sets to the session row and commit."""
+    held = get_store().get(session_id)
+    if held is None:
+        return False
+    _, sets = held
+    db.session.execute(
+        update(LiveWorkoutSession).where(
+            LiveWorkoutSession.id == session_id,
+            LiveWorkoutSession.status == 'active',
+        ).values(document={'sets': sets}, set_count=len(sets),
+                 checkpointed_at=datetime.utcnow(), last_activity_at=datetime.utcnow())
+    )
+    db.session.commit()
+    get_store().update_meta(session_id, checkpointed_sets=len(sets), checkpointed_at=time.time())
+    return True
+
+
+def append_set(session_id, user_id, entry):
+    """
+    Append a normalized set. Returns (set_count, checkpointed), or None if
+    the user has no such active session.
+    """
+    store = get_store()
+    if not store.shared:
+        # Re-seed from the row and checkpoint every set, under the row's lock
+        if load_session(session_id, user_id, lock=True) is None:
+            return None
+        count, _ = store.append(session_id, entry)
+        return count, checkpoint(session_id)
+
+    result = store.append(session_id, entry)
+    if result is None or result[1]['user_id'] != user_id:
+        if result is not None or load_session(session_id, user_id) is None:
+            return None
+        result = store.append(session_id, entry)
+        if result is None:
+            return None
+
+    count, meta = result
+    due = (count - meta['checkpointed_sets'] >= CHECKPOINT_EVERY_SETS
+           or time.time() - meta['checkpointed_at'] >= CHECKPOINT_SECONDS)
+    return count, checkpoint(session_id) if due else False
+
+
+def finish_session(session_id, user_id, duration=None, notes=None, rpe=None, workout_date=None):
+    """
+    Convert the session into a Workout with its WorkoutExercise rows.
+    Returns (row, workout, workout_exercises), or None if the user has no
+    such active session. The caller commits, then calls release().
+    """
+    row = _active_query(user_id).filter(
+        LiveWorkoutSession.id == session_id
+    ).with_for_update().first()
+    if row is None:
+        return None
+
+    store = get_store()
+    held = store.get(session_id) if store.shared else None
+    sets = held[1] if held else (row.document or {}).get('sets', [])
+    known = {
+        exercise_id for (exercise_id,) in db.session.query(Exercise.id).filter(
+            Exercise.id.in_({s['exercise_id'] for s in sets})
+        )
+    } if sets else set()
+    sets = [s for s in sets if s['exercise_id'] in known]
+
+    now = datetime.utcnow()
+    if duration is None:
+        duration = max(1, math.ceil((now - row.started_at).total_seconds() / 60))
+    workout = Workout(
+        user_id=user_id,
+        type=row.workout_type or 'Strength',
+        duration=duration,
+        date=workout_date or now.date(),
+        notes=notes,
+        rpe=rpe,
+    )
+    db.session.add(workout)
+    db.session.flush()
+
+    workout_exercises = [WorkoutExercise(workout_id=workout.id, **values) for values in collapse_sets(sets)]
+    db.session.add_all(workout_exercises)
+
+    row.status = 'finished'
+    row.document = {'sets': sets}
+    row.set_count = len(sets)
+    row.finished_at = now
+    row.workout_id = workout.id
+    return row, workout, workout_exercises
+
+
+def discard_session(session_id, user_id):
+    """Mark the user's active session discarded; the caller commits, then calls release()."""
+    row = _active_query(user_id).filter(LiveWorkoutSession.id == session_id).first()
+    if row is None:
+        return None
+    row.status = 'discarded'
+    row.finished_at = datetime.utcnow()
+    return row
+
+
+def release(session_id):
+    """Drop a finished or discarded session from the store (after commit)."""
+    get_store().delete(session_id)
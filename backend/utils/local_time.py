@@ -0,0 +1,65 @@
+"""
+User-local calendar days.
+
+Timestamps are stored as naive UTC. Rows that are grouped or deduplicated
+by day (habit logs, cardio sessions) also store the day they fell on in
+the user's timezone, so those queries compare a plain indexed date column.
+"""
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from models import UserProfile
+
+
+DEFAULT_TIMEZONE = 'UTC'
+
+
+def is_valid_timezone(name):
+    try:
+        ZoneInfo(name)
+        return True
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return False
+
+
+def user_timezone(user_id):
+    """The user's ZoneInfo from their profile, falling back to UTC."""
+    name = UserProfile.query.with_entities(UserProfile.timezone).filter_by(user_id=user_id).scalar()
+    if name and is_valid_timezone(name):
+        return ZoneInfo(name)
+    return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def as_utc(moment):
+    """Naive UTC datetime for storage; aware datetimes are converted."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_local_date(moment, tz):
+    """Calendar day of `moment` in `tz`; naive datetimes are taken as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(tz).date()
+
+
+def local_date_for(user_id, moment=None):
+    return to_local_date(moment or datetime.utcnow(), user_timezone(user_id))
+
+
+def local_today(user_id):
+    return local_date_for(user_id)
+
+
+def local_today_by_user(user_ids):
+    """{user_id: local_today(user_id)} for many users, from one profile query."""
+    names = dict(UserProfile.query.with_entities(
+        UserProfile.user_id, UserProfile.timezone
+    ).filter(UserProfile.user_id.in_(user_ids)).all()) if user_ids else {}
+    now = datetime.utcnow()
+    return {
+        user_id: to_local_date(now, ZoneInfo(
+            names[user_id] if is_valid_timezone(names.get(user_id)) else DEFAULT_TIMEZONE
+        ))
+        for user_id in user_ids
+    }
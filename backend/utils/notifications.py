@@ -2,6 +2,7 @@ from database import db
 from models.notification import Notification
 from flask import current_app
 from datetime import datetime
+from sqlalchemy import insert
 
 
 def create_notification(user_id, notification_type, message, priority="normal"):
@@ -22,6 +23,40 @@ def create_notification(user_id, notification_type, message, priority="normal"):
         return None
 
 
+def create_notifications_bulk(notifications):
+    """
+    Insert many notifications with a single statement. Each item is a dict
+    with user_id, type and message, plus optional priority, entity_type,
+    entity_id, action_url and scheduled_for. Returns the number queued;
+    caller commits.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "user_id": n["user_id"],
+            "type": n["type"],
+            "message": n["message"],
+            "priority": n.get("priority", "normal"),
+            "entity_type": n.get("entity_type"),
+            "entity_id": n.get("entity_id"),
+            "action_url": n.get("action_url"),
+            "is_read": False,
+            "scheduled_for": n.get("scheduled_for", now),
+            "delivered_at": now,
+            "created_at": now,
+        }
+        for n in notifications
+    ]
+    if not rows:
+        return 0
+    try:
+        db.session.execute(insert(Notification), rows)
+        return len(rows)
+    except Exception as e:
+        current_app.logger.error(f"Error creating {len(rows)} notifications: {e}")
+        raise
+
+
 def notify_achievement(user_id, achievement_name):
     return create_notification(user_id, "achievement", f"Achievement unlocked: {achievement_name}!", priority="high")
 
@@ -19,7 +19,8 @@ def calculate_point_multiplier(user_id):
     for i in range(30):  # Check last 30 days
         has_workout = Workout.query.filter(
             Workout.user_id == user_id,
-            db.func.date(Workout.date) == check_date
+            Workout.is_completed,
+            Workout.date == check_date
         ).first()
         
         if has_workout:
@@ -4,19 +4,24 @@ Automatically detects and records PRs when workouts are logged.
 """
 from database import db
 from models.personal_record import PersonalRecord
-from models import WorkoutExercise, Exercise
+from models import Workout, WorkoutExercise, Exercise
 from datetime import datetime
 from flask import current_app
+from sqlalchemy import func, case
+import numpy as np
+from utils.strength_analytics import one_rep_max
 
 
-def calculate_one_rep_max(weight, reps):
+def calculate_one_rep_max(weight, reps, formula='epley'):
     """
-    Calculate estimated 1RM using Epley formula.
+    Calculate estimated 1RM. Defaults to the Epley formula used for PRs:
     1RM = weight × (1 + reps/30)
+    Brzycki and Lombardi are also available (see utils.strength_analytics).
     """
     if not weight or not reps or reps < 1:
         return None
-    return weight * (1 + reps / 30)
+    estimate = one_rep_max(weight, reps, formula)
+    return None if np.isnan(estimate) else float(estimate)
 
 
 def check_and_update_prs(user_id, workout_id, workout_exercises):
@@ -125,6 +130,222 @@ def check_and_update_prs(user_id, workout_id, workout_exercises):
         return []
 
 
+# PersonalRecord columns in _set_metrics order, and the pr_types they report as
+PR_METRICS = ('max_weight', 'max_reps', 'max_volume', 'best_one_rep_max')
+PR_TYPES = {
+    'max_weight': 'max_weight',
+    'max_reps': 'max_reps',
+    'max_volume': 'max_volume',
+    'best_one_rep_max': 'one_rep_max',
+}
+
+
+def _set_metrics(we):
+    """Return (weight, reps, volume, 1rm) for a set, using the same rules as PR detection."""
+    weight = float(we.weight) if we.weight else 0
+    reps = we.reps if we.reps else 0
+    volume = weight * reps * (we.sets if we.sets else 1)
+    return weight, reps, volume, calculate_one_rep_max(weight, reps)
+
+
+def _backs_record(pr, we):
+    """True if removing or changing this set could lower any metric of the PR."""
+    if pr.workout_exercise_id == we.id:
+        return True
+    weight, reps, volume, one_rm = _set_metrics(we)
+    return (
+        (pr.max_weight is not None and weight >= pr.max_weight)
+        or (pr.max_reps is not None and reps >= pr.max_reps)
+        or (pr.max_volume is not None and volume >= pr.max_volume)
+        or (pr.best_one_rep_max is not None and one_rm is not None and one_rm >= pr.best_one_rep_max)
+    )
+
+
+def find_affected_prs(user_id, workout_exercises):
+    """
+    Return the exercise ids whose PR is backed by any of the given sets.
+    Must be called before the sets are deleted or modified.
+    """
+    exercise_ids = {we.exercise_id for we in workout_exercises}
+    if not exercise_ids:
+        return set()
+
+    prs = PersonalRecord.query.filter(
+        PersonalRecord.user_id == user_id,
+        PersonalRecord.exercise_id.in_(exercise_ids)
+    ).all()
+    prs_by_exercise = {pr.exercise_id: pr for pr in prs}
+
+    affected = set()
+    for we in workout_exercises:
+        pr = prs_by_exercise.get(we.exercise_id)
+        if pr and _backs_record(pr, we):
+            affected.add(we.exercise_id)
+    return affected
+
+
+def _best_sets_query(user_ids, exercise_ids=None):
+    """
+    One windowed pass over the users' set history.
+
+    Yields a single row per (user, exercise): the heaviest set (the one that
+    backs the record) together with every PR metric maxed over the partition.
+    Served by idx_workout_exercises_exercise_workout and idx_workouts_user_date.
+    """
+    weight = func.coalesce(WorkoutExercise.weight, 0)
+    reps = func.coalesce(WorkoutExercise.reps, 0)
+    volume = weight * reps * func.coalesce(WorkoutExercise.sets, 1)
+    one_rm = case(
+        (WorkoutExercise.reps >= 1, weight * (1 + WorkoutExercise.reps / 30.0)),
+        else_=None
+    )
+    partition = (Workout.user_id, WorkoutExercise.exercise_id)
+
+    ranked = db.session.query(
+        Workout.user_id.label('user_id'),
+        WorkoutExercise.exercise_id.label('exercise_id'),
+        WorkoutExercise.id.label('workout_exercise_id'),
+        WorkoutExercise.workout_id.label('workout_id'),
+        Workout.created_at.label('achieved_at'),
+        func.max(weight).over(partition_by=partition).label('max_weight'),
+        func.max(reps).over(partition_by=partition).label('max_reps'),
+        func.max(volume).over(partition_by=partition).label('max_volume'),
+        func.max(one_rm).over(partition_by=partition).label('best_one_rep_max'),
+        func.row_number().over(
+            partition_by=partition,
+            order_by=(weight.desc(), Workout.date.asc(), WorkoutExercise.id.asc())
+        ).label('rn')
+    ).join(
+        Workout, WorkoutExercise.workout_id == Workout.id
+    ).filter(
+        Workout.user_id.in_(user_ids),
+        Workout.is_completed,  # planned sets are not records
+    )
+    if exercise_ids is not None:
+        ranked = ranked.filter(WorkoutExercise.exercise_id.in_(exercise_ids))
+
+    ranked = ranked.subquery()
+    return db.session.query(ranked).filter(ranked.c.rn == 1)
+
+
+def _apply_best_set(pr, row):
+    """Copy aggregated metrics onto a PR row; zero metrics are stored as NULL."""
+    pr.max_weight = float(row.max_weight) if row.max_weight else None
+    pr.max_reps = row.max_reps or None
+    pr.max_volume = float(row.max_volume) if row.max_volume else None
+    pr.best_one_rep_max = float(row.best_one_rep_max) if row.best_one_rep_max else None
+    if pr.workout_exercise_id != row.workout_exercise_id:
+        pr.workout_id = row.workout_id
+        pr.workout_exercise_id = row.workout_exercise_id
+        pr.achieved_at = row.achieved_at or datetime.utcnow()
+
+
+def recompute_prs(user_id, exercise_ids):
+    """
+    Recompute PRs for the given (user, exercise) pairs from the remaining history.
+    Records with no remaining sets are deleted. Caller commits.
+    """
+    exercise_ids = set(exercise_ids)
+    if not exercise_ids:
+        return
+
+    rows = {
+        row.exercise_id: row
+        for row in _best_sets_query([user_id], exercise_ids)
+    }
+    prs = PersonalRecord.query.filter(
+        PersonalRecord.user_id == user_id,
+        PersonalRecord.exercise_id.in_(exercise_ids)
+    ).all()
+    prs_by_exercise = {pr.exercise_id: pr for pr in prs}
+
+    for exercise_id in exercise_ids:
+        row = rows.get(exercise_id)
+        pr = prs_by_exercise.get(exercise_id)
+        if row is None:
+            if pr:
+                db.session.delete(pr)
+            continue
+        if pr is None:
+            pr = PersonalRecord(user_id=user_id, exercise_id=exercise_id)
+            db.session.add(pr)
+        _apply_best_set(pr, row)
+
+    db.session.flush()
+
+
+def recheck_edited_set(user_id, workout_exercise):
+    """
+    Recompute the PR of an edited set's exercise from the full history, the
+    edited set included, and report the metrics the set now beats compared
+    with the record stored before the edit. Call after changing weight,
+    reps or sets. Caller commits.
+    """
+    exercise_id = workout_exercise.exercise_id
+    pr = PersonalRecord.query.filter_by(user_id=user_id, exercise_id=exercise_id).first()
+    before = {metric: getattr(pr, metric) for metric in PR_METRICS} if pr else None
+
+    recompute_prs(user_id, [exercise_id])
+    if before is None:
+        # First record for the exercise: a baseline, as when logging
+        return []
+
+    current = dict(zip(PR_METRICS, _set_metrics(workout_exercise)))
+    pr_types = [
+        PR_TYPES[metric] for metric in PR_METRICS
+        if current[metric] and (before[metric] is None or current[metric] > float(before[metric]))
+    ]
+    if not pr_types:
+        return []
+
+    exercise = Exercise.query.get(exercise_id)
+    weight, reps, volume, one_rm = (current[metric] for metric in PR_METRICS)
+    return [{
+        'exercise_id': exercise_id,
+        'exercise_name': exercise.name if exercise else 'Unknown',
+        'pr_types': pr_types,
+        'weight': weight,
+        'reps': reps,
+        'volume': volume,
+        'estimated_1rm': one_rm
+    }]
+
+
+def rebuild_prs_for_users(user_ids):
+    """
+    Rebuild every PR for a chunk of users from their full history.
+    Three queries per chunk regardless of history size. Caller commits.
+    Returns the number of PR rows written.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
+
+    rows = {(row.user_id, row.exercise_id): row for row in _best_sets_query(user_ids)}
+    existing = PersonalRecord.query.filter(PersonalRecord.user_id.in_(user_ids)).all()
+
+    seen = set()
+    for pr in existing:
+        key = (pr.user_id, pr.exercise_id)
+        row = rows.get(key)
+        if row is None or key in seen:
+            # No history left, or a duplicate record for the same pair
+            db.session.delete(pr)
+            continue
+        seen.add(key)
+        _apply_best_set(pr, row)
+
+    for (user_id, exercise_id), row in rows.items():
+        if (user_id, exercise_id) in seen:
+            continue
+        pr = PersonalRecord(user_id=user_id, exercise_id=exercise_id)
+        _apply_best_set(pr, row)
+        db.session.add(pr)
+
+    db.session.flush()
+    return len(rows)
+
+
 def get_user_prs(user_id, exercise_id=None):
     """Get all PRs for a user, optionally filtered by exercise."""
     query = PersonalRecord.query.filter_by(user_id=user_id)
@@ -0,0 +1,71 @@
+"""
+Serialized workout program trees, cached per worker by catalog version.
+
+A program tree (program -> workouts -> exercises) is loaded with
+selectinload in three queries and serialized once; readers get the cached
+dict until seed_programs.py bumps the programs catalog version. Per-user
+enrollment state is kept out of the cache and attached by the caller from
+active_enrollments(), one query per request.
+"""
+from sqlalchemy.orm import selectinload
+from models.workout_program import WorkoutProgram, ProgramWorkout, ProgramEnrollment
+from utils.catalog_cache import PROGRAMS, get_entry
+
+
+def _load(query):
+    return query.options(
+        selectinload(WorkoutProgram.workouts).selectinload(ProgramWorkout.exercises)
+    )
+
+
+def serialize_tree(program):
+    """program.to_dict() with its workouts by week and day, exercises in order."""
+    tree = program.to_dict()
+    tree['workouts'] = []
+    for workout in sorted(program.workouts, key=lambda w: (w.week_number, w.day_number, w.id)):
+        workout_dict = workout.to_dict()
+        workout_dict['exercises'] = [
+            e.to_dict() for e in sorted(workout.exercises, key=lambda e: (e.order_index or 0, e.id))
+        ]
+        tree['workouts'].append(workout_dict)
+    return tree
+
+
+def public_programs():
+    """Payload of GET /programs."""
+    programs = WorkoutProgram.query.filter_by(is_public=True).order_by(WorkoutProgram.id).all()
+    return {
+        'success': True,
+        'programs': [p.to_dict() for p in programs]
+    }
+
+
+def program_tree(program_id):
+    """The cached tree for a program, or None if it does not exist."""
+    def build():
+        program = _load(WorkoutProgram.query.filter_by(id=program_id)).first()
+        return serialize_tree(program) if program else None
+    return get_entry(PROGRAMS, ('tree', program_id), build).payload
+
+
+def program_summaries():
+    """{program_id: program.to_dict()} for every program, public or not."""
+    def build():
+        return {p.id: p.to_dict() for p in WorkoutProgram.query.all()}
+    return get_entry(PROGRAMS, 'summaries', build).payload
+
+
+def find_workout(tree, week_number, day_number):
+    """The serialized workout scheduled for (week, day) in a tree, or None."""
+    for workout in tree['workouts']:
+        if workout['week_number'] == week_number and workout['day_number'] == day_number:
+            return workout
+    return None
+
+
+def active_enrollments(user_id, program_id=None):
+    """{program_id: ProgramEnrollment} for the user's active enrollments."""
+    query = ProgramEnrollment.query.filter_by(user_id=user_id, status='active')
+    if program_id is not None:
+        query = query.filter_by(program_id=program_id)
+    return {e.program_id: e for e in query.all()}
@@ -0,0 +1,179 @@
+"""
+Program enrollments driven by logged workouts.
+
+A logged workout fulfils a programmed session when the client names it
+(program_workout_id) or, failing that, when it covers at least
+MATCH_THRESHOLD of the exercises in an active enrollment's current session.
+Linking records the session on the workout and moves the enrollment past
+it, so current_week/current_day follow what the user actually trained.
+Adherence compares the distinct sessions completed with those scheduled
+since the start date.
+"""
+from datetime import datetime
+from sqlalchemy import func
+from database import db
+from models import Exercise, Workout, WorkoutExercise
+from utils.last_performance import last_performance_map
+from utils.program_catalog import active_enrollments, find_workout, program_summaries, program_tree
+
+
+# Share of a session's exercises a workout must include to count as that session
+MATCH_THRESHOLD = 0.5
+
+
+def advance_enrollment(enrollment, program, after=None, now=None):
+    """
+    Move `enrollment` to the session following `after` (week, day), by
+    default its current one, completing it past the program's last week.
+    `program` is the program's summary dict.
+    """
+    week, day = after or (enrollment.current_week, enrollment.current_day)
+    day += 1
+    if day > (program['workouts_per_week'] or 1):
+        day = 1
+        week += 1
+    enrollment.current_week, enrollment.current_day = week, day
+
+    if program['duration_weeks'] and week > program['duration_weeks']:
+        enrollment.status = 'completed'
+        enrollment.completed_at = now or datetime.utcnow()
+
+
+def _coverage(session, exercise_names):
+    planned = {e['exercise_name'].strip().lower() for e in session['exercises']}
+    return len(planned & exercise_names) / len(planned) if planned else 0.0
+
+
+def _match_session(enrollments, workout, program_workout_id):
+    """(enrollment, session) the workout fulfils, or (None, None)."""
+    if program_workout_id:
+        for enrollment in enrollments:
+            tree = program_tree(enrollment.program_id)
+            for session in (tree or {}).get('workouts', []):
+                if session['id'] == program_workout_id:
+                    return enrollment, session
+        return None, None
+
+    exercise_names = {
+        name.lower() for (name,) in db.session.query(Exercise.name).join(
+            WorkoutExercise, WorkoutExercise.exercise_id == Exercise.id
+        ).filter(WorkoutExercise.workout_id == workout.id)
+    }
+    best, best_coverage = (None, None), MATCH_THRESHOLD
+    for enrollment in enrollments:
+        tree = program_tree(enrollment.program_id)
+        session = find_workout(tree, enrollment.current_week, enrollment.current_day) if tree else None
+        if session:
+            coverage = _coverage(session, exercise_names)
+            if coverage >= best_coverage:
+                best, best_coverage = (enrollment, session), coverage
+    return best
+
+
+def link_workout_to_program(user_id, workout, program_workout_id=None):
+    """
+    Link a just-logged workout to the programmed session it fulfils and
+    advance that enrollment. Returns the enrollment, or None if the workout
+    is not part of an active program. The caller commits.
+    """
+    enrollments = sorted(active_enrollments(user_id).values(), key=lambda e: e.id)
+    if not enrollments:
+        return None
+
+    enrollment, session = _match_session(enrollments, workout, program_workout_id)
+    if not enrollment:
+        return None
+
+    workout.program_enrollment_id = enrollment.id
+    workout.program_workout_id = session['id']
+
+    # Sessions done early or out of order move the enrollment forward only
+    position = (session['week_number'], session['day_number'])
+    if position >= (enrollment.current_week, enrollment.current_day):
+        program = program_summaries().get(enrollment.program_id)
+        if program:
+            advance_enrollment(enrollment, program, after=position)
+    return enrollment
+
+
+def adherence(enrollments, today):
+    """
+    {enrollment_id: stats} for the given enrollments, from one grouped
+    query: sessions completed and scheduled to date, adherence_rate
+    (completed / scheduled, capped at 1) and percent_complete.
+    """
+    ids = [e.id for e in enrollments]
+    completed = {
+        row.enrollment_id: row for row in db.session.query(
+            Workout.program_enrollment_id.label('enrollment_id'),
+            func.count(func.distinct(Workout.program_workout_id)).label('sessions'),
+            func.max(Workout.date).label('last_session'),
+        ).filter(
+            Workout.program_enrollment_id.in_(ids),
+            Workout.is_completed,
+        ).group_by(Workout.program_enrollment_id)
+    } if ids else {}
+    summaries = program_summaries()
+
+    stats = {}
+    for enrollment in enrollments:
+        program = summaries.get(enrollment.program_id) or {}
+        per_week = program.get('workouts_per_week') or 1
+        total = per_week * (program.get('duration_weeks') or 0)
+
+        end = enrollment.completed_at.date() if enrollment.completed_at else today
+        elapsed_days = (end - enrollment.start_date).days + 1 if enrollment.start_date else 0
+        scheduled = max(elapsed_days, 0) * per_week // 7
+        if total:
+            scheduled = min(scheduled, total)
+
+        row = completed.get(enrollment.id)
+        done = row.sessions if row else 0
+        stats[enrollment.id] = {
+            'sessions_completed': done,
+            'sessions_scheduled': scheduled,
+            'sessions_total': total,
+            'adherence_rate': round(min(done / scheduled, 1.0), 3) if scheduled else None,
+            'percent_complete': round(100 * done / total, 1) if total else None,
+            'last_session_date': row.last_session.isoformat() if row and row.last_session else None,
+        }
+    return stats
+
+
+def todays_sessions(user_id, enrollments):
+    """
+    The current programmed session of each enrollment, with every planned
+    exercise resolved to an Exercise id and the user's last performance.
+    Exercises and history are fetched in one query each, for all sessions.
+    """
+    planned = []
+    for enrollment in sorted(enrollments, key=lambda e: e.id):
+        tree = program_tree(enrollment.program_id)
+        session = find_workout(tree, enrollment.current_week, enrollment.current_day) if tree else None
+        if session:
+            planned.append((enrollment, tree, session))
+
+    names = {e['exercise_name'].strip().lower() for _, _, s in planned for e in s['exercises']}
+    exercise_ids = dict(
+        db.session.query(func.lower(Exercise.name), Exercise.id).filter(
+            func.lower(Exercise.name).in_(names)
+        ).all()
+    ) if names else {}
+    history = last_performance_map(user_id, list(exercise_ids.values())) if exercise_ids else {}
+
+    sessions = []
+    for enrollment, tree, session in planned:
+        exercises = []
+        for planned_exercise in session['exercises']:
+            exercise_id = exercise_ids.get(planned_exercise['exercise_name'].strip().lower())
+            exercises.append({
+                **planned_exercise,
+                'exercise_id': exercise_id,
+                'last_performance': history.get(exercise_id),
+            })
+        sessions.append({
+            'enrollment': enrollment.to_dict(),
+            'program': {k: v for k, v in tree.items() if k != 'workouts'},
+            'workout': {**session, 'exercises': exercises},
+        })
+    return sessions
@@ -0,0 +1,139 @@
+"""
+Daily quest catalog cache and batch assignment.
+
+The active quest catalog is cached per process and reloaded only when its
+version (kept in the shared cache) changes, so any worker that edits the
+catalog invalidates all of them. Quests are pre-assigned for a whole day by
+scripts/assign_daily_quests.py with one INSERT ... SELECT per chunk of users;
+each user's picks come from a seeded hash of (user, quest, day), so re-runs
+and the on-demand path pick the same quests.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from sqlalchemy import BigInteger, and_, cast, exists, func, literal, select, union
+from database import db, cache
+from models import User, Workout
+from models.daily_quest import DailyQuest, UserDailyQuest
+
+
+QUESTS_PER_DAY = 3
+
+# Users with any activity in this window get quests pre-assigned
+ACTIVE_USER_DAYS = 30
+
+_VERSION_KEY = 'daily_quest_catalog_version'
+# How long a worker trusts its copy before re-checking the shared version
+VERSION_CHECK_SECONDS = 30
+
+# Multiplicative hash constants (P is prime, below 2**31)
+_HASH_PRIME = 2147483629
+_USER_MULTIPLIER = 2654435761
+_DAY_MULTIPLIER = 40503
+
+_catalog = {'version': None, 'checked_at': 0.0, 'quests': {}}
+_catalog_lock = threading.Lock()
+
+
+def _current_version():
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.set(_VERSION_KEY, version, timeout=0)
+    return version
+
+
+def invalidate_quest_catalog():
+    """Bump the catalog version; every worker reloads on its next check."""
+    cache.set(_VERSION_KEY, _current_version() + 1, timeout=0)
+    with _catalog_lock:
+        _catalog['checked_at'] = 0.0
+
+
+def get_quest_catalog():
+    """{quest_id: quest dict} for every active quest, served from memory."""
+    now = time.monotonic()
+    with _catalog_lock:
+        if _catalog['version'] is not None and now - _catalog['checked_at'] < VERSION_CHECK_SECONDS:
+            return _catalog['quests']
+
+    version = _current_version()
+    with _catalog_lock:
+        if version != _catalog['version']:
+            quests = DailyQuest.query.filter_by(is_active=True).order_by(DailyQuest.id).all()
+            _catalog['quests'] = {quest.id: quest.to_dict() for quest in quests}
+            _catalog['version'] = version
+        _catalog['checked_at'] = now
+        return _catalog['quests']
+
+
+def active_user_ids(day=None, days=ACTIVE_USER_DAYS):
+    """Users who signed up, logged a workout or had quests within `days`."""
+    cutoff = (day or date.today()) - timedelta(days=days)
+    rows = db.session.execute(union(
+        select(User.id).where(User.created_at >= cutoff),
+        select(Workout.user_id).where(Workout.date >= cutoff),
+        select(UserDailyQuest.user_id).where(UserDailyQuest.date_assigned >= cutoff),
+    )).scalars()
+    return sorted(rows)
+
+
+def _pick_rank(day):
+    """
+    Per-user pseudo-random order over the catalog, stable for a given day:
+    k = hash(user, day), then rank quests by k * (quest_id + 1) mod P.
+    """
+    user_key = (
+        cast(User.id, BigInteger) * _USER_MULTIPLIER + day.toordinal() * _DAY_MULTIPLIER
+    ) % _HASH_PRIME + 1
+    quest_hash = (user_key * (cast(DailyQuest.id, BigInteger) + 1)) % _HASH_PRIME
+    return func.row_number().over(
+        partition_by=User.id, order_by=(quest_hash, DailyQuest.id)
+    )
+
+
+def assign_quests_for_users(user_ids, day=None, per_user=QUESTS_PER_DAY):
+    """
+    Assign `per_user` active quests to each user for `day` with a single
+    INSERT ... SELECT. Users who already have quests for that day are left
+    alone, and rows a concurrent assignment inserted first are skipped.
+    Caller commits. Returns the number of rows inserted.
+    """
+    day = day or date.today()
+    if not user_ids:
+        return 0
+
+    already_assigned = exists().where(and_(
+        UserDailyQuest.user_id == User.id,
+        UserDailyQuest.date_assigned == day,
+    ))
+    candidates = select(
+        User.id.label('user_id'),
+        DailyQuest.id.label('quest_id'),
+        _pick_rank(day).label('pick'),
+    ).select_from(User).join(
+        DailyQuest, DailyQuest.is_active == True  # noqa: E712
+    ).where(
+        User.id.in_(user_ids),
+        ~already_assigned,
+    ).subquery()
+
+    picks = select(
+        candidates.c.user_id,
+        candidates.c.quest_id,
+        literal(day).label('date_assigned'),
+        literal(0).label('current_progress'),
+        literal(False).label('is_completed'),
+    ).where(candidates.c.pick <= per_user)
+
+    if db.engine.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    result = db.session.execute(
+        insert(UserDailyQuest.__table__).from_select(
+            ['user_id', 'quest_id', 'date_assigned', 'current_progress', 'is_completed'],
+            picks,
+        ).on_conflict_do_nothing(index_elements=['user_id', 'date_assigned', 'quest_id'])
+    )
+    return result.rowcount or 0
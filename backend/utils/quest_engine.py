@@ -0,0 +1,136 @@
+"""
+Server-side daily quest evaluation.
+
+The reward hooks (utils/rewards.py) pass each write event here. One query
+loads the user's open quests for today whose type the event can advance;
+if there are none, nothing else runs. Progress is advanced in place and
+every quest completed by the event is paid out with a single ledger write.
+"""
+from datetime import datetime
+from sqlalchemy import func
+from database import db
+from models import Workout, WorkoutExercise, GoalLink, Goal
+from models.daily_quest import DailyQuest, UserDailyQuest
+from utils.gamification_helper import award_points_bulk
+from utils.local_time import local_today
+
+
+# Quest types each event can advance. Covers both the seeded catalog
+# (seed_test_data.py) and the built-in defaults (api/daily_quests.py).
+EVENT_QUEST_TYPES = {
+    'workout_logged': (
+        'workout_count', 'log_workout', 'exercise_count',
+        'streak_maintain', 'workout_streak', 'hit_pr', 'goal_progress',
+    ),
+    'habit_completed': ('habit_count', 'complete_habit', 'goal_progress'),
+    'weight_logged': ('log_weight',),
+    'social_like': ('social_activity',),
+    'social_comment': ('social_activity', 'comment_on_friend'),
+    'goal_updated': ('goal_progress',),
+}
+
+# Quest types only a workout dated on the quest's day can advance
+SAME_DAY_WORKOUT_QUEST_TYPES = ('workout_count', 'log_workout', 'streak_maintain', 'workout_streak')
+
+# Every quest type some event evaluates; others can still be completed by hand
+EVALUATED_QUEST_TYPES = frozenset(t for types in EVENT_QUEST_TYPES.values() for t in types)
+
+
+def _open_quests(user_id, quest_types, day):
+    return db.session.query(UserDailyQuest, DailyQuest).join(
+        DailyQuest, DailyQuest.id == UserDailyQuest.quest_id
+    ).filter(
+        UserDailyQuest.user_id == user_id,
+        UserDailyQuest.date_assigned == day,
+        UserDailyQuest.is_completed == False,  # noqa: E712
+        DailyQuest.quest_type.in_(quest_types),
+    ).all()
+
+
+def _distinct_exercises_on(user_id, day):
+    return db.session.query(
+        func.count(func.distinct(WorkoutExercise.exercise_id))
+    ).join(
+        Workout, WorkoutExercise.workout_id == Workout.id
+    ).filter(
+        Workout.user_id == user_id,
+        Workout.is_completed,
+        Workout.date == day,
+    ).scalar() or 0
+
+
+def _goal_links_advanced(user_id, event, context):
+    """Whether sync_goal_progress would have moved a goal for this event."""
+    query = db.session.query(GoalLink.id).join(Goal, Goal.id == GoalLink.goal_id).filter(
+        Goal.user_id == user_id,
+        Goal.auto_sync == True,  # noqa: E712
+    )
+    if event == 'workout_logged':
+        workout = context['workout']
+        query = query.filter(
+            GoalLink.entity_type == 'workout',
+            db.or_(GoalLink.linked_workout_type == workout.type, GoalLink.linked_workout_type.is_(None)),
+        )
+    else:
+        habit_ids = context.get('habit_ids') or [context['habit_id']]
+        query = query.filter(GoalLink.entity_type == 'habit', GoalLink.entity_id.in_(habit_ids))
+    return query.first() is not None
+
+
+def _new_progress(quest_type, current, user_id, event, day, context):
+    """Progress after the event, or None if the event doesn't move this quest."""
+    if quest_type == 'exercise_count':
+        return max(current, _distinct_exercises_on(user_id, day))
+    if quest_type in SAME_DAY_WORKOUT_QUEST_TYPES and context['workout'].date != day:
+        return None  # a backdated workout isn't today's training
+    if quest_type in ('streak_maintain', 'workout_streak'):
+        # A workout logged today keeps the streak alive
+        return max(current, 1)
+    if quest_type == 'hit_pr':
+        prs = context.get('pr_count', 0)
+        return current + prs if prs else None
+    if quest_type == 'goal_progress' and event != 'goal_updated':
+        return current + 1 if _goal_links_advanced(user_id, event, context) else None
+    return current + context.get('count', 1)
+
+
+def evaluate_quest_event(user_id, event, day=None, **context):
+    """
+    Advance today's quests for one event. Context by event:
+    workout_logged -> workout, pr_count; habit_completed -> habit_id, or
+    habit_ids and count for a batch check-in.
+    Returns the UserDailyQuest rows completed by this event. Caller commits.
+    """
+    quest_types = EVENT_QUEST_TYPES.get(event)
+    if not quest_types:
+        return []
+    day = day or local_today(user_id)
+
+    open_quests = _open_quests(user_id, quest_types, day)
+    if not open_quests:
+        return []
+
+    completed = []
+    awards = []
+    for user_quest, quest in open_quests:
+        progress = _new_progress(quest.quest_type, user_quest.current_progress or 0, user_id, event, day, context)
+        if progress is None:
+            continue
+
+        target = quest.target_value or 1
+        user_quest.current_progress = min(progress, target)
+        if progress >= target:
+            user_quest.is_completed = True
+            user_quest.completed_at = datetime.utcnow()
+            completed.append(user_quest)
+            awards.append({
+                'user_id': user_id,
+                'reason': 'daily_quest_completed',
+                'points': quest.points_reward,
+                'entity_type': 'quest',
+                'entity_id': user_quest.id,
+            })
+
+    award_points_bulk(awards)
+    db.session.flush()
+    return completed
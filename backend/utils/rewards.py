@@ -7,15 +7,24 @@ Endpoints call these functions after a successful action. Each function handles:
 3. Syncing goal progress
 4. Sending notifications
 5. Creating social activity
+6. Applying challenge progress
+7. Advancing daily quests
+8. Advancing program enrollments
 """
 from flask import current_app
 from utils.gamification_helper import (
     award_points,
+    award_points_bulk,
     check_workout_achievements,
     check_habit_achievements,
     check_goal_achievements,
+    check_streak_achievements,
 )
 from utils.goal_sync import sync_goal_progress
+from utils.challenge_progress import apply_workout_to_challenges
+from utils.quest_engine import evaluate_quest_event
+from utils.program_progress import link_workout_to_program
+from utils.habit_calendar import current_streak, consistency_rate
 from utils.notifications import (
     notify_achievement,
     notify_level_up,
@@ -65,8 +74,19 @@ def _handle_completed_goals(user_id, completed_goals):
     _handle_achievements(user_id, achievements)
 
 
-def on_workout_logged(user_id, workout):
-    """Called after a workout is successfully created."""
+def _advance_quests(user_id, event, **context):
+    """Quest failures are logged but never block the rest of the pipeline."""
+    try:
+        evaluate_quest_event(user_id, event, **context)
+    except Exception as e:
+        current_app.logger.warning(f"Failed to evaluate daily quests for {event}: {e}")
+
+
+def on_workout_logged(user_id, workout, pr_count=0, program_workout_id=None):
+    """
+    Called after a workout is successfully created. `program_workout_id`
+    names the programmed session it fulfils, if the client knows it.
+    """
     try:
         from models.workout import Workout
         from utils.social_helpers import create_workout_activity
@@ -79,7 +99,7 @@ def on_workout_logged(user_id, workout):
         _handle_reward_result(user_id, result)
 
         # 2. Check workout achievements
-        workout_count = Workout.query.filter_by(user_id=user_id).count()
+        workout_count = Workout.query.filter(Workout.user_id == user_id, Workout.is_completed).count()
         achievements = check_workout_achievements(user_id, workout_count)
         _handle_achievements(user_id, achievements)
 
@@ -98,10 +118,89 @@ def on_workout_logged(user_id, workout):
         if completed_goals:
             _handle_completed_goals(user_id, completed_goals)
 
+        # 5. Apply this workout's delta to active challenges
+        try:
+            apply_workout_to_challenges(user_id, workout)
+        except Exception as e:
+            current_app.logger.warning(f"Failed to update challenge progress for workout: {e}")
+
+        # 6. Advance daily quests
+        _advance_quests(user_id, "workout_logged", workout=workout, pr_count=pr_count)
+
+        # 7. Link to the programmed session and advance the enrollment
+        try:
+            link_workout_to_program(user_id, workout, program_workout_id)
+        except Exception as e:
+            current_app.logger.warning(f"Failed to advance program enrollment for workout: {e}")
+
     except Exception as e:
         current_app.logger.error(f"Error in on_workout_logged for user {user_id}: {e}")
 
 
+def on_workouts_logged(user_id, workouts, pr_counts=None, program_workout_ids=None):
+    """
+    Called after several workouts are created at once (offline sync). Runs
+    the on_workout_logged chain with one points award and one achievement
+    pass for the batch; the per-workout steps follow in date order.
+    `pr_counts` and `program_workout_ids` are keyed by workout id.
+    """
+    try:
+        from models.workout import Workout
+        from utils.social_helpers import create_workout_activity
+
+        if not workouts:
+            return
+        pr_counts = pr_counts or {}
+        program_workout_ids = program_workout_ids or {}
+        workouts = sorted(workouts, key=lambda w: (w.date, w.id))
+
+        # 1. Award points
+        results = award_points_bulk([
+            {"user_id": user_id, "reason": "workout_logged", "entity_type": "workout", "entity_id": workout.id}
+            for workout in workouts
+        ])
+        _handle_reward_result(user_id, results.get(user_id))
+
+        # 2. Check workout achievements
+        workout_count = Workout.query.filter(Workout.user_id == user_id, Workout.is_completed).count()
+        achievements = check_workout_achievements(user_id, workout_count)
+        _handle_achievements(user_id, achievements)
+
+        for workout in workouts:
+            # 3. Create social activity
+            try:
+                create_workout_activity(user_id, workout)
+            except Exception as e:
+                current_app.logger.warning(f"Failed to create social activity for workout: {e}")
+
+            # 4. Sync goal progress
+            completed_goals = sync_goal_progress(
+                user_id, "workout",
+                entity_id=workout.id,
+                entity_value=workout.type,
+            )
+            if completed_goals:
+                _handle_completed_goals(user_id, completed_goals)
+
+            # 5. Apply this workout's delta to active challenges
+            try:
+                apply_workout_to_challenges(user_id, workout)
+            except Exception as e:
+                current_app.logger.warning(f"Failed to update challenge progress for workout: {e}")
+
+            # 6. Advance daily quests
+            _advance_quests(user_id, "workout_logged", workout=workout, pr_count=pr_counts.get(workout.id, 0))
+
+            # 7. Link to the programmed session and advance the enrollment
+            try:
+                link_workout_to_program(user_id, workout, program_workout_ids.get(workout.id))
+            except Exception as e:
+                current_app.logger.warning(f"Failed to advance program enrollment for workout: {e}")
+
+    except Exception as e:
+        current_app.logger.error(f"Error in on_workouts_logged for user {user_id}: {e}")
+
+
 def on_habit_logged(user_id, habit_id, habit_log):
     """Called after a habit completion is logged."""
     try:
@@ -123,16 +222,23 @@ def on_habit_logged(user_id, habit_id, habit_log):
         total_logs = HabitLog.query.filter_by(completed=True)\
             .join(HabitLog.habit)\
             .filter_by(user_id=user_id).count()
-        achievements = check_habit_achievements(user_id, total_logs)
+        achievements = check_habit_achievements(user_id, total_logs, consistency_rate(user_id))
         _handle_achievements(user_id, achievements)
 
-        # 3. Create social activity on first completion and every 7-day milestone
+        # 3. Streak achievements, and social activity on first completion
+        # and every 7-day milestone (streaks are kept by utils/habit_calendar.py)
+        habit = Habit.query.get(habit_id)
+        streak = current_streak(habit, habit_log.local_date) if habit else 0
+        achievements = check_streak_achievements(user_id, habit_streak=streak)
+        _handle_achievements(user_id, achievements)
         try:
-            streak = HabitLog.query.filter_by(habit_id=habit_id, completed=True).count()
-            if streak == 1 or streak % 7 == 0:
-                habit = Habit.query.get(habit_id)
-                if habit:
-                    create_habit_activity(user_id, habit, streak)
+            first_completion = HabitLog.query.filter(
+                HabitLog.habit_id == habit_id,
+                HabitLog.completed == True,  # noqa: E712
+                HabitLog.id != habit_log.id,
+            ).first() is None
+            if habit and (first_completion or (streak and streak % 7 == 0)):
+                create_habit_activity(user_id, habit, streak)
         except Exception as e:
             current_app.logger.warning(f"Failed to create social activity for habit: {e}")
 
@@ -144,10 +250,81 @@ def on_habit_logged(user_id, habit_id, habit_log):
         if completed_goals:
             _handle_completed_goals(user_id, completed_goals)
 
+        # 5. Advance daily quests
+        _advance_quests(user_id, "habit_completed", habit_id=habit_id)
+
     except Exception as e:
         current_app.logger.error(f"Error in on_habit_logged for user {user_id}: {e}")
 
 
+def on_habits_logged(user_id, habit_logs):
+    """
+    Called after a batch check-in. Runs the on_habit_logged chain once for
+    all the logs: one points award, one achievement pass, one goal sync and
+    one quest evaluation.
+    """
+    try:
+        from database import db
+        from models.habit_log import HabitLog
+        from models.habit import Habit
+        from utils.social_helpers import create_habit_activity
+
+        completed = [log for log in habit_logs if log.completed]
+        if not completed:
+            return
+        habit_ids = [log.habit_id for log in completed]
+
+        # 1. Award points
+        results = award_points_bulk([
+            {"user_id": user_id, "reason": "habit_completed", "entity_type": "habit", "entity_id": habit_id}
+            for habit_id in habit_ids
+        ])
+        _handle_reward_result(user_id, results.get(user_id))
+
+        # 2. Check habit achievements
+        total_logs = HabitLog.query.filter_by(completed=True)\
+            .join(HabitLog.habit)\
+            .filter_by(user_id=user_id).count()
+        achievements = check_habit_achievements(user_id, total_logs, consistency_rate(user_id))
+        _handle_achievements(user_id, achievements)
+
+        # 3. Streak achievements, and social activity on first completion
+        # and every 7-day milestone
+        day = completed[0].local_date
+        habits = Habit.query.filter(Habit.id.in_(habit_ids)).all()
+        streaks = {habit.id: current_streak(habit, day) for habit in habits}
+        achievements = check_streak_achievements(user_id, habit_streak=max(streaks.values(), default=0))
+        _handle_achievements(user_id, achievements)
+        try:
+            logged_before = {
+                row.habit_id for row in db.session.query(HabitLog.habit_id).filter(
+                    HabitLog.habit_id.in_(habit_ids),
+                    HabitLog.completed == True,  # noqa: E712
+                    HabitLog.id.notin_([log.id for log in completed]),
+                ).distinct()
+            }
+            for habit in habits:
+                streak = streaks[habit.id]
+                if habit.id not in logged_before or (streak and streak % 7 == 0):
+                    create_habit_activity(user_id, habit, streak)
+        except Exception as e:
+            current_app.logger.warning(f"Failed to create social activity for habits: {e}")
+
+        # 4. Sync goal progress
+        completed_goals = sync_goal_progress(
+            user_id, "habit",
+            entity_ids=habit_ids,
+        )
+        if completed_goals:
+            _handle_completed_goals(user_id, completed_goals)
+
+        # 5. Advance daily quests
+        _advance_quests(user_id, "habit_completed", habit_ids=habit_ids, count=len(habit_ids))
+
+    except Exception as e:
+        current_app.logger.error(f"Error in on_habits_logged for user {user_id}: {e}")
+
+
 def on_weight_logged(user_id, weight_log_id):
     """Called after a weight log is created."""
     try:
@@ -157,5 +334,17 @@ def on_weight_logged(user_id, weight_log_id):
         )
         _handle_reward_result(user_id, result)
 
+        _advance_quests(user_id, "weight_logged")
+
     except Exception as e:
-        current_app.logger.error(f"Error in on_weight_logged for user {user_id}: {e}")
\ No newline at end of file
+        current_app.logger.error(f"Error in on_weight_logged for user {user_id}: {e}")
+
+
+def on_social_interaction(user_id, kind):
+    """Called after a user likes ('like') or comments on ('comment') someone else's activity."""
+    _advance_quests(user_id, f"social_{kind}")
+
+
+def on_goal_updated(user_id):
+    """Called after a user records progress on a goal by hand."""
+    _advance_quests(user_id, "goal_updated")
@@ -0,0 +1,274 @@
+"""
+Vectorized strength-progression analytics.
+
+A user's history for one exercise is loaded once as NumPy arrays and every
+statistic (e1RM, rolling bests, trend, plateau) is computed without Python
+loops over sets, so cost stays flat for 10k+ set histories.
+"""
+import numpy as np
+from database import db
+from models import Workout, WorkoutExercise
+
+
+# Estimated one-rep max models. Each takes weight and reps arrays.
+ONE_RM_FORMULAS = {
+    'epley': lambda weight, reps: weight * (1 + reps / 30.0),
+    'brzycki': lambda weight, reps: weight * 36.0 / (37.0 - reps),
+    'lombardi': lambda weight, reps: weight * np.power(reps, 0.10),
+}
+
+DEFAULT_FORMULA = 'epley'
+
+
+def one_rep_max(weight, reps, formula=DEFAULT_FORMULA):
+    """
+    Estimate 1RM for scalars or arrays. Sets without weight or reps, and
+    rep counts outside a model's range (Brzycki past 36), give NaN.
+    """
+    if formula not in ONE_RM_FORMULAS:
+        raise ValueError(f"Unknown 1RM formula: {formula}")
+
+    weight = np.asarray(weight, dtype=np.float64)
+    reps = np.asarray(reps, dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        estimate = ONE_RM_FORMULAS[formula](weight, reps)
+    valid = (weight > 0) & (reps >= 1) & np.isfinite(estimate) & (estimate > 0)
+    return np.where(valid, estimate, np.nan)
+
+
+def load_exercise_history(user_id, exercise_id):
+    """
+    Load every logged set for (user, exercise) in one query, ordered by date.
+    Returns a dict of equal-length arrays.
+    """
+    rows = db.session.query(
+        Workout.id,
+        Workout.date,
+        WorkoutExercise.sets,
+        WorkoutExercise.reps,
+        WorkoutExercise.weight,
+        WorkoutExercise.duration,
+    ).join(
+        Workout, WorkoutExercise.workout_id == Workout.id
+    ).filter(
+        Workout.user_id == user_id,
+        Workout.is_completed,
+        WorkoutExercise.exercise_id == exercise_id
+    ).order_by(
+        Workout.date.asc(), Workout.id.asc()
+    ).all()
+
+    n = len(rows)
+    return {
+        'workout_id': np.fromiter((r[0] for r in rows), dtype=np.int64, count=n),
+        'date': np.array([r[1] for r in rows], dtype='datetime64[D]'),
+        'sets': np.fromiter((r[2] or 0 for r in rows), dtype=np.float64, count=n),
+        'reps': np.fromiter((r[3] or 0 for r in rows), dtype=np.float64, count=n),
+        'weight': np.fromiter((float(r[4]) if r[4] else 0.0 for r in rows), dtype=np.float64, count=n),
+        'duration': np.fromiter((r[5] or 0 for r in rows), dtype=np.float64, count=n),
+    }
+
+
+def aggregate_sessions(history, formula=DEFAULT_FORMULA):
+    """
+    Collapse set rows into one row per workout: top weight, best e1RM,
+    total sets and volume. Rows must already be ordered by workout.
+    """
+    workout_ids = history['workout_id']
+    if workout_ids.size == 0:
+        empty = np.array([], dtype=np.float64)
+        return {
+            'date': np.array([], dtype='datetime64[D]'),
+            'sets': empty, 'reps': empty, 'weight': empty,
+            'volume': empty, 'e1rm': empty, 'duration': empty,
+        }
+
+    # Session boundaries are where the workout id changes
+    starts = np.flatnonzero(np.r_[True, workout_ids[1:] != workout_ids[:-1]])
+
+    volume = history['weight'] * history['reps'] * np.maximum(history['sets'], 1)
+    e1rm = one_rep_max(history['weight'], history['reps'], formula)
+    # fmax.reduceat ignores NaN unless the whole session is NaN
+    session_e1rm = np.fmax.reduceat(e1rm, starts)
+
+    return {
+        'date': history['date'][starts],
+        'sets': np.add.reduceat(history['sets'], starts),
+        'reps': np.maximum.reduceat(history['reps'], starts),
+        'weight': np.maximum.reduceat(history['weight'], starts),
+        'volume': np.add.reduceat(volume, starts),
+        'e1rm': session_e1rm,
+        'duration': np.add.reduceat(history['duration'], starts),
+    }
+
+
+def rolling_best(values, window=None):
+    """
+    Best value so far (window=None) or over the trailing `window` sessions.
+    NaN entries never count as a best.
+    """
+    filled = np.where(np.isnan(values), -np.inf, values)
+    if window is None or window >= filled.size:
+        best = np.maximum.accumulate(filled) if filled.size else filled
+    else:
+        padded = np.r_[np.full(window - 1, -np.inf), filled]
+        best = np.lib.stride_tricks.sliding_window_view(padded, window).max(axis=1)
+    return np.where(np.isinf(best), np.nan, best)
+
+
+def trend_slope(dates, values, days=90):
+    """
+    Least-squares slope of values over the last `days`, in units per week.
+    Returns None with fewer than two usable points.
+    """
+    if dates.size == 0:
+        return None
+    recent = dates >= dates[-1] - np.timedelta64(days, 'D')
+    mask = recent & ~np.isnan(values)
+    if np.count_nonzero(mask) < 2:
+        return None
+
+    x = (dates[mask] - dates[mask][0]).astype(np.float64)
+    y = values[mask]
+    if np.ptp(x) == 0:
+        return None
+    slope_per_day = np.polyfit(x, y, 1)[0]
+    return float(slope_per_day * 7)
+
+
+def detect_plateau(dates, values, min_sessions=6, min_days=21, tolerance=0.01):
+    """
+    A plateau is when the all-time best has not improved by more than
+    `tolerance` (fraction) for at least `min_sessions` sessions spanning
+    `min_days`.
+    """
+    result = {'is_plateau': False, 'sessions_since_best': 0, 'days_since_best': 0}
+    if dates.size == 0 or np.all(np.isnan(values)):
+        return result
+
+    # Index of the last session that beat the previous best by more than tolerance
+    best = np.nan_to_num(rolling_best(values), nan=-np.inf)
+    prev = np.r_[-np.inf, best[:-1]]
+    improved = np.flatnonzero(best > prev * (1 + tolerance))
+    last_idx = int(improved[-1]) if improved.size else 0
+
+    sessions_since = int(dates.size - 1 - last_idx)
+    days_since = int((dates[-1] - dates[last_idx]).astype(np.int64))
+    result.update({
+        'is_plateau': sessions_since >= min_sessions and days_since >= min_days,
+        'sessions_since_best': sessions_since,
+        'days_since_best': days_since,
+    })
+    return result
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling. Returns the indices of the
+    points to keep, always including the first and last.
+    """
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    y = np.nan_to_num(y, nan=0.0)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], (edges[i + 2] if i + 2 < edges.size else n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs(
+            (x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
+
+
+def _float_or_none(value):
+    return None if value is None or np.isnan(value) else round(float(value), 2)
+
+
+def _nanmax_or_none(values):
+    return None if np.all(np.isnan(values)) else _float_or_none(np.nanmax(values))
+
+
+def analyze_progression(history, formula=DEFAULT_FORMULA, max_points=500,
+                        best_window=10, trend_days=90):
+    """
+    Build the chart series and summary stats for one exercise history.
+    The series is downsampled to at most `max_points` with LTTB on e1RM
+    (or top weight for sets without reps); stats use the full history.
+    """
+    sessions = aggregate_sessions(history, formula)
+    dates = sessions['date']
+    count = int(dates.size)
+
+    if count == 0:
+        return {'progression': [], 'stats': None, 'analysis': None}
+
+    e1rm = sessions['e1rm']
+    all_time_best = rolling_best(e1rm)
+    window_best = rolling_best(e1rm, best_window)
+
+    signal = np.where(np.isnan(e1rm), sessions['weight'], e1rm)
+    x = (dates - dates[0]).astype(np.float64) + np.arange(count) * 1e-3
+    keep = lttb_indices(x, signal, max_points)
+
+    date_strings = np.datetime_as_string(dates[keep], unit='D')
+    progression = [
+        {
+            'date': str(date_strings[i]),
+            'sets': int(sessions['sets'][k]),
+            'reps': int(sessions['reps'][k]),
+            'weight': float(sessions['weight'][k]),
+            'volume': float(sessions['volume'][k]),
+            'duration': int(sessions['duration'][k]),
+            'e1rm': _float_or_none(e1rm[k]),
+            'best_e1rm': _float_or_none(all_time_best[k]),
+            'rolling_best_e1rm': _float_or_none(window_best[k]),
+        }
+        for i, k in enumerate(keep)
+    ]
+
+    weights = sessions['weight']
+    reps = sessions['reps']
+    volumes = sessions['volume']
+    stats = {
+        'total_sessions': count,
+        'total_sets': int(history['workout_id'].size),
+        'max_weight': float(weights.max()),
+        'avg_weight': round(float(weights.mean()), 1),
+        'max_reps': int(reps.max()),
+        'avg_reps': round(float(reps.mean()), 1),
+        'max_volume': float(volumes.max()),
+        'avg_volume': round(float(volumes.mean()), 1),
+    }
+
+    slope = trend_slope(dates, e1rm, trend_days)
+    analysis = {
+        'formula': formula,
+        'best_e1rm': _nanmax_or_none(e1rm),
+        # Best single-set estimate under every model, for side-by-side display
+        'estimates': {
+            name: _nanmax_or_none(one_rep_max(history['weight'], history['reps'], name))
+            for name in ONE_RM_FORMULAS
+        },
+        'trend_per_week': round(slope, 2) if slope is not None else None,
+        'trend_days': trend_days,
+        'plateau': detect_plateau(dates, e1rm),
+        'downsampled': bool(keep.size < count),
+    }
+
+    return {'progression': progression, 'stats': stats, 'analysis': analysis}
@@ -0,0 +1,415 @@
+"""
+Offline sync: idempotent batches of queued writes, and a change feed.
+
+apply_batch() applies an ordered list of operations, each carrying a
+client-generated idempotency key. Keys already applied are answered from
+sync_operations without writing again. New operations are applied in order,
+each in its own savepoint of one transaction, so an invalid operation fails
+alone while the rest commit together with their keys.
+
+Every flush that writes a synced entity appends to sync_changes in the same
+transaction. changes_since() returns what changed after a cursor, collapsed
+to the current row or a tombstone per entity, so a client can resync
+without downloading full lists.
+
+Feed ids are taken at flush, not commit, so a transaction can commit rows
+with lower ids than one still in flight. On Postgres each row therefore
+carries its transaction's txid, the feed is read in (txid, id) order, and
+only rows below the oldest in-flight txid (the snapshot xmin) are served:
+anything committed later has a txid at or above it, so it sorts after the
+cursor. SQLite has a single writer, commits in id order and uses txid 0.
+"""
+from datetime import date, datetime
+from marshmallow import ValidationError
+from sqlalchemy import event, func, insert, or_, select, text, tuple_
+from sqlalchemy.exc import IntegrityError
+from database import db
+from models import BodyMeasurement, Exercise, Habit, HabitLog, WeightLog, Workout, WorkoutExercise
+from models.sync import SyncChange, SyncOperation
+from utils.habit_calendar import record_completion
+from utils.local_time import as_utc, local_date_for, local_today
+from utils.validators import BodyMeasurementSchema, WorkoutSchema
+
+
+MAX_OPERATIONS = 100
+MAX_KEY_LENGTH = 100
+CHANGES_PAGE_SIZE = 500
+MAX_CHANGES_PAGE_SIZE = 2000
+
+# entity_type -> key in the change feed
+FEED_KEYS = {
+    'workout': 'workouts',
+    'habit_log': 'habit_logs',
+    'weight_log': 'weight_logs',
+    'body_measurement': 'body_measurements',
+}
+
+_OWNED_ENTITIES = {Workout: 'workout', WeightLog: 'weight_log', BodyMeasurement: 'body_measurement'}
+
+
+# ---------------------------------------------------------------------------
+# Change feed
+# ---------------------------------------------------------------------------
+
+def _current_txid(connection):
+    if connection.dialect.name == 'sqlite':
+        return 0
+    return connection.execute(text('SELECT txid_current()')).scalar()
+
+
+def _watermark():
+    """Oldest txid that may still be in flight; None on SQLite."""
+    if db.engine.dialect.name == 'sqlite':
+        return None
+    return db.session.execute(text('SELECT txid_snapshot_xmin(txid_current_snapshot())')).scalar()
+
+
+def encode_cursor(txid, change_id):
+    return f"{txid}.{change_id}"
+
+
+def decode_cursor(cursor):
+    """(txid, id) from a feed cursor; a bare id is (0, id). ValueError if malformed."""
+    txid, _, change_id = cursor.rpartition('.')
+    txid, change_id = int(txid or 0), int(change_id)
+    if txid < 0 or change_id < 0:
+        raise ValueError("negative cursor")
+    return txid, change_id
+
+
+def _change(changes, entity_type, entity_id, user_id, deleted):
+    if entity_id is None or user_id is None:
+        return
+    key = (entity_type, entity_id)
+    previous = changes.get(key)
+    changes[key] = (user_id, deleted or (previous is not None and previous[1]))
+
+
+@event.listens_for(db.session, 'after_flush')
+def _record_changes(session, flush_context):
+    changes = {}
+    parent_workouts = set()
+    habit_owners, habit_logs = {}, []
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        entity_type = _OWNED_ENTITIES.get(type(obj))
+        if entity_type:
+            _change(changes, entity_type, obj.id, obj.user_id, obj in session.deleted)
+        elif isinstance(obj, WorkoutExercise):
+            parent_workouts.add(obj.workout_id)
+        elif isinstance(obj, HabitLog):
+            habit_logs.append((obj.id, obj.habit_id, obj in session.deleted))
+        elif isinstance(obj, Habit):
+            habit_owners[obj.id] = obj.user_id
+
+    # An exercise row changes its workout; a log belongs to its habit's user
+    connection = session.connection()
+    parent_workouts -= {workout_id for entity_type, workout_id in changes if entity_type == 'workout'}
+    parent_workouts.discard(None)
+    if parent_workouts:
+        for workout_id, user_id in connection.execute(
+            select(Workout.id, Workout.user_id).where(Workout.id.in_(parent_workouts))
+        ):
+            _change(changes, 'workout', workout_id, user_id, False)
+    unknown = {habit_id for _, habit_id, _ in habit_logs} - set(habit_owners)
+    if unknown:
+        habit_owners.update(connection.execute(
+            select(Habit.id, Habit.user_id).where(Habit.id.in_(unknown))
+        ).all())
+    for log_id, habit_id, deleted in habit_logs:
+        _change(changes, 'habit_log', log_id, habit_owners.get(habit_id), deleted)
+
+    if changes:
+        now, txid = datetime.utcnow(), _current_txid(connection)
+        connection.execute(insert(SyncChange), [
+            {'user_id': user_id, 'entity_type': entity_type, 'entity_id': entity_id,
+             'deleted': deleted, 'created_at': now, 'txid': txid}
+            for (entity_type, entity_id), (user_id, deleted) in changes.items()
+        ])
+
+
+def record_changes(user_id, entity_type, entity_ids, deleted=False):
+    """Feed rows for Core writes, which bypass the flush hook. The caller commits."""
+    if entity_ids:
+        now, txid = datetime.utcnow(), _current_txid(db.session.connection())
+        db.session.execute(insert(SyncChange), [
+            {'user_id': user_id, 'entity_type': entity_type, 'entity_id': entity_id,
+             'deleted': deleted, 'created_at': now, 'txid': txid}
+            for entity_id in entity_ids
+        ])
+
+
+def _committed(query):
+    watermark = _watermark()
+    return query if watermark is None else query.filter(SyncChange.txid < watermark)
+
+
+def head_cursor(user_id):
+    """The cursor to start from after a full download."""
+    head = _committed(db.session.query(SyncChange.txid, SyncChange.id).filter(
+        SyncChange.user_id == user_id,
+    )).order_by(SyncChange.txid.desc(), SyncChange.id.desc()).first()
+    return encode_cursor(*head) if head else encode_cursor(0, 0)
+
+
+def _workouts(user_id, ids):
+    workouts = Workout.query.filter(Workout.id.in_(ids), Workout.user_id == user_id).all()
+    exercises = {}
+    for we, name in db.session.query(WorkoutExercise, Exercise.name).join(
+        Exercise, WorkoutExercise.exercise_id == Exercise.id
+    ).filter(
+        WorkoutExercise.workout_id.in_([w.id for w in workouts])
+    ).order_by(WorkoutExercise.id):
+        exercises.setdefault(we.workout_id, []).append({
+            'exercise_id': we.exercise_id,
+            'name': name,
+            'sets': we.sets,
+            'reps': we.reps,
+            'weight': float(we.weight) if we.weight is not None else None,
+            'duration': we.duration,
+            'notes': we.notes
+        })
+    return [{**w.to_dict(), 'exercises': exercises.get(w.id, [])} for w in workouts]
+
+
+def _habit_logs(user_id, ids):
+    return [log.to_dict() for log in HabitLog.query.join(Habit, HabitLog.habit_id == Habit.id).filter(
+        HabitLog.id.in_(ids), Habit.user_id == user_id
+    )]
+
+
+def _weight_logs(user_id, ids):
+    return [{
+        'id': w.id,
+        'weight_kg': float(w.weight_kg) if w.weight_kg is not None else None,
+        'date': w.date.isoformat() if w.date else None,
+        'created_at': w.created_at.isoformat() if w.created_at else None
+    } for w in WeightLog.query.filter(WeightLog.id.in_(ids), WeightLog.user_id == user_id)]
+
+
+def _body_measurements(user_id, ids):
+    return [m.to_dict() for m in BodyMeasurement.query.filter(
+        BodyMeasurement.id.in_(ids), BodyMeasurement.user_id == user_id
+    )]
+
+
+_LOADERS = {
+    'workout': _workouts,
+    'habit_log': _habit_logs,
+    'weight_log': _weight_logs,
+    'body_measurement': _body_measurements,
+}
+
+
+def changes_since(user_id, cursor, limit=CHANGES_PAGE_SIZE):
+    """
+    Up to `limit` feed rows after `cursor` (a decoded (txid, id) pair), as
+    the current state of each changed entity (one query per entity type)
+    and the ids deleted since. Returns {cursor, has_more, changes, deleted};
+    pass `cursor` back to continue.
+    """
+    rows = _committed(db.session.query(
+        SyncChange.txid, SyncChange.id, SyncChange.entity_type, SyncChange.entity_id, SyncChange.deleted
+    ).filter(
+        SyncChange.user_id == user_id,
+        tuple_(SyncChange.txid, SyncChange.id) > tuple(cursor),
+    )).order_by(SyncChange.txid, SyncChange.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest = {}
+    for row in rows:
+        latest[(row.entity_type, row.entity_id)] = row.deleted
+
+    changes = {key: [] for key in FEED_KEYS.values()}
+    deleted = {key: [] for key in FEED_KEYS.values()}
+    for entity_type, key in FEED_KEYS.items():
+        ids = [entity_id for (kind, entity_id), gone in latest.items() if kind == entity_type and not gone]
+        deleted[key] = sorted(entity_id for (kind, entity_id), gone in latest.items()
+                              if kind == entity_type and gone)
+        if ids:
+            changes[key] = _LOADERS[entity_type](user_id, ids)
+            # Changed, then deleted in a later page: a tombstone now
+            deleted[key] = sorted(set(deleted[key]) | (set(ids) - {item['id'] for item in changes[key]}))
+
+    return {
+        'cursor': encode_cursor(*(rows[-1][:2] if rows else cursor)),
+        'has_more': has_more,
+        'changes': changes,
+        'deleted': deleted,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Operations
+# ---------------------------------------------------------------------------
+
+def _create_workout(user_id, data):
+    data = WorkoutSchema().load(data)
+    entries = [e for e in data.get('exercises') or [] if isinstance(e, dict)]
+
+    # Exercises by id or, failing that, by name; one query for the workout
+    ids = {e['exercise_id'] for e in entries if isinstance(e.get('exercise_id'), int)}
+    names = {e['exercise_name'].strip().lower() for e in entries
+             if not e.get('exercise_id') and isinstance(e.get('exercise_name'), str)}
+    known_ids, by_name = set(), {}
+    if ids or names:
+        for exercise_id, name in db.session.query(Exercise.id, func.lower(Exercise.name)).filter(
+            or_(Exercise.id.in_(ids), func.lower(Exercise.name).in_(names))
+        ):
+            known_ids.add(exercise_id)
+            by_name.setdefault(name, exercise_id)
+
+    workout = Workout(
+        user_id=user_id,
+        type=data['type'],
+        duration=data['duration'],
+        date=data.get('date') or local_today(user_id),
+        notes=data.get('notes'),
+        rpe=data.get('rpe')
+    )
+    db.session.add(workout)
+    db.session.flush()
+
+    workout_exercises = []
+    for entry in entries:
+        exercise_id = entry.get('exercise_id')
+        if not exercise_id and isinstance(entry.get('exercise_name'), str):
+            exercise_id = by_name.get(entry['exercise_name'].strip().lower())
+        if exercise_id not in known_ids:
+            continue
+        workout_exercises.append(WorkoutExercise(
+            workout_id=workout.id,
+            exercise_id=exercise_id,
+            sets=entry.get('sets'),
+            reps=entry.get('reps'),
+            weight=entry.get('weight'),
+            duration=entry.get('duration'),
+            notes=entry.get('notes')
+        ))
+    db.session.add_all(workout_exercises)
+    return workout, (workout, workout_exercises, data.get('program_workout_id'))
+
+
+def _create_habit_log(user_id, data):
+    habit_id = data.get('habit_id')
+    if not isinstance(habit_id, int):
+        raise ValueError("habit_id is required")
+    habit = Habit.query.filter_by(id=habit_id, user_id=user_id).first()
+    if not habit:
+        raise ValueError("Habit not found")
+
+    try:
+        logged_at = as_utc(datetime.fromisoformat(data['timestamp'])) if data.get('timestamp') else datetime.utcnow()
+    except (TypeError, ValueError):
+        raise ValueError("timestamp must be an ISO 8601 datetime")
+    local_date = local_date_for(user_id, logged_at)
+    if HabitLog.query.filter_by(habit_id=habit_id, local_date=local_date).first():
+        raise ValueError("Habit already logged that day")
+
+    habit_log = HabitLog(
+        habit_id=habit_id,
+        timestamp=logged_at,
+        local_date=local_date,
+        completed=data.get('completed', True),
+        amount=data.get('amount'),
+        notes=data.get('notes')
+    )
+    db.session.add(habit_log)
+    db.session.flush()
+    if habit_log.completed:
+        record_completion(habit, local_date)
+    return habit_log, habit_log
+
+
+def _create_weight_log(user_id, data):
+    weight = data.get('weight_kg')
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+        raise ValueError("weight_kg must be a positive number")
+    try:
+        day = date.fromisoformat(data['date']) if data.get('date') else local_today(user_id)
+    except (TypeError, ValueError):
+        raise ValueError("date must be YYYY-MM-DD")
+
+    weight_log = WeightLog(user_id=user_id, weight_kg=weight, date=day, created_at=datetime.utcnow())
+    db.session.add(weight_log)
+    return weight_log, weight_log
+
+
+def _upsert_body_measurement(user_id, data):
+    data = BodyMeasurementSchema().load(data)
+    measured_at = data.pop('measured_at', None) or local_today(user_id)
+    fields = {field: data.get(field) for field in BodyMeasurementSchema().fields if field != 'measured_at'}
+
+    measurement = BodyMeasurement.query.filter_by(user_id=user_id, measured_at=measured_at).first()
+    created = measurement is None
+    if created:
+        measurement = BodyMeasurement(user_id=user_id, measured_at=measured_at, **fields)
+        db.session.add(measurement)
+    else:
+        for field, value in fields.items():
+            setattr(measurement, field, value)
+        measurement.updated_at = datetime.utcnow()
+    return measurement, (measurement, created)
+
+
+# op -> (entity_type, apply(user_id, data) -> (entity, reward item))
+OPERATIONS = {
+    'workout.create': ('workout', _create_workout),
+    'habit_log.create': ('habit_log', _create_habit_log),
+    'weight_log.create': ('weight_log', _create_weight_log),
+    'body_measurement.upsert': ('body_measurement', _upsert_body_measurement),
+}
+
+
+def apply_batch(user_id, operations):
+    """
+    Apply operations ([{key, op, data}], already shape-checked) in order.
+    Returns (results, applied): one result per operation, and per
+    entity_type the items for the reward pipeline, for new writes only.
+    The caller commits.
+    """
+    keys = {operation['key'] for operation in operations}
+    done = {
+        row.idempotency_key: row.result for row in SyncOperation.query.filter(
+            SyncOperation.user_id == user_id,
+            SyncOperation.idempotency_key.in_(keys),
+        )
+    }
+
+    results = []
+    applied = {entity_type: [] for entity_type in FEED_KEYS}
+    for operation in operations:
+        key, op = operation['key'], operation['op']
+        if key in done:
+            results.append({'key': key, **(done[key] or {}), 'status': 'duplicate'})
+            continue
+
+        entity_type, apply = OPERATIONS[op]
+        try:
+            with db.session.begin_nested():
+                record = SyncOperation(user_id=user_id, idempotency_key=key, op_type=op)
+                db.session.add(record)
+                db.session.flush()  # claims the key before writing
+                entity, reward = apply(user_id, operation.get('data') or {})
+                db.session.flush()
+                record.result = {'op': op, 'entity_type': entity_type, 'id': entity.id}
+        except ValidationError as e:
+            results.append({'key': key, 'op': op, 'status': 'failed',
+                            'message': "Validation error", 'errors': e.messages})
+            continue
+        except ValueError as e:
+            results.append({'key': key, 'op': op, 'status': 'failed', 'message': str(e)})
+            continue
+        except IntegrityError:
+            # A concurrent replay committed the key first, or a unique row clashed
+            existing = SyncOperation.query.filter_by(user_id=user_id, idempotency_key=key).first()
+            if existing:
+                results.append({'key': key, **(existing.result or {}), 'status': 'duplicate'})
+            else:
+                results.append({'key': key, 'op': op, 'status': 'failed', 'message': "Conflicts with existing data"})
+            continue
+
+        done[key] = record.result
+        applied[entity_type].append(reward)
+        results.append({'key': key, **record.result, 'status': 'applied'})
+    return results, applied
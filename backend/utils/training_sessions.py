@@ -0,0 +1,150 @@
+"""
+The training_sessions projection: strength workouts and cardio sessions in
+one table keyed by (user_id, local_date).
+
+Rows are rewritten from their source tables after every flush that adds,
+changes or deletes a Workout, WorkoutExercise or CardioWorkout, inside the
+same transaction, so the projection commits or rolls back with the write.
+The same hook refreshes the per-workout counters (utils/workout_totals.py)
+first, and strength rows copy total_volume from them. A planned workout
+(completed_at NULL) has no row until it is completed.
+Readers get a day's sessions, durations and volume from one indexed range
+query.
+"""
+from datetime import timedelta
+from sqlalchemy import event, func, insert, literal, null, select
+from database import db
+from models import Workout, WorkoutExercise
+from models.cardio_workout import CardioWorkout
+from models.training_session import TrainingSession
+from utils.workout_totals import refresh_workout_totals
+
+
+STREAK_WINDOW_DAYS = 366
+
+_COLUMNS = ['user_id', 'kind', 'source_id', 'local_date', 'activity', 'duration', 'volume', 'distance']
+
+
+def _strength_rows(workout_ids):
+    return select(
+        Workout.user_id, literal('strength'), Workout.id,
+        func.coalesce(Workout.date, func.date(Workout.created_at)),
+        Workout.type, Workout.duration, Workout.total_volume, null(),
+    ).where(Workout.id.in_(workout_ids), Workout.is_completed)
+
+
+def _cardio_rows(cardio_ids):
+    return select(
+        CardioWorkout.user_id, literal('cardio'), CardioWorkout.id,
+        CardioWorkout.local_date, CardioWorkout.cardio_type,
+        CardioWorkout.duration, literal(0), CardioWorkout.distance,
+    ).where(CardioWorkout.id.in_(cardio_ids))
+
+
+def _refresh(connection, kind, source_ids, rows):
+    source_ids = sorted(source_ids)
+    connection.execute(TrainingSession.__table__.delete().where(
+        TrainingSession.kind == kind, TrainingSession.source_id.in_(source_ids)
+    ))
+    connection.execute(insert(TrainingSession).from_select(_COLUMNS, rows(source_ids)))
+
+
+def refresh_workouts(session, workout_ids):
+    """
+    Counters and projection rows for `workout_ids`. The flush hook calls
+    this; bulk Core writes to workout_exercises, which bypass the hook,
+    call it themselves.
+    """
+    connection = session.connection()
+    refresh_workout_totals(session, connection, workout_ids)
+    _refresh(connection, 'strength', workout_ids, _strength_rows)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _sync_projection(session, flush_context):
+    workout_ids, cardio_ids = set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Workout):
+            workout_ids.add(obj.id)
+        elif isinstance(obj, WorkoutExercise):
+            workout_ids.add(obj.workout_id)
+        elif isinstance(obj, CardioWorkout):
+            cardio_ids.add(obj.id)
+    workout_ids.discard(None)
+    cardio_ids.discard(None)
+
+    # Deleted sources simply have no row to re-insert
+    connection = session.connection()
+    if workout_ids:
+        refresh_workouts(session, workout_ids)
+    if cardio_ids:
+        _refresh(connection, 'cardio', cardio_ids, _cardio_rows)
+
+
+def sessions_between(user_id, start, end):
+    """The user's TrainingSession rows with start <= local_date <= end, oldest first."""
+    return TrainingSession.query.filter(
+        TrainingSession.user_id == user_id,
+        TrainingSession.local_date >= start,
+        TrainingSession.local_date <= end,
+    ).order_by(TrainingSession.local_date, TrainingSession.id).all()
+
+
+def period_totals(user_id, start, end):
+    """(sessions, duration, volume) for start <= local_date < end."""
+    count, duration, volume = db.session.query(
+        func.count(TrainingSession.id),
+        func.coalesce(func.sum(TrainingSession.duration), 0),
+        func.coalesce(func.sum(TrainingSession.volume), 0),
+    ).filter(
+        TrainingSession.user_id == user_id,
+        TrainingSession.local_date >= start,
+        TrainingSession.local_date < end,
+    ).one()
+    return count, int(duration), float(volume)
+
+
+def active_days(user_id, start=None, end=None):
+    """Set of local dates (optionally within [start, end]) with at least one session."""
+    query = db.session.query(TrainingSession.local_date).filter(TrainingSession.user_id == user_id)
+    if start:
+        query = query.filter(TrainingSession.local_date >= start)
+    if end:
+        query = query.filter(TrainingSession.local_date <= end)
+    return {day for (day,) in query.distinct()}
+
+
+def last_active_date(user_id):
+    return db.session.query(func.max(TrainingSession.local_date)).filter(
+        TrainingSession.user_id == user_id
+    ).scalar()
+
+
+def count_back(days, today):
+    """Consecutive days in `days` ending on `today`."""
+    streak = 0
+    while today - timedelta(days=streak) in days:
+        streak += 1
+    return streak
+
+
+def longest_run(days):
+    """Longest run of consecutive dates in `days`."""
+    longest = 0
+    for day in days:
+        if day - timedelta(days=1) in days:
+            continue
+        run = 1
+        while day + timedelta(days=run) in days:
+            run += 1
+        longest = max(longest, run)
+    return longest
+
+
+def training_streak(user_id, today, extra_days=()):
+    """
+    Consecutive days up to today with a session (or one of `extra_days`,
+    e.g. streak freezes). One range query over the last year.
+    """
+    days = active_days(user_id, today - timedelta(days=STREAK_WINDOW_DAYS - 1), today)
+    return count_back(days | set(extra_days), today)
@@ -45,6 +45,7 @@ class WorkoutSchema(Schema):
     notes = fields.Str(allow_none=True, validate=validate.Length(max=500))
     rpe = fields.Int(allow_none=True, validate=validate.Range(min=1, max=10))
     exercises = fields.List(fields.Dict(), required=False)
+    program_workout_id = fields.Int(allow_none=True, load_default=None)
 
     class Meta:
         unknown = EXCLUDE
@@ -134,6 +135,7 @@ class UserProfileSchema(Schema):
     activity_level = fields.Str(allow_none=True, validate=validate.OneOf([
         'sedentary', 'lightly_active', 'moderately_active', 'very_active', 'extra_active'
     ]))
+    timezone = fields.Str(allow_none=True, validate=validate.Length(max=64))
 
 
 class PaginationSchema(Schema):
@@ -0,0 +1,124 @@
+"""
+Workout templates: batched loading and starting a workout from one.
+
+load_template_exercises() fetches the exercises of any number of templates
+in one joined query, so listing templates costs the same at 1 or 100.
+
+instantiate_template() copies a template's rows into a new workout with a
+single INSERT ... SELECT, prefilling reps and weight from the user's last
+performance of each exercise (double progression: add weight once the top
+of the rep range was reached, otherwise aim for one more rep).
+"""
+import re
+from datetime import datetime
+from sqlalchemy import case, insert, literal, null, select
+from database import db
+from models import Exercise, TemplateExercise, Workout, WorkoutExercise
+from utils.last_performance import last_performance_map
+from utils.training_sessions import refresh_workouts
+
+
+# Load added once the top of the rep range was reached (kg)
+WEIGHT_INCREMENT = 2.5
+
+_REP_RANGE = re.compile(r'^\s*(\d+)\s*(?:-\s*(\d+))?')
+
+
+def load_template_exercises(template_ids):
+    """{template_id: [(TemplateExercise, exercise_name)]} in template order."""
+    grouped = {template_id: [] for template_id in template_ids}
+    if not grouped:
+        return grouped
+    rows = db.session.query(TemplateExercise, Exercise.name).join(
+        Exercise, TemplateExercise.exercise_id == Exercise.id
+    ).filter(
+        TemplateExercise.template_id.in_(list(grouped))
+    ).order_by(
+        TemplateExercise.template_id, TemplateExercise.order_index, TemplateExercise.id
+    ).all()
+    for template_exercise, name in rows:
+        grouped[template_exercise.template_id].append((template_exercise, name))
+    return grouped
+
+
+def parse_rep_range(reps):
+    """(low, high) from "8-12" or "10"; None when there is no rep target."""
+    match = _REP_RANGE.match(reps or '')
+    if not match:
+        return None
+    low = int(match.group(1))
+    high = int(match.group(2)) if match.group(2) else low
+    return min(low, high), max(low, high)
+
+
+def suggest_progression(rep_range, last_performance, template_weight=None):
+    """(reps, weight) to prefill for an exercise."""
+    low, high = rep_range or (None, None)
+    last_weight = last_performance['weight'] if last_performance else None
+    last_reps = last_performance['reps'] if last_performance else None
+
+    if last_weight is None:
+        return low, float(template_weight) if template_weight else None
+    if low is None or last_reps is None:
+        return low if low is not None else last_reps, last_weight
+    if last_reps >= high:
+        return low, last_weight + WEIGHT_INCREMENT
+    return max(low, min(last_reps + 1, high)), last_weight
+
+
+def instantiate_template(user_id, template, workout_date):
+    """
+    Create a planned Workout (completed_at NULL) from `template` with its
+    exercises prefilled. Returns (workout, [(WorkoutExercise, name,
+    last_performance)]); the caller commits.
+    """
+    rows = load_template_exercises([template.id])[template.id]
+    history = last_performance_map(user_id, list({te.exercise_id for te, _ in rows}))
+
+    reps_by_row, weight_by_row = {}, {}
+    for template_exercise, _ in rows:
+        reps, weight = suggest_progression(
+            parse_rep_range(template_exercise.reps),
+            history.get(template_exercise.exercise_id),
+            template_exercise.weight,
+        )
+        if reps is not None:
+            reps_by_row[template_exercise.id] = reps
+        if weight is not None:
+            weight_by_row[template_exercise.id] = weight
+
+    workout = Workout(
+        user_id=user_id,
+        type=template.name,
+        duration=template.duration_minutes,
+        date=workout_date,
+        created_at=datetime.utcnow(),
+        completed_at=null(),  # not None, which would take the column default
+    )
+    db.session.add(workout)
+    db.session.flush()
+
+    def by_row(values):
+        return case(values, value=TemplateExercise.id, else_=null()) if values else null()
+
+    db.session.execute(insert(WorkoutExercise).from_select(
+        ['workout_id', 'exercise_id', 'sets', 'reps', 'weight', 'duration', 'rest_time', 'notes'],
+        select(
+            literal(workout.id), TemplateExercise.exercise_id, TemplateExercise.sets,
+            by_row(reps_by_row), by_row(weight_by_row),
+            TemplateExercise.duration, TemplateExercise.rest_time, TemplateExercise.notes,
+        ).join(
+            Exercise, TemplateExercise.exercise_id == Exercise.id
+        ).where(
+            TemplateExercise.template_id == template.id
+        ).order_by(TemplateExercise.order_index, TemplateExercise.id)
+    ))
+    # The Core insert bypasses the flush hook that maintains counters
+    refresh_workouts(db.session, [workout.id])
+
+    created = db.session.query(WorkoutExercise, Exercise.name).join(
+        Exercise, WorkoutExercise.exercise_id == Exercise.id
+    ).filter(
+        WorkoutExercise.workout_id == workout.id
+    ).order_by(WorkoutExercise.id).all()
+    return workout, [(we, name, history.get(we.exercise_id)) for we, name in created]
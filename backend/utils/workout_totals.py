@@ -0,0 +1,49 @@
+"""
+Denormalized per-workout counters: exercise_count, total_sets and
+total_volume on workouts.
+
+refresh_workout_totals() recomputes them from workout_exercises with one
+UPDATE for every workout touched by a flush. It runs from the flush hook in
+utils/training_sessions.py, so every write path (API, templates, programs,
+scripts using the ORM) keeps them current within the same transaction.
+"""
+from sqlalchemy import func, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+from models import Workout, WorkoutExercise
+
+
+TOTAL_COLUMNS = ('exercise_count', 'total_sets', 'total_volume')
+
+
+def _per_workout(expr):
+    return select(expr).where(WorkoutExercise.workout_id == Workout.id).scalar_subquery()
+
+
+def refresh_workout_totals(session, connection, workout_ids):
+    """Recompute the counters for `workout_ids` and sync loaded Workout objects."""
+    workout_ids = sorted(workout_ids)
+    connection.execute(
+        update(Workout.__table__).where(Workout.id.in_(workout_ids)).values(
+            exercise_count=_per_workout(func.count(WorkoutExercise.id)),
+            total_sets=_per_workout(func.coalesce(func.sum(WorkoutExercise.sets), 0)),
+            total_volume=_per_workout(func.coalesce(
+                func.sum(WorkoutExercise.weight * WorkoutExercise.reps * WorkoutExercise.sets), 0
+            )),
+        )
+    )
+
+    # Objects already in the session would otherwise keep their pre-flush values
+    wanted = set(workout_ids)
+    loaded = {
+        obj.id: obj for obj in session.identity_map.values()
+        if isinstance(obj, Workout) and obj.id in wanted
+    }
+    if not loaded:
+        return
+    rows = connection.execute(
+        select(Workout.id, Workout.exercise_count, Workout.total_sets, Workout.total_volume)
+        .where(Workout.id.in_(list(loaded)))
+    )
+    for row in rows:
+        for column in TOTAL_COLUMNS:
+            set_committed_value(loaded[row.id], column, getattr(row, column))